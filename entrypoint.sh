@@ -5,40 +5,10 @@ set -e
 
 echo "Starting entrypoint script..."
 
-# Wait for PostgreSQL to be ready
-echo "Waiting for PostgreSQL..."
-while ! pg_isready -h "$POSTGRES_HOST" -p "$POSTGRES_PORT" -U "$POSTGRES_USER"; do
-  echo "PostgreSQL is unavailable - sleeping"
-  sleep 2
-done
-
-echo "PostgreSQL is up - continuing..."
-
-# Run migrations
-echo "Running database migrations..."
-python manage.py migrate --noinput
-
-# Create superuser if it doesn't exist
-echo "Creating superuser if needed..."
-python manage.py shell << END
-from django.contrib.auth import get_user_model
-User = get_user_model()
-if not User.objects.filter(username='admin').exists():
-    User.objects.create_superuser('admin', 'admin@example.com', 'admin123')
-    print('Superuser created successfully')
-else:
-    print('Superuser already exists')
-END
-
-# Collect static files
-echo "Collecting static files..."
-python manage.py collectstatic --noinput
+# Wait for the database, apply pending migrations, ensure the admin user
+# exists and collect static files only if they changed - in one process
+python manage.py bootstrap
 
 echo "Starting Gunicorn..."
-exec gunicorn mymainserver.wsgi:application \
-    --bind 0.0.0.0:8000 \
-    --workers 3 \
-    --timeout 120 \
-    --access-logfile - \
-    --error-logfile - \
-    --log-level info
+# Worker model, sizing, preload and recycling are configured via GUNICORN_* env vars
+exec gunicorn -c python:mymainserver.gunicorn_conf
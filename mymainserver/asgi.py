@@ -5,6 +5,18 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Serving over ASGI lets the async polling views in userbaseapp/async_views.py
+(mounted under /async/) handle many concurrent pollers per process. Run it
+standalone with uvicorn:
+
+    python -m mymainserver.asgi
+
+or under gunicorn with uvicorn workers:
+
+    gunicorn mymainserver.asgi:application -k uvicorn.workers.UvicornWorker
+
+Standalone server settings come from the ASGI_* environment variables below.
 """
 
 import os
@@ -14,3 +26,25 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mymainserver.settings')
 
 application = get_asgi_application()
+
+
+# Standalone uvicorn server configuration
+ASGI_SERVER_CONFIG = {
+    'host': os.environ.get('ASGI_HOST', '0.0.0.0'),
+    'port': int(os.environ.get('ASGI_PORT', '8000')),
+    # A few processes are enough: each one multiplexes many pollers
+    'workers': int(os.environ.get('ASGI_WORKERS', '2')),
+    # Shed load instead of queueing without bound during bazar open/close bursts
+    'limit_concurrency': int(os.environ.get('ASGI_LIMIT_CONCURRENCY', '500')),
+    'timeout_keep_alive': int(os.environ.get('ASGI_KEEP_ALIVE', '5')),
+    'log_level': os.environ.get('ASGI_LOG_LEVEL', 'info'),
+    # Django does not implement the ASGI lifespan protocol
+    'lifespan': 'off',
+    'proxy_headers': True,
+}
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    uvicorn.run('mymainserver.asgi:application', **ASGI_SERVER_CONFIG)
@@ -0,0 +1,114 @@
+"""
+Gunicorn configuration for mymainserver.
+
+Usage:
+    gunicorn -c python:mymainserver.gunicorn_conf
+
+Everything is tunable from environment variables so the same image fits
+different VM sizes:
+
+    GUNICORN_WORKER_CLASS   sync | gthread | uvicorn (default: gthread)
+    GUNICORN_WORKERS        worker processes (default: sized from CPU count)
+    GUNICORN_MAX_WORKERS    cap for the computed default (default: 4)
+    GUNICORN_THREADS        threads per gthread worker (default: 4)
+    GUNICORN_PRELOAD        load Django once in the master and fork (default: True)
+    GUNICORN_MAX_REQUESTS   recycle a worker after N requests (default: 1000, 0 = never)
+    GUNICORN_MAX_REQUESTS_JITTER  random extra requests so workers don't recycle together (default: 100)
+    GUNICORN_TIMEOUT        worker timeout in seconds (default: 120)
+    GUNICORN_BIND           bind address (default: 0.0.0.0:8000)
+    GUNICORN_LOG_LEVEL      log level (default: info)
+    GUNICORN_STATSD_HOST    host:port to export worker metrics over StatsD (default: off)
+    GUNICORN_STATSD_PREFIX  metric name prefix (default: bettingsystem)
+"""
+import gc
+import os
+
+# Imported under another name: gunicorn treats a module-level `config` as its own setting
+from decouple import config as env
+
+
+# CPUs this process may run on (respects container cpusets, unlike os.cpu_count)
+cpu_count = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+
+# Worker model
+_WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'uvicorn': 'uvicorn.workers.UvicornWorker',
+}
+worker_model = env('GUNICORN_WORKER_CLASS', default='gthread')
+if worker_model not in _WORKER_CLASSES:
+    raise ValueError(f'GUNICORN_WORKER_CLASS must be one of {", ".join(_WORKER_CLASSES)}, got {worker_model!r}')
+worker_class = _WORKER_CLASSES[worker_model]
+
+# Uvicorn workers speak ASGI and can serve the async polling views natively
+wsgi_app = 'mymainserver.asgi:application' if worker_model == 'uvicorn' else 'mymainserver.wsgi:application'
+
+# Sizing: sync workers handle one request each, so they need more processes;
+# gthread and uvicorn workers multiplex requests and need fewer (less memory)
+if worker_model == 'sync':
+    _default_workers = cpu_count * 2 + 1
+elif worker_model == 'gthread':
+    _default_workers = cpu_count + 1
+else:
+    _default_workers = cpu_count
+_default_workers = min(_default_workers, env('GUNICORN_MAX_WORKERS', default=4, cast=int))
+
+# An empty value (e.g. an unset docker-compose variable) means "use the computed default"
+workers = int(env('GUNICORN_WORKERS', default='') or _default_workers)
+threads = env('GUNICORN_THREADS', default=4, cast=int) if worker_model == 'gthread' else 1
+
+# Preload Django (and the number tables in userbaseapp.views) once in the
+# master so forked workers share those pages copy-on-write
+preload_app = env('GUNICORN_PRELOAD', default=True, cast=bool)
+
+# Recycle workers periodically; jitter keeps them from restarting in lockstep
+max_requests = env('GUNICORN_MAX_REQUESTS', default=1000, cast=int)
+max_requests_jitter = env('GUNICORN_MAX_REQUESTS_JITTER', default=100, cast=int)
+
+timeout = env('GUNICORN_TIMEOUT', default=120, cast=int)
+graceful_timeout = 30
+keepalive = 5
+
+bind = env('GUNICORN_BIND', default='0.0.0.0:8000')
+
+# Heartbeat files on tmpfs; a disk-backed /tmp can stall workers in Docker
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+# Logging
+accesslog = '-'
+errorlog = '-'
+loglevel = env('GUNICORN_LOG_LEVEL', default='info')
+
+# Worker metrics (request rate/duration, status codes, worker count) over StatsD
+if env('GUNICORN_STATSD_HOST', default=''):
+    statsd_host = env('GUNICORN_STATSD_HOST')
+    statsd_prefix = env('GUNICORN_STATSD_PREFIX', default='bettingsystem')
+
+
+def when_ready(server):
+    """Warm shared state in the master before workers are forked"""
+    if not preload_app:
+        return
+
+    # URL patterns (and with them the views module and its number tables)
+    # are otherwise imported lazily on each worker's first request
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+
+    # Move everything allocated so far out of the GC's reach so collections
+    # in the workers don't touch (and copy) the shared pages
+    gc.freeze()
+    server.log.info(
+        'Preloaded application; starting %s %s worker(s) x %s thread(s)',
+        workers, worker_model, threads,
+    )
+
+
+def post_fork(server, worker):
+    server.log.info('Worker spawned (pid: %s)', worker.pid)
+
+
+def worker_exit(server, worker):
+    server.log.info('Worker exited (pid: %s, requests served: %s)', worker.pid, worker.nr)
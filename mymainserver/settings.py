@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import json
 import os
 import dj_database_url
 from decouple import config
@@ -64,6 +65,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'userbaseapp.db_router.PrimaryPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -122,8 +124,8 @@ elif 'POSTGRES_HOST' in os.environ or 'POSTGRES_PASSWORD' in os.environ:
             'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
             'HOST': os.environ.get('POSTGRES_HOST', 'db'),
             'PORT': os.environ.get('POSTGRES_PORT', '5432'),
-            'ATOMIC_REQUESTS': True,
             'CONN_MAX_AGE': 600,
+            'CONN_HEALTH_CHECKS': True,
             'OPTIONS': {
                 'connect_timeout': 10,
             },
@@ -138,6 +140,52 @@ else:
         }
     }
 
+# Optional read replica for the polling/reporting reads and admin changelists
+# (see userbaseapp/db_router.py). Any dj-database-url URL works, e.g.
+# sqlite:///replica.sqlite3 to try it locally.
+if config('REPLICA_DATABASE_URL', default=''):
+    DATABASES['replica'] = dj_database_url.parse(
+        config('REPLICA_DATABASE_URL'),
+        conn_max_age=600,
+        conn_health_checks=True,
+    )
+    # Tests run against the primary only
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['userbaseapp.db_router.PrimaryReplicaRouter']
+
+# Seconds a user's reads stay on the primary after they write; should exceed
+# the replica's usual lag
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=10, cast=int)
+
+# Connection pooling (PostgreSQL only, psycopg 3). Each worker process keeps
+# one pool per database that its threads / async tasks check connections out
+# of, instead of every thread holding its own persistent connection. SQLite
+# is unaffected.
+DB_POOL = config('DB_POOL', default=True, cast=bool)
+for database in DATABASES.values():
+    if DB_POOL and database['ENGINE'] == 'django.db.backends.postgresql':
+        database['OPTIONS'] = {
+            **database.get('OPTIONS', {}),
+            'pool': {
+                'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+                'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+                # Seconds a request waits for a free connection before failing
+                'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),
+                # Seconds an idle connection above min_size is kept open
+                'max_idle': config('DB_POOL_MAX_IDLE', default=300, cast=float),
+            },
+        }
+        # Pooled connections go back to the pool after each request; Django
+        # refuses persistent connections when pooling is enabled
+        database['CONN_MAX_AGE'] = 0
+        database['CONN_HEALTH_CHECKS'] = False
+
+    # Transaction policy (same for every branch above): requests are not
+    # wrapped in a transaction, so polling reads run in autocommit; write
+    # views use short explicit atomic blocks (see userbaseapp/transactions.py)
+    database['ATOMIC_REQUESTS'] = False
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -181,18 +229,75 @@ STATICFILES_DIRS = [
 ]
 
 # WhiteNoise configuration for serving static files
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# (STATICFILES_STORAGE was removed in Django 5.1, so this must go through STORAGES
+# for collectstatic to emit hashed, pre-compressed files)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# Gzipped size budgets (bytes) for the critical home page bundles.
+# Enforced by `python manage.py check_bundle_budget` during the Docker build.
+STATIC_BUNDLE_BUDGETS = {
+    'userbaseapp/css/home.css': 4 * 1024,
+    'userbaseapp/js/home.js': 40 * 1024,
+}
 
 # Caching Configuration
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-betting-cache',
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000,
+# LocMemCache is per-process; set REDIS_URL to share cached reads across gunicorn workers
+if config('REDIS_URL', default=''):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': config('REDIS_URL'),
         }
     }
-}
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-betting-cache',
+            'OPTIONS': {
+                'MAX_ENTRIES': 1000,
+            }
+        }
+    }
+
+# Book versions (HTTP validators and coalesced reads, see book_cache.py),
+# replica read pins and the closed state of bazars must be seen by every
+# worker. A process-local cache can't share them, so without REDIS_URL they
+# are off: every read is computed and sent in full. Set SHARED_CACHE=True to
+# force them on with LocMemCache when the app runs in a single process.
+SHARED_CACHE = config('SHARED_CACHE', default=bool(config('REDIS_URL', default='')), cast=bool)
+
+# Seconds a coalesced book read (totals, bet list, last bulk action) is reused
+# before it is recomputed; writes to the book invalidate it immediately
+BOOK_READ_CACHE_TTL = config('BOOK_READ_CACHE_TTL', default=5, cast=int)
+
+# Books of past dates: seconds their reads are kept in the shared cache
+# (writes still invalidate them), and seconds browsers may reuse a response
+# without asking. 0 makes browsers revalidate (a cheap 304); a positive value
+# lets a browser show a corrected past book stale for up to that long
+PAST_BOOK_READ_CACHE_TTL = config('PAST_BOOK_READ_CACHE_TTL', default=24 * 60 * 60, cast=int)
+PAST_BOOK_MAX_AGE = config('PAST_BOOK_MAX_AGE', default=0, cast=int)
+
+# Store the bets of All SP/DP, Motar, Comman Pana, Set Pana and Group actions
+# as a number bitmap on the BulkBetAction instead of one Bet row per number
+COMPACT_BULK_BETS = config('COMPACT_BULK_BETS', default=False, cast=bool)
+
+# Payout per rupee staked on a winning bet, by bet type, as a JSON object
+# (e.g. '{"COLUMN": 9.5, "SP": 150}'); unlisted types use the defaults in
+# userbaseapp/settlement.py
+SETTLEMENT_PAYOUT_RATES = config('SETTLEMENT_PAYOUT_RATES', default='{}', cast=json.loads)
+
+# Rows per (bazar, date, bet type, number) in the house exposure table; users
+# are spread over them so concurrent bets on a hot number don't wait on one
+# row lock. Changing it needs `manage.py rebuild_exposure`.
+EXPOSURE_SHARDS = config('EXPOSURE_SHARDS', default=8, cast=int)
 
 # Session Configuration for Performance
 SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
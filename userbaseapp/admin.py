@@ -1,7 +1,117 @@
+import json
+
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
 from django.utils.html import format_html
-from .models import CustomUser, Bet, BulkBetAction
+from .models import CustomUser, Bet, BulkBetAction, BazarResult, BetEvent, ClosedBook
+from .book_cache import invalidate_book, invalidate_books_for_queryset
+from .exposure import add_bets, add_compact_actions, remove_bets, remove_compact_actions
+from .fields import encode_bet_number
+from .events import (
+    log_placed_bets, log_placed_compact_actions, log_removed_bets, log_removed_compact_actions,
+)
+from .db_router import replica_reads
+from .views import Family_Pana_numbers
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that trusts PostgreSQL's planner statistics for large result sets.
+
+    An exact COUNT(*) over millions of bets scans the whole table; the
+    estimate is free. Small results (and other databases) are counted exactly.
+    """
+    ESTIMATE_THRESHOLD = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql':
+            estimate = self._estimate_count(queryset, connection)
+            if estimate is not None and estimate >= self.ESTIMATE_THRESHOLD:
+                return estimate
+        return super().count
+
+    def _estimate_count(self, queryset, connection):
+        with connection.cursor() as cursor:
+            if not queryset.query.where:
+                # Unfiltered: the table's row estimate, kept fresh by (auto)vacuum/analyze
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                    [queryset.model._meta.db_table],
+                )
+                reltuples = cursor.fetchone()[0]
+                # -1 for a table that has never been analyzed
+                return reltuples if reltuples >= 0 else None
+
+            sql, params = queryset.order_by().query.sql_with_params()
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+class ReplicaChangelistMixin:
+    """Serve changelist pages (GET only, not actions) from the read replica"""
+
+    def changelist_view(self, request, extra_context=None):
+        if request.method != 'GET':
+            return super().changelist_view(request, extra_context)
+
+        @replica_reads
+        def replica_changelist_view(request):
+            response = super(ReplicaChangelistMixin, self).changelist_view(request, extra_context)
+            # The result list is a lazy queryset; evaluate it while routed to the replica
+            if hasattr(response, 'render'):
+                response.render()
+            return response
+        return replica_changelist_view(request)
+
+
+class StaticValuesListFilter(admin.SimpleListFilter):
+    """List filter with a fixed set of values, instead of a DISTINCT scan of the column"""
+    values = ()
+
+    def lookups(self, request, model_admin):
+        return [(str(value), str(value)) for value in self.values]
+
+    def queryset(self, request, queryset):
+        if self.value() is None:
+            return queryset
+        return queryset.filter(**{self.parameter_name: self.value()})
+
+
+class ColumnNumberFilter(StaticValuesListFilter):
+    title = 'column number'
+    parameter_name = 'column_number'
+    values = range(1, 11)
+
+
+class JodiColumnFilter(StaticValuesListFilter):
+    title = 'jodi column'
+    parameter_name = 'jodi_column'
+    values = range(1, 11)
+
+
+class JodiTypeFilter(StaticValuesListFilter):
+    title = 'jodi type'
+    parameter_name = 'jodi_type'
+    values = (5, 6, 7, 12)
+
+
+class FamilyGroupFilter(StaticValuesListFilter):
+    title = 'family group'
+    parameter_name = 'family_group'
+    values = tuple(Family_Pana_numbers)
+
 
 @admin.register(CustomUser)
 class CustomUserAdmin(UserAdmin):
@@ -25,21 +135,22 @@ class CustomUserAdmin(UserAdmin):
 
 
 @admin.register(Bet)
-class BetAdmin(admin.ModelAdmin):
+class BetAdmin(ReplicaChangelistMixin, admin.ModelAdmin):
     list_display = [
         'id', 'user_link', 'number', 'formatted_amount', 'bet_type_badge', 
         'column_number', 'bazar_display', 'bet_date', 'status_badge', 
         'created_at', 'is_deleted'
     ]
+    # Choice fields, booleans and dates filter without querying; the rest use fixed values
     list_filter = [
         'bet_type', 'bazar', 'status', 'is_deleted', 'bet_date', 
-        'created_at', 'column_number', 'family_group'
+        'created_at', ColumnNumberFilter, FamilyGroupFilter
     ]
+    # number is stored as a code, so get_search_results matches it exactly
     search_fields = [
-        'number', 'user__email', 'user__username', 'user__first_name', 
+        'user__email', 'user__username', 'user__first_name',
         'user__last_name', 'session_id', 'input_digits'
     ]
-    date_hierarchy = 'created_at'
     readonly_fields = ['created_at', 'updated_at', 'deleted_at']
     
     fieldsets = (
@@ -70,12 +181,49 @@ class BetAdmin(admin.ModelAdmin):
     )
     
     list_per_page = 100
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     actions = ['soft_delete_bets']
     
     def get_queryset(self, request):
         qs = super().get_queryset(request)
         return qs.select_related('user', 'bulk_action', 'deleted_by')
     
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        term = search_term.strip()
+        if term.isdigit():
+            try:
+                encode_bet_number(term)
+            except ValueError:
+                pass
+            else:
+                results |= queryset.filter(number=term)
+        return results, may_have_duplicates
+    
+    # Keep cached book reads, house exposure and the event log in sync with admin edits
+    def save_model(self, request, obj, form, change):
+        if change:
+            invalidate_books_for_queryset(Bet.objects.filter(pk=obj.pk))
+            remove_bets(Bet.objects.filter(pk=obj.pk))
+            log_removed_bets(Bet.objects.filter(pk=obj.pk))
+        super().save_model(request, obj, form, change)
+        add_bets([obj])
+        log_placed_bets([obj])
+        invalidate_book(obj.user_id, obj.bazar, obj.bet_date)
+    
+    def delete_model(self, request, obj):
+        invalidate_book(obj.user_id, obj.bazar, obj.bet_date)
+        remove_bets(Bet.objects.filter(pk=obj.pk))
+        log_removed_bets(Bet.objects.filter(pk=obj.pk))
+        super().delete_model(request, obj)
+    
+    def delete_queryset(self, request, queryset):
+        invalidate_books_for_queryset(queryset)
+        remove_bets(queryset)
+        log_removed_bets(queryset)
+        super().delete_queryset(request, queryset)
+    
     def user_link(self, obj):
         return format_html(
             '<a href="/admin/userbaseapp/customuser/{}/change/">{}</a>',
@@ -138,32 +286,35 @@ class BetAdmin(admin.ModelAdmin):
     # Admin actions
     def soft_delete_bets(self, request, queryset):
         from django.utils import timezone
-        updated = queryset.filter(is_deleted=False).update(
-            is_deleted=True,
-            deleted_at=timezone.now(),
-            deleted_by=request.user,
-            status='CANCELLED'
-        )
+        with transaction.atomic():
+            invalidate_books_for_queryset(queryset.filter(is_deleted=False))
+            remove_bets(queryset)
+            log_removed_bets(queryset)
+            updated = queryset.filter(is_deleted=False).update(
+                is_deleted=True,
+                deleted_at=timezone.now(),
+                deleted_by=request.user,
+                status='CANCELLED'
+            )
         self.message_user(request, f'{updated} bets soft deleted')
     soft_delete_bets.short_description = 'Soft delete selected bets'
 
 
 @admin.register(BulkBetAction)
-class BulkBetActionAdmin(admin.ModelAdmin):
+class BulkBetActionAdmin(ReplicaChangelistMixin, admin.ModelAdmin):
     list_display = [
         'id', 'user_link', 'action_type_badge', 'formatted_amount', 
-        'total_bets', 'formatted_total_amount', 'bazar_display', 
+        'total_bets', 'live_bets', 'formatted_total_amount', 'bazar_display', 
         'action_date', 'status_badge', 'is_undone', 'created_at'
     ]
     list_filter = [
         'action_type', 'bazar', 'is_undone', 'status', 'action_date',
-        'created_at', 'jodi_column', 'jodi_type', 'family_group'
+        'created_at', JodiColumnFilter, JodiTypeFilter, FamilyGroupFilter
     ]
     search_fields = [
         'user__email', 'user__username', 'user__first_name', 
         'user__last_name', 'input_data', 'columns_used'
     ]
-    date_hierarchy = 'created_at'
     readonly_fields = ['created_at', 'updated_at', 'undone_at']
     
     fieldsets = (
@@ -195,11 +346,48 @@ class BulkBetActionAdmin(admin.ModelAdmin):
     )
     
     list_per_page = 100
-    actions = ['undo_bulk_actions']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ['undo_bulk_actions', 'materialize_bets']
     
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.select_related('user', 'undone_by').prefetch_related('bets')
+        # Count live bets per action in SQL (only for the rows on the page)
+        # instead of prefetching every related bet
+        live_bets = (
+            Bet.objects.filter(bulk_action=OuterRef('pk'), is_deleted=False)
+            .order_by()
+            .values('bulk_action')
+            .annotate(count=Count('*'))
+            .values('count')
+        )
+        return qs.select_related('user', 'undone_by').annotate(
+            live_bet_count=Coalesce(Subquery(live_bets), 0)
+        )
+    
+    # Keep cached book reads (e.g. last bulk action), the house exposure and
+    # the event log of compact actions in sync with admin edits
+    def save_model(self, request, obj, form, change):
+        if change:
+            invalidate_books_for_queryset(BulkBetAction.objects.filter(pk=obj.pk), date_field='action_date')
+            remove_compact_actions(BulkBetAction.objects.filter(pk=obj.pk))
+            log_removed_compact_actions(BulkBetAction.objects.filter(pk=obj.pk))
+        super().save_model(request, obj, form, change)
+        add_compact_actions(BulkBetAction.objects.filter(pk=obj.pk))
+        log_placed_compact_actions(BulkBetAction.objects.filter(pk=obj.pk))
+        invalidate_book(obj.user_id, obj.bazar, obj.action_date)
+    
+    def delete_model(self, request, obj):
+        invalidate_book(obj.user_id, obj.bazar, obj.action_date)
+        remove_compact_actions(BulkBetAction.objects.filter(pk=obj.pk))
+        log_removed_compact_actions(BulkBetAction.objects.filter(pk=obj.pk))
+        super().delete_model(request, obj)
+    
+    def delete_queryset(self, request, queryset):
+        invalidate_books_for_queryset(queryset, date_field='action_date')
+        remove_compact_actions(queryset)
+        log_removed_compact_actions(queryset)
+        super().delete_queryset(request, queryset)
     
     def user_link(self, obj):
         return format_html(
@@ -215,6 +403,13 @@ class BulkBetActionAdmin(admin.ModelAdmin):
     formatted_amount.short_description = 'Bet Amount'
     formatted_amount.admin_order_field = 'amount'
     
+    def live_bets(self, obj):
+        # Compact actions have no Bet rows; their bets live in number_set
+        if obj.is_compact and not obj.is_undone:
+            return obj.total_bets
+        return obj.live_bet_count
+    live_bets.short_description = 'Live Bets'
+    
     def formatted_total_amount(self, obj):
         return f'₹{obj.total_amount:,.2f}'
     formatted_total_amount.short_description = 'Total Amount'
@@ -265,10 +460,63 @@ class BulkBetActionAdmin(admin.ModelAdmin):
     
     # Admin actions
     def undo_bulk_actions(self, request, queryset):
-        undone_count = 0
-        for bulk_action in queryset.filter(is_undone=False):
-            success, message = bulk_action.undo(undone_by_user=request.user)
-            if success:
-                undone_count += 1
-        self.message_user(request, f'{undone_count} bulk actions undone successfully')
+        bet_counts = BulkBetAction.undo_many(queryset, undone_by_user=request.user)
+        details = ', '.join(f'#{action_id}: {count}' for action_id, count in sorted(bet_counts.items()))
+        self.message_user(
+            request,
+            f'{len(bet_counts)} bulk actions undone successfully, '
+            f'{sum(bet_counts.values())} bets deleted' + (f' ({details})' if details else '')
+        )
     undo_bulk_actions.short_description = 'Undo selected bulk actions'
+    
+    def materialize_bets(self, request, queryset):
+        created = sum(action.materialize() for action in queryset.filter(number_set__isnull=False, is_undone=False))
+        self.message_user(request, f'{created} bets created from compact bulk actions')
+    materialize_bets.short_description = 'Create bet rows for compact bulk actions (to edit them individually)'
+
+
+@admin.register(BazarResult)
+class BazarResultAdmin(admin.ModelAdmin):
+    """Declared results; declare or correct them through the declare-result endpoint so bets are settled"""
+    list_display = [
+        'bazar', 'result_date', 'pana', 'total_bets', 'winning_bets',
+        'total_stake', 'total_payout', 'declared_by', 'declared_at'
+    ]
+    list_filter = ['bazar', 'result_date']
+    date_hierarchy = 'result_date'
+    readonly_fields = [field.name for field in BazarResult._meta.fields]
+    
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ClosedBook)
+class ClosedBookAdmin(admin.ModelAdmin):
+    """Closed bazars; close and reopen them through close_book / reopen_book so their snapshots follow"""
+    list_display = ['bazar', 'bet_date', 'blocks_placements', 'closed_by', 'closed_at']
+    list_filter = ['bazar', 'blocks_placements', 'bet_date']
+    date_hierarchy = 'bet_date'
+    readonly_fields = [field.name for field in ClosedBook._meta.fields]
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(BetEvent)
+class BetEventAdmin(ReplicaChangelistMixin, admin.ModelAdmin):
+    """The append-only bet event log; rebuild projections from it with rebuild_projections"""
+    list_display = ['user', 'bazar', 'bet_date', 'seq', 'kind', 'bulk_action_id', 'created_at']
+    list_filter = ['kind', 'bazar', 'bet_date']
+    search_fields = ['user__username']
+    date_hierarchy = 'bet_date'
+    list_select_related = ['user']
+    readonly_fields = [field.name for field in BetEvent._meta.fields]
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
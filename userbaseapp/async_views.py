@@ -0,0 +1,227 @@
+# userbaseapp/async_views.py
+"""
+Native async variants of the read-heavy polling endpoints.
+
+They return the same payloads as their sync counterparts in views.py (sharing
+the querysets and payload builders there) but query through Django's async
+ORM, so under an ASGI server (see mymainserver/asgi.py) a slow book read
+does not tie up a whole worker.
+"""
+from datetime import datetime
+
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import require_http_methods
+
+from .book_cache import acoalesced_book_read, conditional_book_read, request_book
+from .closing import aclosed_book_snapshot, snapshot_column_totals, snapshot_last_action
+from .fields import PaiseSum, paise_to_rupees
+from .db_router import replica_reads
+from .views import (
+    wants_compact_times, versioned_payload, book_read_name,
+    book_bets_queryset, group_bets_by_number,
+    compact_actions_queryset, expand_compact_actions, compact_actions_total_paise,
+    book_total_queryset,
+    book_totals_queryset, paise_totals_by_number, bet_totals_response,
+    last_bulk_action_queryset, serialize_last_bulk_action,
+    bulk_action_history_queryset, serialize_bulk_action_history,
+    column_totals_queryset, column_totals_from_rows,
+)
+
+
+def _book_params(request):
+    """Read (bazar, date) from the query string, defaulting to today"""
+    bazar = request.GET.get('bazar', 'SRIDEVI_OPEN')
+    date_str = request.GET.get('date')
+
+    bet_date = timezone.now().date()
+    if date_str:
+        bet_date = datetime.fromisoformat(date_str).date()
+    return bazar, bet_date
+
+
+@login_required
+@require_http_methods(["GET"])
+@conditional_book_read
+async def load_bets(request):
+    """Async variant of views.load_bets"""
+    try:
+        user = await request.auser()
+        bazar, bet_date = _book_params(request)
+
+        compact_times = wants_compact_times(request)
+
+        async def build_bets_dict():
+            bets = [bet async for bet in book_bets_queryset(user, bazar, bet_date)]
+            actions = [action async for action in compact_actions_queryset(user, bazar, bet_date)]
+            return group_bets_by_number(bets, expand_compact_actions(actions), compact_times)
+
+        bets_dict = await acoalesced_book_read(
+            book_read_name('load_bets', compact_times), user.id, bazar, bet_date, build_bets_dict
+        )
+
+        return JsonResponse(versioned_payload({
+            'success': True,
+            'bets': bets_dict
+        }, compact_times))
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required
+@require_http_methods(["GET"])
+@conditional_book_read
+async def get_last_bulk_action(request):
+    """Async variant of views.get_last_bulk_action"""
+    try:
+        user = await request.auser()
+        bazar, action_date = _book_params(request)
+
+        compact_times = wants_compact_times(request)
+
+        async def build_last_action():
+            snapshot = await aclosed_book_snapshot(user.id, bazar, action_date)
+            if snapshot is not None:
+                return snapshot_last_action(snapshot, compact_times)
+            return serialize_last_bulk_action(
+                await last_bulk_action_queryset(user, bazar, action_date).afirst(),
+                compact_times
+            )
+
+        action = await acoalesced_book_read(
+            book_read_name('last_bulk_action', compact_times), user.id, bazar, action_date, build_last_action
+        )
+
+        if not action:
+            return JsonResponse({
+                'success': True,
+                'has_action': False
+            })
+
+        return JsonResponse(versioned_payload({
+            'success': True,
+            'has_action': True,
+            'action': action
+        }, compact_times))
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required
+@require_http_methods(["GET"])
+@conditional_book_read
+@replica_reads
+async def get_bet_total(request):
+    """Async variant of views.get_bet_total"""
+    try:
+        user = await request.auser()
+        bazar, bet_date = _book_params(request)
+
+        async def build_total():
+            snapshot = await aclosed_book_snapshot(user.id, bazar, bet_date)
+            if snapshot is not None:
+                return snapshot['total']
+            totals = await book_total_queryset(user, bazar, bet_date).aaggregate(total=PaiseSum('amount'))
+            actions = [action async for action in compact_actions_queryset(user, bazar, bet_date)]
+            return totals['total'] + compact_actions_total_paise(actions)
+
+        total_paise = await acoalesced_book_read('bet_total_paise', user.id, bazar, bet_date, build_total)
+
+        return JsonResponse({
+            'success': True,
+            'total_amount': paise_to_rupees(total_paise)
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@login_required
+@require_http_methods(["GET"])
+@conditional_book_read
+@replica_reads
+async def get_all_bet_totals(request):
+    """Async variant of views.get_all_bet_totals"""
+    try:
+        user = await request.auser()
+        bazar, bet_date = _book_params(request)
+
+        async def build_paise_totals():
+            snapshot = await aclosed_book_snapshot(user.id, bazar, bet_date)
+            if snapshot is not None:
+                return snapshot['totals']
+            rows = [row async for row in book_totals_queryset(user, bazar, bet_date)]
+            actions = [action async for action in compact_actions_queryset(user, bazar, bet_date)]
+            return paise_totals_by_number(rows, expand_compact_actions(actions))
+
+        paise_totals = await acoalesced_book_read('bet_totals_paise', user.id, bazar, bet_date, build_paise_totals)
+
+        return bet_totals_response(paise_totals, request.GET.get('format'))
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+@login_required
+@require_http_methods(["GET"])
+@replica_reads
+async def get_bulk_action_history(request):
+    """Async variant of views.get_bulk_action_history"""
+    try:
+        user = await request.auser()
+        bazar = request.GET.get('bazar', None)
+        date_str = request.GET.get('date', None)
+
+        compact_times = wants_compact_times(request)
+        bulk_actions = bulk_action_history_queryset(user, bazar, date_str)
+        history_data = [serialize_bulk_action_history(action, compact_times) async for action in bulk_actions]
+
+        return JsonResponse(versioned_payload({
+            'success': True,
+            'history': history_data,
+            'count': len(history_data)
+        }, compact_times))
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@login_required
+@require_http_methods(["GET"])
+@conditional_book_read
+@replica_reads
+async def get_column_totals(request):
+    """Async variant of views.get_column_totals"""
+    try:
+        user = await request.auser()
+        # The same book conditional_book_read derived the ETag from
+        book = request_book(request)
+        if book is None:
+            return JsonResponse({'success': False, 'error': 'Invalid date'}, status=400)
+        bazar, bet_date = book
+
+        async def build_column_totals():
+            snapshot = await aclosed_book_snapshot(user.id, bazar, bet_date)
+            if snapshot is not None:
+                return snapshot_column_totals(snapshot)
+            rows = [row async for row in column_totals_queryset(user, bazar, bet_date)]
+            return column_totals_from_rows(rows)
+
+        column_totals = await acoalesced_book_read('column_totals', user.id, bazar, bet_date, build_column_totals)
+
+        return JsonResponse({
+            'success': True,
+            'column_totals': column_totals
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=500)
@@ -0,0 +1,374 @@
+# userbaseapp/book_cache.py
+"""
+Read coalescing for per-book endpoints.
+
+A "book" is the set of bets for one (user, bazar, date). Read endpoints that
+poll a book (totals, bet lists, last bulk action) go through `coalesced_book_read`:
+
+- Concurrent identical reads inside one worker share a single in-flight
+  computation (single-flight), so a burst of polls runs the query once.
+- The result is stored in the Django cache for BOOK_READ_CACHE_TTL seconds,
+  so other workers reuse it when the cache backend is shared (REDIS_URL).
+
+`acoalesced_book_read` is the asyncio equivalent used by async_views.py; it
+shares cache keys with the sync path, so both kinds of view reuse each
+other's results.
+
+Cache keys embed a per-book version. Every write path calls `invalidate_book`
+(or `invalidate_user_books`), which bumps the version once the transaction
+commits, so stale entries are never read again and simply expire. For a book
+of a closed bazar it also refreshes the book's snapshot (see closing.py).
+Versions are timestamps: a read filling a version bumped less than
+REPLICA_STICKY_SECONDS ago runs on the primary, never a lagging replica.
+
+Reads spanning all of a user's books (e.g. the bazar overview) go through
+`coalesced_user_read`, keyed on a per-user version that every book
+invalidation of that user also bumps.
+
+The same version is the book's HTTP validator: views wrapped in
+`conditional_book_read` send it as an ETag and answer a matching
+If-None-Match with 304 before running any query.
+
+All of this relies on every worker seeing the same versions, i.e. a shared
+cache (REDIS_URL). With a process-local cache (SHARED_CACHE off) a write
+would only retire the versions of the worker that handled it, so reads are
+then neither coalesced, cached nor answered with 304.
+
+Books of past dates rarely change, so their reads are cached for
+PAST_BOOK_READ_CACHE_TTL instead. The version in the key still retires them
+on the next write (an admin correction, undo, bazar delete or settlement all
+invalidate the book). Browsers revalidate them like any other book, unless
+PAST_BOOK_MAX_AGE lets them reuse a response that many seconds; a browser
+that has not written to the book itself can then show it stale for that long.
+"""
+import asyncio
+import hashlib
+import threading
+import time
+import weakref
+from datetime import datetime
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from .db_router import pin_to_primary, primary_reads
+
+
+_MISSING = object()
+
+# Followers give up waiting on a stuck leader after this many seconds and
+# compute the result themselves
+_FOLLOWER_WAIT_SECONDS = 30
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+# Async in-flight futures, per event loop (futures cannot be awaited across loops)
+_ainflight = weakref.WeakKeyDictionary()
+
+
+class _Flight:
+    """One in-flight computation that followers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _new_version():
+    # The clock, so an evicted version key never reuses an old value and a
+    # version also tells when its book was last written
+    return time.time_ns()
+
+
+def _recently_written(version):
+    """Whether a version token was bumped within REPLICA_STICKY_SECONDS"""
+    written_ns = max(int(part) for part in version.split('.'))
+    return time.time_ns() - written_ns < settings.REPLICA_STICKY_SECONDS * 1_000_000_000
+
+
+def _user_generation_key(user_id):
+    return f'book-gen:{user_id}'
+
+
+def _book_version_key(user_id, bazar, bet_date):
+    return f'book-ver:{user_id}:{bazar}:{bet_date}'
+
+
+def _user_books_version_key(user_id):
+    return f'book-user-ver:{user_id}'
+
+
+def get_book_version(user_id, bazar, bet_date):
+    """Return the current version token for a book"""
+    generation = cache.get_or_set(_user_generation_key(user_id), _new_version, None)
+    version = cache.get_or_set(_book_version_key(user_id, bazar, bet_date), _new_version, None)
+    return f'{generation}.{version}'
+
+
+async def aget_book_version(user_id, bazar, bet_date):
+    """Async version of get_book_version"""
+    generation = await cache.aget_or_set(_user_generation_key(user_id), _new_version, None)
+    version = await cache.aget_or_set(_book_version_key(user_id, bazar, bet_date), _new_version, None)
+    return f'{generation}.{version}'
+
+
+def get_user_books_version(user_id):
+    """Version token that changes whenever any book of the user changes"""
+    generation = cache.get_or_set(_user_generation_key(user_id), _new_version, None)
+    version = cache.get_or_set(_user_books_version_key(user_id), _new_version, None)
+    return f'{generation}.{version}'
+
+
+def shared_cache():
+    """Whether book versions are shared by all workers (see module docstring)"""
+    return settings.SHARED_CACHE
+
+
+def is_past_book(bet_date):
+    """Whether a book (date or 'YYYY-MM-DD') is of a day before today"""
+    if isinstance(bet_date, str):
+        bet_date = datetime.fromisoformat(bet_date).date()
+    return bet_date < timezone.localdate()
+
+
+def _book_read_ttl(bet_date):
+    return settings.PAST_BOOK_READ_CACHE_TTL if is_past_book(bet_date) else settings.BOOK_READ_CACHE_TTL
+
+
+def _book_read_key(name, user_id, bazar, bet_date, version, params):
+    return f'book-read:{name}:{user_id}:{bazar}:{bet_date}:{version}:{params}'
+
+
+def _bump(key):
+    cache.set(key, _new_version(), None)
+
+
+def invalidate_book(user_id, bazar, bet_date, closed=None):
+    """
+    Invalidate cached reads for one book once the current transaction commits.
+
+    `closed` is whether the bazar is closed for the date, when the caller has
+    already read it (placements do); otherwise it is looked up.
+    """
+    def bump():
+        # A closed book's snapshot is brought up to date first (imported here:
+        # closing.py builds on this module)
+        from .closing import is_book_closed, refresh_book_snapshot
+        if closed or (closed is None and is_book_closed(bazar, bet_date)):
+            refresh_book_snapshot(user_id, bazar, bet_date)
+        _bump(_book_version_key(user_id, bazar, bet_date))
+        _bump(_user_books_version_key(user_id))
+        # Whoever wrote, the owner's next reads must not hit a lagging replica
+        pin_to_primary(user_id)
+    transaction.on_commit(bump)
+
+
+def invalidate_user_books(user_id):
+    """Invalidate cached reads for every book of a user (e.g. after a master delete)"""
+    def bump():
+        _bump(_user_generation_key(user_id))
+        pin_to_primary(user_id)
+    transaction.on_commit(bump)
+
+
+def invalidate_books_for_queryset(queryset, date_field='bet_date'):
+    """Invalidate every book touched by a Bet/BulkBetAction queryset, before it is changed"""
+    books = queryset.order_by().values_list('user_id', 'bazar', date_field).distinct()
+    for user_id, bazar, bet_date in books:
+        invalidate_book(user_id, bazar, bet_date)
+
+
+def single_flight(key, compute, ttl):
+    """
+    Return the cached value for `key`, or compute it once per worker.
+
+    The first caller (leader) runs `compute()` and caches the result; callers
+    arriving while it runs wait for and share that result.
+    """
+    cached = cache.get(key, _MISSING)
+    if cached is not _MISSING:
+        return cached
+
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        is_leader = flight is None
+        if is_leader:
+            flight = _inflight[key] = _Flight()
+
+    if not is_leader:
+        if flight.done.wait(_FOLLOWER_WAIT_SECONDS):
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        return compute()
+
+    try:
+        result = compute()
+        cache.set(key, result, ttl)
+        flight.result = result
+        return result
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        flight.done.set()
+
+
+async def asingle_flight(key, compute, ttl):
+    """Async version of single_flight; `compute` is a coroutine function"""
+    cached = await cache.aget(key, _MISSING)
+    if cached is not _MISSING:
+        return cached
+
+    loop = asyncio.get_running_loop()
+    flights = _ainflight.setdefault(loop, {})
+    future = flights.get(key)
+    if future is not None:
+        return await asyncio.shield(future)
+
+    future = flights[key] = loop.create_future()
+    try:
+        result = await compute()
+        await cache.aset(key, result, ttl)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        if isinstance(e, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when there are no followers
+        raise
+    finally:
+        flights.pop(key, None)
+
+
+def _fresh(compute, version):
+    """
+    `compute`, reading from the primary if the version was just bumped: the
+    result is cached under that version, so it must not come from a replica
+    that has not caught up with the write yet
+    """
+    if not _recently_written(version):
+        return compute
+
+    def compute_on_primary():
+        with primary_reads():
+            return compute()
+    return compute_on_primary
+
+
+def coalesced_book_read(name, user_id, bazar, bet_date, compute, params=''):
+    """
+    Run a read of one book through the single-flight layer.
+
+    `name` identifies the endpoint and `params` any extra request parameters
+    that change the result.
+    """
+    if not shared_cache():
+        return compute()
+    version = get_book_version(user_id, bazar, bet_date)
+    key = _book_read_key(name, user_id, bazar, bet_date, version, params)
+    return single_flight(key, _fresh(compute, version), _book_read_ttl(bet_date))
+
+
+def coalesced_user_read(name, user_id, compute, params=''):
+    """Like coalesced_book_read, for a read over all of a user's books"""
+    if not shared_cache():
+        return compute()
+    version = get_user_books_version(user_id)
+    key = f'user-read:{name}:{user_id}:{version}:{params}'
+    return single_flight(key, _fresh(compute, version), settings.BOOK_READ_CACHE_TTL)
+
+
+async def acoalesced_book_read(name, user_id, bazar, bet_date, compute, params=''):
+    """Async version of coalesced_book_read; `compute` is a coroutine function"""
+    if not shared_cache():
+        return await compute()
+    version = await aget_book_version(user_id, bazar, bet_date)
+    key = _book_read_key(name, user_id, bazar, bet_date, version, params)
+    if _recently_written(version):
+        with primary_reads():
+            return await asingle_flight(key, compute, _book_read_ttl(bet_date))
+    return await asingle_flight(key, compute, _book_read_ttl(bet_date))
+
+
+def request_book(request):
+    """(bazar, date) of a book read request, or None when the date is invalid"""
+    bazar = request.GET.get('bazar', 'SRIDEVI_OPEN')
+    date_str = request.GET.get('date')
+    if not date_str:
+        return bazar, timezone.now().date()
+    try:
+        return bazar, datetime.fromisoformat(date_str).date()
+    except ValueError:
+        return None
+
+
+def _book_etag(request, user_id, version):
+    # The full path covers every parameter that changes the body (bazar,
+    # date, format, v), the version every write to the book
+    digest = hashlib.md5(f'{user_id}:{request.get_full_path()}:{version}'.encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def _tag(response, etag, bet_date):
+    if response.status_code in (200, 304):
+        response.headers.setdefault('ETag', etag)
+        if settings.PAST_BOOK_MAX_AGE and is_past_book(bet_date):
+            patch_cache_control(response, private=True, max_age=settings.PAST_BOOK_MAX_AGE)
+        else:
+            # Make browsers revalidate every poll instead of reusing the body blindly
+            patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_book_read(view):
+    """
+    Conditional GET for a read of one book (?bazar=&date=).
+
+    The ETag is derived from the book version before the view runs, so an
+    unchanged book gets a 304 without touching the bets table. A write that
+    lands while the view runs only makes the ETag older, never newer. Off
+    without a shared cache.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            if not shared_cache():
+                return await view(request, *args, **kwargs)
+            user = await request.auser()
+            book = request_book(request)
+            if request.method not in ('GET', 'HEAD') or not user.is_authenticated or book is None:
+                return await view(request, *args, **kwargs)
+
+            etag = _book_etag(request, user.id, await aget_book_version(user.id, *book))
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                return _tag(not_modified, etag, book[1])
+            return _tag(await view(request, *args, **kwargs), etag, book[1])
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not shared_cache():
+            return view(request, *args, **kwargs)
+        book = request_book(request)
+        if request.method not in ('GET', 'HEAD') or not request.user.is_authenticated or book is None:
+            return view(request, *args, **kwargs)
+
+        etag = _book_etag(request, request.user.id, get_book_version(request.user.id, *book))
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return _tag(not_modified, etag, book[1])
+        return _tag(view(request, *args, **kwargs), etag, book[1])
+    return wrapper
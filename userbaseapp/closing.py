@@ -0,0 +1,270 @@
+# userbaseapp/closing.py
+"""
+Closing a bazar for a date: finalize its books into precomputed snapshots.
+
+`close_book` records a ClosedBook for (bazar, date), optionally blocking
+further placements, and once it commits every user's book of it gets one
+BookSnapshot row: per-number, column and bet-type totals, bulk action
+summaries and the last bulk action. Reads of a closed book (bet total, all bet totals, column
+totals, last bulk action, book-snapshot sections other than bets) are then
+served from that single row via `closed_book_snapshot`; bet histories stay
+live.
+
+Snapshots never disagree with the bets: deletes, undos and admin corrections
+are still possible on a closed book, and every write path calls
+invalidate_book, which refreshes the user's snapshot (`refresh_book_snapshot`)
+before it bumps the book version. Placements pass it the closed state they
+already checked (`placement_state`); other writes use `is_book_closed`, so a
+write to an open book costs no extra query with a shared cache. A book
+without a snapshot row (e.g. right after closing, before its refresh has
+run) is simply read live.
+
+`reopen_book` deletes the snapshots and returns the bazar to live reads
+(manage.py close_book / reopen_book, or the staff endpoints).
+"""
+from django.core.cache import cache
+from django.db import models, transaction
+
+from .book_cache import invalidate_book, shared_cache
+from .fields import PaiseSum, number_set_size, paise_to_rupees, rupees_to_paise
+from .models import Bet, BookSnapshot, BulkBetAction, ClosedBook
+from .transactions import read_snapshot
+
+
+# Seconds the open/closed state of a bazar is kept in the shared cache.
+# Closing and reopening delete it, so this only bounds the rare race with a
+# read that looked it up while the change committed
+CLOSED_STATE_TTL = 60
+
+
+def _closed_state_key(bazar, bet_date):
+    return f'closed-book:{bazar}:{bet_date}'
+
+
+def _closed_queryset(bazar, bet_date):
+    return ClosedBook.objects.filter(bazar=bazar, bet_date=bet_date)
+
+
+def placement_state(bazar, bet_date):
+    """(closed, blocks placements) of (bazar, date), always read from the database"""
+    blocks_placements = _closed_queryset(bazar, bet_date).values_list('blocks_placements', flat=True).first()
+    return blocks_placements is not None, bool(blocks_placements)
+
+
+def is_book_closed(bazar, bet_date):
+    """Whether (bazar, date) is closed, from the shared cache if there is one"""
+    if not shared_cache():
+        return _closed_queryset(bazar, bet_date).exists()
+    return cache.get_or_set(
+        _closed_state_key(bazar, bet_date),
+        lambda: _closed_queryset(bazar, bet_date).exists(),
+        CLOSED_STATE_TTL
+    )
+
+
+async def ais_book_closed(bazar, bet_date):
+    """Async version of is_book_closed"""
+    if not shared_cache():
+        return await _closed_queryset(bazar, bet_date).aexists()
+    key = _closed_state_key(bazar, bet_date)
+    closed = await cache.aget(key)
+    if closed is None:
+        closed = await _closed_queryset(bazar, bet_date).aexists()
+        await cache.aset(key, closed, CLOSED_STATE_TTL)
+    return closed
+
+
+def book_user_ids(bazar, bet_date):
+    """Users with bets or bulk actions on (bazar, date)"""
+    bet_users = Bet.objects.filter(bazar=bazar, bet_date=bet_date).values_list('user_id', flat=True)
+    action_users = BulkBetAction.objects.filter(bazar=bazar, action_date=bet_date).values_list('user_id', flat=True)
+    return set(bet_users.distinct()) | set(action_users.distinct())
+
+
+def book_breakdown_paise(user_id, bazar, bet_date, compact_actions):
+    """({bet_type: {bets, stake}}, {action_type: {actions, bets, amount}}) of one book, in paise"""
+    by_bet_type = {}
+    rows = Bet.objects.filter(
+        user_id=user_id,
+        bazar=bazar,
+        bet_date=bet_date
+    ).order_by().values('bet_type').annotate(bets=models.Count('id'), stake=PaiseSum('amount'))
+    for row in rows:
+        by_bet_type[row['bet_type']] = {'bets': row['bets'], 'stake': row['stake']}
+    for action in compact_actions:
+        size = number_set_size(action.number_set)
+        totals = by_bet_type.setdefault(action.action_type, {'bets': 0, 'stake': 0})
+        totals['bets'] += size
+        totals['stake'] += rupees_to_paise(action.amount) * size
+
+    rows = BulkBetAction.objects.filter(
+        user_id=user_id,
+        bazar=bazar,
+        action_date=bet_date,
+        is_undone=False
+    ).order_by().values('action_type').annotate(
+        actions=models.Count('id'),
+        bets=models.Sum('total_bets'),
+        # total_amount is not filled in by the placement views; amount is per bet
+        amount=models.Sum(
+            models.F('amount') * models.F('total_bets'),
+            output_field=models.DecimalField(max_digits=14, decimal_places=2)
+        )
+    )
+    bulk_actions = {
+        row['action_type']: {
+            'actions': row['actions'],
+            'bets': row['bets'] or 0,
+            'amount': rupees_to_paise(row['amount'] or 0),
+        }
+        for row in rows
+    }
+    return by_bet_type, bulk_actions
+
+
+def format_breakdown(by_bet_type, bulk_actions):
+    """The book-snapshot breakdown section from book_breakdown_paise's result"""
+    return {
+        'by_bet_type': [
+            {'bet_type': bet_type, 'bets': totals['bets'], 'stake': paise_to_rupees(totals['stake'])}
+            for bet_type, totals in sorted(by_bet_type.items(), key=lambda item: -item[1]['stake'])
+        ],
+        'bulk_actions': [
+            {'action_type': action_type, 'actions': totals['actions'], 'bets': totals['bets'],
+             'amount': paise_to_rupees(totals['amount'])}
+            for action_type, totals in sorted(bulk_actions.items())
+        ],
+    }
+
+
+def compute_book_snapshot(user_id, bazar, bet_date):
+    """Snapshot data of one user's book, from the bets and bulk actions"""
+    # Shares the querysets and builders of the live reads, so a snapshot
+    # always equals what those reads would return
+    from .views import (
+        book_total_queryset, book_totals_queryset, column_totals_queryset,
+        compact_actions_queryset, compact_actions_total_paise, epoch_ms,
+        expand_compact_actions, last_bulk_action_queryset, paise_totals_by_number,
+        serialize_last_bulk_action,
+    )
+
+    bets = book_total_queryset(user_id, bazar, bet_date)
+    with read_snapshot(using=bets.db):
+        compact_actions = list(compact_actions_queryset(user_id, bazar, bet_date))
+        totals = paise_totals_by_number(
+            book_totals_queryset(user_id, bazar, bet_date),
+            expand_compact_actions(compact_actions)
+        )
+        total = bets.aggregate(total=PaiseSum('amount'))['total']
+        column_totals = {
+            str(row['column_number']): row['total']
+            for row in column_totals_queryset(user_id, bazar, bet_date)
+        }
+        by_bet_type, bulk_actions = book_breakdown_paise(user_id, bazar, bet_date, compact_actions)
+        last_action = last_bulk_action_queryset(user_id, bazar, bet_date).first()
+
+    last_action_data = serialize_last_bulk_action(last_action)
+    if last_action_data:
+        last_action_data['created_at_ms'] = epoch_ms(last_action.created_at)
+    return {
+        'totals': totals,
+        'total': total + compact_actions_total_paise(compact_actions),
+        'column_totals': column_totals,
+        'by_bet_type': by_bet_type,
+        'bulk_actions': bulk_actions,
+        'last_action': last_action_data,
+    }
+
+
+def refresh_book_snapshot(user_id, bazar, bet_date):
+    """Recompute one user's snapshot of a closed book (called by invalidate_book after commit)"""
+    BookSnapshot.objects.update_or_create(
+        user_id=user_id,
+        bazar=bazar,
+        bet_date=bet_date,
+        defaults={'data': compute_book_snapshot(user_id, bazar, bet_date)}
+    )
+
+
+def _forget_closed_state(bazar, bet_date):
+    # Deleted rather than set, so every worker reads the new state from the
+    # database next
+    transaction.on_commit(lambda: cache.delete(_closed_state_key(bazar, bet_date)))
+
+
+def close_book(bazar, bet_date, blocks_placements=True, closed_by=None):
+    """
+    Close (bazar, date) and snapshot every user's book of it.
+
+    Closing again refreshes all snapshots (and the placement block). Returns
+    (ClosedBook, number of books).
+    """
+    with transaction.atomic():
+        closed, created = ClosedBook.objects.update_or_create(
+            bazar=bazar,
+            bet_date=bet_date,
+            defaults={'blocks_placements': blocks_placements, 'closed_by': closed_by}
+        )
+        user_ids = book_user_ids(bazar, bet_date)
+        BookSnapshot.objects.filter(bazar=bazar, bet_date=bet_date).exclude(user_id__in=user_ids).delete()
+        _forget_closed_state(bazar, bet_date)
+        # Once committed, each invalidation writes the user's snapshot and
+        # then retires the cached live reads
+        for user_id in user_ids:
+            invalidate_book(user_id, bazar, bet_date, closed=True)
+    return closed, len(user_ids)
+
+
+def reopen_book(bazar, bet_date):
+    """Return (bazar, date) to live reads and placements; False when it was not closed"""
+    with transaction.atomic():
+        deleted, per_model = _closed_queryset(bazar, bet_date).delete()
+        user_ids = set(
+            BookSnapshot.objects.filter(bazar=bazar, bet_date=bet_date).values_list('user_id', flat=True)
+        )
+        BookSnapshot.objects.filter(bazar=bazar, bet_date=bet_date).delete()
+        _forget_closed_state(bazar, bet_date)
+        for user_id in user_ids:
+            invalidate_book(user_id, bazar, bet_date, closed=False)
+    return bool(deleted)
+
+
+def closed_book_snapshot(user_id, bazar, bet_date):
+    """Snapshot data of a book of a closed bazar, or None to read it live"""
+    if not is_book_closed(bazar, bet_date):
+        return None
+    return BookSnapshot.objects.filter(
+        user_id=user_id,
+        bazar=bazar,
+        bet_date=bet_date
+    ).values_list('data', flat=True).first()
+
+
+async def aclosed_book_snapshot(user_id, bazar, bet_date):
+    """Async version of closed_book_snapshot"""
+    if not await ais_book_closed(bazar, bet_date):
+        return None
+    return await BookSnapshot.objects.filter(
+        user_id=user_id,
+        bazar=bazar,
+        bet_date=bet_date
+    ).values_list('data', flat=True).afirst()
+
+
+def snapshot_column_totals(snapshot):
+    """{column: rupees} for columns 1-10, as get_column_totals returns them"""
+    return {
+        column: paise_to_rupees(snapshot['column_totals'].get(str(column), 0))
+        for column in range(1, 11)
+    }
+
+
+def snapshot_last_action(snapshot, compact_times=False):
+    """The last bulk action as get_last_bulk_action returns it, or None"""
+    if not snapshot['last_action']:
+        return None
+    action = dict(snapshot['last_action'])
+    created_at_ms = action.pop('created_at_ms')
+    if compact_times:
+        action['created_at'] = created_at_ms
+    return action
@@ -0,0 +1,142 @@
+# userbaseapp/db_router.py
+"""
+Read-replica routing.
+
+When a `replica` database is configured (REPLICA_DATABASE_URL), views wrapped
+in `replica_reads` and the admin changelists read from it; everything else,
+and every write, uses `default`.
+
+Replicas lag behind the primary, so reads stay on the primary for
+REPLICA_STICKY_SECONDS after a write:
+
+- the writer's own: `PrimaryPinningMiddleware` sets a short-lived cookie on
+  the response to any write request, so the pin holds on every worker;
+- the book owner's, whoever wrote (staff, admin, settlement):
+  invalidate_book pins the owner in the shared cache (`pin_to_primary`);
+- coalesced book reads (see book_cache.py) of a book written within the
+  window are computed on the primary (`primary_reads`), so a lagging
+  replica result is never cached under the new version.
+
+To try it locally, point REPLICA_DATABASE_URL at a second database, e.g.
+sqlite:///replica.sqlite3.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+
+REPLICA_DB_ALIAS = 'replica'
+
+# Cookie marking a browser that just wrote; its value doesn't matter
+PIN_COOKIE = 'primary_pin'
+
+# Set while a replica-eligible view runs; a ContextVar so it is scoped to the
+# current thread or asyncio task
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def replica_available():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def _pin_key(user_id):
+    return f'db-primary-pin:{user_id}'
+
+
+def pin_to_primary(user_id):
+    """Route this user's reads to the primary for REPLICA_STICKY_SECONDS (needs a shared cache)"""
+    if replica_available():
+        cache.set(_pin_key(user_id), True, settings.REPLICA_STICKY_SECONDS)
+
+
+def is_pinned_to_primary(user_id):
+    return cache.get(_pin_key(user_id), False)
+
+
+async def ais_pinned_to_primary(user_id):
+    return await cache.aget(_pin_key(user_id), False)
+
+
+@contextmanager
+def primary_reads():
+    """Read from the primary inside this block, even within `replica_reads`"""
+    token = _use_replica.set(False)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """Send reads to the replica inside `replica_reads`, everything else to the primary"""
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and replica_available():
+            return REPLICA_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+
+class PrimaryPinningMiddleware:
+    """Pin browsers to the primary after any write request (POST, PUT, PATCH, DELETE)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if replica_available() and request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+def replica_reads(view):
+    """Run a read-only view against the replica, unless the browser or user is pinned to the primary"""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            if not replica_available():
+                return await view(request, *args, **kwargs)
+            user = await request.auser()
+            if PIN_COOKIE in request.COOKIES or await ais_pinned_to_primary(user.id):
+                return await view(request, *args, **kwargs)
+
+            token = _use_replica.set(True)
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _use_replica.reset(token)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if (
+            not replica_available()
+            or PIN_COOKIE in request.COOKIES
+            or is_pinned_to_primary(request.user.id)
+        ):
+            return view(request, *args, **kwargs)
+
+        token = _use_replica.set(True)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+    return wrapper
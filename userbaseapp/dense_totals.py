@@ -0,0 +1,74 @@
+# userbaseapp/dense_totals.py
+"""
+Dense wire formats for a book's per-number totals.
+
+Every three-digit number 000-999 has a fixed slot, so the totals can be sent
+without per-number keys (get_all_bet_totals `format=` parameter):
+
+- `array`: JSON with `totals`, a list of 1000 integer paise totals indexed
+  by number, plus `extra` for bare column numbers ('1'-'10').
+- `binary`: little-endian bytes the client decodes straight into a typed
+  array:
+      125 bytes   bitmask, bit n set when number n has a non-zero total
+      8 bytes     int64 paise total for each set bit, in number order
+      2 bytes     uint16 count of extra (bare) numbers
+      10 bytes    uint16 number code (1000 + n) and int64 paise, per extra
+
+  Totals are int64 since one bet alone may be up to 9,999,999,999 paise.
+"""
+import struct
+
+from .fields import NUMBER_SET_BYTES, encode_bet_number
+
+
+DENSE_SLOTS = 1000
+BINARY_CONTENT_TYPE = 'application/octet-stream'
+
+
+def split_totals(paise_by_number):
+    """{number: paise} -> (list of 1000 paise totals, {bare number: paise})"""
+    dense = [0] * DENSE_SLOTS
+    extra = {}
+    for number, paise in paise_by_number.items():
+        code = encode_bet_number(number)
+        if code < DENSE_SLOTS:
+            dense[code] = paise
+        else:
+            extra[number] = paise
+    return dense, extra
+
+
+def encode_binary(paise_by_number):
+    dense, extra = split_totals(paise_by_number)
+    bits = 0
+    values = []
+    for code, paise in enumerate(dense):
+        if paise:
+            bits |= 1 << code
+            values.append(paise)
+
+    parts = [
+        bits.to_bytes(NUMBER_SET_BYTES, 'little'),
+        struct.pack(f'<{len(values)}q', *values),
+        struct.pack('<H', len(extra)),
+    ]
+    parts.extend(struct.pack('<Hq', encode_bet_number(number), paise) for number, paise in extra.items())
+    return b''.join(parts)
+
+
+def decode_binary(data):
+    """Inverse of encode_binary, -> {number: paise}"""
+    bits = int.from_bytes(data[:NUMBER_SET_BYTES], 'little')
+    codes = [code for code in range(DENSE_SLOTS) if bits >> code & 1]
+    offset = NUMBER_SET_BYTES
+    values = struct.unpack_from(f'<{len(codes)}q', data, offset)
+    offset += 8 * len(codes)
+    totals = {f'{code:03d}': paise for code, paise in zip(codes, values)}
+
+    (count,) = struct.unpack_from('<H', data, offset)
+    offset += 2
+    for _ in range(count):
+        code, paise = struct.unpack_from('<Hq', data, offset)
+        offset += 10
+        totals[str(code - DENSE_SLOTS)] = paise
+    return totals
@@ -0,0 +1,308 @@
+# userbaseapp/events.py
+"""
+Bet event log: every change to a user's book as an append-only, numbered event.
+
+Each BetEvent belongs to one book (user, bazar, date) and is one of:
+
+- PLACED: bets or a bulk action were placed (or re-added by an admin edit);
+- DELETED: bets were deleted (single deletes, admin deletes and edits);
+- UNDONE: bulk actions were undone;
+- WIPED: the whole book was cleared (bazar delete, master delete).
+
+An event's `entries` are [bet_type, number, column, stake paise, bets]
+deltas, negative for removals; a WIPED event has none and resets the book.
+Like the house exposure, every write path records its events in the same
+transaction as the bets themselves, next to its exposure call:
+
+- placements call `log_placed_bets` or `log_placed_bulk_action`;
+- deletes and undos call `log_removed_bets` (a Bet queryset, before it
+  changes), `log_removed_compact_actions` or `log_removed_compact_number`;
+- bazar and master deletes call `log_wiped_books`.
+
+Events are numbered per book from the book's BookSummary row, which the
+writer locks for the rest of its transaction. Writers to one book are
+thereby serialized, so the projections (PROJECTIONS) are updated in place
+from each new event:
+
+- number_totals: BookNumberTotal, stake and bets per number;
+- column_totals: BookColumnTotal, stake and bets of the column bets per column;
+- summary: BookSummary, stake, bets and last seq of the book.
+
+Projections are derived from the events alone, so `rebuild_projections`
+(manage.py rebuild_projections) can replay the log into any of them, e.g.
+after adding a projection or fixing one's logic.
+"""
+from collections import defaultdict
+from itertools import groupby
+
+from django.db import models, transaction
+
+from .fields import PaiseSum, rupees_to_paise
+from .models import BetEvent, BookColumnTotal, BookNumberTotal, BookSummary
+
+
+def _book_key(user_id, bazar, bet_date):
+    """Book key with the date in stored form, so equal books merge whatever their input type"""
+    return user_id, bazar, BetEvent._meta.get_field('bet_date').to_python(bet_date)
+
+
+def _new_changes():
+    # {(user_id, bazar, bet_date, bulk_action_id): {(bet_type, number, column): [stake, bets]}}
+    return defaultdict(lambda: defaultdict(lambda: [0, 0]))
+
+
+def _add(changes, user_id, bazar, bet_date, bulk_action_id, entry, stake, bets):
+    delta = changes[(*_book_key(user_id, bazar, bet_date), bulk_action_id)][entry]
+    delta[0] += stake
+    delta[1] += bets
+
+
+def _add_queryset(changes, queryset, sign):
+    rows = (
+        queryset.filter(is_deleted=False)
+        .order_by()
+        .values('user_id', 'bazar', 'bet_date', 'bulk_action_id', 'bet_type', 'number', 'column_number')
+        .annotate(stake=PaiseSum('amount'), bets=models.Count('id'))
+    )
+    for row in rows:
+        _add(
+            changes, row['user_id'], row['bazar'], row['bet_date'], row['bulk_action_id'],
+            (row['bet_type'], row['number'], row['column_number']),
+            sign * row['stake'], sign * row['bets'],
+        )
+
+
+def _add_compact_action(changes, action, sign, numbers=None):
+    amount_paise = rupees_to_paise(action.amount)
+    for number in action.numbers if numbers is None else numbers:
+        _add(
+            changes, action.user_id, action.bazar, action.action_date, action.id,
+            (action.action_type, number, None), sign * amount_paise, sign,
+        )
+
+
+def _add_compact_actions(changes, queryset, sign):
+    compact_actions = queryset.filter(is_undone=False, number_set__isnull=False).only(
+        'id', 'user_id', 'bazar', 'action_date', 'action_type', 'amount', 'number_set'
+    )
+    for action in compact_actions:
+        _add_compact_action(changes, action, sign)
+
+
+def _lock_summary(book):
+    summary, created = BookSummary.objects.select_for_update().get_or_create(**book)
+    return summary
+
+
+def _append(book, kind, entries=(), bulk_action_id=None):
+    """Append one event to a book and bring the projections up to date"""
+    summary = _lock_summary(book)
+    event = BetEvent.objects.create(
+        **book,
+        seq=summary.last_seq + 1,
+        kind=kind,
+        entries=list(entries),
+        bulk_action_id=bulk_action_id,
+    )
+    for projection in PROJECTIONS.values():
+        projection.apply(book, [event])
+    return event
+
+
+def _record(changes, kind):
+    # One event per book and bulk action, books in key order (no deadlocks
+    # between concurrent writers locking several books). Admin actions may
+    # call in without a transaction; the summary locks need one
+    with transaction.atomic(savepoint=False):
+        for key in sorted(changes, key=lambda key: (*key[:3], key[3] or 0)):
+            user_id, bazar, bet_date, bulk_action_id = key
+            entries = [
+                [bet_type, number, column, stake, bets]
+                for (bet_type, number, column), (stake, bets) in changes[key].items()
+                if stake or bets
+            ]
+            if entries:
+                book = {'user_id': user_id, 'bazar': bazar, 'bet_date': bet_date}
+                _append(book, kind, entries, bulk_action_id)
+
+
+def log_placed_bets(bets):
+    """Log newly placed Bet instances"""
+    changes = _new_changes()
+    for bet in bets:
+        if bet.is_deleted:
+            continue
+        _add(
+            changes, bet.user_id, bet.bazar, bet.bet_date, bet.bulk_action_id,
+            (bet.bet_type, bet.number, bet.column_number), rupees_to_paise(bet.amount), 1,
+        )
+    _record(changes, 'PLACED')
+
+
+def log_placed_bulk_action(action):
+    """Log a newly placed bulk action, compact or stored as rows"""
+    changes = _new_changes()
+    if action.is_compact:
+        _add_compact_action(changes, action, 1)
+    else:
+        _add_queryset(changes, action.bets.all(), 1)
+    _record(changes, 'PLACED')
+
+
+def log_placed_compact_actions(queryset):
+    """Log the active compact actions in a BulkBetAction queryset as placed (e.g. after an admin edit)"""
+    changes = _new_changes()
+    _add_compact_actions(changes, queryset, 1)
+    _record(changes, 'PLACED')
+
+
+def log_removed_bets(queryset, kind='DELETED'):
+    """Log that the live bets in a Bet queryset are about to be deleted (kind DELETED or UNDONE)"""
+    changes = _new_changes()
+    _add_queryset(changes, queryset, -1)
+    _record(changes, kind)
+
+
+def log_removed_compact_actions(queryset, kind='DELETED'):
+    """Log that the active compact actions in a BulkBetAction queryset are about to go"""
+    changes = _new_changes()
+    _add_compact_actions(changes, queryset, -1)
+    _record(changes, kind)
+
+
+def log_removed_compact_number(action, number):
+    """Log that one number's virtual bet was discarded from a compact action"""
+    changes = _new_changes()
+    _add_compact_action(changes, action, -1, numbers=[number])
+    _record(changes, 'DELETED')
+
+
+def log_wiped_books(user_id, bazar=None, bet_date=None):
+    """Log that a user's books (all, or of one bazar and/or date) are about to be cleared"""
+    books = BookSummary.objects.filter(user_id=user_id)
+    if bazar:
+        books = books.filter(bazar=bazar)
+    if bet_date:
+        books = books.filter(bet_date=bet_date)
+    with transaction.atomic(savepoint=False):
+        for bazar, bet_date in books.order_by('bazar', 'bet_date').values_list('bazar', 'bet_date'):
+            _append({'user_id': user_id, 'bazar': bazar, 'bet_date': bet_date}, 'WIPED')
+
+
+def _fold(events, key):
+    """({key: [stake, bets]} of the events' entries, whether one of them wiped the book)"""
+    deltas = defaultdict(lambda: [0, 0])
+    wiped = False
+    for event in events:
+        if event.kind == 'WIPED':
+            wiped = True
+            deltas.clear()
+            continue
+        for bet_type, number, column, stake, bets in event.entries:
+            entry_key = key(bet_type, number, column)
+            if entry_key is not None:
+                deltas[entry_key][0] += stake
+                deltas[entry_key][1] += bets
+    return deltas, wiped
+
+
+class _KeyedTotals:
+    """Projection of stake and bets per key of a book, e.g. per number"""
+
+    def __init__(self, model, field, key):
+        self.model = model
+        self.field = field
+        self.key = key
+
+    def reset(self, queryset):
+        queryset.delete()
+
+    def apply(self, book, events):
+        deltas, wiped = _fold(events, self.key)
+        rows = self.model.objects.filter(**book)
+        if wiped:
+            rows.delete()
+            current = {}
+        else:
+            current = {getattr(row, self.field): row for row in rows.filter(**{f'{self.field}__in': list(deltas)})}
+
+        updated, emptied = [], []
+        for key, (stake, bets) in deltas.items():
+            row = current.get(key) or self.model(**book, **{self.field: key})
+            row.stake += stake
+            row.bets += bets
+            (updated if row.bets else emptied).append(key)
+            current[key] = row
+
+        if emptied:
+            rows.filter(**{f'{self.field}__in': emptied}).delete()
+        if updated:
+            self.model.objects.bulk_create(
+                [current[key] for key in updated],
+                update_conflicts=True,
+                unique_fields=['user', 'bazar', 'bet_date', self.field],
+                update_fields=['stake', 'bets'],
+            )
+
+
+class _Summary:
+    """Projection of a book's stake, bets and last seq"""
+    model = BookSummary
+
+    def reset(self, queryset):
+        # Zeroed rather than deleted: the rows number new events
+        queryset.update(last_seq=0, stake=0, bets=0)
+
+    def apply(self, book, events):
+        totals, wiped = _fold(events, lambda bet_type, number, column: 'book')
+        stake, bets = totals['book']
+        values = {'last_seq': events[-1].seq}
+        if wiped:
+            values.update(stake=stake, bets=bets)
+        else:
+            values.update(stake=models.F('stake') + stake, bets=models.F('bets') + bets)
+        if not BookSummary.objects.filter(**book).update(**values):
+            BookSummary.objects.create(**book, last_seq=events[-1].seq, stake=stake, bets=bets)
+
+
+PROJECTIONS = {
+    'number_totals': _KeyedTotals(BookNumberTotal, 'number', lambda bet_type, number, column: number),
+    'column_totals': _KeyedTotals(
+        BookColumnTotal, 'column', lambda bet_type, number, column: column if bet_type == 'COLUMN' else None
+    ),
+    'summary': _Summary(),
+}
+
+
+def rebuild_projections(names=None, bazar=None, bet_date=None):
+    """
+    Replay the event log into projections (all, or the named ones), for all
+    books or one bazar and/or date. Returns the number of books replayed.
+    """
+    projections = [PROJECTIONS[name] for name in names or PROJECTIONS]
+    events = BetEvent.objects.all()
+    if bazar:
+        events = events.filter(bazar=bazar)
+    if bet_date:
+        events = events.filter(bet_date=bet_date)
+
+    books = 0
+    with transaction.atomic():
+        for projection in projections:
+            rows = projection.model.objects.all()
+            if bazar:
+                rows = rows.filter(bazar=bazar)
+            if bet_date:
+                rows = rows.filter(bet_date=bet_date)
+            projection.reset(rows)
+
+        ordered = events.order_by('user_id', 'bazar', 'bet_date', 'seq').iterator()
+        for (user_id, book_bazar, book_date), book_events in groupby(
+            ordered, key=lambda event: (event.user_id, event.bazar, event.bet_date)
+        ):
+            book = {'user_id': user_id, 'bazar': book_bazar, 'bet_date': book_date}
+            book_events = list(book_events)
+            for projection in projections:
+                projection.apply(book, book_events)
+            books += 1
+    return books
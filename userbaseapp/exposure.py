@@ -0,0 +1,239 @@
+# userbaseapp/exposure.py
+"""
+House exposure: live stake per number across all users of a (bazar, date).
+
+BookExposure holds one running total per (bazar, date, bet type, number,
+shard). Every write path records its change here in the same transaction as
+the bets themselves, next to its invalidate_book call:
+
+- placements call `add_bets` (Bet instances) or `add_bulk_action`;
+- deletes and undos call `remove_bets` (a Bet queryset, before it changes),
+  `remove_compact_actions` or `remove_compact_number`;
+- admin edits remove the old state before saving and add the new one after.
+
+Changes are accumulated into deltas and applied with one batched
+INSERT ... ON CONFLICT DO UPDATE that increments the totals, so a placement
+costs one statement however many numbers it covers. Rows are written in
+key order (no deadlocks between concurrent batches) and users are spread
+over EXPOSURE_SHARDS rows per number, so bettors on the same hot number in
+the last minutes before close don't queue on a single row lock.
+
+`rebuild_exposure` recomputes the table from the bets (manage.py
+rebuild_exposure), e.g. after changing EXPOSURE_SHARDS.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.db.models.functions import Mod
+
+from .fields import PaiseSum, encode_bet_number, paise_to_rupees, rupees_to_paise
+from .models import Bet, BookExposure, BulkBetAction
+from .settlement import pana_ank
+
+
+# Rows per INSERT statement (7 parameters each)
+_BATCH_SIZE = 100
+
+_COLUMNS = ['bazar', 'bet_date', 'bet_type', 'number', 'shard', 'stake', 'bets']
+
+
+def _shard(user_id):
+    return user_id % settings.EXPOSURE_SHARDS
+
+
+def _key(bazar, bet_date, bet_type, number, shard):
+    """Delta key in stored form, so equal keys merge whatever their input type"""
+    return (
+        Bet.BAZAR_CODES[bazar],
+        BookExposure._meta.get_field('bet_date').to_python(bet_date),
+        Bet.BET_TYPE_CODES[bet_type],
+        encode_bet_number(number),
+        shard,
+    )
+
+
+def _new_deltas():
+    return defaultdict(lambda: [0, 0])
+
+
+def _apply(deltas):
+    rows = sorted(
+        (*key, stake, bets) for key, (stake, bets) in deltas.items() if stake or bets
+    )
+    if not rows:
+        return
+
+    table = connection.ops.quote_name(BookExposure._meta.db_table)
+    columns = ', '.join(connection.ops.quote_name(column) for column in _COLUMNS)
+    key_columns = ', '.join(connection.ops.quote_name(column) for column in _COLUMNS[:5])
+    stake, bets = (connection.ops.quote_name(column) for column in _COLUMNS[5:])
+    row_placeholder = f"({', '.join(['%s'] * len(_COLUMNS))})"
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), _BATCH_SIZE):
+            batch = rows[start:start + _BATCH_SIZE]
+            cursor.execute(
+                f'INSERT INTO {table} ({columns}) VALUES {", ".join([row_placeholder] * len(batch))} '
+                f'ON CONFLICT ({key_columns}) DO UPDATE SET '
+                f'{stake} = {table}.{stake} + excluded.{stake}, '
+                f'{bets} = {table}.{bets} + excluded.{bets}',
+                [
+                    connection.ops.adapt_datefield_value(value) if index == 1 else value
+                    for row in batch
+                    for index, value in enumerate(row)
+                ],
+            )
+
+
+def _add_queryset(deltas, queryset, sign):
+    rows = (
+        queryset.filter(is_deleted=False)
+        .order_by()
+        .annotate(shard=Mod('user_id', settings.EXPOSURE_SHARDS))
+        .values('bazar', 'bet_date', 'bet_type', 'number', 'shard')
+        .annotate(stake=PaiseSum('amount'), bets=models.Count('id'))
+    )
+    for row in rows:
+        delta = deltas[_key(row['bazar'], row['bet_date'], row['bet_type'], row['number'], row['shard'])]
+        delta[0] += sign * row['stake']
+        delta[1] += sign * row['bets']
+
+
+def _add_compact_action(deltas, action, sign, numbers=None):
+    amount_paise = rupees_to_paise(action.amount)
+    shard = _shard(action.user_id)
+    for number in action.numbers if numbers is None else numbers:
+        delta = deltas[_key(action.bazar, action.action_date, action.action_type, number, shard)]
+        delta[0] += sign * amount_paise
+        delta[1] += sign
+
+
+def add_bets(bets):
+    """Record newly placed Bet instances"""
+    deltas = _new_deltas()
+    for bet in bets:
+        if bet.is_deleted:
+            continue
+        delta = deltas[_key(bet.bazar, bet.bet_date, bet.bet_type, bet.number, _shard(bet.user_id))]
+        delta[0] += rupees_to_paise(bet.amount)
+        delta[1] += 1
+    _apply(deltas)
+
+
+def add_bulk_action(action):
+    """Record a newly placed bulk action, compact or stored as rows"""
+    deltas = _new_deltas()
+    if action.is_compact:
+        _add_compact_action(deltas, action, 1)
+    else:
+        _add_queryset(deltas, action.bets.all(), 1)
+    _apply(deltas)
+
+
+def remove_bets(queryset):
+    """Record that the live bets in a Bet queryset are about to be deleted"""
+    deltas = _new_deltas()
+    _add_queryset(deltas, queryset, -1)
+    _apply(deltas)
+
+
+def _add_compact_actions(deltas, queryset, sign):
+    compact_actions = queryset.filter(is_undone=False, number_set__isnull=False).only(
+        'user_id', 'bazar', 'action_date', 'action_type', 'amount', 'number_set'
+    )
+    for action in compact_actions:
+        _add_compact_action(deltas, action, sign)
+
+
+def add_compact_actions(queryset):
+    """Record the active compact actions in a BulkBetAction queryset (e.g. after an admin edit)"""
+    deltas = _new_deltas()
+    _add_compact_actions(deltas, queryset, 1)
+    _apply(deltas)
+
+
+def remove_compact_actions(queryset):
+    """Record that the active compact actions in a BulkBetAction queryset are about to go"""
+    deltas = _new_deltas()
+    _add_compact_actions(deltas, queryset, -1)
+    _apply(deltas)
+
+
+def remove_compact_number(action, number):
+    """Record that one number's virtual bet was discarded from a compact action"""
+    deltas = _new_deltas()
+    _add_compact_action(deltas, action, -1, numbers=[number])
+    _apply(deltas)
+
+
+def rebuild_exposure(bazar=None, bet_date=None):
+    """Recompute exposure from the bets, for all books or one bazar and/or date"""
+    bets = Bet.objects.all()
+    actions = BulkBetAction.objects.all()
+    exposure = BookExposure.objects.all()
+    if bazar:
+        bets, actions, exposure = bets.filter(bazar=bazar), actions.filter(bazar=bazar), exposure.filter(bazar=bazar)
+    if bet_date:
+        bets, actions = bets.filter(bet_date=bet_date), actions.filter(action_date=bet_date)
+        exposure = exposure.filter(bet_date=bet_date)
+
+    deltas = _new_deltas()
+    with transaction.atomic():
+        exposure.delete()
+        _add_queryset(deltas, bets, 1)
+        _add_compact_actions(deltas, actions, 1)
+        _apply(deltas)
+    return len(deltas)
+
+
+def book_exposure(bazar, bet_date, top=20):
+    """House exposure of one (bazar, date): totals, hottest numbers and breakdowns"""
+    rows = (
+        BookExposure.objects.filter(bazar=bazar, bet_date=bet_date)
+        .order_by()
+        .values('bet_type', 'number')
+        .annotate(stake=models.Sum('stake'), bets=models.Sum('bets'))
+    )
+
+    by_number = defaultdict(lambda: [0, 0])
+    by_bet_type = defaultdict(lambda: [0, 0])
+    # Column c (1-10) covers the panas whose ank is c % 10, and the column bets on c
+    by_column = {column: {'pana_stake': 0, 'column_stake': 0} for column in range(1, 11)}
+    for row in rows:
+        if not row['bets']:
+            continue
+        by_bet_type[row['bet_type']][0] += row['stake']
+        by_bet_type[row['bet_type']][1] += row['bets']
+        if row['bet_type'] == 'COLUMN':
+            by_column[int(row['number'])]['column_stake'] += row['stake']
+            continue
+        by_number[row['number']][0] += row['stake']
+        by_number[row['number']][1] += row['bets']
+        if len(row['number']) == 3:
+            by_column[pana_ank(row['number']) or 10]['pana_stake'] += row['stake']
+
+    hottest = sorted(by_number.items(), key=lambda item: (-item[1][0], item[0]))[:top]
+    return {
+        'total_stake': paise_to_rupees(sum(stake for stake, bets in by_bet_type.values())),
+        'total_bets': sum(bets for stake, bets in by_bet_type.values()),
+        # Column bets are only in by_column
+        'numbers': len(by_number),
+        'top_numbers': [
+            {'number': number, 'stake': paise_to_rupees(stake), 'bets': bets}
+            for number, (stake, bets) in hottest
+        ],
+        'by_bet_type': [
+            {'bet_type': bet_type, 'stake': paise_to_rupees(stake), 'bets': bets}
+            for bet_type, (stake, bets) in sorted(by_bet_type.items(), key=lambda item: -item[1][0])
+        ],
+        'by_column': [
+            {
+                'column': column,
+                'pana_stake': paise_to_rupees(totals['pana_stake']),
+                'column_stake': paise_to_rupees(totals['column_stake']),
+                'stake': paise_to_rupees(totals['pana_stake'] + totals['column_stake']),
+            }
+            for column, totals in by_column.items()
+        ],
+    }
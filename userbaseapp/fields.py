@@ -0,0 +1,263 @@
+# userbaseapp/fields.py
+"""
+Compact column types for the bets table.
+
+The number/bazar/bet_type fields store a small integer in the database but
+expose the original string values in Python, so filters
+(`bazar='KALYAN_OPEN'`), `values()`, forms, the admin and the JSON APIs keep
+working with strings while rows, indexes and GROUP BYs shrink to two bytes per
+column.
+
+A bulk action's numbers can be stored as a 1000-bit bitmap
+(`pack_number_set`) instead of one bet row per number.
+
+Amounts are stored as integer paise (PaiseAmountField) and exposed as
+2-place Decimals. Hot read paths skip the Decimal entirely: `PaiseSum` and
+`RawPaise` return integer paise, which `paise_to_rupees` turns into the API
+amount format.
+"""
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+from django import forms
+from django.core import exceptions, validators
+from django.db import models
+
+
+class CodedChoiceField(models.PositiveSmallIntegerField):
+    """
+    A string choice stored as a smallint code.
+
+    `codes` maps each choice value to its code. Codes are persisted, so
+    existing entries must never be renumbered; add new choices with new codes.
+    """
+
+    def __init__(self, *args, codes=None, **kwargs):
+        self.codes = dict(codes or {})
+        self.values_by_code = {code: value for value, code in self.codes.items()}
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['codes'] = self.codes
+        return name, path, args, kwargs
+
+    @property
+    def validators(self):
+        # Values are strings in Python; the integer range validators don't apply
+        return []
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return self.values_by_code[value]
+
+    def to_python(self, value):
+        if value is None or isinstance(value, str):
+            return value
+        try:
+            return self.values_by_code[value]
+        except KeyError:
+            raise exceptions.ValidationError(f'Unknown {self.name} code {value!r}', code='invalid')
+
+    def get_prep_value(self, value):
+        if value is None or isinstance(value, int):
+            return value
+        value = str(value)
+        try:
+            return self.codes[value]
+        except KeyError:
+            raise ValueError(f'Unknown {self.name} {value!r}')
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
+
+
+# Bare (unpadded) numbers, such as a column bet's column '1'-'10', are stored
+# above the three-digit range so they round-trip unchanged
+BARE_NUMBER_OFFSET = 1000
+
+
+def encode_bet_number(value):
+    """'000'-'999' -> 0-999; bare numbers like '7' or '10' -> 1007, 1010"""
+    value = str(value)
+    if not value.isdigit():
+        raise ValueError(f'Invalid bet number {value!r}')
+    if len(value) == 3:
+        return int(value)
+    if len(value) < 3 and not (len(value) == 2 and value[0] == '0'):
+        return BARE_NUMBER_OFFSET + int(value)
+    raise ValueError(f'Invalid bet number {value!r}')
+
+
+def is_valid_bet_number(value):
+    """Whether a bet number can be stored (see encode_bet_number)"""
+    try:
+        encode_bet_number(value)
+    except ValueError:
+        return False
+    return True
+
+
+def decode_bet_number(code):
+    if code >= BARE_NUMBER_OFFSET:
+        return str(code - BARE_NUMBER_OFFSET)
+    return f'{code:03d}'
+
+
+# One bit per three-digit number code 0-999
+NUMBER_SET_BYTES = 125
+
+
+def pack_number_set(numbers):
+    """
+    Three-digit numbers -> 125-byte bitmap, or None if the numbers can't be
+    represented (a duplicate, or a number that isn't three digits)
+    """
+    bits = 0
+    count = 0
+    for number in numbers:
+        number = str(number)
+        if len(number) != 3 or not number.isdigit():
+            return None
+        bits |= 1 << int(number)
+        count += 1
+    if bits.bit_count() != count:
+        return None
+    return bits.to_bytes(NUMBER_SET_BYTES, 'little')
+
+
+def unpack_number_set(data):
+    """Bitmap -> sorted list of three-digit numbers"""
+    bits = int.from_bytes(bytes(data), 'little')
+    return [f'{code:03d}' for code in range(NUMBER_SET_BYTES * 8) if bits >> code & 1]
+
+
+def number_set_size(data):
+    return int.from_bytes(bytes(data), 'little').bit_count()
+
+
+def number_set_contains(data, number):
+    return bool(int.from_bytes(bytes(data), 'little') >> int(number) & 1)
+
+
+def discard_from_number_set(data, number):
+    """Bitmap with `number` removed"""
+    bits = int.from_bytes(bytes(data), 'little') & ~(1 << int(number))
+    return bits.to_bytes(NUMBER_SET_BYTES, 'little')
+
+
+class BetNumberField(models.PositiveSmallIntegerField):
+    """A bet number ('000'-'999', or a bare column number) stored as a smallint"""
+
+    @property
+    def validators(self):
+        return []
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return decode_bet_number(value)
+
+    def to_python(self, value):
+        if value is None:
+            return value
+        if isinstance(value, str):
+            if not is_valid_bet_number(value):
+                raise exceptions.ValidationError(f'Invalid bet number {value!r}', code='invalid')
+            return value
+        return decode_bet_number(value)
+
+    def get_prep_value(self, value):
+        if value is None or isinstance(value, int):
+            return value
+        return encode_bet_number(value)
+
+    def formfield(self, **kwargs):
+        # Skip IntegerField.formfield: the form works with the string value
+        return models.Field.formfield(self, **{'form_class': forms.CharField, 'max_length': 4, **kwargs})
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
+
+
+PAISE_PER_RUPEE = 100
+
+
+def rupees_to_paise(value):
+    """Rupees (Decimal, str, int or float) -> integer paise, rounded half up"""
+    return int((Decimal(str(value)) * PAISE_PER_RUPEE).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def paise_to_decimal(paise):
+    return Decimal(paise).scaleb(-2)
+
+
+def paise_to_rupees(paise):
+    """
+    API amount format: rupees as a JSON number with at most two decimals.
+
+    Dividing integer paise once gives the float closest to the exact amount,
+    which JSON encodes as e.g. 12.5 or 1234.56.
+    """
+    return (paise or 0) / PAISE_PER_RUPEE
+
+
+class PaiseAmountField(models.BigIntegerField):
+    """
+    A rupee amount stored as integer paise and exposed as a 2-place Decimal.
+
+    Bigint, since the largest amount of the former DecimalField(10, 2),
+    99,999,999.99, is 9,999,999,999 paise; the same range is validated.
+    """
+
+    @property
+    def validators(self):
+        # The integer range validators would compare rupees against paise limits
+        return [validators.DecimalValidator(10, 2)]
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return paise_to_decimal(value)
+
+    def to_python(self, value):
+        if value is None:
+            return value
+        try:
+            return Decimal(str(value)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        except InvalidOperation:
+            raise exceptions.ValidationError(f'Invalid amount {value!r}', code='invalid')
+
+    def get_prep_value(self, value):
+        if value is None:
+            return None
+        try:
+            return rupees_to_paise(value)
+        except InvalidOperation:
+            raise ValueError(f'Invalid amount {value!r}')
+
+    def formfield(self, **kwargs):
+        # Skip IntegerField.formfield: the form works in rupees
+        return models.Field.formfield(self, **{
+            'form_class': forms.DecimalField,
+            'max_digits': 10,
+            'decimal_places': 2,
+            **kwargs,
+        })
+
+    def value_to_string(self, obj):
+        value = self.value_from_object(obj)
+        return None if value is None else str(value)
+
+
+class PaiseSum(models.Sum):
+    """SUM of a PaiseAmountField as raw integer paise (0 when there are no rows)"""
+    output_field = models.BigIntegerField()
+
+    def __init__(self, expression, **extra):
+        super().__init__(expression, default=0, **extra)
+
+
+def RawPaise(field_name):
+    """Select a PaiseAmountField as raw integer paise, skipping the Decimal conversion"""
+    return models.ExpressionWrapper(models.F(field_name), output_field=models.BigIntegerField())
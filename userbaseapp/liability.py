@@ -0,0 +1,117 @@
+# userbaseapp/liability.py
+"""
+What a bazar would pay out for every possible result, computed at once.
+
+The book is loaded into stake matrices, one row per bet type, indexed by
+number code (000-999), plus a stake vector for the ten column bets. With
+the settlement rules (see settlement.py), the payout for every outcome is
+then two matrix products:
+
+    pana_payout  = rates @ stakes                 (1000,)
+    payouts      = pana_payout[OUTCOMES] + ANK_MEMBERSHIP @ column_payout
+
+OUTCOMES are the 220 valid panas of ALL_COLUMN_DATA (every other catalog is
+a subset of it) and ANK_MEMBERSHIP the 220 x 10 matrix of which column each
+pana belongs to.
+
+Requires NumPy.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from .fields import BARE_NUMBER_OFFSET, NUMBER_SET_BYTES, PaiseSum, encode_bet_number, paise_to_rupees, rupees_to_paise
+from .models import Bet, BulkBetAction
+from .settlement import payout_rates
+
+
+BET_TYPES = [bet_type for bet_type, label in Bet.BET_TYPE_CHOICES]
+BET_TYPE_ROWS = {bet_type: row for row, bet_type in enumerate(BET_TYPES)}
+
+
+@lru_cache(maxsize=None)
+def outcome_matrices():
+    """(outcome pana codes, outcome x column membership matrix), built once"""
+    from .views import ALL_COLUMN_DATA
+
+    outcomes = sorted({int(number) for column in ALL_COLUMN_DATA for number in column})
+    index = {code: i for i, code in enumerate(outcomes)}
+    membership = np.zeros((len(outcomes), len(ALL_COLUMN_DATA)), dtype=np.int64)
+    for column, numbers in enumerate(ALL_COLUMN_DATA):
+        for number in numbers:
+            membership[index[int(number)], column] = 1
+    return np.array(outcomes), membership
+
+
+def load_stakes(bazar, bet_date):
+    """
+    Stake matrices of a bazar's book (all users), in paise, and the stake on
+    bare numbers (e.g. '7' placed as a single bet), which no pana can match
+    """
+    stakes = np.zeros((len(BET_TYPES), 1000), dtype=np.int64)
+    column_stakes = np.zeros(10, dtype=np.int64)
+    bare_stake = 0
+
+    rows = Bet.objects.filter(
+        bazar=bazar,
+        bet_date=bet_date,
+        is_deleted=False
+    ).order_by().values('bet_type', 'number', 'column_number').annotate(
+        stake=PaiseSum('amount')
+    )
+    for row in rows:
+        if row['bet_type'] == 'COLUMN':
+            column_stakes[row['column_number'] - 1] += row['stake']
+            continue
+        code = encode_bet_number(row['number'])
+        if code >= BARE_NUMBER_OFFSET:
+            bare_stake += row['stake']
+        else:
+            stakes[BET_TYPE_ROWS[row['bet_type']], code] += row['stake']
+
+    # Compact bulk actions: unpack each number bitmap straight into its row
+    compact_actions = BulkBetAction.objects.filter(
+        bazar=bazar,
+        action_date=bet_date,
+        is_undone=False,
+        number_set__isnull=False
+    ).only('action_type', 'amount', 'number_set')
+    for action in compact_actions:
+        bits = np.unpackbits(
+            np.frombuffer(bytes(action.number_set), dtype=np.uint8, count=NUMBER_SET_BYTES),
+            bitorder='little'
+        )
+        stakes[BET_TYPE_ROWS[action.action_type]] += bits.astype(np.int64) * rupees_to_paise(action.amount)
+
+    return stakes, column_stakes, bare_stake
+
+
+def simulate_outcomes(bazar, bet_date, top=10):
+    """Payout for every possible pana of a bazar, worst outcomes first in `worst`"""
+    outcomes, membership = outcome_matrices()
+    stakes, column_stakes, bare_stake = load_stakes(bazar, bet_date)
+
+    rates = payout_rates()
+    type_rates = np.array([float(rates[bet_type]) for bet_type in BET_TYPES])
+    pana_payout = type_rates @ stakes
+    column_payout = float(rates['COLUMN']) * column_stakes
+    payouts = np.rint(pana_payout[outcomes] + membership @ column_payout).astype(np.int64)
+
+    total_stake = int(stakes.sum() + column_stakes.sum()) + bare_stake
+    worst = np.argsort(-payouts, kind='stable')[:top]
+    return {
+        'total_stake': paise_to_rupees(total_stake),
+        'max_payout': paise_to_rupees(int(payouts.max())),
+        'outcomes_at_loss': int((payouts > total_stake).sum()),
+        'worst': [
+            {
+                'pana': f'{outcomes[i]:03d}',
+                'payout': paise_to_rupees(int(payouts[i])),
+                'net': paise_to_rupees(total_stake - int(payouts[i])),
+            }
+            for i in worst
+        ],
+        # Liability curve: the payout for each pana, aligned with `outcomes`
+        'outcomes': [f'{code:03d}' for code in outcomes],
+        'payouts': [paise_to_rupees(int(paise)) for paise in payouts],
+    }
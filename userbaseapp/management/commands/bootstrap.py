@@ -0,0 +1,123 @@
+import hashlib
+import os
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.staticfiles import finders
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.utils import OperationalError
+
+
+FINGERPRINT_FILENAME = '.static-fingerprint'
+
+
+class Command(BaseCommand):
+    help = (
+        'Prepare the container in one process: wait for the database, apply '
+        'pending migrations, ensure the admin user exists and collect static '
+        'files only when they changed'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--wait',
+            type=int,
+            default=60,
+            help='Seconds to wait for the database to accept connections (default: 60)',
+        )
+        parser.add_argument(
+            '--skip-db',
+            action='store_true',
+            help='Skip the database steps (readiness, migrations, admin user), e.g. at image build time',
+        )
+        parser.add_argument(
+            '--skip-static',
+            action='store_true',
+            help='Skip the collectstatic step',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        if not options['skip_db']:
+            self._step('Waiting for database', self.wait_for_database, options['wait'])
+            self._step('Checking migrations', self.apply_pending_migrations)
+            self._step('Checking admin user', self.ensure_superuser)
+
+        if not options['skip_static']:
+            self._step('Checking static files', self.collect_static_if_changed)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Bootstrap finished in {time.monotonic() - started:.1f}s'))
+
+    def _step(self, title, func, *args):
+        step_started = time.monotonic()
+        self.stdout.write(f'⏳ {title}...')
+        result = func(*args)
+        self.stdout.write(f'   {result} ({time.monotonic() - step_started:.2f}s)')
+
+    def wait_for_database(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                connection.ensure_connection()
+                return 'Database is up'
+            except OperationalError as e:
+                if time.monotonic() >= deadline:
+                    raise CommandError(f'Database unavailable after {timeout}s: {e}')
+                self.stdout.write('   Database is unavailable - sleeping')
+                time.sleep(1)
+
+    def apply_pending_migrations(self):
+        executor = MigrationExecutor(connection)
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        if not plan:
+            return 'No pending migrations'
+
+        call_command('migrate', interactive=False, verbosity=1)
+        return f'Applied {len(plan)} migration(s)'
+
+    def ensure_superuser(self):
+        User = get_user_model()
+        username = os.environ.get('DJANGO_SUPERUSER_USERNAME', 'admin')
+        if User.objects.filter(username=username).exists():
+            return f'Superuser "{username}" already exists'
+
+        email = os.environ.get('DJANGO_SUPERUSER_EMAIL', 'admin@example.com')
+        password = os.environ.get('DJANGO_SUPERUSER_PASSWORD', 'admin123')
+        User.objects.create_superuser(username, email, password)
+        return f'Superuser "{username}" created successfully'
+
+    def static_fingerprint(self):
+        """Hash of every source static file's path and content"""
+        digest = hashlib.sha256()
+        files = {}
+        for finder in finders.get_finders():
+            for path, storage in finder.list([]):
+                # First finder wins, matching collectstatic
+                files.setdefault(path, storage)
+
+        for path in sorted(files):
+            digest.update(path.encode())
+            with files[path].open(path) as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        return digest.hexdigest()
+
+    def collect_static_if_changed(self):
+        fingerprint_path = os.path.join(settings.STATIC_ROOT, FINGERPRINT_FILENAME)
+        fingerprint = self.static_fingerprint()
+
+        try:
+            with open(fingerprint_path) as f:
+                if f.read().strip() == fingerprint:
+                    return 'Static files unchanged - skipping collectstatic'
+        except FileNotFoundError:
+            pass
+
+        call_command('collectstatic', interactive=False, verbosity=0)
+        with open(fingerprint_path, 'w') as f:
+            f.write(fingerprint)
+        return 'Static files collected'
@@ -0,0 +1,32 @@
+import gzip
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Fail if a critical static bundle grows past its gzipped size budget'
+
+    def handle(self, *args, **options):
+        budgets = getattr(settings, 'STATIC_BUNDLE_BUDGETS', {})
+        over_budget = []
+
+        for path, budget in budgets.items():
+            absolute_path = finders.find(path)
+            if not absolute_path:
+                raise CommandError(f'Static bundle not found: {path}')
+
+            with open(absolute_path, 'rb') as f:
+                content = f.read()
+            gzipped_size = len(gzip.compress(content, compresslevel=9))
+
+            line = f'{path}: {len(content) / 1024:.1f} KB raw, {gzipped_size / 1024:.1f} KB gzipped (budget {budget / 1024:.1f} KB)'
+            if gzipped_size > budget:
+                over_budget.append(path)
+                self.stdout.write(self.style.ERROR(f'❌ {line}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'✅ {line}'))
+
+        if over_budget:
+            raise CommandError(f'{len(over_budget)} bundle(s) over budget: {", ".join(over_budget)}')
@@ -1,5 +1,7 @@
 from django.core.management.base import BaseCommand
-from userbaseapp.models import Bet, BulkBetAction
+from userbaseapp.models import (
+    Bet, BetEvent, BookColumnTotal, BookExposure, BookNumberTotal, BookSummary, BulkBetAction,
+)
 
 class Command(BaseCommand):
     help = 'Delete all bets and bulk actions from the database'
@@ -38,4 +40,11 @@ class Command(BaseCommand):
         deleted_actions = BulkBetAction.objects.all().delete()
         self.stdout.write(self.style.SUCCESS(f'   ✅ Deleted {deleted_actions[0]} bulk actions'))
         
+        # Nothing is left to be exposed to
+        BookExposure.objects.all().delete()
+        
+        # Start the event log (and its projections) over as well
+        for model in (BetEvent, BookSummary, BookNumberTotal, BookColumnTotal):
+            model.objects.all().delete()
+        
         self.stdout.write(self.style.SUCCESS('\n✅ All bets deleted successfully!\n'))
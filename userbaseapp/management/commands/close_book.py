@@ -0,0 +1,31 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from userbaseapp.closing import close_book
+from userbaseapp.models import Bet
+
+class Command(BaseCommand):
+    help = 'Close a bazar for a date: serve its books from precomputed snapshots'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bazar', required=True, help='Bazar (e.g. KALYAN_OPEN)')
+        parser.add_argument('--date', required=True, help='Date (YYYY-MM-DD)')
+        parser.add_argument(
+            '--allow-placements',
+            action='store_true',
+            help='Keep accepting new bets (the snapshots follow them)',
+        )
+
+    def handle(self, *args, **options):
+        bazar = options['bazar']
+        if bazar not in Bet.BAZAR_CODES:
+            raise CommandError(f'Unknown bazar {bazar}')
+
+        try:
+            bet_date = date.fromisoformat(options['date'])
+        except ValueError:
+            raise CommandError('Date must be YYYY-MM-DD')
+
+        closed, books = close_book(bazar, bet_date, blocks_placements=not options['allow_placements'])
+        blocked = 'placements blocked' if closed.blocks_placements else 'placements allowed'
+        self.stdout.write(self.style.SUCCESS(f'✅ Closed {bazar} {bet_date}: {books} book snapshots, {blocked}'))
@@ -0,0 +1,27 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from userbaseapp.exposure import rebuild_exposure
+from userbaseapp.models import Bet
+
+class Command(BaseCommand):
+    help = 'Recompute the house exposure table from the bets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bazar', help='Only this bazar (e.g. KALYAN_OPEN)')
+        parser.add_argument('--date', help='Only this date (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        bazar = options['bazar']
+        if bazar and bazar not in Bet.BAZAR_CODES:
+            raise CommandError(f'Unknown bazar {bazar}')
+
+        bet_date = None
+        if options['date']:
+            try:
+                bet_date = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError('Date must be YYYY-MM-DD')
+
+        rows = rebuild_exposure(bazar=bazar, bet_date=bet_date)
+        self.stdout.write(self.style.SUCCESS(f'✅ Rebuilt {rows} exposure rows'))
@@ -0,0 +1,26 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from userbaseapp.closing import reopen_book
+from userbaseapp.models import Bet
+
+class Command(BaseCommand):
+    help = 'Reopen a closed bazar for a date: back to live reads and placements'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bazar', required=True, help='Bazar (e.g. KALYAN_OPEN)')
+        parser.add_argument('--date', required=True, help='Date (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        bazar = options['bazar']
+        if bazar not in Bet.BAZAR_CODES:
+            raise CommandError(f'Unknown bazar {bazar}')
+
+        try:
+            bet_date = date.fromisoformat(options['date'])
+        except ValueError:
+            raise CommandError('Date must be YYYY-MM-DD')
+
+        if not reopen_book(bazar, bet_date):
+            raise CommandError(f'{bazar} {bet_date} is not closed')
+        self.stdout.write(self.style.SUCCESS(f'✅ Reopened {bazar} {bet_date}'))
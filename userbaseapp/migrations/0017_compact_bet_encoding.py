@@ -0,0 +1,237 @@
+# Compact encoding for Bet.number, Bet.bazar and Bet.bet_type
+#
+# The string columns are replaced by smallint codes (see userbaseapp/fields.py).
+# The data is converted with one UPDATE in each direction, after checking that
+# every number can be encoded, and the indexes that cover these columns are
+# rebuilt over the smaller columns.
+
+from django.db import migrations, models
+from django.db.models import Case, F, IntegerField, CharField, Value, When
+from django.db.models.functions import Cast, LPad
+
+import userbaseapp.fields
+
+
+# Frozen copies of Bet.BAZAR_CODES / Bet.BET_TYPE_CODES at the time of this migration
+BAZAR_CODES = {
+    'SRIDEVI_OPEN': 1,
+    'SRIDEVI_CLOSED': 2,
+    'TIME_OPEN': 3,
+    'TIME_CLOSED': 4,
+    'DIVAS_MILAN_OPEN': 5,
+    'DIVAS_MILAN_CLOSED': 6,
+    'KALYAN_OPEN': 7,
+    'KALYAN_CLOSED': 8,
+    'NIGHT_MILAN_OPEN': 9,
+    'NIGHT_MILAN_CLOSED': 10,
+    'MAIN_BAZAR': 11,
+    'MAIN_BAZAR_CLOSED': 12,
+    'CM_1': 13,
+    'CM_2': 14,
+    'CM_3': 15,
+    'CM_4': 16,
+    'CM_5': 17,
+    'CM_6': 18,
+    'CM_7': 19,
+    'CM_8': 20,
+    'CM_9': 21,
+    'CM_10': 22,
+    'CM_11': 23,
+    'CM_12': 24,
+}
+
+BET_TYPE_CODES = {
+    'SINGLE': 1,
+    'SP': 2,
+    'DP': 3,
+    'JODI': 4,
+    'DADAR': 5,
+    'EKI': 6,
+    'BEKI': 7,
+    'ABR_CUT': 8,
+    'JODI_PANEL': 9,
+    'MOTAR': 10,
+    'COMMAN_PANA_36': 11,
+    'COMMAN_PANA_56': 12,
+    'SET_PANA': 13,
+    'COLUMN': 14,
+    'GROUP': 15,
+}
+
+# Bare numbers (column bets store '1'-'10') are stored above 1000
+BARE_NUMBER_OFFSET = 1000
+
+# Numbers the codes can represent: three digits, or a bare 0-99 without a
+# leading zero (see encode_bet_number in userbaseapp/fields.py)
+ENCODABLE_NUMBER = r'^([0-9]{3}|[0-9]|[1-9][0-9])$'
+
+
+def check_numbers(Bet):
+    """Refuse to migrate numbers that would be lost or fail to convert"""
+    invalid = list(Bet.objects.exclude(number__regex=ENCODABLE_NUMBER).order_by('id').values_list('id', 'number')[:50])
+    if invalid:
+        listed = ', '.join(f'{bet_id}: {number!r}' for bet_id, number in invalid)
+        raise ValueError(
+            f'Bets with numbers that cannot be encoded (id: number, first 50): {listed}. '
+            'Correct or delete them, then migrate again.'
+        )
+
+
+def encode_columns(apps, schema_editor):
+    Bet = apps.get_model('userbaseapp', 'Bet')
+    check_numbers(Bet)
+    Bet.objects.update(
+        number_code=Case(
+            When(number__regex=r'^[0-9]{3}$', then=Cast('number', IntegerField())),
+            default=Cast('number', IntegerField()) + BARE_NUMBER_OFFSET,
+        ),
+        bazar_code=Case(
+            *[When(bazar=value, then=Value(code)) for value, code in BAZAR_CODES.items()],
+            default=Value(BAZAR_CODES['SRIDEVI_OPEN']),
+        ),
+        bet_type_code=Case(
+            *[When(bet_type=value, then=Value(code)) for value, code in BET_TYPE_CODES.items()],
+            default=Value(BET_TYPE_CODES['SINGLE']),
+        ),
+    )
+
+
+def decode_columns(apps, schema_editor):
+    Bet = apps.get_model('userbaseapp', 'Bet')
+    Bet.objects.update(
+        number=Case(
+            When(
+                number_code__gte=BARE_NUMBER_OFFSET,
+                then=Cast(F('number_code') - BARE_NUMBER_OFFSET, CharField(max_length=10)),
+            ),
+            default=LPad(Cast('number_code', CharField(max_length=10)), 3, Value('0')),
+        ),
+        bazar=Case(
+            *[When(bazar_code=code, then=Value(value)) for value, code in BAZAR_CODES.items()],
+        ),
+        bet_type=Case(
+            *[When(bet_type_code=code, then=Value(value)) for value, code in BET_TYPE_CODES.items()],
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('userbaseapp', '0016_add_cm1_to_cm8_bazars'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='bet',
+            name='userbaseapp_user_id_153865_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='bet',
+            name='userbaseapp_user_id_795fb8_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='bet',
+            name='userbaseapp_bet_typ_1570ad_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='bet',
+            name='userbaseapp_family__f036ad_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='bet',
+            name='userbaseapp_user_id_d02a25_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='bet',
+            name='userbaseapp_bazar_b00a72_idx',
+        ),
+        migrations.AddField(
+            model_name='bet',
+            name='number_code',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='bet',
+            name='bazar_code',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='bet',
+            name='bet_type_code',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.RunPython(encode_columns, decode_columns),
+        # Give the old column a default so the RemoveField below can be reversed
+        migrations.AlterField(
+            model_name='bet',
+            name='number',
+            field=models.CharField(db_index=True, default='', max_length=10),
+        ),
+        migrations.RemoveField(
+            model_name='bet',
+            name='number',
+        ),
+        migrations.RemoveField(
+            model_name='bet',
+            name='bazar',
+        ),
+        migrations.RemoveField(
+            model_name='bet',
+            name='bet_type',
+        ),
+        migrations.RenameField(
+            model_name='bet',
+            old_name='number_code',
+            new_name='number',
+        ),
+        migrations.RenameField(
+            model_name='bet',
+            old_name='bazar_code',
+            new_name='bazar',
+        ),
+        migrations.RenameField(
+            model_name='bet',
+            old_name='bet_type_code',
+            new_name='bet_type',
+        ),
+        migrations.AlterField(
+            model_name='bet',
+            name='number',
+            field=userbaseapp.fields.BetNumberField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='bet',
+            name='bazar',
+            field=userbaseapp.fields.CodedChoiceField(choices=[('SRIDEVI_OPEN', 'Sridevi Open'), ('SRIDEVI_CLOSED', 'Sridevi Closed'), ('TIME_OPEN', 'Time Open'), ('TIME_CLOSED', 'Time Closed'), ('DIVAS_MILAN_OPEN', 'Divas Milan Open'), ('DIVAS_MILAN_CLOSED', 'Divas Milan Closed'), ('KALYAN_OPEN', 'Kalyan Open'), ('KALYAN_CLOSED', 'Kalyan Closed'), ('NIGHT_MILAN_OPEN', 'Night Milan Open'), ('NIGHT_MILAN_CLOSED', 'Night Milan Closed'), ('MAIN_BAZAR', 'Main Bazar'), ('MAIN_BAZAR_CLOSED', 'Main Bazar Closed'), ('CM_1', 'CM-1'), ('CM_2', 'CM-2'), ('CM_3', 'CM-3'), ('CM_4', 'CM-4'), ('CM_5', 'CM-5'), ('CM_6', 'CM-6'), ('CM_7', 'CM-7'), ('CM_8', 'CM-8'), ('CM_9', 'CM-9'), ('CM_10', 'CM-10'), ('CM_11', 'CM-11'), ('CM_12', 'CM-12')], codes={'CM_1': 13, 'CM_10': 22, 'CM_11': 23, 'CM_12': 24, 'CM_2': 14, 'CM_3': 15, 'CM_4': 16, 'CM_5': 17, 'CM_6': 18, 'CM_7': 19, 'CM_8': 20, 'CM_9': 21, 'DIVAS_MILAN_CLOSED': 6, 'DIVAS_MILAN_OPEN': 5, 'KALYAN_CLOSED': 8, 'KALYAN_OPEN': 7, 'MAIN_BAZAR': 11, 'MAIN_BAZAR_CLOSED': 12, 'NIGHT_MILAN_CLOSED': 10, 'NIGHT_MILAN_OPEN': 9, 'SRIDEVI_CLOSED': 2, 'SRIDEVI_OPEN': 1, 'TIME_CLOSED': 4, 'TIME_OPEN': 3}, db_index=True, default='SRIDEVI_OPEN'),
+        ),
+        migrations.AlterField(
+            model_name='bet',
+            name='bet_type',
+            field=userbaseapp.fields.CodedChoiceField(choices=[('SINGLE', 'Single Bet'), ('SP', 'All SP'), ('DP', 'All DP'), ('JODI', 'Jodi Vagar'), ('DADAR', 'Dadar'), ('EKI', 'Eki'), ('BEKI', 'Beki'), ('ABR_CUT', 'ABR Cut'), ('JODI_PANEL', 'Jodi Panel'), ('MOTAR', 'Motar'), ('COMMAN_PANA_36', 'Comman Pana 36'), ('COMMAN_PANA_56', 'Comman Pana 56'), ('SET_PANA', 'Set Pana'), ('COLUMN', 'Column Bet'), ('GROUP', 'Group Bet')], codes={'ABR_CUT': 8, 'BEKI': 7, 'COLUMN': 14, 'COMMAN_PANA_36': 11, 'COMMAN_PANA_56': 12, 'DADAR': 5, 'DP': 3, 'EKI': 6, 'GROUP': 15, 'JODI': 4, 'JODI_PANEL': 9, 'MOTAR': 10, 'SET_PANA': 13, 'SINGLE': 1, 'SP': 2}, db_index=True, default='SINGLE'),
+        ),
+        migrations.AddIndex(
+            model_name='bet',
+            index=models.Index(fields=['user', 'number'], name='userbaseapp_user_id_153865_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bet',
+            index=models.Index(fields=['user', 'bet_type'], name='userbaseapp_user_id_795fb8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bet',
+            index=models.Index(fields=['bet_type', 'column_number'], name='userbaseapp_bet_typ_1570ad_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bet',
+            index=models.Index(fields=['family_group', 'bet_type'], name='userbaseapp_family__f036ad_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bet',
+            index=models.Index(fields=['user', 'bazar', 'bet_date'], name='userbaseapp_user_id_d02a25_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bet',
+            index=models.Index(fields=['bazar', 'bet_date'], name='userbaseapp_bazar_b00a72_idx'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Store Bet.amount as integer paise (see PaiseAmountField in userbaseapp/fields.py)
+#
+# The decimal column is replaced by a bigint column holding amount * 100 (the
+# largest amount, 99,999,999.99, overflows a 32-bit integer); the data is
+# converted with one UPDATE in each direction.
+
+from django.db import migrations, models
+from django.db.models import BigIntegerField, F, FloatField
+from django.db.models.functions import Cast, Round
+
+import userbaseapp.fields
+
+
+def amount_to_paise(apps, schema_editor):
+    Bet = apps.get_model('userbaseapp', 'Bet')
+    # ROUND first: on SQLite decimals are floats, e.g. 0.29 * 100 = 28.999...
+    Bet.objects.update(
+        amount_paise=Cast(Round(F('amount') * 100), BigIntegerField()),
+    )
+
+
+def paise_to_amount(apps, schema_editor):
+    Bet = apps.get_model('userbaseapp', 'Bet')
+    # Divide as floats (SQLite would do integer division) and round back to paise
+    Bet.objects.update(
+        amount=Round(Cast(F('amount_paise'), FloatField()) / 100, 2),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('userbaseapp', '0017_compact_bet_encoding'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bet',
+            name='amount_paise',
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.RunPython(amount_to_paise, paise_to_amount),
+        # Give the old column a default so the RemoveField below can be reversed
+        migrations.AlterField(
+            model_name='bet',
+            name='amount',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.RemoveField(
+            model_name='bet',
+            name='amount',
+        ),
+        migrations.RenameField(
+            model_name='bet',
+            old_name='amount_paise',
+            new_name='amount',
+        ),
+        migrations.AlterField(
+            model_name='bet',
+            name='amount',
+            field=userbaseapp.fields.PaiseAmountField(),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 19:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('userbaseapp', '0018_bet_amount_paise'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bulkbetaction',
+            name='number_set',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
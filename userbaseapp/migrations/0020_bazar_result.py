@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-19 19:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('userbaseapp', '0019_bulk_action_number_set'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BazarResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bazar', models.CharField(choices=[('SRIDEVI_OPEN', 'Sridevi Open'), ('SRIDEVI_CLOSED', 'Sridevi Closed'), ('TIME_OPEN', 'Time Open'), ('TIME_CLOSED', 'Time Closed'), ('DIVAS_MILAN_OPEN', 'Divas Milan Open'), ('DIVAS_MILAN_CLOSED', 'Divas Milan Closed'), ('KALYAN_OPEN', 'Kalyan Open'), ('KALYAN_CLOSED', 'Kalyan Closed'), ('NIGHT_MILAN_OPEN', 'Night Milan Open'), ('NIGHT_MILAN_CLOSED', 'Night Milan Closed'), ('MAIN_BAZAR', 'Main Bazar'), ('MAIN_BAZAR_CLOSED', 'Main Bazar Closed'), ('CM_1', 'CM-1'), ('CM_2', 'CM-2'), ('CM_3', 'CM-3'), ('CM_4', 'CM-4'), ('CM_5', 'CM-5'), ('CM_6', 'CM-6'), ('CM_7', 'CM-7'), ('CM_8', 'CM-8'), ('CM_9', 'CM-9'), ('CM_10', 'CM-10'), ('CM_11', 'CM-11'), ('CM_12', 'CM-12')], db_index=True, max_length=30)),
+                ('result_date', models.DateField(db_index=True)),
+                ('pana', models.CharField(max_length=3)),
+                ('total_bets', models.IntegerField(default=0)),
+                ('winning_bets', models.IntegerField(default=0)),
+                ('total_stake', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_payout', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('declared_at', models.DateTimeField(auto_now=True)),
+                ('declared_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='declared_results', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Bazar Result',
+                'verbose_name_plural': 'Bazar Results',
+                'ordering': ['-result_date', 'bazar'],
+                'constraints': [models.UniqueConstraint(fields=('bazar', 'result_date'), name='unique_bazar_result')],
+            },
+        ),
+    ]
@@ -0,0 +1,79 @@
+# House exposure table (see userbaseapp/exposure.py), filled from the
+# existing live bets and active compact bulk actions
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Mod
+
+import userbaseapp.fields
+
+
+def fill_exposure(apps, schema_editor):
+    Bet = apps.get_model('userbaseapp', 'Bet')
+    BulkBetAction = apps.get_model('userbaseapp', 'BulkBetAction')
+    BookExposure = apps.get_model('userbaseapp', 'BookExposure')
+
+    totals = defaultdict(lambda: [0, 0])
+    rows = (
+        Bet.objects.filter(is_deleted=False)
+        .order_by()
+        .annotate(shard=Mod('user_id', settings.EXPOSURE_SHARDS))
+        .values('bazar', 'bet_date', 'bet_type', 'number', 'shard')
+        .annotate(stake=userbaseapp.fields.PaiseSum('amount'), bets=Count('id'))
+    )
+    for row in rows:
+        key = (row['bazar'], row['bet_date'], row['bet_type'], row['number'], row['shard'])
+        totals[key][0] += row['stake']
+        totals[key][1] += row['bets']
+
+    compact_actions = BulkBetAction.objects.filter(is_undone=False, number_set__isnull=False)
+    for action in compact_actions.iterator():
+        amount_paise = userbaseapp.fields.rupees_to_paise(action.amount)
+        shard = action.user_id % settings.EXPOSURE_SHARDS
+        for number in userbaseapp.fields.unpack_number_set(action.number_set):
+            key = (action.bazar, action.action_date, action.action_type, number, shard)
+            totals[key][0] += amount_paise
+            totals[key][1] += 1
+
+    BookExposure.objects.bulk_create(
+        (
+            BookExposure(
+                bazar=bazar, bet_date=bet_date, bet_type=bet_type, number=number,
+                shard=shard, stake=stake, bets=bets,
+            )
+            for (bazar, bet_date, bet_type, number, shard), (stake, bets) in totals.items()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('userbaseapp', '0020_bazar_result'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookExposure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bazar', userbaseapp.fields.CodedChoiceField(choices=[('SRIDEVI_OPEN', 'Sridevi Open'), ('SRIDEVI_CLOSED', 'Sridevi Closed'), ('TIME_OPEN', 'Time Open'), ('TIME_CLOSED', 'Time Closed'), ('DIVAS_MILAN_OPEN', 'Divas Milan Open'), ('DIVAS_MILAN_CLOSED', 'Divas Milan Closed'), ('KALYAN_OPEN', 'Kalyan Open'), ('KALYAN_CLOSED', 'Kalyan Closed'), ('NIGHT_MILAN_OPEN', 'Night Milan Open'), ('NIGHT_MILAN_CLOSED', 'Night Milan Closed'), ('MAIN_BAZAR', 'Main Bazar'), ('MAIN_BAZAR_CLOSED', 'Main Bazar Closed'), ('CM_1', 'CM-1'), ('CM_2', 'CM-2'), ('CM_3', 'CM-3'), ('CM_4', 'CM-4'), ('CM_5', 'CM-5'), ('CM_6', 'CM-6'), ('CM_7', 'CM-7'), ('CM_8', 'CM-8'), ('CM_9', 'CM-9'), ('CM_10', 'CM-10'), ('CM_11', 'CM-11'), ('CM_12', 'CM-12')], codes={'CM_1': 13, 'CM_10': 22, 'CM_11': 23, 'CM_12': 24, 'CM_2': 14, 'CM_3': 15, 'CM_4': 16, 'CM_5': 17, 'CM_6': 18, 'CM_7': 19, 'CM_8': 20, 'CM_9': 21, 'DIVAS_MILAN_CLOSED': 6, 'DIVAS_MILAN_OPEN': 5, 'KALYAN_CLOSED': 8, 'KALYAN_OPEN': 7, 'MAIN_BAZAR': 11, 'MAIN_BAZAR_CLOSED': 12, 'NIGHT_MILAN_CLOSED': 10, 'NIGHT_MILAN_OPEN': 9, 'SRIDEVI_CLOSED': 2, 'SRIDEVI_OPEN': 1, 'TIME_CLOSED': 4, 'TIME_OPEN': 3})),
+                ('bet_date', models.DateField()),
+                ('bet_type', userbaseapp.fields.CodedChoiceField(choices=[('SINGLE', 'Single Bet'), ('SP', 'All SP'), ('DP', 'All DP'), ('JODI', 'Jodi Vagar'), ('DADAR', 'Dadar'), ('EKI', 'Eki'), ('BEKI', 'Beki'), ('ABR_CUT', 'ABR Cut'), ('JODI_PANEL', 'Jodi Panel'), ('MOTAR', 'Motar'), ('COMMAN_PANA_36', 'Comman Pana 36'), ('COMMAN_PANA_56', 'Comman Pana 56'), ('SET_PANA', 'Set Pana'), ('COLUMN', 'Column Bet'), ('GROUP', 'Group Bet')], codes={'ABR_CUT': 8, 'BEKI': 7, 'COLUMN': 14, 'COMMAN_PANA_36': 11, 'COMMAN_PANA_56': 12, 'DADAR': 5, 'DP': 3, 'EKI': 6, 'GROUP': 15, 'JODI': 4, 'JODI_PANEL': 9, 'MOTAR': 10, 'SET_PANA': 13, 'SINGLE': 1, 'SP': 2})),
+                ('number', userbaseapp.fields.BetNumberField()),
+                ('shard', models.PositiveSmallIntegerField(default=0)),
+                ('stake', models.BigIntegerField(default=0)),
+                ('bets', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Book Exposure',
+                'verbose_name_plural': 'Book Exposure',
+                'constraints': [models.UniqueConstraint(fields=('bazar', 'bet_date', 'bet_type', 'number', 'shard'), name='unique_book_exposure')],
+            },
+        ),
+        migrations.RunPython(fill_exposure, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-19 19:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('userbaseapp', '0021_book_exposure'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bazar', models.CharField(choices=[('SRIDEVI_OPEN', 'Sridevi Open'), ('SRIDEVI_CLOSED', 'Sridevi Closed'), ('TIME_OPEN', 'Time Open'), ('TIME_CLOSED', 'Time Closed'), ('DIVAS_MILAN_OPEN', 'Divas Milan Open'), ('DIVAS_MILAN_CLOSED', 'Divas Milan Closed'), ('KALYAN_OPEN', 'Kalyan Open'), ('KALYAN_CLOSED', 'Kalyan Closed'), ('NIGHT_MILAN_OPEN', 'Night Milan Open'), ('NIGHT_MILAN_CLOSED', 'Night Milan Closed'), ('MAIN_BAZAR', 'Main Bazar'), ('MAIN_BAZAR_CLOSED', 'Main Bazar Closed'), ('CM_1', 'CM-1'), ('CM_2', 'CM-2'), ('CM_3', 'CM-3'), ('CM_4', 'CM-4'), ('CM_5', 'CM-5'), ('CM_6', 'CM-6'), ('CM_7', 'CM-7'), ('CM_8', 'CM-8'), ('CM_9', 'CM-9'), ('CM_10', 'CM-10'), ('CM_11', 'CM-11'), ('CM_12', 'CM-12')], max_length=30)),
+                ('bet_date', models.DateField()),
+                ('data', models.JSONField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='book_snapshots', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Book Snapshot',
+                'verbose_name_plural': 'Book Snapshots',
+                'indexes': [models.Index(fields=['bazar', 'bet_date'], name='book_snapshot_bazar_date')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'bazar', 'bet_date'), name='unique_book_snapshot')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ClosedBook',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bazar', models.CharField(choices=[('SRIDEVI_OPEN', 'Sridevi Open'), ('SRIDEVI_CLOSED', 'Sridevi Closed'), ('TIME_OPEN', 'Time Open'), ('TIME_CLOSED', 'Time Closed'), ('DIVAS_MILAN_OPEN', 'Divas Milan Open'), ('DIVAS_MILAN_CLOSED', 'Divas Milan Closed'), ('KALYAN_OPEN', 'Kalyan Open'), ('KALYAN_CLOSED', 'Kalyan Closed'), ('NIGHT_MILAN_OPEN', 'Night Milan Open'), ('NIGHT_MILAN_CLOSED', 'Night Milan Closed'), ('MAIN_BAZAR', 'Main Bazar'), ('MAIN_BAZAR_CLOSED', 'Main Bazar Closed'), ('CM_1', 'CM-1'), ('CM_2', 'CM-2'), ('CM_3', 'CM-3'), ('CM_4', 'CM-4'), ('CM_5', 'CM-5'), ('CM_6', 'CM-6'), ('CM_7', 'CM-7'), ('CM_8', 'CM-8'), ('CM_9', 'CM-9'), ('CM_10', 'CM-10'), ('CM_11', 'CM-11'), ('CM_12', 'CM-12')], db_index=True, max_length=30)),
+                ('bet_date', models.DateField(db_index=True)),
+                ('blocks_placements', models.BooleanField(default=True)),
+                ('closed_at', models.DateTimeField(auto_now=True)),
+                ('closed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='closed_books', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Closed Book',
+                'verbose_name_plural': 'Closed Books',
+                'ordering': ['-bet_date', 'bazar'],
+                'constraints': [models.UniqueConstraint(fields=('bazar', 'bet_date'), name='unique_closed_book')],
+            },
+        ),
+    ]
@@ -0,0 +1,160 @@
+# Bet event log and its projections (see userbaseapp/events.py). Every
+# existing book starts with one PLACED event holding its live bets and active
+# compact bulk actions, and projections matching it
+
+from collections import defaultdict
+
+import django.db.models.deletion
+import userbaseapp.fields
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_event_log(apps, schema_editor):
+    Bet = apps.get_model('userbaseapp', 'Bet')
+    BulkBetAction = apps.get_model('userbaseapp', 'BulkBetAction')
+    BetEvent = apps.get_model('userbaseapp', 'BetEvent')
+    BookSummary = apps.get_model('userbaseapp', 'BookSummary')
+    BookNumberTotal = apps.get_model('userbaseapp', 'BookNumberTotal')
+    BookColumnTotal = apps.get_model('userbaseapp', 'BookColumnTotal')
+
+    # {(user_id, bazar, bet_date): {(bet_type, number, column): [stake, bets]}}
+    books = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+    rows = (
+        Bet.objects.filter(is_deleted=False)
+        .order_by()
+        .values('user_id', 'bazar', 'bet_date', 'bet_type', 'number', 'column_number')
+        .annotate(stake=userbaseapp.fields.PaiseSum('amount'), bets=Count('id'))
+    )
+    for row in rows:
+        delta = books[(row['user_id'], row['bazar'], row['bet_date'])][
+            (row['bet_type'], row['number'], row['column_number'])
+        ]
+        delta[0] += row['stake']
+        delta[1] += row['bets']
+
+    compact_actions = BulkBetAction.objects.filter(is_undone=False, number_set__isnull=False)
+    for action in compact_actions.iterator():
+        amount_paise = userbaseapp.fields.rupees_to_paise(action.amount)
+        for number in userbaseapp.fields.unpack_number_set(action.number_set):
+            delta = books[(action.user_id, action.bazar, action.action_date)][(action.action_type, number, None)]
+            delta[0] += amount_paise
+            delta[1] += 1
+
+    events, summaries, number_totals, column_totals = [], [], [], []
+    for (user_id, bazar, bet_date), deltas in books.items():
+        book = {'user_id': user_id, 'bazar': bazar, 'bet_date': bet_date}
+        events.append(BetEvent(
+            **book, seq=1, kind='PLACED',
+            entries=[[*entry, stake, bets] for entry, (stake, bets) in deltas.items()],
+        ))
+        by_number = defaultdict(lambda: [0, 0])
+        by_column = defaultdict(lambda: [0, 0])
+        for (bet_type, number, column), (stake, bets) in deltas.items():
+            by_number[number][0] += stake
+            by_number[number][1] += bets
+            if bet_type == 'COLUMN' and column is not None:
+                by_column[column][0] += stake
+                by_column[column][1] += bets
+        summaries.append(BookSummary(
+            **book, last_seq=1,
+            stake=sum(stake for stake, bets in deltas.values()),
+            bets=sum(bets for stake, bets in deltas.values()),
+        ))
+        number_totals.extend(
+            BookNumberTotal(**book, number=number, stake=stake, bets=bets)
+            for number, (stake, bets) in by_number.items()
+        )
+        column_totals.extend(
+            BookColumnTotal(**book, column=column, stake=stake, bets=bets)
+            for column, (stake, bets) in by_column.items()
+        )
+
+    for model, objs in (
+        (BetEvent, events), (BookSummary, summaries),
+        (BookNumberTotal, number_totals), (BookColumnTotal, column_totals),
+    ):
+        model.objects.bulk_create(objs, batch_size=1000)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('userbaseapp', '0022_closed_book'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BetEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bazar', models.CharField(choices=[('SRIDEVI_OPEN', 'Sridevi Open'), ('SRIDEVI_CLOSED', 'Sridevi Closed'), ('TIME_OPEN', 'Time Open'), ('TIME_CLOSED', 'Time Closed'), ('DIVAS_MILAN_OPEN', 'Divas Milan Open'), ('DIVAS_MILAN_CLOSED', 'Divas Milan Closed'), ('KALYAN_OPEN', 'Kalyan Open'), ('KALYAN_CLOSED', 'Kalyan Closed'), ('NIGHT_MILAN_OPEN', 'Night Milan Open'), ('NIGHT_MILAN_CLOSED', 'Night Milan Closed'), ('MAIN_BAZAR', 'Main Bazar'), ('MAIN_BAZAR_CLOSED', 'Main Bazar Closed'), ('CM_1', 'CM-1'), ('CM_2', 'CM-2'), ('CM_3', 'CM-3'), ('CM_4', 'CM-4'), ('CM_5', 'CM-5'), ('CM_6', 'CM-6'), ('CM_7', 'CM-7'), ('CM_8', 'CM-8'), ('CM_9', 'CM-9'), ('CM_10', 'CM-10'), ('CM_11', 'CM-11'), ('CM_12', 'CM-12')], max_length=30)),
+                ('bet_date', models.DateField()),
+                ('seq', models.PositiveIntegerField()),
+                ('kind', models.CharField(choices=[('PLACED', 'Placed'), ('DELETED', 'Deleted'), ('UNDONE', 'Undone'), ('WIPED', 'Wiped')], max_length=10)),
+                ('entries', models.JSONField(default=list)),
+                ('bulk_action_id', models.BigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bet_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Bet Event',
+                'verbose_name_plural': 'Bet Events',
+                'ordering': ['user', 'bazar', 'bet_date', 'seq'],
+                'indexes': [models.Index(fields=['bazar', 'bet_date'], name='bet_event_bazar_date')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'bazar', 'bet_date', 'seq'), name='unique_bet_event')],
+            },
+        ),
+        migrations.CreateModel(
+            name='BookColumnTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bazar', models.CharField(choices=[('SRIDEVI_OPEN', 'Sridevi Open'), ('SRIDEVI_CLOSED', 'Sridevi Closed'), ('TIME_OPEN', 'Time Open'), ('TIME_CLOSED', 'Time Closed'), ('DIVAS_MILAN_OPEN', 'Divas Milan Open'), ('DIVAS_MILAN_CLOSED', 'Divas Milan Closed'), ('KALYAN_OPEN', 'Kalyan Open'), ('KALYAN_CLOSED', 'Kalyan Closed'), ('NIGHT_MILAN_OPEN', 'Night Milan Open'), ('NIGHT_MILAN_CLOSED', 'Night Milan Closed'), ('MAIN_BAZAR', 'Main Bazar'), ('MAIN_BAZAR_CLOSED', 'Main Bazar Closed'), ('CM_1', 'CM-1'), ('CM_2', 'CM-2'), ('CM_3', 'CM-3'), ('CM_4', 'CM-4'), ('CM_5', 'CM-5'), ('CM_6', 'CM-6'), ('CM_7', 'CM-7'), ('CM_8', 'CM-8'), ('CM_9', 'CM-9'), ('CM_10', 'CM-10'), ('CM_11', 'CM-11'), ('CM_12', 'CM-12')], max_length=30)),
+                ('bet_date', models.DateField()),
+                ('column', models.IntegerField()),
+                ('stake', models.BigIntegerField(default=0)),
+                ('bets', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='book_column_totals', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Book Column Total',
+                'verbose_name_plural': 'Book Column Totals',
+                'constraints': [models.UniqueConstraint(fields=('user', 'bazar', 'bet_date', 'column'), name='unique_book_column_total')],
+            },
+        ),
+        migrations.CreateModel(
+            name='BookNumberTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bazar', models.CharField(choices=[('SRIDEVI_OPEN', 'Sridevi Open'), ('SRIDEVI_CLOSED', 'Sridevi Closed'), ('TIME_OPEN', 'Time Open'), ('TIME_CLOSED', 'Time Closed'), ('DIVAS_MILAN_OPEN', 'Divas Milan Open'), ('DIVAS_MILAN_CLOSED', 'Divas Milan Closed'), ('KALYAN_OPEN', 'Kalyan Open'), ('KALYAN_CLOSED', 'Kalyan Closed'), ('NIGHT_MILAN_OPEN', 'Night Milan Open'), ('NIGHT_MILAN_CLOSED', 'Night Milan Closed'), ('MAIN_BAZAR', 'Main Bazar'), ('MAIN_BAZAR_CLOSED', 'Main Bazar Closed'), ('CM_1', 'CM-1'), ('CM_2', 'CM-2'), ('CM_3', 'CM-3'), ('CM_4', 'CM-4'), ('CM_5', 'CM-5'), ('CM_6', 'CM-6'), ('CM_7', 'CM-7'), ('CM_8', 'CM-8'), ('CM_9', 'CM-9'), ('CM_10', 'CM-10'), ('CM_11', 'CM-11'), ('CM_12', 'CM-12')], max_length=30)),
+                ('bet_date', models.DateField()),
+                ('number', userbaseapp.fields.BetNumberField()),
+                ('stake', models.BigIntegerField(default=0)),
+                ('bets', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='book_number_totals', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Book Number Total',
+                'verbose_name_plural': 'Book Number Totals',
+                'constraints': [models.UniqueConstraint(fields=('user', 'bazar', 'bet_date', 'number'), name='unique_book_number_total')],
+            },
+        ),
+        migrations.CreateModel(
+            name='BookSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bazar', models.CharField(choices=[('SRIDEVI_OPEN', 'Sridevi Open'), ('SRIDEVI_CLOSED', 'Sridevi Closed'), ('TIME_OPEN', 'Time Open'), ('TIME_CLOSED', 'Time Closed'), ('DIVAS_MILAN_OPEN', 'Divas Milan Open'), ('DIVAS_MILAN_CLOSED', 'Divas Milan Closed'), ('KALYAN_OPEN', 'Kalyan Open'), ('KALYAN_CLOSED', 'Kalyan Closed'), ('NIGHT_MILAN_OPEN', 'Night Milan Open'), ('NIGHT_MILAN_CLOSED', 'Night Milan Closed'), ('MAIN_BAZAR', 'Main Bazar'), ('MAIN_BAZAR_CLOSED', 'Main Bazar Closed'), ('CM_1', 'CM-1'), ('CM_2', 'CM-2'), ('CM_3', 'CM-3'), ('CM_4', 'CM-4'), ('CM_5', 'CM-5'), ('CM_6', 'CM-6'), ('CM_7', 'CM-7'), ('CM_8', 'CM-8'), ('CM_9', 'CM-9'), ('CM_10', 'CM-10'), ('CM_11', 'CM-11'), ('CM_12', 'CM-12')], max_length=30)),
+                ('bet_date', models.DateField()),
+                ('last_seq', models.PositiveIntegerField(default=0)),
+                ('stake', models.BigIntegerField(default=0)),
+                ('bets', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='book_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Book Summary',
+                'verbose_name_plural': 'Book Summaries',
+                'constraints': [models.UniqueConstraint(fields=('user', 'bazar', 'bet_date'), name='unique_book_summary')],
+            },
+        ),
+        migrations.RunPython(fill_event_log, migrations.RunPython.noop),
+    ]
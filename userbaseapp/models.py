@@ -1,9 +1,17 @@
 # userbaseapp/models.py
+from collections import namedtuple
+
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
+from .book_cache import invalidate_book, invalidate_books_for_queryset
+from .fields import (
+    BetNumberField, CodedChoiceField, PaiseAmountField, encode_bet_number,
+    discard_from_number_set, number_set_size, rupees_to_paise, unpack_number_set,
+)
+
 
 class CustomUser(AbstractUser):
     """Custom user model"""
@@ -71,15 +79,20 @@ class Bet(models.Model):
         ('CM_12', 'CM-12'),
     ]
     
+    # Stored smallint codes for bazar and bet_type. Codes are persisted:
+    # only ever append to the choices above, never reorder or remove
+    BAZAR_CODES = {value: code for code, (value, label) in enumerate(BAZAR_CHOICES, start=1)}
+    BET_TYPE_CODES = {value: code for code, (value, label) in enumerate(BET_TYPE_CHOICES, start=1)}
+    
     # Core fields
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='bets', db_index=True)
-    number = models.CharField(max_length=10, db_index=True)  # "000", "999", "137", etc.
-    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    number = BetNumberField(db_index=True)  # "000", "999", "137", etc. (or a bare column number "1"-"10")
+    amount = PaiseAmountField()  # Stored as integer paise, read as a 2-place Decimal
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     # Bazar and Date
-    bazar = models.CharField(max_length=30, choices=BAZAR_CHOICES, default='SRIDEVI_OPEN', db_index=True)
+    bazar = CodedChoiceField(choices=BAZAR_CHOICES, codes=BAZAR_CODES, default='SRIDEVI_OPEN', db_index=True)
     bet_date = models.DateField(default=timezone.now, db_index=True)  # Date of bet placement
     
     # Bulk action tracking
@@ -92,7 +105,7 @@ class Bet(models.Model):
     )
     
     # Bet type and classification
-    bet_type = models.CharField(max_length=20, choices=BET_TYPE_CHOICES, default='SINGLE', db_index=True)
+    bet_type = CodedChoiceField(choices=BET_TYPE_CHOICES, codes=BET_TYPE_CODES, default='SINGLE', db_index=True)
     column_number = models.IntegerField(null=True, blank=True, db_index=True)  # Column 1-10 for applicable bet types
     sub_type = models.CharField(max_length=20, null=True, blank=True)  # For storing jodi_type (5,7,12) or panel_type (6,7)
     
@@ -136,6 +149,19 @@ class Bet(models.Model):
     def __str__(self):
         return f"{self.user.username} bet ₹{self.amount} on {self.number} ({self.bet_type}) - {self.status}"
     
+    @property
+    def number_code(self):
+        """Stored integer form of number (0-999 for three-digit numbers)"""
+        return encode_bet_number(self.number)
+
+    @property
+    def bazar_code(self):
+        return self.BAZAR_CODES[self.bazar]
+
+    @property
+    def bet_type_code(self):
+        return self.BET_TYPE_CODES[self.bet_type]
+
     def soft_delete(self, deleted_by_user):
         """Soft delete the bet"""
         self.is_deleted = True
@@ -145,8 +171,22 @@ class Bet(models.Model):
         self.save()
 
 
+# A bet of a compact bulk action, expanded from its number set. Has the
+# attributes the book read helpers use on Bet rows.
+VirtualBet = namedtuple(
+    'VirtualBet',
+    'id number amount_paise created_at bet_type column_number sub_type bulk_action_id',
+)
+
+
 class BulkBetAction(models.Model):
     """Track bulk betting operations for undo functionality"""
+    # Action types whose bets can be stored as a number set (see number_set):
+    # one bet of `amount` per number, with no column or sub type
+    COMPACT_ACTION_TYPES = {
+        'SP', 'DP', 'MOTAR', 'COMMAN_PANA_36', 'COMMAN_PANA_56', 'SET_PANA', 'GROUP',
+    }
+
     ACTION_TYPES = [
         ('SP', 'All SP'),
         ('DP', 'All DP'),
@@ -221,6 +261,10 @@ class BulkBetAction(models.Model):
     input_data = models.CharField(max_length=100, null=True, blank=True)  # Store original input
     search_digit = models.IntegerField(null=True, blank=True)  # Digit for Common Pana
     
+    # Compact storage: bitmap of the numbers bet on (fields.pack_number_set),
+    # with no Bet rows. Null when the action's bets are rows.
+    number_set = models.BinaryField(null=True, blank=True)
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -253,16 +297,395 @@ class BulkBetAction(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.action_type} - ₹{self.amount} ({self.total_bets} bets) - {self.status}"
 
+    @property
+    def is_compact(self):
+        return self.number_set is not None
+
+    @property
+    def numbers(self):
+        """Numbers of a compact action"""
+        return unpack_number_set(self.number_set) if self.is_compact else []
+
+    def virtual_bet_id(self, number):
+        """
+        Id of one of this action's virtual bets. Negative, so it never clashes
+        with a Bet id, and encodes both the action and the number.
+        """
+        return -(self.id * 1000 + int(number))
+
+    @staticmethod
+    def split_virtual_bet_id(bet_id):
+        """Virtual bet id -> (action id, number)"""
+        action_id, code = divmod(-int(bet_id), 1000)
+        return action_id, f'{code:03d}'
+
+    def virtual_bets(self):
+        """Expand a compact action into its bets, in number order"""
+        amount_paise = rupees_to_paise(self.amount)
+        return [
+            VirtualBet(
+                self.virtual_bet_id(number), number, amount_paise, self.created_at,
+                self.action_type, None, None, self.id,
+            )
+            for number in self.numbers
+        ]
+
+    def bet_count(self):
+        if self.is_compact:
+            return number_set_size(self.number_set)
+        return self.bets.count()
+
+    @staticmethod
+    def compact_bet_count(actions):
+        """Number of virtual bets of the active compact actions in `actions`"""
+        return actions.filter(is_undone=False, number_set__isnull=False).aggregate(
+            count=models.Sum('total_bets')
+        )['count'] or 0
+
+    def discard_number(self, number):
+        """
+        Remove one number's virtual bet from a compact action. Returns False
+        when the number is not (or no longer) in the action's number set.
+        """
+        with transaction.atomic():
+            # Re-read under a lock so concurrent deletes don't overwrite each other
+            self.number_set = BulkBetAction.objects.select_for_update().values_list(
+                'number_set', flat=True
+            ).get(pk=self.pk)
+            if self.number_set is None or number not in self.numbers:
+                return False
+
+            from .events import log_removed_compact_number
+            from .exposure import remove_compact_number
+            remove_compact_number(self, number)
+            log_removed_compact_number(self, number)
+            invalidate_book(self.user_id, self.bazar, self.action_date)
+            self.number_set = discard_from_number_set(self.number_set, number)
+            self.total_bets = number_set_size(self.number_set)
+            self.save(update_fields=['number_set', 'total_bets', 'updated_at'])
+        return True
+
+    def materialize(self):
+        """
+        Turn a compact action into ordinary Bet rows, e.g. before editing its
+        bets one by one. Returns the number of rows created.
+        """
+        if not self.is_compact or self.is_undone:
+            return 0
+
+        with transaction.atomic():
+            invalidate_book(self.user_id, self.bazar, self.action_date)
+            bets = Bet.objects.bulk_create(
+                Bet(
+                    user_id=self.user_id,
+                    number=number,
+                    amount=self.amount,
+                    bulk_action=self,
+                    bet_type=self.action_type,
+                    bazar=self.bazar,
+                    bet_date=self.action_date,
+                )
+                for number in self.numbers
+            )
+            # Keep the placement time rather than the materialization time
+            self.bets.update(created_at=self.created_at)
+            self.number_set = None
+            self.save(update_fields=['number_set', 'updated_at'])
+        return len(bets)
+
     def undo(self, undone_by_user=None):
         """Undo this bulk action by deleting all associated bets"""
         if self.is_undone:
             return False, "Already undone"
         
-        deleted_count = self.bets.all().delete()[0]
-        self.is_undone = True
-        self.status = 'UNDONE'
-        self.undone_at = timezone.now()
-        if undone_by_user:
-            self.undone_by = undone_by_user
-        self.save()
+        from .events import log_removed_bets, log_removed_compact_actions
+        from .exposure import remove_bets, remove_compact_actions
+
+        with transaction.atomic():
+            invalidate_book(self.user_id, self.bazar, self.action_date)
+            if self.is_compact:
+                # No rows to delete: the action's number set stops counting once undone
+                deleted_count = number_set_size(self.number_set)
+                remove_compact_actions(BulkBetAction.objects.filter(pk=self.pk))
+                log_removed_compact_actions(BulkBetAction.objects.filter(pk=self.pk), kind='UNDONE')
+            else:
+                remove_bets(self.bets.all())
+                log_removed_bets(self.bets.all(), kind='UNDONE')
+                deleted_count = self.bets.all().delete()[0]
+            self.is_undone = True
+            self.status = 'UNDONE'
+            self.undone_at = timezone.now()
+            if undone_by_user:
+                self.undone_by = undone_by_user
+            self.save()
         return True, f"Undone {deleted_count} bets"
+
+    @classmethod
+    def undo_many(cls, actions, undone_by_user=None):
+        """
+        Undo a set of bulk actions in one transaction.
+
+        Deletes all of their bets with a single DELETE and marks the actions
+        UNDONE with a single UPDATE. Actions that are already undone are
+        skipped. Returns {action_id: deleted bet count} for the undone actions.
+        """
+        from .events import log_removed_bets, log_removed_compact_actions
+        from .exposure import remove_bets, remove_compact_actions
+
+        with transaction.atomic():
+            # Lock the actions so a concurrent undo cannot process them twice
+            action_ids = list(
+                actions.filter(is_undone=False)
+                .select_for_update()
+                .order_by()
+                .values_list('id', flat=True)
+            )
+            if not action_ids:
+                return {}
+
+            pending = cls.objects.filter(id__in=action_ids)
+            bets = Bet.objects.filter(bulk_action_id__in=action_ids)
+
+            bet_counts = dict.fromkeys(action_ids, 0)
+            bet_counts.update(
+                bets.order_by()
+                .values('bulk_action_id')
+                .annotate(count=models.Count('id'))
+                .values_list('bulk_action_id', 'count')
+            )
+            # Compact actions have no rows; count their number sets
+            for action_id, number_set in pending.filter(number_set__isnull=False).values_list('id', 'number_set'):
+                bet_counts[action_id] = number_set_size(number_set)
+
+            invalidate_books_for_queryset(pending, date_field='action_date')
+            remove_bets(bets)
+            remove_compact_actions(pending)
+            log_removed_bets(bets, kind='UNDONE')
+            log_removed_compact_actions(pending, kind='UNDONE')
+            # Bet has no dependent rows or delete signals, so this is one DELETE
+            bets.delete()
+
+            now = timezone.now()
+            pending.update(
+                is_undone=True,
+                status='UNDONE',
+                undone_at=now,
+                undone_by=undone_by_user,
+                updated_at=now,
+            )
+        return bet_counts
+
+
+class BazarResult(models.Model):
+    """Declared result (pana) of one bazar on one date, with its settlement totals"""
+    bazar = models.CharField(max_length=30, choices=Bet.BAZAR_CHOICES, db_index=True)
+    result_date = models.DateField(db_index=True)
+    pana = models.CharField(max_length=3)
+
+    # Settlement totals (see userbaseapp/settlement.py)
+    total_bets = models.IntegerField(default=0)
+    winning_bets = models.IntegerField(default=0)
+    total_stake = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_payout = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    declared_at = models.DateTimeField(auto_now=True)
+    declared_by = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='declared_results')
+
+    class Meta:
+        ordering = ['-result_date', 'bazar']
+        constraints = [
+            models.UniqueConstraint(fields=['bazar', 'result_date'], name='unique_bazar_result'),
+        ]
+        verbose_name = 'Bazar Result'
+        verbose_name_plural = 'Bazar Results'
+
+    def __str__(self):
+        return f"{self.get_bazar_display()} {self.result_date}: {self.pana}"
+
+
+class BookExposure(models.Model):
+    """
+    House exposure: live stake per (bazar, date, bet type, number) across
+    all users, kept up to date by every write path (see userbaseapp/exposure.py).
+
+    Each key is split over EXPOSURE_SHARDS rows by user, so concurrent bets
+    on a hot number lock different rows; reads sum the shards.
+    """
+    bazar = CodedChoiceField(choices=Bet.BAZAR_CHOICES, codes=Bet.BAZAR_CODES)
+    bet_date = models.DateField()
+    bet_type = CodedChoiceField(choices=Bet.BET_TYPE_CHOICES, codes=Bet.BET_TYPE_CODES)
+    number = BetNumberField()
+    shard = models.PositiveSmallIntegerField(default=0)
+
+    stake = models.BigIntegerField(default=0)  # Paise
+    bets = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # Also the index for reading one (bazar, date)
+            models.UniqueConstraint(
+                fields=['bazar', 'bet_date', 'bet_type', 'number', 'shard'],
+                name='unique_book_exposure',
+            ),
+        ]
+        verbose_name = 'Book Exposure'
+        verbose_name_plural = 'Book Exposure'
+
+    def __str__(self):
+        return f"{self.bazar} {self.bet_date} {self.bet_type} {self.number}: {self.stake} paise"
+
+
+class ClosedBook(models.Model):
+    """
+    A bazar closed for one date: its books are read from BookSnapshot rows
+    instead of the bets (see userbaseapp/closing.py)
+    """
+    bazar = models.CharField(max_length=30, choices=Bet.BAZAR_CHOICES, db_index=True)
+    bet_date = models.DateField(db_index=True)
+    blocks_placements = models.BooleanField(default=True)
+
+    closed_at = models.DateTimeField(auto_now=True)
+    closed_by = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='closed_books')
+
+    class Meta:
+        ordering = ['-bet_date', 'bazar']
+        constraints = [
+            models.UniqueConstraint(fields=['bazar', 'bet_date'], name='unique_closed_book'),
+        ]
+        verbose_name = 'Closed Book'
+        verbose_name_plural = 'Closed Books'
+
+    def __str__(self):
+        return f"{self.get_bazar_display()} {self.bet_date} (closed)"
+
+
+class BookSnapshot(models.Model):
+    """Precomputed reads of one user's book of a closed bazar, kept in step with its bets"""
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='book_snapshots')
+    bazar = models.CharField(max_length=30, choices=Bet.BAZAR_CHOICES)
+    bet_date = models.DateField()
+
+    # Totals in paise, by number, column and bet type, plus bulk action summaries
+    data = models.JSONField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            # Also the index for reading one book
+            models.UniqueConstraint(fields=['user', 'bazar', 'bet_date'], name='unique_book_snapshot'),
+        ]
+        indexes = [
+            models.Index(fields=['bazar', 'bet_date'], name='book_snapshot_bazar_date'),
+        ]
+        verbose_name = 'Book Snapshot'
+        verbose_name_plural = 'Book Snapshots'
+
+    def __str__(self):
+        return f"{self.user} {self.bazar} {self.bet_date}"
+
+
+class BetEvent(models.Model):
+    """
+    One change to a user's book, in the append-only bet event log (see
+    userbaseapp/events.py). `seq` numbers the events of each book from 1.
+    """
+    KIND_CHOICES = [
+        ('PLACED', 'Placed'),
+        ('DELETED', 'Deleted'),
+        ('UNDONE', 'Undone'),
+        ('WIPED', 'Wiped'),
+    ]
+
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='bet_events')
+    bazar = models.CharField(max_length=30, choices=Bet.BAZAR_CHOICES)
+    bet_date = models.DateField()
+    seq = models.PositiveIntegerField()
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    # [bet_type, number, column, stake paise, bets] deltas, negative for removals
+    entries = models.JSONField(default=list)
+    # Not a foreign key: the log outlives deleted bulk actions
+    bulk_action_id = models.BigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['user', 'bazar', 'bet_date', 'seq']
+        constraints = [
+            # Also the index for replaying one book
+            models.UniqueConstraint(fields=['user', 'bazar', 'bet_date', 'seq'], name='unique_bet_event'),
+        ]
+        indexes = [
+            models.Index(fields=['bazar', 'bet_date'], name='bet_event_bazar_date'),
+        ]
+        verbose_name = 'Bet Event'
+        verbose_name_plural = 'Bet Events'
+
+    def __str__(self):
+        return f"{self.user} {self.bazar} {self.bet_date} #{self.seq} {self.kind}"
+
+
+class BookSummary(models.Model):
+    """
+    Projection of the event log: stake and bets of one user's book, and the
+    seq of its last event (the row writers lock to number new events)
+    """
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='book_summaries')
+    bazar = models.CharField(max_length=30, choices=Bet.BAZAR_CHOICES)
+    bet_date = models.DateField()
+
+    last_seq = models.PositiveIntegerField(default=0)
+    stake = models.BigIntegerField(default=0)  # Paise
+    bets = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'bazar', 'bet_date'], name='unique_book_summary'),
+        ]
+        verbose_name = 'Book Summary'
+        verbose_name_plural = 'Book Summaries'
+
+    def __str__(self):
+        return f"{self.user} {self.bazar} {self.bet_date}: {self.stake} paise"
+
+
+class BookNumberTotal(models.Model):
+    """Projection of the event log: stake and bets per number of one user's book"""
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='book_number_totals')
+    bazar = models.CharField(max_length=30, choices=Bet.BAZAR_CHOICES)
+    bet_date = models.DateField()
+    number = BetNumberField()
+
+    stake = models.BigIntegerField(default=0)  # Paise
+    bets = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # Also the index for reading one book
+            models.UniqueConstraint(fields=['user', 'bazar', 'bet_date', 'number'], name='unique_book_number_total'),
+        ]
+        verbose_name = 'Book Number Total'
+        verbose_name_plural = 'Book Number Totals'
+
+    def __str__(self):
+        return f"{self.user} {self.bazar} {self.bet_date} {self.number}: {self.stake} paise"
+
+
+class BookColumnTotal(models.Model):
+    """Projection of the event log: stake and bets of the column bets per column of one user's book"""
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='book_column_totals')
+    bazar = models.CharField(max_length=30, choices=Bet.BAZAR_CHOICES)
+    bet_date = models.DateField()
+    column = models.IntegerField()
+
+    stake = models.BigIntegerField(default=0)  # Paise
+    bets = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'bazar', 'bet_date', 'column'], name='unique_book_column_total'),
+        ]
+        verbose_name = 'Book Column Total'
+        verbose_name_plural = 'Book Column Totals'
+
+    def __str__(self):
+        return f"{self.user} {self.bazar} {self.bet_date} column {self.column}: {self.stake} paise"
@@ -0,0 +1,174 @@
+# userbaseapp/settlement.py
+"""
+Result declaration and settlement of a bazar.
+
+Declaring the pana for one (bazar, date) settles every bet placed on it, for
+all users, in a fixed number of statements regardless of the book size:
+
+1. One UPDATE marks the winning bets WON and one marks the rest LOST. A pana
+   bet wins when its number is the declared pana; a COLUMN bet wins when its
+   column is the pana's ank (digit sum mod 10, column 10 being ank 0).
+2. One grouped aggregate over the book gives stake and winnings per
+   (user, bet type, status), from which payouts and the per-user summaries
+   are computed.
+3. Compact bulk actions stay compact: one query reads their number bitmaps,
+   and each adds its bets to the same groups as virtual rows, the one whose
+   bit is the pana as WON and the rest as LOST. Their status is not stored;
+   it follows from the declared pana (BazarResult).
+
+Declaring again (e.g. to correct a pana) re-settles the book from scratch.
+"""
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+
+from .book_cache import invalidate_books_for_queryset
+from .fields import (
+    PaiseSum, number_set_contains, number_set_size, paise_to_decimal, paise_to_rupees, rupees_to_paise,
+)
+from .models import Bet, BazarResult, BulkBetAction, CustomUser
+
+
+# Payout per rupee staked on a winning bet, by Bet.bet_type. Override any of
+# them with a JSON object in the SETTLEMENT_PAYOUT_RATES setting.
+DEFAULT_PAYOUT_RATES = {
+    'COLUMN': '9',
+    'DP': '280',
+    'DADAR': '280',
+}
+DEFAULT_PANA_PAYOUT_RATE = '140'
+
+# Bets that can still be settled (soft-deleted bets are CANCELLED)
+SETTLEABLE_STATUSES = ['ACTIVE', 'PENDING', 'WON', 'LOST']
+
+
+def payout_rates():
+    """{bet_type: Decimal rate} for every bet type"""
+    rates = {bet_type: DEFAULT_PANA_PAYOUT_RATE for bet_type, label in Bet.BET_TYPE_CHOICES}
+    rates.update(DEFAULT_PAYOUT_RATES)
+    rates.update(settings.SETTLEMENT_PAYOUT_RATES)
+    return {bet_type: Decimal(str(rate)) for bet_type, rate in rates.items()}
+
+
+def pana_ank(pana):
+    return sum(int(digit) for digit in pana) % 10
+
+
+def winning_bets_q(pana):
+    """Q for the bets that win when `pana` is declared"""
+    ank = pana_ank(pana)
+    column = ank or 10
+    return (
+        (models.Q(number=pana) & ~models.Q(bet_type='COLUMN'))
+        | models.Q(bet_type='COLUMN', column_number=column)
+    )
+
+
+def payout_paise(stake_paise, rate):
+    """Payout in paise for `stake_paise` at `rate`, rounded half up"""
+    return int((Decimal(stake_paise) * rate).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def settle_bazar(bazar, result_date, pana, declared_by=None):
+    """
+    Declare `pana` as the result of `bazar` on `result_date` and settle its bets.
+
+    Returns (BazarResult, per-user summaries). Raises ValueError for an
+    invalid pana.
+    """
+    pana = str(pana)
+    if len(pana) != 3 or not pana.isdigit():
+        raise ValueError('Pana must be a 3-digit number')
+
+    rates = payout_rates()
+
+    with transaction.atomic():
+        book = Bet.objects.filter(
+            bazar=bazar,
+            bet_date=result_date,
+            is_deleted=False,
+            status__in=SETTLEABLE_STATUSES
+        )
+        compact_actions = BulkBetAction.objects.filter(
+            bazar=bazar,
+            action_date=result_date,
+            is_undone=False,
+            number_set__isnull=False
+        )
+        invalidate_books_for_queryset(book)
+        invalidate_books_for_queryset(compact_actions, date_field='action_date')
+
+        now = timezone.now()
+        book.filter(winning_bets_q(pana)).update(status='WON', updated_at=now)
+        book.exclude(winning_bets_q(pana)).update(status='LOST', updated_at=now)
+
+        # {(user_id, bet_type, status): [bets, stake paise]}
+        groups = defaultdict(lambda: [0, 0])
+        rows = (
+            book.order_by()
+            .values('user_id', 'bet_type', 'status')
+            .annotate(bets=models.Count('id'), stake=PaiseSum('amount'))
+        )
+        for row in rows:
+            group = groups[row['user_id'], row['bet_type'], row['status']]
+            group[0] += row['bets']
+            group[1] += row['stake']
+
+        # Locked so a concurrent delete can't change a bitmap once counted
+        compact_actions = compact_actions.select_for_update().only(
+            'user_id', 'action_type', 'amount', 'number_set'
+        )
+        for action in compact_actions:
+            amount_paise = rupees_to_paise(action.amount)
+            size = number_set_size(action.number_set)
+            won = int(number_set_contains(action.number_set, pana))
+            for status, bets in (('WON', won), ('LOST', size - won)):
+                if bets:
+                    group = groups[action.user_id, action.action_type, status]
+                    group[0] += bets
+                    group[1] += bets * amount_paise
+
+        per_user = {}
+        for (user_id, bet_type, status), (bets, stake) in groups.items():
+            summary = per_user.setdefault(user_id, {
+                'bets': 0, 'won_bets': 0, 'stake': 0, 'payout': 0,
+            })
+            summary['bets'] += bets
+            summary['stake'] += stake
+            if status == 'WON':
+                summary['won_bets'] += bets
+                summary['payout'] += payout_paise(stake, rates[bet_type])
+
+        total_stake = sum(summary['stake'] for summary in per_user.values())
+        total_payout = sum(summary['payout'] for summary in per_user.values())
+        result, created = BazarResult.objects.update_or_create(
+            bazar=bazar,
+            result_date=result_date,
+            defaults={
+                'pana': pana,
+                'declared_by': declared_by,
+                'total_bets': sum(summary['bets'] for summary in per_user.values()),
+                'winning_bets': sum(summary['won_bets'] for summary in per_user.values()),
+                'total_stake': paise_to_decimal(total_stake),
+                'total_payout': paise_to_decimal(total_payout),
+            }
+        )
+
+    usernames = dict(CustomUser.objects.filter(id__in=per_user).values_list('id', 'username'))
+    summaries = [
+        {
+            'user_id': user_id,
+            'username': usernames.get(user_id),
+            'bets': summary['bets'],
+            'won_bets': summary['won_bets'],
+            'stake': paise_to_rupees(summary['stake']),
+            'payout': paise_to_rupees(summary['payout']),
+            # From the operator's side: positive when the user lost money
+            'net': paise_to_rupees(summary['stake'] - summary['payout']),
+        }
+        for user_id, summary in sorted(per_user.items())
+    ]
+    return result, summaries
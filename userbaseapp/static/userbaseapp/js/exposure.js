@@ -0,0 +1,100 @@
+// Server-rendered page configuration - emitted by the exposure_dashboard view via json_script
+const exposureConfig = JSON.parse(document.getElementById('exposure-config').textContent);
+
+const bazarSelect = document.getElementById('exposure-bazar');
+const dateInput = document.getElementById('exposure-date');
+
+let refreshTimer = null;
+let refreshController = null;
+
+function formatRupees(amount) {
+    return '₹' + amount.toLocaleString('en-IN', { maximumFractionDigits: 2 });
+}
+
+// Replace a table body with one row per item; cells are plain text
+function renderRows(tbodyId, items, cells) {
+    const tbody = document.getElementById(tbodyId);
+    const fragment = document.createDocumentFragment();
+    items.forEach(item => {
+        const row = document.createElement('tr');
+        cells(item).forEach((value, index) => {
+            const cell = document.createElement('td');
+            cell.textContent = value;
+            if (index > 0) cell.className = 'text-right';
+            row.appendChild(cell);
+        });
+        fragment.appendChild(row);
+    });
+    tbody.replaceChildren(fragment);
+}
+
+function renderExposure(data) {
+    document.getElementById('exposure-total-stake').textContent = formatRupees(data.total_stake);
+    document.getElementById('exposure-total-bets').textContent = data.total_bets.toLocaleString('en-IN');
+    document.getElementById('exposure-numbers').textContent = data.numbers.toLocaleString('en-IN');
+
+    renderRows('exposure-top-numbers', data.top_numbers, item => [
+        item.number, formatRupees(item.stake), item.bets,
+    ]);
+    renderRows('exposure-by-column', data.by_column, item => [
+        item.column, formatRupees(item.pana_stake), formatRupees(item.column_stake), formatRupees(item.stake),
+    ]);
+    renderRows('exposure-by-bet-type', data.by_bet_type, item => [
+        item.bet_type, formatRupees(item.stake), item.bets,
+    ]);
+    document.getElementById('exposure-updated').textContent = 'Updated ' + new Date().toLocaleTimeString();
+}
+
+async function refreshExposure() {
+    // Drop a slow response for a previous bazar/date
+    if (refreshController) refreshController.abort();
+    refreshController = new AbortController();
+
+    const params = new URLSearchParams({ bazar: bazarSelect.value, date: dateInput.value });
+    try {
+        const response = await fetch(`${exposureConfig.urls.houseExposure}?${params}`, {
+            cache: 'no-store',
+            signal: refreshController.signal,
+        });
+        const data = await response.json();
+        if (data.success) {
+            renderExposure(data);
+        } else {
+            document.getElementById('exposure-updated').textContent = data.error;
+        }
+    } catch (error) {
+        if (error.name !== 'AbortError') console.error('Error loading exposure:', error);
+    }
+}
+
+function scheduleRefresh() {
+    clearTimeout(refreshTimer);
+    // Only poll while the dashboard is visible
+    if (document.hidden) return;
+    refreshTimer = setTimeout(async () => {
+        await refreshExposure();
+        scheduleRefresh();
+    }, exposureConfig.refreshSeconds * 1000);
+}
+
+function reloadExposure() {
+    refreshExposure();
+    scheduleRefresh();
+}
+
+exposureConfig.bazars.forEach(bazar => {
+    const option = document.createElement('option');
+    option.value = bazar.value;
+    option.textContent = bazar.label;
+    bazarSelect.appendChild(option);
+});
+dateInput.value = exposureConfig.currentDate;
+
+bazarSelect.addEventListener('change', reloadExposure);
+dateInput.addEventListener('change', reloadExposure);
+document.addEventListener('visibilitychange', () => {
+    if (!document.hidden) reloadExposure();
+    else clearTimeout(refreshTimer);
+});
+
+reloadExposure();
@@ -0,0 +1,3657 @@
+// Server-rendered page configuration - emitted by the home view via json_script
+const homeConfig = JSON.parse(document.getElementById('home-config').textContent);
+const bazarNamesJSON = homeConfig.bazarNames;
+const rowLabelsJSON = homeConfig.rowLabels;
+const allColumnDataJSON = homeConfig.allColumnData;
+
+// ========== PERFORMANCE UTILITIES ==========
+// Debounce function - prevents rapid repeated calls
+function debounce(func, wait) {
+    let timeout;
+    return function executedFunction(...args) {
+        const later = () => {
+            clearTimeout(timeout);
+            func(...args);
+        };
+        clearTimeout(timeout);
+        timeout = setTimeout(later, wait);
+    };
+}
+
+// Throttle function - limits execution rate
+function throttle(func, limit) {
+    let inThrottle;
+    return function(...args) {
+        if (!inThrottle) {
+            func.apply(this, args);
+            inThrottle = true;
+            setTimeout(() => inThrottle = false, limit);
+        }
+    };
+}
+
+// Run non-critical tasks when browser is idle
+function runWhenIdle(callback) {
+    if ('requestIdleCallback' in window) {
+        requestIdleCallback(callback, { timeout: 2000 });
+    } else {
+        setTimeout(callback, 100);
+    }
+}
+
+// Batch DOM updates using requestAnimationFrame
+const pendingUpdates = [];
+let updateScheduled = false;
+function batchDOMUpdate(updateFn) {
+    pendingUpdates.push(updateFn);
+    if (!updateScheduled) {
+        updateScheduled = true;
+        requestAnimationFrame(() => {
+            const updates = pendingUpdates.splice(0);
+            updates.forEach(fn => fn());
+            updateScheduled = false;
+        });
+    }
+}
+
+// Lazy feature initialization tracker
+const initializedFeatures = new Set();
+function initFeatureOnce(featureName, initFn) {
+    if (!initializedFeatures.has(featureName)) {
+        initializedFeatures.add(featureName);
+        initFn();
+    }
+}
+
+// ========== LAZY PANELS ==========
+// Rarely used panels (bet history, storage meter, delete dialogs) ship as
+// separate hashed bundles and are only fetched the first time they are opened.
+// Each bundle registers a factory on window.BettingPanels that receives the
+// shared page API and returns the panel's entry points.
+window.BettingPanels = window.BettingPanels || {};
+const panelLoads = new Map();
+function loadPanel(name, app) {
+    if (!panelLoads.has(name)) {
+        panelLoads.set(name, new Promise((resolve, reject) => {
+            const script = document.createElement('script');
+            script.src = homeConfig.panels[name];
+            script.async = true;
+            script.onload = () => resolve(window.BettingPanels[name](app));
+            script.onerror = () => {
+                panelLoads.delete(name); // Allow a retry on the next open
+                reject(new Error(`Failed to load ${name} panel`));
+            };
+            document.head.appendChild(script);
+        }));
+    }
+    return panelLoads.get(name);
+}
+
+document.addEventListener('DOMContentLoaded', async () => {
+    const API = {
+        PLACE_BET: '/place-bet/',
+        PLACE_BULK: '/place-bulk-bet/',
+        LOAD_BETS: '/load-bets/',
+        DELETE_BET: '/delete-bet/',
+        UNDO_BULK: '/undo-bulk-action/',
+        GET_LAST_BULK: '/get-last-bulk-action/',
+        GET_BET_TOTAL: '/get-bet-total/',
+        GET_ALL_BET_TOTALS: '/get-all-bet-totals/',
+        PLACE_MOTAR: '/place-motar-bet/',
+        PLACE_COMMAN_PANA: '/place-comman-pana-bet/',
+        PLACE_SET_PANA: '/place-set-pana-bet/',
+        PLACE_GROUP: '/place-group-bet/',
+        GET_BULK_HISTORY: '/get-bulk-action-history/',
+        GET_DATABASE_STORAGE: '/get-database-storage/',
+        PLACE_COLUMN_BET: '/place-column-bet/',
+        GET_COLUMN_TOTALS: '/get-column-totals/',
+        DELETE_BAZAR_BETS: '/delete-bazar-bets/',
+        PLACE_QUICK_BETS: homeConfig.urls.placeQuickBets,
+        GET_TOTAL_BET_COUNT: homeConfig.urls.getTotalBetCount,
+        MASTER_DELETE: homeConfig.urls.masterDelete,
+        GET_BAZAR_OVERVIEW: homeConfig.urls.bazarOverview,
+        GET_BOOK_SNAPSHOT: homeConfig.urls.bookSnapshot,
+        MOTAR_NUMBERS: homeConfig.urls.motarNumbers,
+        COMMAN_PANA_NUMBERS: homeConfig.urls.commanPanaNumbers,
+    };
+    // Browsers may reuse past-date book reads for a while if PAST_BOOK_MAX_AGE
+    // is set; refreshes after a write revalidate so they always see it
+    const REVALIDATE = { cache: 'no-cache' };
+    // Catalog previews in their canonical form (see catalog_response in
+    // views.py): cached by the browser for good, keyed on the catalog version
+    function motarNumbersUrl(digits) {
+        const sorted = [...digits].sort().join('');
+        return `${API.MOTAR_NUMBERS}?digits=${sorted}&v=${homeConfig.catalogVersion}`;
+    }
+    function commanPanaNumbersUrl(digit, type) {
+        return `${API.COMMAN_PANA_NUMBERS}?digit=${digit}&type=${type}&v=${homeConfig.catalogVersion}`;
+    }
+    // Restore last selected bazar from localStorage, or use default
+    let currentBazar = localStorage.getItem('selectedBazar') || homeConfig.defaultBazar;
+    let currentDate = homeConfig.currentDate;
+    const bazarNames = bazarNamesJSON;
+    const rowLabels = rowLabelsJSON;
+    const allColumnData = allColumnDataJSON;
+    let bets = {};
+    window.bets = bets; // Make bets globally accessible
+    let currentNumber = null;
+    let currentBetType = null; // 'SINGLE', 'SP', 'DP', 'JODI', 'DADAR', 'EKI_BEKI', 'ABR_CUT'
+    let lastBulkAction = null;
+    let selectedAbrColumns = []; // Array to store selected columns for multi-selection
+    let lastMotarBets = []; // Track last Motar bet IDs for undo
+    let lastCommanPanaBets = []; // Track last Comman Pana bet IDs for undo
+    let currentPage = 1; // Initialize current page to 1 (All SP)
+    let spAmountLimit = null; // SP amount limit for highlighting
+    let dpAmountLimit = null; // DP amount limit for highlighting
+    const loaderOverlay = document.getElementById('loaderOverlay');
+    const loaderText = document.getElementById('loaderText');
+    function showLoader(text = 'Loading...') {
+        loaderOverlay.classList.add('active');
+        document.body.classList.add('loading');
+        loaderText.textContent = text;
+    }
+    function updateLoader(text) {
+        if (text) {
+            loaderText.textContent = text;
+        }
+    }
+    function hideLoader() {
+        loaderOverlay.classList.remove('active');
+        document.body.classList.remove('loading');
+        loaderText.textContent = 'Loading...';
+    }
+    const modal = document.getElementById('universalModal');
+    const closeModalBtn = document.getElementById('closeModal');
+    const modalTitle = document.getElementById('modalTitle');
+    const placeTab = document.getElementById('placeTab');
+    const historyTab = document.getElementById('historyTab');
+    const placeContent = document.getElementById('placeContent');
+    const historyContent = document.getElementById('historyContent');
+    const historyList = document.getElementById('historyList');
+    const cancelBtn = document.getElementById('cancelBtn');
+    const confirmBtn = document.getElementById('confirmBtn');
+    const undoBtn = document.getElementById('undoBtn');
+    const customAmountInput = document.getElementById('customAmount');
+    const amountButtons = document.querySelectorAll('.amount-button');
+    const columnOptions = document.getElementById('columnOptions');
+    const dadarOptions = document.getElementById('dadarOptions');
+    const jodiOptions = document.getElementById('jodiOptions');
+    const ekiBekiOptions = document.getElementById('ekiBekiOptions');
+    const abrCutOptions = document.getElementById('abrCutOptions');
+    const jodiPanelOptions = document.getElementById('jodiPanelOptions');
+    const motarOptions = document.getElementById('motarOptions');
+    const commanPanaOptions = document.getElementById('commanPanaOptions');
+    const setPanaOptions = document.getElementById('setPanaOptions');
+    const tbody = document.getElementById('spreadsheet-body');
+    // Timestamps are requested as epoch milliseconds (v=2) and formatted here,
+    // in the server time zone each v=2 response reports in 'tz'
+    const TIMES_VERSION = 2;
+    let serverTimeZone = 'Asia/Kolkata';
+    let betTimeFormat = null;
+    function setServerTimeZone(data) {
+        if (data.tz && data.tz !== serverTimeZone) {
+            serverTimeZone = data.tz;
+            betTimeFormat = null;
+        }
+    }
+    function formatBetTime(value) {
+        if (typeof value !== 'number') return value ?? '';
+        betTimeFormat = betTimeFormat || new Intl.DateTimeFormat('en-US', {
+            timeZone: serverTimeZone, year: 'numeric', month: '2-digit', day: '2-digit',
+            hour: '2-digit', minute: '2-digit', second: '2-digit', hour12: true
+        });
+        const p = Object.fromEntries(betTimeFormat.formatToParts(value).map(part => [part.type, part.value]));
+        const zone = serverTimeZone === 'Asia/Kolkata' ? 'IST' : serverTimeZone;
+        return `${p.year}-${p.month}-${p.day} ${p.hour}:${p.minute}:${p.second} ${p.dayPeriod.toUpperCase()} ${zone}`;
+    }
+    function getCSRFToken() {
+        return document.cookie.split('; ').find(row => row.startsWith('csrftoken='))?.split('=')[1];
+    }
+    function showToast(title, message, type = 'success') {
+        const container = document.getElementById('toastContainer');
+        const toast = document.createElement('div');
+        toast.className = `toast ${type}`;
+        const icons = {
+            success: '<svg xmlns="http://www.w3.org/2000/svg" width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.5"><polyline points="20 6 9 17 4 12"></polyline></svg>',
+            error: '<svg xmlns="http://www.w3.org/2000/svg" width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.5"><circle cx="12" cy="12" r="10"></circle><line x1="15" y1="9" x2="9" y2="15"></line><line x1="9" y1="9" x2="15" y2="15"></line></svg>',
+            warning: '<svg xmlns="http://www.w3.org/2000/svg" width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.5"><path d="M10.29 3.86L1.82 18a2 2 0 0 0 1.71 3h16.94a2 2 0 0 0 1.71-3L13.71 3.86a2 2 0 0 0-3.42 0z"></path><line x1="12" y1="9" x2="12" y2="13"></line><line x1="12" y1="17" x2="12.01" y2="17"></line></svg>'
+        };
+        toast.innerHTML = `
+            <div class="toast-icon">${icons[type] || icons.success}</div>
+            <div class="toast-content">
+                <div class="toast-title">${title}</div>
+                <div class="toast-message">${message}</div>
+            </div>
+            <button class="toast-close">&times;</button>
+        `;
+        container.appendChild(toast);
+        setTimeout(() => toast.classList.add('show'), 10);
+        const timeoutId = setTimeout(() => removeToast(toast), 3000);
+        toast.querySelector('.toast-close').onclick = () => {
+            clearTimeout(timeoutId);
+            removeToast(toast);
+        };
+    }
+    function removeToast(toast) {
+        toast.classList.remove('show');
+        setTimeout(() => toast.remove(), 400);
+    }
+    // Open Modal Function
+    function openModal(betType, number = null, title = 'Place a Bet') {
+        currentBetType = betType;
+        currentNumber = number;
+        modal.classList.remove('hidden');
+        modalTitle.textContent = title;
+        customAmountInput.value = '';
+        amountButtons.forEach(b => b.classList.remove('selected'));
+        selectedAbrColumns = [];
+        // Uncheck all checkboxes
+        document.querySelectorAll('.betColumnCheckbox').forEach(cb => cb.checked = false);
+        document.querySelectorAll('.jodiColumnCheckbox').forEach(cb => cb.checked = false);
+        document.querySelectorAll('.abrCutColumnCheckbox').forEach(cb => cb.checked = false);
+        document.querySelectorAll('.jodiPanelColumnCheckbox').forEach(cb => cb.checked = false);
+        const selectAllCheckbox = document.getElementById('selectAllColumnsCheckbox');
+        selectAllCheckbox.checked = false;
+        // Show/hide specific options
+        columnOptions.classList.add('hidden');
+        jodiOptions.classList.add('hidden');
+        ekiBekiOptions.classList.add('hidden');
+        abrCutOptions.classList.add('hidden');
+        jodiPanelOptions.classList.add('hidden');
+        motarOptions.classList.add('hidden');
+        commanPanaOptions.classList.add('hidden');
+        setPanaOptions.classList.add('hidden');
+        document.getElementById('columnBetOptions').classList.add('hidden');
+        document.getElementById('groupBetOptions').classList.add('hidden');
+        document.getElementById('groupBetOptions').classList.add('hidden');
+        if (motarOptions) {
+            document.getElementById('motarNumberInput').value = '';
+            document.getElementById('motarGeneratedNumbers').classList.add('hidden');
+        }
+        if (commanPanaOptions) {
+            document.getElementById('commanPanaDigitInput').value = '';
+            document.getElementById('commanPanaGeneratedNumbers').classList.add('hidden');
+        }
+        document.getElementById('setPanaNumberInput').value = '';
+        document.getElementById('setPanaFamilyInfo').classList.add('hidden');
+        // Show/hide "Select All Columns" checkbox (only for JODI, ABR_CUT, JODI_PANEL)
+        // Note: DADAR is now part of EKI_BEKI dropdown, so it's handled differently
+        const selectAllContainer = document.getElementById('selectAllColumnsContainer');
+        if (['JODI', 'ABR_CUT', 'JODI_PANEL'].includes(betType)) {
+            selectAllContainer.classList.remove('hidden');
+        } else {
+            selectAllContainer.classList.add('hidden');
+        }
+        if (betType === 'SINGLE' || betType === 'SP' || betType === 'DP') {
+            columnOptions.classList.remove('hidden');
+        } else if (betType === 'JODI') {
+            jodiOptions.classList.remove('hidden');
+        } else if (betType === 'EKI_BEKI') {
+            ekiBekiOptions.classList.remove('hidden');
+        } else if (betType === 'ABR_CUT') {
+            abrCutOptions.classList.remove('hidden');
+        } else if (betType === 'JODI_PANEL') {
+            jodiPanelOptions.classList.remove('hidden');
+        } else if (betType === 'MOTAR') {
+            motarOptions.classList.remove('hidden');
+        } else if (betType === 'COMMAN_PANA') {
+            commanPanaOptions.classList.remove('hidden');
+        } else if (betType === 'SET_PANA') {
+            setPanaOptions.classList.remove('hidden');
+            selectAllContainer.classList.add('hidden');
+        } else if (betType === 'COLUMN') {
+            document.getElementById('columnBetOptions').classList.remove('hidden');
+            selectAllContainer.classList.add('hidden');
+        } else if (betType === 'GROUP') {
+            document.getElementById('groupBetOptions').classList.remove('hidden');
+            selectAllContainer.classList.add('hidden');
+            // Clear group bet input
+            document.getElementById('groupBetDigitsInput').value = '';
+            document.getElementById('groupBetPreview').textContent = 'Enter two digits to see matching numbers';
+            document.getElementById('groupBetCount').textContent = '0';
+        }
+        switchToPlaceTab();
+        updateUndoButton();
+    }
+    // Close Modal Function
+    function closeModal() {
+        modal.classList.add('hidden');
+        currentBetType = null;
+        currentNumber = null;
+        selectedAbrColumns = [];
+        // Uncheck all checkboxes
+        document.querySelectorAll('.betColumnCheckbox').forEach(cb => cb.checked = false);
+        document.querySelectorAll('.jodiColumnCheckbox').forEach(cb => cb.checked = false);
+        document.querySelectorAll('.abrCutColumnCheckbox').forEach(cb => cb.checked = false);
+        document.querySelectorAll('.jodiPanelColumnCheckbox').forEach(cb => cb.checked = false);
+        document.querySelectorAll('.columnBetCheckbox').forEach(cb => cb.checked = false);
+        document.getElementById('motarNumberInput').value = '';
+        document.getElementById('motarGeneratedNumbers').classList.add('hidden');
+        // Reset multiple motar checkbox and input state
+        const multipleMotarCheckbox = document.getElementById('multipleMotarCheckbox');
+        if (multipleMotarCheckbox) {
+            multipleMotarCheckbox.checked = false;
+            const motarInput = document.getElementById('motarNumberInput');
+            motarInput.placeholder = 'e.g. 4789';
+            motarInput.maxLength = 10;
+            document.getElementById('motarInputLabel').textContent = 'Enter Number (4-10 digits)';
+            document.getElementById('motarInputHint').textContent = 'Enter 4-10 digit number. Only digits 0-9 allowed.';
+        }
+        // Reset multiple group checkbox and input state
+        const multipleGroupCheckbox = document.getElementById('multipleGroupCheckbox');
+        if (multipleGroupCheckbox) {
+            multipleGroupCheckbox.checked = false;
+            const groupInput = document.getElementById('groupBetDigitsInput');
+            groupInput.placeholder = '00';
+            groupInput.maxLength = 2;
+            document.getElementById('groupInputLabel').textContent = 'Enter Two Digits (e.g., 35, 99, 07)';
+            document.getElementById('groupInputHint').textContent = 'Enter exactly 2 digits (0-9). First digit and second digit will be used for matching.';
+        }
+        document.getElementById('groupBetDigitsInput').value = '';
+        document.getElementById('groupBetPreview').textContent = 'Enter two digits to see matching numbers';
+        document.getElementById('groupBetCount').textContent = '0';
+        // Reset multiple set pana checkbox and input state
+        const multipleSetPanaCheckbox = document.getElementById('multipleSetPanaCheckbox');
+        if (multipleSetPanaCheckbox) {
+            multipleSetPanaCheckbox.checked = false;
+            const setPanaInput = document.getElementById('setPanaNumberInput');
+            setPanaInput.placeholder = 'e.g. 115, 156, 660';
+            setPanaInput.maxLength = 3;
+            document.getElementById('setPanaInputLabel').textContent = 'Enter 3-Digit Number';
+            document.getElementById('setPanaInputHint').textContent = 'Enter any 3-digit number from a family group (e.g., 115, 156, 110 are all in G17)';
+        }
+        document.getElementById('setPanaNumberInput').value = '';
+        document.getElementById('setPanaFamilyInfo').classList.add('hidden');
+        const selectAllCheckbox = document.getElementById('selectAllColumnsCheckbox');
+        selectAllCheckbox.checked = false;
+    }
+    function getSelectedColumns(checkboxClass) {
+        const selected = [];
+        document.querySelectorAll(`.${checkboxClass}:checked`).forEach(cb => {
+            selected.push(parseInt(cb.value));
+        });
+        return selected;
+    }
+    function switchToPlaceTab() {
+        placeContent.classList.remove('hidden');
+        historyContent.classList.add('hidden');
+        placeTab.classList.add('border-indigo-600', 'text-indigo-600');
+        historyTab.classList.remove('border-indigo-600', 'text-indigo-600');
+    }
+    function switchToHistoryTab() {
+        placeContent.classList.add('hidden');
+        historyContent.classList.remove('hidden');
+        historyTab.classList.add('border-indigo-600', 'text-indigo-600');
+        placeTab.classList.remove('border-indigo-600', 'text-indigo-600');
+        renderHistory();
+    }
+    function updateUndoButton() {
+        if (currentBetType === 'MOTAR' && lastMotarBets.length > 0) {
+            undoBtn.textContent = `Undo Last Motar (${lastMotarBets.length} bets)`;
+            undoBtn.classList.remove('hidden');
+            return;
+        }
+        if (currentBetType === 'COMMAN_PANA' && lastCommanPanaBets.length > 0) {
+            undoBtn.textContent = `Undo Last Comman Pana (${lastCommanPanaBets.length} bets)`;
+            undoBtn.classList.remove('hidden');
+            return;
+        }
+        undoBtn.textContent = 'Undo Last Action';
+        if (lastBulkAction && ['SP', 'DP', 'JODI', 'DADAR', 'EKI_BEKI', 'ABR_CUT', 'JODI_PANEL', 'GROUP', 'SET_PANA'].includes(currentBetType)) {
+            if (currentBetType === 'EKI_BEKI') {
+                const selectedType = document.getElementById('ekiBekiType').value;
+                if (lastBulkAction.type === selectedType) {
+                    undoBtn.classList.remove('hidden');
+                    return;
+                }
+            } else {
+                // For SP, DP, JODI, DADAR, ABR_CUT, JODI_PANEL - show if last action matches current type
+                if (lastBulkAction.type === currentBetType) {
+                    undoBtn.classList.remove('hidden');
+                    return;
+                }
+            }
+        }
+        undoBtn.classList.add('hidden');
+    }
+    function renderHistory() {
+        historyList.innerHTML = '';
+        let relevantBets = [];
+        if (currentBetType === 'SINGLE') {
+            const history = bets[currentNumber]?.history || [];
+            if (history.length === 0) {
+                historyList.innerHTML = '<div class="p-4 text-center text-gray-500">No bets yet.</div>';
+                return;
+            }
+            history.forEach((bet, i) => {
+                const li = document.createElement('li');
+                li.classList.add('flex', 'flex-col', 'bg-gray-50', 'p-3', 'rounded', 'gap-1');
+                const mainRow = document.createElement('div');
+                mainRow.classList.add('flex', 'justify-between', 'items-center');
+                const infoDiv = document.createElement('div');
+                infoDiv.classList.add('flex', 'flex-col');
+                const amountText = document.createElement('span');
+                amountText.classList.add('font-semibold');
+                amountText.textContent = `${bet.amount}`;
+                const metaText = document.createElement('span');
+                metaText.classList.add('text-xs', 'text-gray-500');
+                metaText.textContent = `${formatBetTime(bet.created_at)} • ${bet.bet_type || 'SINGLE'}`;
+                infoDiv.append(amountText, metaText);
+                const delBtn = document.createElement('button');
+                delBtn.textContent = 'Delete';
+                delBtn.classList.add('delete-button');
+                delBtn.onclick = async () => {
+                    await deleteBet(bet.id, currentNumber);
+                    renderHistory();
+                };
+                mainRow.append(infoDiv, delBtn);
+                li.appendChild(mainRow);
+                historyList.appendChild(li);
+            });
+        } else if (currentBetType === 'DADAR') {
+            const dadarNumbers = new Set([678, 345, 120, 789, 456, 123, 890, 567, 234, 190].map(String));
+            relevantBets = Object.entries(bets)
+                .filter(([number]) => dadarNumbers.has(number))
+                .flatMap(([number, data]) =>
+                    data.history.map(bet => ({
+                        ...bet,
+                        number
+                    }))
+                );
+            if (relevantBets.length === 0) {
+                historyList.innerHTML = '<div class="p-4 text-center text-gray-500">No Dadar bets found</div>';
+                return;
+            }
+            relevantBets.forEach((bet) => {
+                const li = document.createElement('li');
+                li.className = 'flex flex-col bg-gray-50 p-3 rounded gap-1';
+                const mainRow = document.createElement('div');
+                mainRow.className = 'flex justify-between items-center';
+                const infoDiv = document.createElement('div');
+                infoDiv.className = 'flex flex-col';
+                const numberAmount = document.createElement('span');
+                numberAmount.className = 'font-semibold';
+                numberAmount.textContent = `${bet.number}: ${bet.amount}`;
+                const metaText = document.createElement('span');
+                metaText.className = 'text-xs text-gray-500';
+                const columnInfo = bet.column ? `Col ${bet.column} • ` : '';
+                metaText.textContent = `${formatBetTime(bet.created_at)} • ${columnInfo}${bet.bet_type || 'DADAR'}`;
+                infoDiv.append(numberAmount, metaText);
+                const delBtn = document.createElement('button');
+                delBtn.textContent = 'Delete';
+                delBtn.className = 'delete-button';
+                delBtn.onclick = async () => {
+                    await deleteBet(bet.id, bet.number);
+                    renderHistory();
+                };
+                mainRow.append(infoDiv, delBtn);
+                li.appendChild(mainRow);
+                historyList.appendChild(li);
+            });
+        } else if (currentBetType === 'EKI_BEKI') {
+            const ekiBekiType = document.getElementById('ekiBekiType').value;
+            let targetNumbers;
+            if (ekiBekiType === 'EKI') {
+                targetNumbers = new Set([137, 135, 139, 157, 159, 179, 357, 359, 379, 579].map(String));
+            } else if (ekiBekiType === 'BEKI') {
+                targetNumbers = new Set([246, 248, 240, 268, 260, 280, 468, 460, 480, 680].map(String));
+            } else if (ekiBekiType === 'DADAR') {
+                targetNumbers = new Set([100, 110, 112, 113, 114, 115, 116, 117, 118, 119].map(String));
+            }
+            relevantBets = Object.entries(bets)
+                .filter(([number]) => targetNumbers.has(number))
+                .flatMap(([number, data]) =>
+                    data.history.map(bet => ({
+                        ...bet,
+                        number
+                    }))
+                );
+            if (relevantBets.length === 0) {
+                historyList.innerHTML = `<div class="p-4 text-center text-gray-500">No ${ekiBekiType} bets found</div>`;
+                return;
+            }
+            relevantBets.forEach((bet) => {
+                const li = document.createElement('li');
+                li.className = 'flex flex-col bg-gray-50 p-3 rounded gap-1';
+                const mainRow = document.createElement('div');
+                mainRow.className = 'flex justify-between items-center';
+                const infoDiv = document.createElement('div');
+                infoDiv.className = 'flex flex-col';
+                const numberAmount = document.createElement('span');
+                numberAmount.className = 'font-semibold';
+                numberAmount.textContent = `${bet.number}: ${bet.amount}`;
+                const metaText = document.createElement('span');
+                metaText.className = 'text-xs text-gray-500';
+                metaText.textContent = `${formatBetTime(bet.created_at)} • ${bet.sub_type || bet.bet_type || ekiBekiType}`;
+                infoDiv.append(numberAmount, metaText);
+                const delBtn = document.createElement('button');
+                delBtn.textContent = 'Delete';
+                delBtn.className = 'delete-button';
+                delBtn.onclick = async () => {
+                    await deleteBet(bet.id, bet.number);
+                    renderHistory();
+                };
+                mainRow.append(infoDiv, delBtn);
+                li.appendChild(mainRow);
+                historyList.appendChild(li);
+            });
+        } else {
+            historyList.innerHTML = '<div class="p-4 text-center text-gray-500">No history available</div>';
+        }
+    }
+    async function loadBets() {
+        try {
+            const res = await fetch(`${API.LOAD_BETS}?bazar=${currentBazar}&date=${currentDate}&v=${TIMES_VERSION}`, REVALIDATE);
+            const data = await res.json();
+            if (data.success) {
+                setServerTimeZone(data);
+                bets = data.bets;
+                renderPage(currentPage);
+            } else {
+                console.error('Load bets failed:', data);
+            }
+        } catch (err) {
+            console.error('Error loading bets:', err);
+            throw err; // Re-throw to be caught by Promise.allSettled
+        }
+    }
+    async function getLastBulkAction() {
+        try {
+            const res = await fetch(`${API.GET_LAST_BULK}?bazar=${currentBazar}&date=${currentDate}&v=${TIMES_VERSION}`, REVALIDATE);
+            const data = await res.json();
+            lastBulkAction = data.has_action ? data.action : null;
+            updateUndoButton();
+        } catch (err) {
+            console.error('Error getting last bulk:', err);
+            throw err; // Re-throw to be caught by Promise.allSettled
+        }
+    }
+    async function placeSingleBet(number, amount) {
+        showLoader('Placing bet...');
+        try {
+            updateLoader('Processing request...');
+            const res = await fetch(API.PLACE_BET, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json', 'X-CSRFToken': getCSRFToken() },
+                body: JSON.stringify({ number, amount, bazar: currentBazar, date: currentDate })
+            });
+            updateLoader('Saving bet...');
+            const data = await res.json();
+            if (data.success) {
+                if (!bets[number]) bets[number] = { total: 0, history: [] };
+                bets[number].total += parseFloat(amount);
+                bets[number].history.push({ id: data.bet_id, amount: parseFloat(amount) });
+                updateBetTotal(number);
+                updateLoader('Complete!');
+            }
+            return data;
+        } finally {
+            setTimeout(() => hideLoader(), 300);
+        }
+    }
+    async function placeBulkBet(type, amount, column = null, jodiType = null, panelType = null) {
+        showLoader(`Placing ${type} bets...`);
+        try {
+            const payload = { type, amount, bazar: currentBazar, date: currentDate };
+            updateLoader('Preparing data...');
+            if (type === 'JODI') {
+                payload.columns = Array.isArray(column) ? column : [column];
+                payload.jodi_type = jodiType;
+            } else if (type === 'DADAR') {
+                payload.columns = Array.isArray(column) ? column : [column];
+            } else if (type === 'SINGLE' || type === 'SP' || type === 'DP') {
+                if (column !== null) {
+                    payload.columns = Array.isArray(column) ? column : [column];
+                }
+            } else if (type === 'ABR_CUT') {
+                payload.columns = Array.isArray(column) ? column : [column];
+            } else if (type === 'JODI_PANEL') {
+                payload.columns = Array.isArray(column) ? column : [column];
+                payload.panel_type = panelType;
+            }
+            updateLoader('Sending request...');
+            const res = await fetch(`${API.PLACE_BULK}?v=${TIMES_VERSION}`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json', 'X-CSRFToken': getCSRFToken() },
+                body: JSON.stringify(payload)
+            });
+            updateLoader('Processing bets...');
+            const data = await res.json();
+            if (data.success) {
+                updateLoader('Updating totals...');
+                data.bets.forEach(bet => {
+                    const num = bet.number;
+                    if (!bets[num]) bets[num] = { total: 0, history: [] };
+                    bets[num].total += parseFloat(bet.amount);
+                    bets[num].history.push({ id: bet.id, amount: parseFloat(bet.amount) });
+                    updateBetTotal(num);
+                });
+                lastBulkAction = { id: data.bulk_action_id, type, total_bets: data.total_bets };
+                updateLoader('Complete!');
+            }
+            return data;
+        } finally {
+            setTimeout(() => hideLoader(), 300);
+        }
+    }
+    async function deleteBet(betId, number) {
+        const res = await fetch(API.DELETE_BET, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'X-CSRFToken': getCSRFToken() },
+            body: JSON.stringify({ bet_id: betId })
+        });
+        const data = await res.json();
+        if (data.success) {
+            const hist = bets[number]?.history;
+            if (hist) {
+                const idx = hist.findIndex(h => h.id === betId);
+                if (idx !== -1) {
+                    bets[number].total -= hist[idx].amount;
+                    hist.splice(idx, 1);
+                }
+                if (hist.length === 0) delete bets[number];
+            }
+            updateBetTotal(number);
+            await refreshAllBetTotals();
+        }
+        return data;
+    }
+    async function undoBulkAction() {
+        if (currentBetType === 'MOTAR' && lastMotarBets.length > 0) {
+            if (!confirm(`Undo last Motar action (${lastMotarBets.length} bets)?`)) return;
+            let successCount = 0;
+            let failCount = 0;
+            for (const bet of lastMotarBets) {
+                const result = await deleteBet(bet.bet_id, bet.number);
+                if (result.success) {
+                    successCount++;
+                } else {
+                    failCount++;
+                }
+            }
+            if (successCount > 0) {
+                showToast('Success', `${successCount} Motar bets undone`, 'success');
+                lastMotarBets = []; // Clear tracked bets
+                await updateTotalAmount();
+                renderPage(1);
+                updateUndoButton(); // Hide undo button
+            }
+            if (failCount > 0) {
+                showToast('Warning', `Failed to undo ${failCount} bets`, 'warning');
+            }
+            return;
+        }
+        if (currentBetType === 'COMMAN_PANA' && lastCommanPanaBets.length > 0) {
+            if (!confirm(`Undo last Comman Pana action (${lastCommanPanaBets.length} bets)?`)) return;
+            let successCount = 0;
+            let failCount = 0;
+            for (const bet of lastCommanPanaBets) {
+                const result = await deleteBet(bet.bet_id, bet.number);
+                if (result.success) {
+                    successCount++;
+                } else {
+                    failCount++;
+                }
+            }
+            if (successCount > 0) {
+                showToast('Success', `${successCount} Comman Pana bets undone`, 'success');
+                lastCommanPanaBets = []; // Clear tracked bets
+                await updateTotalAmount();
+                renderPage(1);
+                updateUndoButton(); // Hide undo button
+            }
+            if (failCount > 0) {
+                showToast('Warning', `Failed to undo ${failCount} bets`, 'warning');
+            }
+            return;
+        }
+        if (!lastBulkAction) return showToast('Error', 'No bulk action to undo', 'warning');
+        if (!confirm(`Undo last ${lastBulkAction.type} bulk action (${lastBulkAction.total_bets} bets)?`)) return;
+        const res = await fetch(API.UNDO_BULK, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'X-CSRFToken': getCSRFToken() },
+            body: JSON.stringify({ bulk_action_id: lastBulkAction.id })
+        });
+        const data = await res.json();
+        if (data.success) {
+            showToast('Success', data.message, 'success');
+            await loadBets();
+            await refreshAllBetTotals();
+            lastBulkAction = null;
+            await getLastBulkAction();
+            await updateTotalAmount();
+            closeModal();
+        } else {
+            showToast('Error', data.message || 'Failed to undo', 'error');
+        }
+    }
+    function setTotalAmount(total) {
+        const totalAmount = parseFloat(total).toLocaleString('en-IN');
+        const totalElement = document.getElementById('totalBalance');
+        const totalElementMobile = document.getElementById('totalBalanceMobile');
+        if (totalElement) totalElement.textContent = totalAmount;
+        if (totalElementMobile) totalElementMobile.textContent = totalAmount;
+    }
+    async function updateTotalAmount() {
+        try {
+            const res = await fetch(`${API.GET_BET_TOTAL}?bazar=${currentBazar}&date=${currentDate}`, REVALIDATE);
+            const data = await res.json();
+            if (data.success) {
+                setTotalAmount(data.total_amount);
+            }
+        } catch (err) {
+            console.error('Error fetching total amount:', err);
+        }
+    }
+
+    // Every bazar's total and bet count for the current date, in one request,
+    // to label the bazar selector
+    async function loadBazarOverview() {
+        try {
+            const res = await fetch(`${API.GET_BAZAR_OVERVIEW}?date=${currentDate}&v=${TIMES_VERSION}`);
+            const data = await res.json();
+            if (!data.success) return;
+            data.bazars.forEach(item => {
+                const option = bazarSelectorSidebar.querySelector(`option[value="${item.bazar}"]`);
+                if (option) {
+                    option.textContent = item.bet_count
+                        ? `${item.label} · ₹${item.total_amount.toLocaleString('en-IN')} (${item.bet_count})`
+                        : item.label;
+                }
+            });
+        } catch (err) {
+            console.error('Error loading bazar overview:', err);
+        }
+    }
+
+    // Cache for bet total elements to avoid repeated DOM queries
+    const betTotalElementCache = new Map();
+    function getBetTotalElement(number) {
+        if (!betTotalElementCache.has(number)) {
+            betTotalElementCache.set(number, document.getElementById(`bet-total-${number}`));
+        }
+        return betTotalElementCache.get(number);
+    }
+
+    function updateBetTotal(number) {
+        const el = getBetTotalElement(number);
+        if (el) {
+            el.textContent = bets[number]?.total ? `${bets[number].total}` : '';
+        }
+    }
+
+    // Batch update bet totals for better performance
+    function updateAllBetTotals() {
+        batchDOMUpdate(() => {
+            for (const number in bets) {
+                updateBetTotal(number);
+            }
+            highlightCellsByLimit();
+        });
+    }
+
+    // Binary book totals (format=binary, see userbaseapp/dense_totals.py):
+    // a 125-byte bitmask of the numbers 000-999 with a total, an int64 paise
+    // total per set bit, then a uint16 count of (uint16 code, int64 paise)
+    // pairs for bare column numbers (code = 1000 + number). Paise totals stay
+    // well within Number's exact integer range
+    function decodeBetTotals(buffer) {
+        const view = new DataView(buffer);
+        const paise = new Float64Array(1000);
+        let offset = 125;
+        for (let code = 0; code < 1000; code++) {
+            if (view.getUint8(code >> 3) & (1 << (code & 7))) {
+                paise[code] = Number(view.getBigInt64(offset, true));
+                offset += 8;
+            }
+        }
+        const extra = {};
+        const count = view.getUint16(offset, true);
+        offset += 2;
+        for (let i = 0; i < count; i++) {
+            extra[String(view.getUint16(offset, true) - 1000)] = Number(view.getBigInt64(offset + 2, true));
+            offset += 10;
+        }
+        return { paise, extra };
+    }
+    function setBetTotal(number, total) {
+        if (!bets[number]) {
+            bets[number] = { total: 0, history: [] };
+        }
+        bets[number].total = total;
+    }
+    // Background polls ({ poll: true }) accept a past-date response the browser still holds
+    async function refreshAllBetTotals({ poll = false } = {}) {
+        try {
+            const res = await fetch(`${API.GET_ALL_BET_TOTALS}?bazar=${currentBazar}&date=${currentDate}&format=binary`, poll ? undefined : REVALIDATE);
+            if (!res.ok) return;
+            const { paise, extra } = decodeBetTotals(await res.arrayBuffer());
+            for (const number in bets) {
+                bets[number].total = 0;
+            }
+            for (let code = 0; code < 1000; code++) {
+                if (paise[code]) setBetTotal(String(code).padStart(3, '0'), paise[code] / 100);
+            }
+            for (const number in extra) {
+                setBetTotal(number, extra[number] / 100);
+            }
+            updateAllBetTotals();
+        } catch (err) {
+            console.error('Error refreshing bet totals:', err);
+        }
+    }
+    function setColumnTotals(columnTotals) {
+        for (let col = 1; col <= 10; col++) {
+            const totalSpan = document.getElementById(`column-total-${col}`);
+            if (totalSpan) {
+                const total = columnTotals[col] || 0;
+                totalSpan.textContent = total > 0 ? total : '';
+            }
+        }
+    }
+    async function refreshColumnTotals() {
+        try {
+            const res = await fetch(`${API.GET_COLUMN_TOTALS}?bazar=${currentBazar}&date=${currentDate}`, REVALIDATE);
+            const data = await res.json();
+            if (data.success) {
+                setColumnTotals(data.column_totals);
+            }
+        } catch (err) {
+            console.error('Error refreshing column totals:', err);
+        }
+    }
+    // Bets, total amount, last bulk action and column totals of the current
+    // book in one request (instead of loadBets, updateTotalAmount,
+    // getLastBulkAction and refreshColumnTotals); the bets carry their totals
+    async function loadBookSnapshot() {
+        const sections = 'bets,total,last_action,column_totals';
+        const res = await fetch(`${API.GET_BOOK_SNAPSHOT}?bazar=${currentBazar}&date=${currentDate}&v=${TIMES_VERSION}&sections=${sections}`);
+        const data = await res.json();
+        if (!data.success) {
+            throw new Error(data.error || 'Failed to load book');
+        }
+        setServerTimeZone(data);
+        bets = data.bets;
+        renderPage(currentPage);
+        setTotalAmount(data.total_amount);
+        lastBulkAction = data.last_action;
+        updateUndoButton();
+        setColumnTotals(data.column_totals);
+    }
+    function renderPage(page) {
+        tbody.innerHTML = '';
+        const start = page === 1 ? 0 : 13;
+        const end = page === 1 ? 11 : 22;
+        currentPage = page;
+        const page1Btn = document.getElementById('page-1-btn');
+        const page2Btn = document.getElementById('page-2-btn');
+        if (page === 1) {
+            page1Btn.classList.add('bg-indigo-600', 'text-white');
+            page1Btn.classList.remove('bg-gray-300', 'text-gray-800');
+            page2Btn.classList.add('bg-gray-300', 'text-gray-800');
+            page2Btn.classList.remove('bg-indigo-600', 'text-white');
+        } else {
+            page2Btn.classList.add('bg-indigo-600', 'text-white');
+            page2Btn.classList.remove('bg-gray-300', 'text-gray-800');
+            page1Btn.classList.add('bg-gray-300', 'text-gray-800');
+            page1Btn.classList.remove('bg-indigo-600', 'text-white');
+        }
+        for (let i = start; i <= end; i++) {
+            const row = document.createElement('tr');
+            const dataIndex = i > 12 ? i - 1 : i;
+            const rowNum = document.createElement('td');
+            rowNum.textContent = rowLabels[dataIndex] || (dataIndex + 1);
+            rowNum.classList.add('spreadsheet-cell', 'row-number-cell');
+            row.appendChild(rowNum);
+            for (let j = 0; j < 10; j++) {
+                const cell = document.createElement('td');
+                cell.classList.add('spreadsheet-cell', 'text-gray-700');
+                const value = allColumnData[j][dataIndex];
+                if (value) {
+                    const span = document.createElement('span');
+                    span.textContent = value;
+                    span.style.fontWeight = '600';
+                    const plus = document.createElement('button');
+                    plus.textContent = '+';
+                    plus.classList.add('bet-button');
+                    plus.onclick = () => openModal('SINGLE', value, `Place a Bet on ${value}`);
+                    const total = document.createElement('span');
+                    total.classList.add('ml-2', 'text-sm', 'font-semibold', 'text-green-600');
+                    total.id = `bet-total-${value}`;
+                    if (bets[value]?.total) total.textContent = `${bets[value].total}`;
+                    cell.append(span, plus, total);
+                }
+                row.appendChild(cell);
+            }
+            tbody.appendChild(row);
+        }
+        highlightCellsByLimit();
+    }
+    // Event Listeners
+    // Amount button selection
+    amountButtons.forEach(btn => {
+        btn.onclick = () => {
+            amountButtons.forEach(b => b.classList.remove('selected'));
+            btn.classList.add('selected');
+            customAmountInput.value = '';
+        };
+    });
+    customAmountInput.addEventListener('input', () => {
+        amountButtons.forEach(b => b.classList.remove('selected'));
+    });
+    closeModalBtn.onclick = closeModal;
+    cancelBtn.onclick = closeModal;
+    modal.addEventListener('click', e => { if (e.target === modal) closeModal(); });
+    // Tab switching
+    placeTab.onclick = switchToPlaceTab;
+    historyTab.onclick = switchToHistoryTab;
+    // Confirm Bet
+    confirmBtn.onclick = async () => {
+        let amount = 0;
+        const selected = document.querySelector('.amount-button.selected');
+        if (selected) {
+            amount = parseFloat(selected.dataset.amount);
+        } else {
+            amount = parseFloat(customAmountInput.value);
+        }
+        if (!amount || amount <= 0) {
+            return showToast('Invalid Amount', 'Please select or enter an amount', 'warning');
+        }
+        if (!selected) {
+            if (amount < 1) return showToast('Amount Too Low', 'Minimum is 1', 'warning');
+            if (amount > 5000) return showToast('Amount Too High', 'Maximum is 5,000', 'warning');
+        }
+        if (currentBetType === 'SINGLE') {
+            const result = await placeSingleBet(currentNumber, amount);
+            if (result.success) {
+                showToast('Success!', `Bet of ${amount} placed on ${currentNumber}`, 'success');
+                closeModal();
+                await updateTotalAmount();
+                await refreshAllBetTotals();
+            } else {
+                showToast('Error', result.error || 'Failed to place bet', 'error');
+            }
+        } else if (currentBetType === 'JODI') {
+            const columns = getSelectedColumns('jodiColumnCheckbox');
+            if (columns.length === 0) {
+                return showToast('No Columns Selected', 'Please select at least one column', 'warning');
+            }
+            const jodiType = parseInt(document.getElementById('jodiType').value);
+            const result = await placeBulkBet('JODI', amount, columns, jodiType);
+            if (result.success) {
+                const columnText = columns.length > 1
+                    ? `${columns.length} columns (${columns.join(', ')})`
+                    : `Column ${columns[0]}`;
+                showToast('Success!', `Jodi Vagar ${jodiType} bet placed on ${columnText}: ${result.total_bets} numbers`, 'success');
+                closeModal();
+                renderPage(1);
+                await getLastBulkAction();
+                await updateTotalAmount();
+                await refreshAllBetTotals();
+            } else {
+                showToast('Error', result.error || 'Failed to place Jodi bet', 'error');
+            }
+        } else if (currentBetType === 'EKI_BEKI') {
+            const ekiBekiType = document.getElementById('ekiBekiType').value;
+            const result = await placeBulkBet(ekiBekiType, amount);
+            if (result.success) {
+                showToast('Success!', `${ekiBekiType} bet placed on ${result.total_bets} numbers`, 'success');
+                closeModal();
+                renderPage(1);
+                await getLastBulkAction();
+                await updateTotalAmount();
+            } else {
+                showToast('Error', result.error || 'Failed to place bet', 'error');
+            }
+        } else if (currentBetType === 'ABR_CUT') {
+            const columns = getSelectedColumns('abrCutColumnCheckbox');
+            if (columns.length === 0) {
+                return showToast('No Columns Selected', 'Please select at least one column', 'warning');
+            }
+            const result = await placeBulkBet('ABR_CUT', amount, columns);
+            if (result.success) {
+                const columnText = columns.length > 1
+                    ? `${columns.length} columns (${columns.join(', ')})`
+                    : `Column ${columns[0]}`;
+                showToast('Success!', `ABR Cut bet placed on ${columnText}: ${result.total_bets} numbers`, 'success');
+                closeModal();
+                renderPage(1);
+                await getLastBulkAction();
+                await updateTotalAmount();
+                await refreshAllBetTotals();
+            } else {
+                showToast('Error', result.error || 'Failed to place ABR Cut bet', 'error');
+            }
+        } else if (currentBetType === 'JODI_PANEL') {
+            const columns = getSelectedColumns('jodiPanelColumnCheckbox');
+            if (columns.length === 0) {
+                return showToast('No Columns Selected', 'Please select at least one column', 'warning');
+            }
+            const panelType = parseInt(document.getElementById('jodiPanelType').value);
+            const result = await placeBulkBet('JODI_PANEL', amount, columns, null, panelType);
+            if (result.success) {
+                const columnText = columns.length > 1
+                    ? `${columns.length} columns (${columns.join(', ')})`
+                    : `Column ${columns[0]}`;
+                showToast('Success!', `Jodi Panel ${panelType} bet placed on ${columnText}: ${result.total_bets} numbers`, 'success');
+                closeModal();
+                renderPage(1);
+                await getLastBulkAction();
+                await updateTotalAmount();
+                await refreshAllBetTotals();
+            } else {
+                showToast('Error', result.error || 'Failed to place Jodi Panel bet', 'error');
+            }
+        } else if (['SP', 'DP'].includes(currentBetType)) {
+            let columns = null;
+            // For SP/DP, columns are optional
+            columns = getSelectedColumns('betColumnCheckbox');
+            columns = columns.length > 0 ? columns : null;
+            const result = await placeBulkBet(currentBetType, amount, columns);
+            if (result.success) {
+                let message = `${result.total_bets} ${currentBetType} bets placed successfully`;
+                if (columns && columns.length > 0) {
+                    const columnText = columns.length > 1
+                        ? `${columns.length} columns (${columns.join(', ')})`
+                        : `Column ${columns[0]}`;
+                    message = `${currentBetType} bet placed on ${columnText}: ${result.total_bets} numbers`;
+                }
+                showToast('Success!', message, 'success');
+                closeModal();
+                renderPage(currentBetType === 'SP' ? 1 : 2);
+                await getLastBulkAction();
+                await updateTotalAmount();
+            } else {
+                showToast('Error', result.error || 'Failed to place bets', 'error');
+            }
+        } else if (currentBetType === 'MOTAR') {
+            const motarInput = document.getElementById('motarNumberInput').value;
+            const isMultipleMode = document.getElementById('multipleMotarCheckbox').checked;
+
+            if (isMultipleMode) {
+                // Multiple motar mode
+                const motars = motarInput.split(',').filter(m => m.trim() !== '');
+                const validMotars = motars.filter(m => m.length >= 4 && m.length <= 10);
+
+                if (validMotars.length === 0) {
+                    return showToast('Invalid Input', 'Please enter at least one valid 4-10 digit number', 'warning');
+                }
+
+                try {
+                    let totalBetsPlaced = 0;
+                    let allBetsData = [];
+                    lastMotarBets = []; // Clear previous tracking
+
+                    // Place bets for each motar
+                    for (const motar of validMotars) {
+                        const res = await fetch(API.PLACE_MOTAR, {
+                            method: 'POST',
+                            headers: {
+                                'Content-Type': 'application/json',
+                                'X-CSRFToken': getCSRFToken()
+                            },
+                            body: JSON.stringify({
+                                digits: motar,
+                                amount: amount,
+                                bazar: currentBazar,
+                                date: currentDate
+                            })
+                        });
+                        const data = await res.json();
+                        if (data.success) {
+                            totalBetsPlaced += data.total_bets;
+                            allBetsData.push(data);
+
+                            data.bets.forEach(bet => {
+                                const num = bet.number;
+                                if (!bets[num]) bets[num] = { total: 0, history: [] };
+                                bets[num].total += parseFloat(bet.amount);
+                                bets[num].history.push({
+                                    id: bet.bet_id,
+                                    amount: parseFloat(bet.amount),
+                                    bet_type: 'MOTAR'
+                                });
+                                updateBetTotal(num);
+                                // Track for undo
+                                lastMotarBets.push({
+                                    bet_id: bet.bet_id,
+                                    number: bet.number,
+                                    amount: parseFloat(bet.amount)
+                                });
+                            });
+                        }
+                    }
+
+                    if (totalBetsPlaced > 0) {
+                        lastBulkAction = {
+                            id: allBetsData[allBetsData.length - 1].bulk_action_id,
+                            type: 'MOTAR',
+                            total_bets: totalBetsPlaced
+                        };
+                        showToast('Success!', `Multiple Motar: ${totalBetsPlaced} bets placed from ${validMotars.length} motars`, 'success');
+                        closeModal();
+                        renderPage(1);
+                        await updateTotalAmount();
+                        await refreshAllBetTotals();
+                        updateUndoButton();
+                    } else {
+                        showToast('Error', 'Failed to place any Motar bets', 'error');
+                    }
+                } catch (err) {
+                    console.error('Error placing Multiple Motar bets:', err);
+                    showToast('Error', 'Failed to place Motar bets', 'error');
+                }
+            } else {
+                // Single motar mode - original behavior
+                if (!motarInput || motarInput.length < 4 || motarInput.length > 10) {
+                    return showToast('Invalid Input', 'Please enter a 4-10 digit number', 'warning');
+                }
+                try {
+                    // Call Django API to place all Motar bets in one transaction
+                    const res = await fetch(API.PLACE_MOTAR, {
+                        method: 'POST',
+                        headers: {
+                            'Content-Type': 'application/json',
+                            'X-CSRFToken': getCSRFToken()
+                        },
+                        body: JSON.stringify({
+                            digits: motarInput,
+                            amount: amount,
+                            bazar: currentBazar,
+                            date: currentDate
+                        })
+                    });
+                    const data = await res.json();
+                    if (data.success) {
+                        lastMotarBets = []; // Clear previous tracking
+                        data.bets.forEach(bet => {
+                            const num = bet.number;
+                            if (!bets[num]) bets[num] = { total: 0, history: [] };
+                            bets[num].total += parseFloat(bet.amount);
+                            bets[num].history.push({
+                                id: bet.bet_id,
+                                amount: parseFloat(bet.amount),
+                                bet_type: 'MOTAR'
+                            });
+                            updateBetTotal(num);
+                            // Track for undo
+                            lastMotarBets.push({
+                                bet_id: bet.bet_id,
+                                number: bet.number,
+                                amount: parseFloat(bet.amount)
+                            });
+                        });
+                        lastBulkAction = {
+                            id: data.bulk_action_id,
+                            type: 'MOTAR',
+                            total_bets: data.total_bets
+                        };
+                        showToast('Success!', `Motar: ${data.total_bets} bets placed from ${motarInput}`, 'success');
+                        closeModal();
+                        renderPage(1);
+                        await updateTotalAmount();
+                        await refreshAllBetTotals();
+                        updateUndoButton();
+                    } else {
+                        showToast('Error', data.error || 'Failed to place Motar bets', 'error');
+                    }
+                } catch (err) {
+                    console.error('Error placing Motar bets:', err);
+                    showToast('Error', 'Failed to place Motar bets', 'error');
+                }
+            }
+        } else if (currentBetType === 'COMMAN_PANA') {
+            const digitInput = document.getElementById('commanPanaDigitInput').value;
+            const is36Checked = document.getElementById('commanPana36Checkbox').checked;
+            const is56Checked = document.getElementById('commanPana56Checkbox').checked;
+            if (!digitInput || digitInput.length !== 1 || !/^[0-9]$/.test(digitInput)) {
+                return showToast('Invalid Input', 'Please enter a single digit (0-9)', 'warning');
+            }
+            if (!is36Checked && !is56Checked) {
+                return showToast('Select Type', 'Please select Common Pana 36 or 56', 'warning');
+            }
+            const betType = is56Checked ? '56' : '36';
+            const betTypeName = is56Checked ? 'COMMAN_PANA_56' : 'COMMAN_PANA_36';
+            const betLabel = is56Checked ? 'Common Pana 56' : 'Common Pana 36';
+            try {
+                // Call Django API to place all Common Pana bets in one transaction
+                const res = await fetch(API.PLACE_COMMAN_PANA, {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'X-CSRFToken': getCSRFToken()
+                    },
+                    body: JSON.stringify({
+                        digit: parseInt(digitInput),
+                        amount: amount,
+                        type: betType,
+                        bazar: currentBazar,
+                        date: currentDate
+                    })
+                });
+                const data = await res.json();
+                if (data.success) {
+                    lastCommanPanaBets = []; // Clear previous tracking
+                    data.bets.forEach(bet => {
+                        const num = bet.number;
+                        if (!bets[num]) bets[num] = { total: 0, history: [] };
+                        bets[num].total += parseFloat(bet.amount);
+                        bets[num].history.push({
+                            id: bet.bet_id,
+                            amount: parseFloat(bet.amount),
+                            bet_type: betTypeName
+                        });
+                        updateBetTotal(num);
+                        // Track for undo
+                        lastCommanPanaBets.push({
+                            bet_id: bet.bet_id,
+                            number: bet.number,
+                            amount: parseFloat(bet.amount)
+                        });
+                    });
+                    lastBulkAction = {
+                        id: data.bulk_action_id,
+                        type: betTypeName,
+                        total_bets: data.total_bets
+                    };
+                    showToast('Success!', `${betLabel}: ${data.total_bets} bets placed for digit ${digitInput}`, 'success');
+                    closeModal();
+                    renderPage(1);
+                    await updateTotalAmount();
+                    await refreshAllBetTotals();
+                    updateUndoButton();
+                } else {
+                    showToast('Error', data.error || 'Failed to place Common Pana bets', 'error');
+                }
+            } catch (err) {
+                console.error('Error placing Common Pana bets:', err);
+                showToast('Error', 'Failed to place Common Pana bets', 'error');
+            }
+        } else if (currentBetType === 'SET_PANA') {
+            const numberInput = document.getElementById('setPanaNumberInput').value;
+            const isMultipleMode = document.getElementById('multipleSetPanaCheckbox').checked;
+
+            // Family definitions for validation
+            const familyPanaNumbers = {
+                'G1': [678, 123, 137, 268, 236, 178, 128, 367],
+                'G2': [345, 890, 390, 458, 480, 359, 589, 340],
+                'G3': [120, 567, 157, 260, 256, 170, 670, 125],
+                'G4': [789, 234, 239, 478, 248, 379, 347, 289],
+                'G5': [456, 190, 140, 569, 159, 460, 690, 145],
+                'G6': [245, 290, 470, 579, 790, 457, 259, 240],
+                'G7': [129, 147, 246, 679, 467, 269, 179, 124],
+                'G8': [139, 148, 346, 689, 468, 369, 189, 134],
+                'G9': [130, 158, 356, 680, 568, 360, 180, 135],
+                'G10': [230, 258, 357, 780, 578, 370, 280, 235],
+                'G11': [146, 119, 669, 169, 466, 114],
+                'G12': [138, 336, 688, 368, 188, 133],
+                'G13': [238, 337, 788, 378, 288, 233],
+                'G14': [149, 446, 699, 469, 199, 144],
+                'G15': [168, 113, 366, 136, 668, 118],
+                'G16': [380, 335, 588, 358, 880, 330],
+                'G17': [156, 110, 660, 160, 566, 115],
+                'G18': [247, 229, 779, 279, 477, 224],
+                'G19': [167, 112, 266, 126, 667, 117],
+                'G20': [249, 447, 799, 479, 299, 244],
+                'G21': [489, 344, 399, 349, 899, 448],
+                'G22': [570, 255, 200, 250, 700, 557],
+                'G23': [490, 445, 599, 459, 990, 440],
+                'G24': [257, 220, 770, 270, 577, 225],
+                'G25': [267, 122, 177, 127, 677, 226],
+                'G26': [560, 100, 155, 150, 556, 600],
+                'G27': [237, 228, 778, 278, 377, 223],
+                'G28': [580, 300, 355, 350, 558, 800],
+                'G29': [590, 400, 455, 450, 559, 900],
+                'G30': [348, 339, 889, 389, 488, 334],
+                'G31': [227, 777, 277, 222],
+                'G32': [499, 444, 449, 999],
+                'G33': [166, 111, 116, 666],
+                'G34': [338, 888, 388, 333],
+                'G35': [500, 555, 550, 0]
+            };
+
+            // Helper function to find family for a number
+            function findFamily(numInt) {
+                for (const [family, numbers] of Object.entries(familyPanaNumbers)) {
+                    if (numbers.includes(numInt)) {
+                        return family;
+                    }
+                }
+                return null;
+            }
+
+            if (isMultipleMode) {
+                // Multiple set pana mode
+                const numbers = numberInput.split(',').map(n => n.trim()).filter(n => n !== '');
+                const validNumbers = numbers.filter(n => n.length === 3 && /^[0-9]{3}$/.test(n) && findFamily(parseInt(n)));
+
+                if (validNumbers.length === 0) {
+                    return showToast('Invalid Input', 'Please enter at least one valid 3-digit number from a family group', 'warning');
+                }
+
+                try {
+                    let totalBetsPlaced = 0;
+                    let allBetsData = [];
+                    let processedFamilies = [];
+
+                    // Place bets for each number (each number places bets for its family)
+                    for (const numStr of validNumbers) {
+                        const numInt = parseInt(numStr);
+                        const family = findFamily(numInt);
+
+                        const res = await fetch(API.PLACE_SET_PANA, {
+                            method: 'POST',
+                            headers: {
+                                'Content-Type': 'application/json',
+                                'X-CSRFToken': getCSRFToken()
+                            },
+                            body: JSON.stringify({
+                                number: numInt,
+                                amount: amount,
+                                bazar: currentBazar,
+                                date: currentDate
+                            })
+                        });
+                        const data = await res.json();
+                        if (data.success) {
+                            totalBetsPlaced += data.total_bets;
+                            allBetsData.push(data);
+                            processedFamilies.push(family);
+
+                            data.bets.forEach(bet => {
+                                const num = bet.number;
+                                if (!bets[num]) bets[num] = { total: 0, history: [] };
+                                bets[num].total += parseFloat(bet.amount);
+                                bets[num].history.push({
+                                    id: bet.bet_id,
+                                    amount: parseFloat(bet.amount),
+                                    bet_type: 'SET_PANA'
+                                });
+                                updateBetTotal(num);
+                            });
+                        }
+                    }
+
+                    if (totalBetsPlaced > 0) {
+                        lastBulkAction = {
+                            id: allBetsData[allBetsData.length - 1].bulk_action_id,
+                            type: 'SET_PANA',
+                            total_bets: totalBetsPlaced
+                        };
+                        showToast('Success!', `Multiple Set Pana: ${totalBetsPlaced} bets placed from ${processedFamilies.length} families (${processedFamilies.join(', ')})`, 'success');
+                        closeModal();
+                        renderPage(1);
+                        await getLastBulkAction();
+                        await updateTotalAmount();
+                        await refreshAllBetTotals();
+                        updateUndoButton();
+                    } else {
+                        showToast('Error', 'Failed to place any Set Pana bets', 'error');
+                    }
+                } catch (err) {
+                    console.error('Error placing Multiple Set Pana bets:', err);
+                    showToast('Error', 'Failed to place Set Pana bets', 'error');
+                }
+            } else {
+                // Single mode - original behavior
+                if (!numberInput || numberInput.length !== 3 || !/^[0-9]{3}$/.test(numberInput)) {
+                    return showToast('Invalid Input', 'Please enter exactly 3 digits', 'warning');
+                }
+                // Check if family info is displayed (means number is valid)
+                const familyInfoDiv = document.getElementById('setPanaFamilyInfo');
+                if (familyInfoDiv.classList.contains('hidden')) {
+                    return showToast('Invalid Number', 'Number not found in any family group', 'warning');
+                }
+                const familyName = document.getElementById('setPanaFamilyName').textContent;
+                try {
+                    // Call Django API to place all Set Pana bets in one transaction
+                    const res = await fetch(API.PLACE_SET_PANA, {
+                        method: 'POST',
+                        headers: {
+                            'Content-Type': 'application/json',
+                            'X-CSRFToken': getCSRFToken()
+                        },
+                        body: JSON.stringify({
+                            number: parseInt(numberInput),
+                            amount: amount,
+                            bazar: currentBazar,
+                            date: currentDate
+                        })
+                    });
+                    const data = await res.json();
+                    if (data.success) {
+                        data.bets.forEach(bet => {
+                            const num = bet.number;
+                            if (!bets[num]) bets[num] = { total: 0, history: [] };
+                            bets[num].total += parseFloat(bet.amount);
+                            bets[num].history.push({
+                                id: bet.bet_id,
+                                amount: parseFloat(bet.amount),
+                                bet_type: 'SET_PANA'
+                            });
+                            updateBetTotal(num);
+                        });
+                        lastBulkAction = {
+                            id: data.bulk_action_id,
+                            type: 'SET_PANA',
+                            total_bets: data.total_bets
+                        };
+                        showToast('Success!', `Set Pana: ${data.total_bets} bets placed for family ${familyName}`, 'success');
+                        closeModal();
+                        renderPage(1);
+                        await getLastBulkAction();
+                        await updateTotalAmount();
+                        await refreshAllBetTotals();
+                        updateUndoButton();
+                    } else {
+                        showToast('Error', data.error || 'Failed to place Set Pana bets', 'error');
+                    }
+                } catch (err) {
+                    console.error('Error placing Set Pana bets:', err);
+                    showToast('Error', 'Failed to place Set Pana bets', 'error');
+                }
+            }
+        } else if (currentBetType === 'GROUP') {
+            const digitsInput = document.getElementById('groupBetDigitsInput').value;
+            const isMultipleMode = document.getElementById('multipleGroupCheckbox').checked;
+
+            if (isMultipleMode) {
+                // Multiple group mode
+                const groups = digitsInput.split(',').map(g => g.trim()).filter(g => g !== '');
+                const validGroups = groups.filter(g => g.length === 2 && /^[0-9]{2}$/.test(g));
+
+                if (validGroups.length === 0) {
+                    return showToast('Invalid Input', 'Please enter at least one valid 2-digit group', 'warning');
+                }
+
+                try {
+                    let totalBetsPlaced = 0;
+                    let allBetsData = [];
+                    let processedGroups = [];
+
+                    // Place bets for each group
+                    for (const group of validGroups) {
+                        const d1 = parseInt(group[0]);
+                        const d2 = parseInt(group[1]);
+
+                        const res = await fetch(API.PLACE_GROUP, {
+                            method: 'POST',
+                            headers: {
+                                'Content-Type': 'application/json',
+                                'X-CSRFToken': getCSRFToken()
+                            },
+                            body: JSON.stringify({
+                                digit1: d1,
+                                digit2: d2,
+                                amount: amount,
+                                bazar: currentBazar,
+                                date: currentDate
+                            })
+                        });
+                        const data = await res.json();
+                        if (data.success) {
+                            totalBetsPlaced += data.total_bets;
+                            allBetsData.push(data);
+                            processedGroups.push(group);
+
+                            data.bets.forEach(bet => {
+                                const num = bet.number;
+                                if (!bets[num]) bets[num] = { total: 0, history: [] };
+                                bets[num].total += parseFloat(bet.amount);
+                                bets[num].history.push({
+                                    id: bet.bet_id,
+                                    amount: parseFloat(bet.amount),
+                                    bet_type: 'GROUP'
+                                });
+                                updateBetTotal(num);
+                            });
+                        }
+                    }
+
+                    if (totalBetsPlaced > 0) {
+                        lastBulkAction = {
+                            id: allBetsData[allBetsData.length - 1].bulk_action_id,
+                            type: 'GROUP',
+                            total_bets: totalBetsPlaced
+                        };
+                        showToast('Success!', `Multiple Group: ${totalBetsPlaced} bets placed from ${processedGroups.length} groups (${processedGroups.join(', ')})`, 'success');
+                        closeModal();
+                        renderPage(1);
+                        await getLastBulkAction();
+                        await updateTotalAmount();
+                        await refreshAllBetTotals();
+                        updateUndoButton();
+                    } else {
+                        showToast('Error', 'Failed to place any Group bets', 'error');
+                    }
+                } catch (err) {
+                    console.error('Error placing Multiple Group bets:', err);
+                    showToast('Error', 'Failed to place Group bets', 'error');
+                }
+            } else {
+                // Single group mode - original behavior
+                if (digitsInput.length !== 2) {
+                    return showToast('Invalid Input', 'Please enter exactly 2 digits', 'warning');
+                }
+
+                const d1 = parseInt(digitsInput[0]);
+                const d2 = parseInt(digitsInput[1]);
+
+                if (isNaN(d1) || isNaN(d2) || d1 < 0 || d1 > 9 || d2 < 0 || d2 > 9) {
+                    return showToast('Invalid Input', 'Please enter valid digits (0-9)', 'warning');
+                }
+
+                try {
+                    // Call Django API to place all Group bets in one transaction
+                    const res = await fetch(API.PLACE_GROUP, {
+                        method: 'POST',
+                        headers: {
+                            'Content-Type': 'application/json',
+                            'X-CSRFToken': getCSRFToken()
+                        },
+                        body: JSON.stringify({
+                            digit1: d1,
+                            digit2: d2,
+                            amount: amount,
+                            bazar: currentBazar,
+                            date: currentDate
+                        })
+                    });
+
+                    const data = await res.json();
+
+                    if (data.success) {
+                        // Update local bets data
+                        data.bets.forEach(bet => {
+                            const num = bet.number;
+                            if (!bets[num]) bets[num] = { total: 0, history: [] };
+                            bets[num].total += parseFloat(bet.amount);
+                            bets[num].history.push({
+                                id: bet.bet_id,
+                                amount: parseFloat(bet.amount),
+                                bet_type: 'GROUP'
+                            });
+                            updateBetTotal(num);
+                        });
+
+                        lastBulkAction = {
+                            id: data.bulk_action_id,
+                            type: 'GROUP',
+                            total_bets: data.total_bets
+                        };
+
+                        showToast('Success!', `Group Bet: ${data.total_bets} bets placed for digits ${d1} and ${d2}`, 'success');
+                        closeModal();
+                        renderPage(1);
+                        await getLastBulkAction();
+                        await updateTotalAmount();
+                        await refreshAllBetTotals();
+                        updateUndoButton();
+                    } else {
+                        showToast('Error', data.error || 'Failed to place Group bets', 'error');
+                    }
+                } catch (err) {
+                    console.error('Error placing Group bets:', err);
+                    showToast('Error', 'Failed to place Group bets', 'error');
+                }
+            }
+        } else if (currentBetType === 'COLUMN') {
+            const columns = getSelectedColumns('columnBetCheckbox');
+            if (columns.length === 0) {
+                return showToast('No Columns Selected', 'Please select at least one column', 'warning');
+            }
+            try {
+                let successCount = 0;
+                let failCount = 0;
+                for (const column of columns) {
+                    const res = await fetch(API.PLACE_COLUMN_BET, {
+                        method: 'POST',
+                        headers: {
+                            'Content-Type': 'application/json',
+                            'X-CSRFToken': getCSRFToken()
+                        },
+                        body: JSON.stringify({
+                            column: column,
+                            amount: amount,
+                            bazar: currentBazar,
+                            date: currentDate
+                        })
+                    });
+                    const data = await res.json();
+                    if (data.success) {
+                        successCount++;
+                    } else {
+                        failCount++;
+                    }
+                }
+                if (successCount > 0) {
+                    const columnText = columns.length > 1 ? `${columns.length} columns (${columns.join(', ')})` : `Column ${columns[0]}`;
+                    showToast('Success!', `Bet of ${amount} placed on ${columnText}`, 'success');
+                    closeModal();
+                    await updateTotalAmount();
+                    await refreshColumnTotals();
+                }
+                if (failCount > 0) {
+                    showToast('Warning', `${failCount} column bet(s) failed`, 'warning');
+                }
+            } catch (err) {
+                console.error('Error placing column bet:', err);
+                showToast('Error', 'Failed to place column bet', 'error');
+            }
+        }
+    };
+    // Undo button
+    undoBtn.onclick = undoBulkAction;
+    // Eki/Beki/Dadar type change listener to update undo button
+    document.getElementById('ekiBekiType').addEventListener('change', function () {
+        updateUndoButton();
+    });
+    // "Select All Columns" checkbox event listener
+    document.getElementById('selectAllColumnsCheckbox').addEventListener('change', function () {
+        let checkboxClass;
+        // Determine which checkboxes to select based on current bet type
+        if (currentBetType === 'ABR_CUT') {
+            checkboxClass = 'abrCutColumnCheckbox';
+        } else if (currentBetType === 'JODI') {
+            checkboxClass = 'jodiColumnCheckbox';
+        } else if (currentBetType === 'JODI_PANEL') {
+            checkboxClass = 'jodiPanelColumnCheckbox';
+        } else {
+            return;
+        }
+        if (this.checked) {
+            // Check all checkboxes
+            document.querySelectorAll(`.${checkboxClass}`).forEach(cb => {
+                cb.checked = true;
+            });
+            showToast('All Columns Selected', 'All 10 columns have been selected', 'success');
+        } else {
+            // Uncheck all checkboxes
+            document.querySelectorAll(`.${checkboxClass}`).forEach(cb => {
+                cb.checked = false;
+            });
+            showToast('Columns Cleared', 'All columns have been deselected', 'success');
+        }
+    });
+    // Page navigation
+    document.getElementById('page-1-btn').onclick = () => renderPage(1);
+    document.getElementById('page-2-btn').onclick = () => renderPage(2);
+    // Load saved limits from localStorage
+    const savedSpLimit = localStorage.getItem('spAmountLimit');
+    const savedDpLimit = localStorage.getItem('dpAmountLimit');
+    if (savedSpLimit) {
+        spAmountLimit = parseFloat(savedSpLimit);
+        document.getElementById('sp-limit-input').value = savedSpLimit;
+    }
+    if (savedDpLimit) {
+        dpAmountLimit = parseFloat(savedDpLimit);
+        document.getElementById('dp-limit-input').value = savedDpLimit;
+    }
+    // SP Limit Input
+    document.getElementById('sp-limit-input').addEventListener('input', function (e) {
+        const value = e.target.value;
+        if (value === '' || value === '0') {
+            spAmountLimit = null;
+            localStorage.removeItem('spAmountLimit');
+            highlightCellsByLimit();
+            return;
+        }
+        const numLimit = parseFloat(value);
+        if (!isNaN(numLimit) && numLimit > 0) {
+            spAmountLimit = numLimit;
+            localStorage.setItem('spAmountLimit', numLimit);
+            if (currentPage === 1) {
+                highlightCellsByLimit();
+            }
+        }
+    });
+    // DP Limit Input
+    document.getElementById('dp-limit-input').addEventListener('input', function (e) {
+        const value = e.target.value;
+        if (value === '' || value === '0') {
+            dpAmountLimit = null;
+            localStorage.removeItem('dpAmountLimit');
+            highlightCellsByLimit();
+            return;
+        }
+        const numLimit = parseFloat(value);
+        if (!isNaN(numLimit) && numLimit > 0) {
+            dpAmountLimit = numLimit;
+            localStorage.setItem('dpAmountLimit', numLimit);
+            if (currentPage === 2) {
+                highlightCellsByLimit();
+            }
+        }
+    });
+    // Function to highlight cells based on amount limit
+    function highlightCellsByLimit() {
+        // Remove all existing highlights first
+        document.querySelectorAll('.spreadsheet-cell').forEach(cell => {
+            cell.classList.remove('highlight-limit');
+        });
+        const limit = currentPage === 1 ? spAmountLimit : dpAmountLimit;
+        if (limit === null) return;
+        document.querySelectorAll('span[id^="bet-total-"]').forEach(betTotalSpan => {
+            const amount = parseFloat(betTotalSpan.textContent) || 0;
+            if (amount > 0 && amount >= limit) {
+                const cell = betTotalSpan.closest('.spreadsheet-cell');
+                if (cell) {
+                    cell.classList.add('highlight-limit');
+                }
+            }
+        });
+    }
+    // Bet action buttons
+    document.getElementById('all-sp-btn').onclick = () => {
+        openModal('SP', null, 'Place Bet on ALL SP (120 numbers)');
+    };
+    document.getElementById('all-dp-btn').onclick = () => {
+        openModal('DP', null, 'Place Bet on ALL DP (100 numbers)');
+    };
+    document.getElementById('jodi-btn').onclick = () => {
+        openModal('JODI', null, 'Jodi Vagar');
+    };
+    document.getElementById('eki-beki-btn').onclick = () => {
+        openModal('EKI_BEKI', null, 'Eki/Beki/Dadar');
+    };
+    document.getElementById('abr-cut-btn').onclick = () => {
+        openModal('ABR_CUT', null, 'ABR Cut');
+    };
+    document.getElementById('jodi-panel-btn').onclick = () => {
+        openModal('JODI_PANEL', null, 'Jodi Panel');
+    };
+    document.getElementById('motar-btn').onclick = () => {
+        openModal('MOTAR', null, 'Motar');
+    };
+    document.getElementById('comman-pana-btn').onclick = () => {
+        openModal('COMMAN_PANA', null, 'Common Bet');
+    };
+    document.getElementById('set-pana-btn').onclick = () => {
+        openModal('SET_PANA', null, 'Set Pana');
+    };
+    document.getElementById('column-bet-btn').onclick = () => {
+        openModal('COLUMN', null, 'Place Bet on Column Number');
+    };
+    document.getElementById('group-bet-btn').onclick = () => {
+        openModal('GROUP', null, 'Group Bet - Place on Numbers Containing Two Digits');
+    };
+
+    // Multiple Motar checkbox handler
+    document.getElementById('multipleMotarCheckbox').addEventListener('change', function() {
+        const motarInput = document.getElementById('motarNumberInput');
+        const inputLabel = document.getElementById('motarInputLabel');
+        const inputHint = document.getElementById('motarInputHint');
+
+        if (this.checked) {
+            motarInput.placeholder = 'e.g. 23456,56789,12345';
+            motarInput.maxLength = 100; // Allow longer input for multiple motars
+            inputLabel.textContent = 'Enter Multiple Numbers (comma separated)';
+            inputHint.textContent = 'Enter multiple 4-10 digit numbers separated by commas. Only digits and commas allowed.';
+        } else {
+            motarInput.placeholder = 'e.g. 4789';
+            motarInput.maxLength = 10;
+            inputLabel.textContent = 'Enter Number (4-10 digits)';
+            inputHint.textContent = 'Enter 4-10 digit number. Only digits 0-9 allowed.';
+        }
+        // Clear input and preview when toggling
+        motarInput.value = '';
+        document.getElementById('motarGeneratedNumbers').classList.add('hidden');
+    });
+
+    // Motar number input handler - call Django API for preview
+    document.getElementById('motarNumberInput').addEventListener('input', async function (e) {
+        const isMultipleMode = document.getElementById('multipleMotarCheckbox').checked;
+        const generatedDiv = document.getElementById('motarGeneratedNumbers');
+        const displayDiv = document.getElementById('motarNumbersDisplay');
+        const countSpan = document.getElementById('motarNumbersCount');
+
+        if (isMultipleMode) {
+            // Multiple motar mode - allow digits and commas
+            let value = e.target.value.replace(/[^0-9,]/g, '');
+            e.target.value = value;
+
+            // Split by comma and validate each motar
+            const motars = value.split(',').filter(m => m.trim() !== '');
+            const validMotars = motars.filter(m => m.length >= 4 && m.length <= 10);
+
+            if (validMotars.length > 0) {
+                try {
+                    // Call Django API for each motar and combine results
+                    let allNumbers = [];
+                    let motarLabels = [];
+
+                    for (const motar of validMotars) {
+                        const res = await fetch(motarNumbersUrl(motar));
+                        const data = await res.json();
+                        if (data.success) {
+                            motarLabels.push({ motar: motar, count: data.numbers.length });
+                            data.numbers.forEach(num => {
+                                if (!allNumbers.includes(num)) {
+                                    allNumbers.push(num);
+                                }
+                            });
+                        }
+                    }
+
+                    // Display generated numbers with motar breakdown
+                    let html = '';
+                    if (motarLabels.length > 1) {
+                        html += '<div class="text-xs text-gray-600 mb-2">';
+                        html += motarLabels.map(m => `<span class="inline-block mr-2 mb-1 px-2 py-0.5 bg-orange-200 rounded">${m.motar}: ${m.count} nums</span>`).join('');
+                        html += '</div>';
+                    }
+                    html += '<div class="flex flex-wrap gap-2">';
+                    html += allNumbers.sort().map(num =>
+                        `<span class="px-2 py-1 bg-orange-100 text-orange-800 rounded text-sm font-mono">${num}</span>`
+                    ).join('');
+                    html += '</div>';
+
+                    displayDiv.innerHTML = html;
+                    countSpan.textContent = allNumbers.length + ' (unique)';
+                    generatedDiv.classList.remove('hidden');
+                } catch (err) {
+                    console.error('Error generating Motar numbers:', err);
+                    generatedDiv.classList.add('hidden');
+                }
+            } else {
+                generatedDiv.classList.add('hidden');
+            }
+        } else {
+            // Single motar mode - original behavior
+            let value = e.target.value.replace(/[^0-9]/g, ''); // Only allow digits
+            e.target.value = value;
+
+            if (value.length >= 4 && value.length <= 10) {
+                try {
+                    // Call Django API to generate numbers
+                    const res = await fetch(motarNumbersUrl(value));
+                    const data = await res.json();
+                    if (data.success) {
+                        const numbers = data.numbers;
+                        // Display generated numbers
+                        displayDiv.innerHTML = numbers.map(num =>
+                            `<span class="px-2 py-1 bg-orange-100 text-orange-800 rounded text-sm font-mono">${num}</span>`
+                        ).join('');
+                        countSpan.textContent = numbers.length;
+                        generatedDiv.classList.remove('hidden');
+                    } else {
+                        generatedDiv.classList.add('hidden');
+                    }
+                } catch (err) {
+                    console.error('Error generating Motar numbers:', err);
+                    generatedDiv.classList.add('hidden');
+                }
+            } else {
+                generatedDiv.classList.add('hidden');
+            }
+        }
+    });
+    // Comman Pana digit input handler - call Django API for preview
+    document.getElementById('commanPanaDigitInput').addEventListener('input', async function (e) {
+        let value = e.target.value.replace(/[^0-9]/g, ''); // Only allow digits
+        if (value.length > 1) value = value.slice(0, 1); // Limit to 1 digit
+        e.target.value = value;
+        const generatedDiv = document.getElementById('commanPanaGeneratedNumbers');
+        const displayDiv = document.getElementById('commanPanaNumbersDisplay');
+        const countSpan = document.getElementById('commanPanaNumbersCount');
+        if (value.length === 1) {
+            // Check which type is selected
+            const is36Checked = document.getElementById('commanPana36Checkbox').checked;
+            const is56Checked = document.getElementById('commanPana56Checkbox').checked;
+            if (!is36Checked && !is56Checked) {
+                showToast('Select Type', 'Please select Common Pana 36 or 56', 'warning');
+                return;
+            }
+            const betType = is56Checked ? '56' : '36';
+            try {
+                // Call Django API to find numbers
+                const res = await fetch(commanPanaNumbersUrl(value, betType));
+                const data = await res.json();
+                if (data.success) {
+                    const numbers = data.numbers;
+                    // Display found numbers
+                    displayDiv.innerHTML = numbers.map(num =>
+                        `<span class="px-2 py-1 bg-blue-100 text-blue-800 rounded text-sm font-mono">${num}</span>`
+                    ).join('');
+                    countSpan.textContent = numbers.length;
+                    generatedDiv.classList.remove('hidden');
+                } else {
+                    generatedDiv.classList.add('hidden');
+                }
+            } catch (err) {
+                console.error('Error finding Common Pana numbers:', err);
+                generatedDiv.classList.add('hidden');
+            }
+        } else {
+            generatedDiv.classList.add('hidden');
+        }
+    });
+    // Add checkbox change listeners for Common Pana types
+    document.getElementById('commanPana36Checkbox').addEventListener('change', function () {
+        if (this.checked) {
+            document.getElementById('commanPana56Checkbox').checked = false;
+        }
+        // Trigger digit input to refresh numbers
+        const digitInput = document.getElementById('commanPanaDigitInput');
+        if (digitInput.value) {
+            digitInput.dispatchEvent(new Event('input'));
+        }
+    });
+    document.getElementById('commanPana56Checkbox').addEventListener('change', function () {
+        if (this.checked) {
+            document.getElementById('commanPana36Checkbox').checked = false;
+        }
+        // Trigger digit input to refresh numbers
+        const digitInput = document.getElementById('commanPanaDigitInput');
+        if (digitInput.value) {
+            digitInput.dispatchEvent(new Event('input'));
+        }
+    });
+
+    // Multiple Set Pana checkbox handler
+    document.getElementById('multipleSetPanaCheckbox').addEventListener('change', function() {
+        const setPanaInput = document.getElementById('setPanaNumberInput');
+        const inputLabel = document.getElementById('setPanaInputLabel');
+        const inputHint = document.getElementById('setPanaInputHint');
+        const familyInfoDiv = document.getElementById('setPanaFamilyInfo');
+
+        if (this.checked) {
+            setPanaInput.placeholder = 'e.g. 115,678,234';
+            setPanaInput.maxLength = 100; // Allow longer input for multiple numbers
+            inputLabel.textContent = 'Enter Multiple Numbers (comma separated)';
+            inputHint.textContent = 'Enter multiple 3-digit numbers separated by commas. Each number will place bets on its family group.';
+        } else {
+            setPanaInput.placeholder = 'e.g. 115, 156, 660';
+            setPanaInput.maxLength = 3;
+            inputLabel.textContent = 'Enter 3-Digit Number';
+            inputHint.textContent = 'Enter any 3-digit number from a family group (e.g., 115, 156, 110 are all in G17)';
+        }
+        // Clear input and preview when toggling
+        setPanaInput.value = '';
+        familyInfoDiv.classList.add('hidden');
+    });
+
+    // Set Pana number input handler - show family information
+    document.getElementById('setPanaNumberInput').addEventListener('input', function (e) {
+        const isMultipleMode = document.getElementById('multipleSetPanaCheckbox').checked;
+        const familyInfoDiv = document.getElementById('setPanaFamilyInfo');
+        const familyNameSpan = document.getElementById('setPanaFamilyName');
+        const familyNumbersDiv = document.getElementById('setPanaFamilyNumbers');
+        const countSpan = document.getElementById('setPanaFamilyCount');
+
+        // Family definitions
+        const familyPanaNumbers = {
+            'G1': [678, 123, 137, 268, 236, 178, 128, 367],
+            'G2': [345, 890, 390, 458, 480, 359, 589, 340],
+            'G3': [120, 567, 157, 260, 256, 170, 670, 125],
+            'G4': [789, 234, 239, 478, 248, 379, 347, 289],
+            'G5': [456, 190, 140, 569, 159, 460, 690, 145],
+            'G6': [245, 290, 470, 579, 790, 457, 259, 240],
+            'G7': [129, 147, 246, 679, 467, 269, 179, 124],
+            'G8': [139, 148, 346, 689, 468, 369, 189, 134],
+            'G9': [130, 158, 356, 680, 568, 360, 180, 135],
+            'G10': [230, 258, 357, 780, 578, 370, 280, 235],
+            'G11': [146, 119, 669, 169, 466, 114],
+            'G12': [138, 336, 688, 368, 188, 133],
+            'G13': [238, 337, 788, 378, 288, 233],
+            'G14': [149, 446, 699, 469, 199, 144],
+            'G15': [168, 113, 366, 136, 668, 118],
+            'G16': [380, 335, 588, 358, 880, 330],
+            'G17': [156, 110, 660, 160, 566, 115],
+            'G18': [247, 229, 779, 279, 477, 224],
+            'G19': [167, 112, 266, 126, 667, 117],
+            'G20': [249, 447, 799, 479, 299, 244],
+            'G21': [489, 344, 399, 349, 899, 448],
+            'G22': [570, 255, 200, 250, 700, 557],
+            'G23': [490, 445, 599, 459, 990, 440],
+            'G24': [257, 220, 770, 270, 577, 225],
+            'G25': [267, 122, 177, 127, 677, 226],
+            'G26': [560, 100, 155, 150, 556, 600],
+            'G27': [237, 228, 778, 278, 377, 223],
+            'G28': [580, 300, 355, 350, 558, 800],
+            'G29': [590, 400, 455, 450, 559, 900],
+            'G30': [348, 339, 889, 389, 488, 334],
+            'G31': [227, 777, 277, 222],
+            'G32': [499, 444, 449, 999],
+            'G33': [166, 111, 116, 666],
+            'G34': [338, 888, 388, 333],
+            'G35': [500, 555, 550, 0]
+        };
+
+        if (isMultipleMode) {
+            // Multiple mode - allow digits and commas
+            let value = e.target.value.replace(/[^0-9,]/g, '');
+            e.target.value = value;
+
+            const numbers = value.split(',').map(n => n.trim()).filter(n => n !== '');
+            const validNumbers = numbers.filter(n => n.length === 3 && /^[0-9]{3}$/.test(n));
+
+            if (validNumbers.length === 0) {
+                familyInfoDiv.classList.add('hidden');
+                return;
+            }
+
+            // Collect all families and their numbers
+            const allFamilies = [];
+            const allNumbers = new Set();
+            let totalCount = 0;
+
+            validNumbers.forEach(numStr => {
+                const numInt = parseInt(numStr);
+                for (const [family, nums] of Object.entries(familyPanaNumbers)) {
+                    if (nums.includes(numInt)) {
+                        if (!allFamilies.includes(family)) {
+                            allFamilies.push(family);
+                            nums.forEach(n => allNumbers.add(n));
+                            totalCount += nums.length;
+                        }
+                        break;
+                    }
+                }
+            });
+
+            if (allFamilies.length > 0) {
+                familyNameSpan.textContent = allFamilies.join(', ');
+                const numbersArray = Array.from(allNumbers).sort((a, b) => a - b);
+                familyNumbersDiv.innerHTML = numbersArray.map(num =>
+                    `<span class="px-2 py-1 bg-indigo-100 text-indigo-800 rounded text-sm font-mono">${String(num).padStart(3, '0')}</span>`
+                ).join('');
+                countSpan.textContent = totalCount + ' (from ' + allFamilies.length + ' families)';
+                familyInfoDiv.classList.remove('hidden');
+            } else {
+                familyInfoDiv.classList.add('hidden');
+            }
+        } else {
+            // Single mode - original behavior
+            let value = e.target.value.replace(/[^0-9]/g, '');
+            e.target.value = value;
+
+            if (value.length === 3) {
+                const numberInt = parseInt(value);
+                let foundFamily = null;
+                let foundNumbers = [];
+                for (const [family, numbers] of Object.entries(familyPanaNumbers)) {
+                    if (numbers.includes(numberInt)) {
+                        foundFamily = family;
+                        foundNumbers = numbers;
+                        break;
+                    }
+                }
+                if (foundFamily) {
+                    familyNameSpan.textContent = foundFamily;
+                    familyNumbersDiv.innerHTML = foundNumbers.map(num =>
+                        `<span class="px-2 py-1 ${num === numberInt ? 'bg-indigo-200 font-bold' : 'bg-indigo-100'} text-indigo-800 rounded text-sm font-mono">${String(num).padStart(3, '0')}</span>`
+                    ).join('');
+                    countSpan.textContent = foundNumbers.length;
+                    familyInfoDiv.classList.remove('hidden');
+                } else {
+                    familyInfoDiv.classList.add('hidden');
+                    showToast('Invalid Number', `Number ${value} is not in any family group`, 'error');
+                }
+            } else {
+                familyInfoDiv.classList.add('hidden');
+            }
+        }
+    });
+    // Add event listeners to all column checkboxes for visual feedback
+    function addCheckboxListeners(checkboxClass, highlightColor) {
+        document.querySelectorAll(`.${checkboxClass}`).forEach(checkbox => {
+            checkbox.addEventListener('change', function () {
+                const label = this.closest('label');
+                if (this.checked) {
+                    label.classList.add(`border-${highlightColor}-500`, `bg-${highlightColor}-50`);
+                    label.classList.remove('border-gray-300');
+                } else {
+                    label.classList.remove(`border-${highlightColor}-500`, `bg-${highlightColor}-50`);
+                    label.classList.add('border-gray-300');
+                }
+            });
+        });
+    }
+
+    // Multiple Group checkbox handler
+    document.getElementById('multipleGroupCheckbox').addEventListener('change', function() {
+        const groupInput = document.getElementById('groupBetDigitsInput');
+        const inputLabel = document.getElementById('groupInputLabel');
+        const inputHint = document.getElementById('groupInputHint');
+
+        if (this.checked) {
+            groupInput.placeholder = 'e.g. 23,56,89';
+            groupInput.maxLength = 100; // Allow longer input for multiple groups
+            inputLabel.textContent = 'Enter Multiple Groups (comma separated)';
+            inputHint.textContent = 'Enter multiple 2-digit groups separated by commas. Only digits and commas allowed.';
+        } else {
+            groupInput.placeholder = '00';
+            groupInput.maxLength = 2;
+            inputLabel.textContent = 'Enter Two Digits (e.g., 35, 99, 07)';
+            inputHint.textContent = 'Enter exactly 2 digits (0-9). First digit and second digit will be used for matching.';
+        }
+        // Clear input and preview when toggling
+        groupInput.value = '';
+        document.getElementById('groupBetPreview').textContent = 'Enter two digits to see matching numbers';
+        document.getElementById('groupBetCount').textContent = '0';
+    });
+
+    // Group Bet digit input handler - show preview of matching numbers
+    function updateGroupBetPreview() {
+        const digitsInput = document.getElementById('groupBetDigitsInput').value;
+        const previewDiv = document.getElementById('groupBetPreview');
+        const countSpan = document.getElementById('groupBetCount');
+        const isMultipleMode = document.getElementById('multipleGroupCheckbox').checked;
+
+        if (isMultipleMode) {
+            // Multiple mode - parse comma-separated groups
+            const groups = digitsInput.split(',').map(g => g.trim()).filter(g => g !== '');
+            const validGroups = groups.filter(g => g.length === 2 && /^[0-9]{2}$/.test(g));
+
+            if (validGroups.length === 0) {
+                previewDiv.textContent = 'Enter 2-digit groups separated by commas';
+                countSpan.textContent = '0';
+                return;
+            }
+
+            // Collect unique matching numbers from all groups
+            const allMatchingNumbers = new Set();
+            const groupBreakdown = [];
+
+            validGroups.forEach(group => {
+                const d1 = parseInt(group[0]);
+                const d2 = parseInt(group[1]);
+                const d1Str = String(d1);
+                const d2Str = String(d2);
+                let groupCount = 0;
+
+                validNumbers.forEach(numStr => {
+                    const digits = numStr.split('');
+                    if (digits.includes(d1Str) && digits.includes(d2Str)) {
+                        allMatchingNumbers.add(numStr);
+                        groupCount++;
+                    }
+                });
+                groupBreakdown.push(`${group}: ${groupCount}`);
+            });
+
+            const matchingArray = Array.from(allMatchingNumbers).sort();
+
+            if (matchingArray.length === 0) {
+                previewDiv.textContent = 'No matching numbers found';
+                countSpan.textContent = '0';
+            } else {
+                previewDiv.innerHTML = '';
+                // Show breakdown
+                const breakdownDiv = document.createElement('div');
+                breakdownDiv.className = 'mb-2 text-xs text-gray-500';
+                breakdownDiv.textContent = `Breakdown: ${groupBreakdown.join(', ')}`;
+                previewDiv.appendChild(breakdownDiv);
+                // Show numbers
+                matchingArray.forEach(num => {
+                    const badge = document.createElement('span');
+                    badge.className = 'inline-block bg-purple-100 text-purple-800 text-xs font-semibold px-2 py-1 rounded mr-1 mb-1';
+                    badge.textContent = num;
+                    previewDiv.appendChild(badge);
+                });
+                countSpan.textContent = matchingArray.length;
+            }
+        } else {
+            // Single mode - original behavior
+            if (digitsInput.length !== 2) {
+                previewDiv.textContent = 'Enter two digits to see matching numbers';
+                countSpan.textContent = '0';
+                return;
+            }
+
+            // Validate input
+            const d1 = parseInt(digitsInput[0]);
+            const d2 = parseInt(digitsInput[1]);
+
+            if (isNaN(d1) || isNaN(d2) || d1 < 0 || d1 > 9 || d2 < 0 || d2 > 9) {
+                previewDiv.textContent = 'Please enter valid digits (0-9)';
+                countSpan.textContent = '0';
+                return;
+            }
+
+            // Generate all 3-digit numbers containing both digits
+            const matchingNumbers = [];
+
+            // Iterate through all valid numbers and check if they contain both digits
+            validNumbers.forEach(numStr => {
+                const digits = numStr.split('');
+                const d1Str = String(d1);
+                const d2Str = String(d2);
+
+                // Check if the number contains both digit1 and digit2
+                if (digits.includes(d1Str) && digits.includes(d2Str)) {
+                    matchingNumbers.push(numStr);
+                }
+            });
+
+            // Sort and display
+            matchingNumbers.sort();
+
+            if (matchingNumbers.length === 0) {
+                previewDiv.textContent = 'No matching numbers found';
+                countSpan.textContent = '0';
+            } else {
+                // Create badge elements for each number
+                previewDiv.innerHTML = '';
+                matchingNumbers.forEach(num => {
+                    const badge = document.createElement('span');
+                    badge.className = 'inline-block bg-purple-100 text-purple-800 text-xs font-semibold px-2 py-1 rounded mr-1 mb-1';
+                    badge.textContent = num;
+                    previewDiv.appendChild(badge);
+                });
+                countSpan.textContent = matchingNumbers.length;
+            }
+        }
+    }
+
+    document.getElementById('groupBetDigitsInput').addEventListener('input', function (e) {
+        const isMultipleMode = document.getElementById('multipleGroupCheckbox').checked;
+        if (isMultipleMode) {
+            // Allow digits and commas in multiple mode
+            let value = e.target.value.replace(/[^0-9,]/g, '');
+            e.target.value = value;
+        } else {
+            // Only digits in single mode
+            let value = e.target.value.replace(/[^0-9]/g, '');
+            if (value.length > 2) value = value.slice(0, 2);
+            e.target.value = value;
+        }
+        updateGroupBetPreview();
+    });
+
+    // Add listeners for all checkbox types
+    addCheckboxListeners('betColumnCheckbox', 'indigo');
+    addCheckboxListeners('jodiColumnCheckbox', 'purple');
+    addCheckboxListeners('abrCutColumnCheckbox', 'pink');
+    addCheckboxListeners('jodiPanelColumnCheckbox', 'teal');
+    addCheckboxListeners('columnBetCheckbox', 'emerald');
+    // Quick Bet Entry functionality
+    let quickBetRowCounter = 2;
+    const validNumbers = new Set();
+    // Build valid numbers set from ALL_COLUMN_DATA (already defined above)
+    allColumnData.forEach(column => {
+        column.forEach(num => {
+            let numStr = String(num);
+            // Pad numbers to 3 digits (e.g., 0 becomes '000', 1 becomes '001')
+            if (numStr.length < 3) {
+                numStr = numStr.padStart(3, '0');
+            }
+            validNumbers.add(numStr);
+        });
+    });
+    document.addEventListener('input', function (e) {
+        if (e.target.classList.contains('quick-bet-number')) {
+            const input = e.target;
+            const rowNum = input.dataset.row;
+            input.value = input.value.replace(/[^0-9]/g, '');
+            // Check if it's a valid 3-digit number
+            if (input.value.length === 3) {
+                if (!validNumbers.has(input.value)) {
+                    input.classList.add('border-red-500', 'bg-red-50');
+                    showToast('Invalid Number', `${input.value} is not in the allowed numbers list`, 'error');
+                } else {
+                    input.classList.remove('border-red-500', 'bg-red-50');
+                    input.classList.add('border-green-500', 'bg-green-50');
+                }
+            } else {
+                input.classList.remove('border-red-500', 'bg-red-50', 'border-green-500', 'bg-green-50');
+            }
+            // Auto-add new row when user starts typing in the last row
+            const allRows = document.querySelectorAll('#quickBetTableBody tr');
+            const lastRow = allRows[allRows.length - 1];
+            const lastRowNum = parseInt(lastRow.dataset.row);
+            if (parseInt(rowNum) === lastRowNum && input.value.length > 0) {
+                addQuickBetRow();
+            }
+        }
+    });
+    document.addEventListener('keydown', function (e) {
+        if (e.key === 'Enter') {
+            const target = e.target;
+            // Check if it's a quick bet input field
+            if (target.classList.contains('quick-bet-number') || target.classList.contains('quick-bet-amount')) {
+                e.preventDefault(); // Prevent form submission
+                const currentRow = parseInt(target.dataset.row);
+                const isNumberField = target.classList.contains('quick-bet-number');
+                // Check if "same amount" checkbox is checked
+                const sameAmountCheckbox = document.getElementById('sameAmountCheckbox');
+                if (isNumberField) {
+                    // If checkbox is checked, skip to next row's number field
+                    if (sameAmountCheckbox.checked) {
+                        const nextRow = currentRow + 1;
+                        let nextNumberInput = document.querySelector(`.quick-bet-number[data-row="${nextRow}"]`);
+                        // If next row doesn't exist, create it
+                        if (!nextNumberInput) {
+                            addQuickBetRow();
+                            nextNumberInput = document.querySelector(`.quick-bet-number[data-row="${nextRow}"]`);
+                        }
+                        if (nextNumberInput) {
+                            nextNumberInput.focus();
+                        }
+                    } else {
+                        // Normal behavior: Jump from number field to amount field in same row
+                        const amountInput = document.querySelector(`.quick-bet-amount[data-row="${currentRow}"]`);
+                        if (amountInput) {
+                            amountInput.focus();
+                        }
+                    }
+                } else {
+                    // Jump from amount field to number field in next row
+                    const nextRow = currentRow + 1;
+                    let nextNumberInput = document.querySelector(`.quick-bet-number[data-row="${nextRow}"]`);
+                    // If next row doesn't exist, create it
+                    if (!nextNumberInput) {
+                        addQuickBetRow();
+                        nextNumberInput = document.querySelector(`.quick-bet-number[data-row="${nextRow}"]`);
+                    }
+                    if (nextNumberInput) {
+                        nextNumberInput.focus();
+                    }
+                }
+            }
+        }
+    });
+    // Same Amount Checkbox - auto-fill amounts from first row
+    document.getElementById('sameAmountCheckbox').addEventListener('change', function () {
+        if (this.checked) {
+            const firstAmountInput = document.querySelector('.quick-bet-amount[data-row="1"]');
+            const firstAmount = firstAmountInput.value;
+            if (firstAmount && parseFloat(firstAmount) > 0) {
+                // Fill all other amount fields with the same value
+                const allAmountInputs = document.querySelectorAll('.quick-bet-amount');
+                allAmountInputs.forEach(input => {
+                    if (input.dataset.row !== '1') {
+                        input.value = firstAmount;
+                        input.readOnly = true;
+                        input.classList.add('bg-gray-100');
+                    }
+                });
+                showToast('Same Amount Applied', `All amounts set to ${firstAmount}`, 'success');
+            } else {
+                showToast('Enter Amount First', 'Please enter an amount in the first row', 'warning');
+                this.checked = false;
+            }
+        } else {
+            // Re-enable all amount fields
+            const allAmountInputs = document.querySelectorAll('.quick-bet-amount');
+            allAmountInputs.forEach(input => {
+                if (input.dataset.row !== '1') {
+                    input.readOnly = false;
+                    input.classList.remove('bg-gray-100');
+                }
+            });
+        }
+    });
+    // Watch first row amount input - update others when checkbox is checked
+    document.addEventListener('input', function (e) {
+        if (e.target.classList.contains('quick-bet-amount') && e.target.dataset.row === '1') {
+            const sameAmountCheckbox = document.getElementById('sameAmountCheckbox');
+            if (sameAmountCheckbox.checked) {
+                const firstAmount = e.target.value;
+                const allAmountInputs = document.querySelectorAll('.quick-bet-amount');
+                allAmountInputs.forEach(input => {
+                    if (input.dataset.row !== '1') {
+                        input.value = firstAmount;
+                    }
+                });
+            }
+        }
+    });
+    // Add new row to quick bet table
+    function addQuickBetRow() {
+        quickBetRowCounter++;
+        const tbody = document.getElementById('quickBetTableBody');
+        const newRow = document.createElement('tr');
+        newRow.dataset.row = quickBetRowCounter;
+        newRow.innerHTML = `
+                <td class="border border-gray-300 px-2 py-2 text-center text-sm font-medium text-gray-600">${quickBetRowCounter}</td>
+                <td class="border border-gray-300 p-1">
+                    <input type="text" 
+                        class="quick-bet-number w-full px-2 py-1 text-sm border border-gray-300 rounded focus:outline-none focus:ring-2 focus:ring-indigo-500" 
+                        placeholder="3-digit" 
+                        maxlength="3"
+                        data-row="${quickBetRowCounter}">
+                </td>
+                <td class="border border-gray-300 p-1">
+                    <input type="number" 
+                        class="quick-bet-amount w-full px-2 py-1 text-sm border border-gray-300 rounded focus:outline-none focus:ring-2 focus:ring-indigo-500" 
+                        placeholder="Amount"
+                        min="1"
+                        data-row="${quickBetRowCounter}">
+                </td>
+                <td class="border border-gray-300 p-1 text-center">
+                    <button class="remove-row-btn text-red-500 hover:text-red-700 hover:bg-red-50 rounded p-1 transition" title="Remove row">
+                        <svg xmlns="http://www.w3.org/2000/svg" class="h-4 w-4" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M6 18L18 6M6 6l12 12" />
+                        </svg>
+                    </button>
+                </td>
+            `;
+        tbody.appendChild(newRow);
+        // If "same amount" checkbox is checked, apply the first row's amount to new row
+        const sameAmountCheckbox = document.getElementById('sameAmountCheckbox');
+        if (sameAmountCheckbox.checked) {
+            const firstAmountInput = document.querySelector('.quick-bet-amount[data-row="1"]');
+            const firstAmount = firstAmountInput.value;
+            if (firstAmount) {
+                const newAmountInput = newRow.querySelector('.quick-bet-amount');
+                newAmountInput.value = firstAmount;
+                newAmountInput.readOnly = true;
+                newAmountInput.classList.add('bg-gray-100');
+            }
+        }
+    }
+    // Remove row button event listener (event delegation)
+    document.getElementById('quickBetTableBody').addEventListener('click', function (e) {
+        const removeBtn = e.target.closest('.remove-row-btn');
+        if (removeBtn) {
+            const row = removeBtn.closest('tr');
+            const tbody = document.getElementById('quickBetTableBody');
+            // Prevent removing if only one row left
+            if (tbody.querySelectorAll('tr').length <= 1) {
+                showToast('Cannot Remove', 'At least one row must remain', 'warning');
+                return;
+            }
+            row.remove();
+            // Re-number remaining rows
+            const remainingRows = tbody.querySelectorAll('tr');
+            remainingRows.forEach((row, index) => {
+                const rowNum = index + 1;
+                row.dataset.row = rowNum;
+                row.querySelector('td:first-child').textContent = rowNum;
+                row.querySelectorAll('input').forEach(input => {
+                    input.dataset.row = rowNum;
+                });
+            });
+            quickBetRowCounter = remainingRows.length;
+            // If "same amount" checkbox is checked and we removed a row, re-apply the logic
+            const sameAmountCheckbox = document.getElementById('sameAmountCheckbox');
+            if (sameAmountCheckbox.checked) {
+                const firstAmountInput = document.querySelector('.quick-bet-amount[data-row="1"]');
+                const firstAmount = firstAmountInput.value;
+                if (firstAmount) {
+                    const allAmountInputs = document.querySelectorAll('.quick-bet-amount');
+                    allAmountInputs.forEach(input => {
+                        if (input.dataset.row !== '1') {
+                            input.value = firstAmount;
+                            input.readOnly = true;
+                            input.classList.add('bg-gray-100');
+                        }
+                    });
+                }
+            }
+        }
+    });
+    // Place bets button
+    document.getElementById('quickBetOkayBtn').addEventListener('click', async function () {
+        const numberInputs = document.querySelectorAll('.quick-bet-number');
+        const amountInputs = document.querySelectorAll('.quick-bet-amount');
+        const betsToPlace = [];
+        console.log('Quick Bet: Starting validation for', numberInputs.length, 'rows');
+        console.log('Valid numbers count:', validNumbers.size);
+        for (let i = 0; i < numberInputs.length; i++) {
+            const number = numberInputs[i].value.trim();
+            const amount = amountInputs[i].value.trim();
+            if (number && amount) {
+                // Validate number
+                if (number.length !== 3) {
+                    showToast('Invalid Entry', `Row ${i + 1}: Number must be 3 digits`, 'error');
+                    return;
+                }
+                if (!validNumbers.has(number)) {
+                    console.error(`Number ${number} not in validNumbers set`);
+                    showToast('Invalid Number', `Row ${i + 1}: ${number} is not allowed`, 'error');
+                    return;
+                }
+                // Validate amount
+                const amountNum = parseFloat(amount);
+                if (isNaN(amountNum) || amountNum <= 0) {
+                    showToast('Invalid Amount', `Row ${i + 1}: Amount must be greater than 0`, 'error');
+                    return;
+                }
+                betsToPlace.push({ number, amount: amountNum });
+            } else if (number || amount) {
+                // One field filled but not the other
+                showToast('Incomplete Entry', `Row ${i + 1}: Please fill both number and amount`, 'warning');
+                return;
+            }
+        }
+        if (betsToPlace.length === 0) {
+            showToast('No Bets', 'Please enter at least one bet', 'warning');
+            return;
+        }
+        console.log('Quick Bet: Placing', betsToPlace.length, 'bets');
+        // Show loader before placing bets
+        showLoader('Placing bets...');
+        // Place all bets
+        let successCount = 0;
+        let failCount = 0;
+        const failedBets = [];
+        try {
+            for (const bet of betsToPlace) {
+                try {
+                    const response = await fetch(API.PLACE_BET, {
+                        method: 'POST',
+                        headers: {
+                            'Content-Type': 'application/json',
+                            'X-CSRFToken': getCSRFToken()
+                        },
+                        body: JSON.stringify({
+                            number: bet.number,
+                            amount: bet.amount,
+                            bazar: currentBazar,
+                            date: currentDate
+                        })
+                    });
+                    const result = await response.json();
+                    if (result.success) {
+                        successCount++;
+                        const num = bet.number;
+                        if (!bets[num]) bets[num] = { total: 0, history: [] };
+                        bets[num].total += parseFloat(bet.amount);
+                        bets[num].history.push({
+                            id: result.bet_id,
+                            amount: parseFloat(bet.amount),
+                            created_at: new Date().toISOString(),
+                            bet_type: 'SINGLE'
+                        });
+                        updateBetTotal(num);
+                    } else {
+                        failCount++;
+                        failedBets.push(`${bet.number} (${bet.amount})`);
+                        console.error('Bet failed:', result.error || 'Unknown error');
+                    }
+                } catch (error) {
+                    failCount++;
+                    failedBets.push(`${bet.number} (${bet.amount})`);
+                    console.error('Bet error:', error);
+                }
+            }
+        } finally {
+            hideLoader();
+        }
+        if (successCount > 0 && failCount === 0) {
+            showToast('Success!', `${successCount} bet(s) placed successfully`, 'success');
+            document.getElementById('quickBetClearBtn').click();
+            // Reload bets and update total
+            await loadBets();
+            await updateTotalAmount();
+            await refreshAllBetTotals();
+            renderPage(1);
+        } else if (successCount > 0 && failCount > 0) {
+            showToast('Partial Success', `${successCount} bet(s) placed, ${failCount} failed: ${failedBets.join(', ')}`, 'warning');
+            // Reload bets and update total
+            await loadBets();
+            await updateTotalAmount();
+            await refreshAllBetTotals();
+            renderPage(1);
+        } else if (failCount > 0) {
+            showToast('Failed', `All ${failCount} bet(s) failed to place: ${failedBets.join(', ')}`, 'error');
+        }
+    });
+    document.getElementById('quickBetClearBtn').addEventListener('click', function () {
+        const tbody = document.getElementById('quickBetTableBody');
+        tbody.innerHTML = `
+                <tr data-row="1">
+                    <td class="border border-gray-300 px-2 py-2 text-center text-sm font-medium text-gray-600">1</td>
+                    <td class="border border-gray-300 p-1">
+                        <input type="text" 
+                            class="quick-bet-number w-full px-2 py-1 text-sm border border-gray-300 rounded focus:outline-none focus:ring-2 focus:ring-indigo-500" 
+                            placeholder="3-digit" 
+                            maxlength="3"
+                            data-row="1">
+                    </td>
+                    <td class="border border-gray-300 p-1">
+                        <input type="number" 
+                            class="quick-bet-amount w-full px-2 py-1 text-sm border border-gray-300 rounded focus:outline-none focus:ring-2 focus:ring-indigo-500" 
+                            placeholder="Amount"
+                            min="1"
+                            data-row="1">
+                    </td>
+                    <td class="border border-gray-300 p-1 text-center">
+                        <button class="remove-row-btn text-red-500 hover:text-red-700 hover:bg-red-50 rounded p-1 transition" title="Remove row">
+                            <svg xmlns="http://www.w3.org/2000/svg" class="h-4 w-4" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M6 18L18 6M6 6l12 12" />
+                            </svg>
+                        </button>
+                    </td>
+                </tr>
+                <tr data-row="2">
+                    <td class="border border-gray-300 px-2 py-2 text-center text-sm font-medium text-gray-600">2</td>
+                    <td class="border border-gray-300 p-1">
+                        <input type="text" 
+                            class="quick-bet-number w-full px-2 py-1 text-sm border border-gray-300 rounded focus:outline-none focus:ring-2 focus:ring-indigo-500" 
+                            placeholder="3-digit" 
+                            maxlength="3"
+                            data-row="2">
+                    </td>
+                    <td class="border border-gray-300 p-1">
+                        <input type="number" 
+                            class="quick-bet-amount w-full px-2 py-1 text-sm border border-gray-300 rounded focus:outline-none focus:ring-2 focus:ring-indigo-500" 
+                            placeholder="Amount"
+                            min="1"
+                            data-row="2">
+                    </td>
+                    <td class="border border-gray-300 p-1 text-center">
+                        <button class="remove-row-btn text-red-500 hover:text-red-700 hover:bg-red-50 rounded p-1 transition" title="Remove row">
+                            <svg xmlns="http://www.w3.org/2000/svg" class="h-4 w-4" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M6 18L18 6M6 6l12 12" />
+                            </svg>
+                        </button>
+                    </td>
+                </tr>
+            `;
+        quickBetRowCounter = 2;
+        // Uncheck the "same amount" checkbox
+        const sameAmountCheckbox = document.getElementById('sameAmountCheckbox');
+        sameAmountCheckbox.checked = false;
+    });
+    // Toggle Quick Bet Container
+    document.getElementById('toggleQuickBetBtn').addEventListener('click', function () {
+        const container = document.getElementById('quickBetContainer');
+        container.classList.toggle('hidden');
+    });
+    document.getElementById('closeQuickBetBtn').addEventListener('click', function () {
+        document.getElementById('quickBetContainer').classList.add('hidden');
+    });
+
+    // ========== BULK PASTE FUNCTIONALITY ==========
+    let parsedBulkBets = []; // Store parsed bets for confirmation
+
+    // ========== VOICE INPUT FUNCTIONALITY ==========
+    let voiceRecognition = null;
+    let voiceDetectedNumbers = [];
+    let isVoiceListening = false;
+    let voiceContinuousMode = false; // Keep listening until manually stopped
+
+    // Check if voice input is supported
+    const voiceSupported = 'webkitSpeechRecognition' in window || 'SpeechRecognition' in window;
+
+    // Initialize voice recognition if supported
+    if (voiceSupported) {
+        const SpeechRecognition = window.SpeechRecognition || window.webkitSpeechRecognition;
+        voiceRecognition = new SpeechRecognition();
+        voiceRecognition.continuous = true;
+        voiceRecognition.interimResults = true;
+        voiceRecognition.maxAlternatives = 3;
+
+        // Set initial language
+        voiceRecognition.lang = document.getElementById('voiceLanguageSelector')?.value || 'en-US';
+
+        voiceRecognition.onstart = function() {
+            isVoiceListening = true;
+            voiceContinuousMode = true; // Enable continuous mode when starting
+            const voiceBtn = document.getElementById('voiceInputBtn');
+            const stopBtn = document.getElementById('voiceStopBtn');
+            const micIcon = document.getElementById('voiceMicIcon');
+            const waveAnimation = document.getElementById('voiceWaveAnimation');
+            const statusText = document.getElementById('voiceStatusText');
+
+            voiceBtn.classList.add('listening');
+            voiceBtn.classList.add('hidden'); // Hide start button
+            stopBtn?.classList.remove('hidden'); // Show stop button
+            micIcon.classList.add('hidden');
+            waveAnimation.classList.remove('hidden');
+            statusText.textContent = 'Listening... Speak your bets';
+            statusText.classList.add('text-green-600');
+            statusText.classList.remove('text-gray-600');
+        };
+
+        voiceRecognition.onend = function() {
+            isVoiceListening = false;
+
+            // Auto-restart if continuous mode is enabled
+            if (voiceContinuousMode) {
+                setTimeout(() => {
+                    try {
+                        voiceRecognition.start();
+                    } catch (e) {
+                        console.log('Restart failed, retrying...', e);
+                        setTimeout(() => voiceRecognition.start(), 100);
+                    }
+                }, 50);
+                return; // Don't update UI, keep showing listening state
+            }
+
+            const voiceBtn = document.getElementById('voiceInputBtn');
+            const stopBtn = document.getElementById('voiceStopBtn');
+            const micIcon = document.getElementById('voiceMicIcon');
+            const waveAnimation = document.getElementById('voiceWaveAnimation');
+            const statusText = document.getElementById('voiceStatusText');
+
+            voiceBtn.classList.remove('listening', 'processing');
+            voiceBtn.classList.remove('hidden');
+            stopBtn?.classList.add('hidden');
+            micIcon.classList.remove('hidden');
+            waveAnimation.classList.add('hidden');
+            statusText.textContent = 'Tap to start speaking';
+            statusText.classList.remove('text-green-600');
+            statusText.classList.add('text-gray-600');
+        };
+
+        voiceRecognition.onresult = function(event) {
+            let transcript = '';
+            let isFinal = false;
+
+            for (let i = event.resultIndex; i < event.results.length; i++) {
+                transcript += event.results[i][0].transcript;
+                if (event.results[i].isFinal) {
+                    isFinal = true;
+                }
+            }
+
+            // Update transcript display
+            const transcriptDisplay = document.getElementById('voiceTranscript');
+            transcriptDisplay.textContent = transcript || 'Listening...';
+            transcriptDisplay.classList.remove('error');
+
+            if (isFinal) {
+                // Extract numbers from transcript
+                processVoiceTranscript(transcript);
+            }
+        };
+
+        voiceRecognition.onerror = function(event) {
+            console.error('Voice recognition error:', event.error);
+            const transcriptDisplay = document.getElementById('voiceTranscript');
+            const statusText = document.getElementById('voiceStatusText');
+            const voiceBtn = document.getElementById('voiceInputBtn');
+            const stopBtn = document.getElementById('voiceStopBtn');
+
+            let errorMessage = 'Error occurred';
+            let shouldStopContinuous = false;
+
+            switch(event.error) {
+                case 'no-speech':
+                    errorMessage = 'No speech detected. Still listening...';
+                    // Don't stop continuous mode for no-speech, it will auto-restart
+                    break;
+                case 'audio-capture':
+                    errorMessage = 'No microphone found.';
+                    shouldStopContinuous = true;
+                    break;
+                case 'not-allowed':
+                    errorMessage = 'Microphone access denied. Please allow microphone.';
+                    shouldStopContinuous = true;
+                    break;
+                case 'network':
+                    errorMessage = 'Network error. Check your connection.';
+                    shouldStopContinuous = true;
+                    break;
+                case 'aborted':
+                    // User stopped, don't show error
+                    return;
+            }
+
+            if (shouldStopContinuous) {
+                voiceContinuousMode = false;
+                voiceBtn?.classList.remove('hidden');
+                stopBtn?.classList.add('hidden');
+                transcriptDisplay.textContent = errorMessage;
+                transcriptDisplay.classList.add('error');
+                statusText.textContent = 'Error - Tap to retry';
+                showToast('Voice Error', errorMessage, 'error');
+            }
+        };
+    }
+
+    // Process voice transcript to extract numbers
+    function processVoiceTranscript(transcript) {
+        // Word to number mapping for various languages
+        const wordToNumber = {
+            // English
+            'zero': '0', 'one': '1', 'two': '2', 'three': '3', 'four': '4',
+            'five': '5', 'six': '6', 'seven': '7', 'eight': '8', 'nine': '9',
+            'ten': '10', 'eleven': '11', 'twelve': '12', 'thirteen': '13',
+            'fourteen': '14', 'fifteen': '15', 'sixteen': '16', 'seventeen': '17',
+            'eighteen': '18', 'nineteen': '19', 'twenty': '20',
+            'thirty': '30', 'forty': '40', 'fifty': '50', 'sixty': '60',
+            'seventy': '70', 'eighty': '80', 'ninety': '90', 'hundred': '100',
+            // Hindi
+            'शून्य': '0', 'एक': '1', 'दो': '2', 'तीन': '3', 'चार': '4',
+            'पांच': '5', 'छह': '6', 'सात': '7', 'आठ': '8', 'नौ': '9', 'दस': '10',
+            // Common variations
+            'to': '2', 'too': '2', 'for': '4', 'fore': '4', 'won': '1',
+            'tree': '3', 'ate': '8', 'niner': '9', 'oh': '0'
+        };
+
+        // Clean and process transcript
+        let processedText = transcript.toLowerCase().trim();
+
+        // Replace word numbers with digits
+        for (const [word, digit] of Object.entries(wordToNumber)) {
+            const regex = new RegExp(`\\b${word}\\b`, 'gi');
+            processedText = processedText.replace(regex, digit);
+        }
+
+        // Extract all numbers (1-3 digits)
+        const numberMatches = processedText.match(/\d{1,3}/g) || [];
+
+        // Filter and validate numbers
+        const newNumbers = numberMatches
+            .map(num => num.padStart(3, '0'))
+            .filter(num => {
+                // Only accept 3-digit numbers (padded)
+                const numInt = parseInt(num);
+                return numInt >= 0 && numInt <= 999;
+            });
+
+        // Add to detected numbers (avoid duplicates)
+        newNumbers.forEach(num => {
+            if (!voiceDetectedNumbers.includes(num)) {
+                voiceDetectedNumbers.push(num);
+            }
+        });
+
+        updateVoiceNumbersPreview();
+    }
+
+    // Update the voice numbers preview display
+    function updateVoiceNumbersPreview() {
+        const previewContainer = document.getElementById('voiceNumbersPreview');
+        const placeBetsBtn = document.getElementById('voicePlaceBetsBtn');
+
+        if (voiceDetectedNumbers.length === 0) {
+            previewContainer.innerHTML = '<span class="text-gray-400 text-sm">Numbers will appear here...</span>';
+            placeBetsBtn.disabled = true;
+            return;
+        }
+
+        let html = '';
+        voiceDetectedNumbers.forEach(num => {
+            const isValid = validNumbers.has(num);
+            html += `<span class="voice-number-chip ${isValid ? '' : 'invalid'}" data-number="${num}">${num}${isValid ? '' : ' ❌'}</span>`;
+        });
+
+        previewContainer.innerHTML = html;
+
+        // Enable place bets button if there are valid numbers
+        const validCount = voiceDetectedNumbers.filter(num => validNumbers.has(num)).length;
+        placeBetsBtn.disabled = validCount === 0;
+
+        if (validCount > 0) {
+            showToast('Numbers Detected', `${validCount} valid number(s) found`, 'success');
+        }
+    }
+
+    // Voice button click handler - Start listening
+    document.getElementById('voiceInputBtn')?.addEventListener('click', function() {
+        if (!voiceSupported) {
+            showToast('Not Supported', 'Voice input is not supported in this browser', 'error');
+            return;
+        }
+
+        // Check if voice input is enabled
+        const voiceEnabled = document.getElementById('enableVoiceInputToggle')?.checked ?? true;
+        if (!voiceEnabled) {
+            showToast('Voice Disabled', 'Enable voice input in settings first', 'warning');
+            return;
+        }
+
+        // Update language before starting
+        voiceRecognition.lang = document.getElementById('voiceLanguageSelector')?.value || 'en-US';
+        voiceContinuousMode = true;
+        voiceRecognition.start();
+    });
+
+    // Voice Stop button click handler - Stop listening
+    document.getElementById('voiceStopBtn')?.addEventListener('click', function() {
+        voiceContinuousMode = false; // Disable continuous mode
+        if (isVoiceListening) {
+            voiceRecognition.stop();
+        }
+        showToast('Stopped', 'Voice input stopped', 'success');
+    });
+
+    // Voice language selector change handler
+    document.getElementById('voiceLanguageSelector')?.addEventListener('change', function() {
+        if (voiceRecognition) {
+            voiceRecognition.lang = this.value;
+            if (isVoiceListening) {
+                voiceRecognition.stop();
+                setTimeout(() => voiceRecognition.start(), 100);
+            }
+        }
+    });
+
+    // Voice clear button handler
+    document.getElementById('voiceClearBtn')?.addEventListener('click', function() {
+        voiceDetectedNumbers = [];
+        document.getElementById('voiceTranscript').innerHTML = '<span class="text-gray-400">Your spoken numbers will appear here...</span>';
+        updateVoiceNumbersPreview();
+        showToast('Cleared', 'Voice input cleared', 'success');
+    });
+
+    // Voice place bets button handler
+    document.getElementById('voicePlaceBetsBtn')?.addEventListener('click', async function() {
+        const validNums = voiceDetectedNumbers.filter(num => validNumbers.has(num));
+        const amount = parseFloat(document.getElementById('voiceBetAmount')?.value) || 10;
+
+        if (validNums.length === 0) {
+            showToast('No Valid Numbers', 'Please speak some valid 3-digit numbers', 'warning');
+            return;
+        }
+
+        if (amount <= 0) {
+            showToast('Invalid Amount', 'Please enter a valid amount', 'warning');
+            return;
+        }
+
+        showLoader();
+
+        // Get current bazar and date
+        const currentBazar = document.getElementById('bazarSelectorSidebar')?.value || 'SRIDEVI_OPEN';
+        const currentDate = document.getElementById('dateSelectorSidebar')?.value || new Date().toISOString().split('T')[0];
+
+        // Place bets for each number
+        const betsToPlace = validNums.map(num => ({
+            number: num,
+            amount: amount
+        }));
+
+        try {
+            const response = await fetch(API.PLACE_QUICK_BETS, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': getCSRFToken()
+                },
+                body: JSON.stringify({
+                    bets: betsToPlace,
+                    bazar: currentBazar,
+                    date: currentDate
+                })
+            });
+
+            const data = await response.json();
+
+            if (data.success) {
+                showToast('Bets Placed!', `${validNums.length} bet(s) placed via voice`, 'success');
+                // Clear voice input
+                voiceDetectedNumbers = [];
+                document.getElementById('voiceTranscript').innerHTML = '<span class="text-gray-400">Your spoken numbers will appear here...</span>';
+                updateVoiceNumbersPreview();
+                // Reload bets
+                if (typeof loadBetsForCurrentPage === 'function') {
+                    loadBetsForCurrentPage();
+                }
+                if (typeof loadTotalBalance === 'function') {
+                    loadTotalBalance();
+                }
+            } else {
+                showToast('Error', data.error || 'Failed to place bets', 'error');
+            }
+        } catch (error) {
+            console.error('Error placing voice bets:', error);
+            showToast('Error', 'Failed to place bets. Please try again.', 'error');
+        } finally {
+            hideLoader();
+        }
+    });
+
+    // Mode Toggle Handlers (Updated for Voice Mode)
+    function switchQuickBetMode(mode) {
+        const manualBtn = document.getElementById('manualModeBtn');
+        const voiceBtn = document.getElementById('voiceModeBtn');
+        const bulkBtn = document.getElementById('bulkPasteModeBtn');
+        const manualMode = document.getElementById('manualEntryMode');
+        const voiceMode = document.getElementById('voiceInputMode');
+        const bulkMode = document.getElementById('bulkPasteMode');
+
+        // Reset all buttons
+        [manualBtn, voiceBtn, bulkBtn].forEach(btn => {
+            btn?.classList.remove('bg-white', 'text-indigo-700', 'shadow-sm');
+            btn?.classList.add('text-gray-600');
+        });
+
+        // Hide all modes
+        manualMode?.classList.add('hidden');
+        voiceMode?.classList.add('hidden');
+        bulkMode?.classList.add('hidden');
+
+        // Activate selected mode
+        switch(mode) {
+            case 'manual':
+                manualBtn?.classList.add('bg-white', 'text-indigo-700', 'shadow-sm');
+                manualBtn?.classList.remove('text-gray-600');
+                manualMode?.classList.remove('hidden');
+                break;
+            case 'voice':
+                voiceBtn?.classList.add('bg-white', 'text-indigo-700', 'shadow-sm');
+                voiceBtn?.classList.remove('text-gray-600');
+                voiceMode?.classList.remove('hidden');
+                // Check browser support
+                if (!voiceSupported) {
+                    document.getElementById('voiceNotSupported')?.classList.remove('hidden');
+                    document.getElementById('voiceInputUI')?.classList.add('hidden');
+                } else {
+                    document.getElementById('voiceNotSupported')?.classList.add('hidden');
+                    document.getElementById('voiceInputUI')?.classList.remove('hidden');
+                }
+                break;
+            case 'bulk':
+                bulkBtn?.classList.add('bg-white', 'text-indigo-700', 'shadow-sm');
+                bulkBtn?.classList.remove('text-gray-600');
+                bulkMode?.classList.remove('hidden');
+                // Reset to input phase
+                document.getElementById('bulkPasteInput')?.classList.remove('hidden');
+                document.getElementById('bulkPastePreview')?.classList.add('hidden');
+                break;
+        }
+    }
+
+    document.getElementById('manualModeBtn').addEventListener('click', function() {
+        switchQuickBetMode('manual');
+    });
+
+    document.getElementById('voiceModeBtn')?.addEventListener('click', function() {
+        // Check if voice input is enabled in settings
+        const voiceEnabled = document.getElementById('enableVoiceInputToggle')?.checked ?? true;
+        if (!voiceEnabled) {
+            showToast('Voice Disabled', 'Enable voice input in settings sidebar first', 'warning');
+            return;
+        }
+        switchQuickBetMode('voice');
+    });
+
+    document.getElementById('bulkPasteModeBtn').addEventListener('click', function() {
+        switchQuickBetMode('bulk');
+    });
+
+    // Voice Input Toggle Handler
+    document.getElementById('enableVoiceInputToggle')?.addEventListener('change', function() {
+        const voiceModeBtn = document.getElementById('voiceModeBtn');
+        if (this.checked) {
+            voiceModeBtn?.classList.remove('opacity-50', 'cursor-not-allowed');
+            showToast('Voice Enabled', 'Voice input is now enabled', 'success');
+        } else {
+            voiceModeBtn?.classList.add('opacity-50', 'cursor-not-allowed');
+            // If currently in voice mode, switch to manual
+            if (!document.getElementById('voiceInputMode')?.classList.contains('hidden')) {
+                switchQuickBetMode('manual');
+            }
+            showToast('Voice Disabled', 'Voice input is now disabled', 'warning');
+        }
+    });
+
+    // Clear Bulk Data
+    document.getElementById('clearBulkDataBtn').addEventListener('click', function() {
+        document.getElementById('bulkPasteTextarea').value = '';
+        parsedBulkBets = [];
+    });
+
+    // Parse Bulk Data
+    document.getElementById('parseBulkDataBtn').addEventListener('click', function() {
+        const textarea = document.getElementById('bulkPasteTextarea');
+        const rawData = textarea.value.trim();
+
+        if (!rawData) {
+            showToast('Empty Input', 'Please paste some bet data first', 'warning');
+            return;
+        }
+
+        // Parse the data
+        const lines = rawData.split(/[\n\r]+/).filter(line => line.trim());
+        parsedBulkBets = [];
+        const numberCounts = {}; // Track duplicates
+
+        lines.forEach((line, index) => {
+            const trimmedLine = line.trim();
+            if (!trimmedLine) return;
+
+            let number = '';
+            let amount = 0;
+            let isValid = true;
+            let error = '';
+
+            // Try to parse the line - supports . + * x / as delimiters
+            const delimiterMatch = trimmedLine.match(/^(\d+)[.+*x\/](\d+)$/i);
+            if (delimiterMatch) {
+                number = delimiterMatch[1].trim();
+                amount = parseFloat(delimiterMatch[2]) || 0;
+            } else if (/[.+*x\/]/i.test(trimmedLine)) {
+                // Has delimiter but invalid format
+                const parts = trimmedLine.split(/[.+*x\/]/i);
+                number = parts[0].trim();
+                amount = parseFloat(parts[1]) || 0;
+            } else {
+                // Try parsing as just a number (user might have forgotten amount)
+                number = trimmedLine;
+                amount = 0;
+                isValid = false;
+                error = 'Missing amount';
+            }
+
+            // Pad number to 3 digits
+            if (number.length < 3 && number.length > 0) {
+                number = number.padStart(3, '0');
+            }
+
+            // Validate number
+            if (number.length !== 3 || !/^\d{3}$/.test(number)) {
+                isValid = false;
+                error = 'Invalid number format';
+            } else if (!validNumbers.has(number)) {
+                isValid = false;
+                error = 'Number not in allowed list';
+            }
+
+            // Validate amount
+            if (isValid && (isNaN(amount) || amount <= 0)) {
+                isValid = false;
+                error = 'Invalid amount';
+            }
+
+            // Track for duplicates
+            if (number) {
+                numberCounts[number] = (numberCounts[number] || 0) + 1;
+            }
+
+            parsedBulkBets.push({
+                lineNumber: index + 1,
+                rawLine: trimmedLine,
+                number: number,
+                amount: amount,
+                isValid: isValid,
+                error: error,
+                isDuplicate: false
+            });
+        });
+
+        // Mark duplicates
+        parsedBulkBets.forEach(bet => {
+            if (bet.number && numberCounts[bet.number] > 1) {
+                bet.isDuplicate = true;
+            }
+        });
+
+        // Render preview
+        renderBulkPreview();
+
+        // Show preview phase, hide input phase
+        document.getElementById('bulkPasteInput').classList.add('hidden');
+        document.getElementById('bulkPastePreview').classList.remove('hidden');
+    });
+
+    // Render Bulk Preview Table
+    function renderBulkPreview() {
+        const tbody = document.getElementById('bulkPreviewTableBody');
+        tbody.innerHTML = '';
+
+        let validCount = 0;
+        let invalidCount = 0;
+        let totalAmount = 0;
+        let duplicateCount = 0;
+        const seenNumbers = new Set();
+
+        parsedBulkBets.forEach((bet, index) => {
+            const row = document.createElement('tr');
+
+            // Determine row styling
+            let rowClass = '';
+            if (!bet.isValid) {
+                rowClass = 'bg-red-50';
+                invalidCount++;
+            } else if (bet.isDuplicate) {
+                rowClass = 'bg-amber-50';
+                if (!seenNumbers.has(bet.number)) {
+                    seenNumbers.add(bet.number);
+                } else {
+                    duplicateCount++;
+                }
+                validCount++;
+                totalAmount += bet.amount;
+            } else {
+                rowClass = index % 2 === 0 ? 'bg-white' : 'bg-gray-50';
+                validCount++;
+                totalAmount += bet.amount;
+            }
+
+            // Status badge
+            let statusBadge = '';
+            if (!bet.isValid) {
+                statusBadge = `<span class="inline-flex items-center px-2 py-0.5 rounded-full text-xs font-medium bg-red-100 text-red-700" title="${bet.error}">
+                    <svg class="w-3 h-3 mr-1" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                        <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M6 18L18 6M6 6l12 12"></path>
+                    </svg>
+                    Invalid
+                </span>`;
+            } else if (bet.isDuplicate) {
+                statusBadge = `<span class="inline-flex items-center px-2 py-0.5 rounded-full text-xs font-medium bg-amber-100 text-amber-700">
+                    <svg class="w-3 h-3 mr-1" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                        <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M8 16H6a2 2 0 01-2-2V6a2 2 0 012-2h8a2 2 0 012 2v2m-6 12h8a2 2 0 002-2v-8a2 2 0 00-2-2h-8a2 2 0 00-2 2v8a2 2 0 002 2z"></path>
+                    </svg>
+                    Dupe
+                </span>`;
+            } else {
+                statusBadge = `<span class="inline-flex items-center px-2 py-0.5 rounded-full text-xs font-medium bg-green-100 text-green-700">
+                    <svg class="w-3 h-3 mr-1" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                        <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 13l4 4L19 7"></path>
+                    </svg>
+                    Valid
+                </span>`;
+            }
+
+            row.className = rowClass;
+            row.innerHTML = `
+                <td class="px-2 py-1.5 text-center text-xs text-gray-500">${bet.lineNumber}</td>
+                <td class="px-2 py-1.5 text-left">
+                    <span class="font-mono font-semibold ${bet.isValid ? 'text-gray-800' : 'text-red-600'}">${bet.number || '-'}</span>
+                    ${!bet.isValid ? `<div class="text-xs text-red-500">${bet.error}</div>` : ''}
+                </td>
+                <td class="px-2 py-1.5 text-right font-medium ${bet.isValid ? 'text-green-600' : 'text-gray-400'}">
+                    ${bet.isValid ? '₹' + bet.amount : '-'}
+                </td>
+                <td class="px-2 py-1.5 text-center">${statusBadge}</td>
+            `;
+
+            tbody.appendChild(row);
+        });
+
+        // Update stats
+        document.getElementById('validBetsCount').textContent = validCount;
+        document.getElementById('invalidBetsCount').textContent = invalidCount;
+        document.getElementById('totalBulkAmount').textContent = '₹' + totalAmount.toLocaleString();
+
+        // Show/hide duplicates warning
+        const duplicatesWarning = document.getElementById('duplicatesWarning');
+        const actualDuplicates = Object.values(parsedBulkBets.reduce((acc, bet) => {
+            if (bet.isValid && bet.number) {
+                acc[bet.number] = (acc[bet.number] || 0) + 1;
+            }
+            return acc;
+        }, {})).filter(count => count > 1).length;
+
+        if (actualDuplicates > 0) {
+            duplicatesWarning.classList.remove('hidden');
+            document.getElementById('duplicateCount').textContent = actualDuplicates;
+        } else {
+            duplicatesWarning.classList.add('hidden');
+        }
+
+        // Enable/disable confirm button
+        const confirmBtn = document.getElementById('confirmBulkBetsBtn');
+        if (validCount === 0) {
+            confirmBtn.disabled = true;
+            confirmBtn.classList.add('opacity-50', 'cursor-not-allowed');
+        } else {
+            confirmBtn.disabled = false;
+            confirmBtn.classList.remove('opacity-50', 'cursor-not-allowed');
+        }
+    }
+
+    // Back to Input
+    document.getElementById('backToInputBtn').addEventListener('click', function() {
+        document.getElementById('bulkPasteInput').classList.remove('hidden');
+        document.getElementById('bulkPastePreview').classList.add('hidden');
+    });
+
+    // Show Confirmation Modal
+    document.getElementById('confirmBulkBetsBtn').addEventListener('click', function() {
+        const validBets = parsedBulkBets.filter(bet => bet.isValid);
+        const totalAmount = validBets.reduce((sum, bet) => sum + bet.amount, 0);
+
+        // Update modal content
+        document.getElementById('confirmBetCount').textContent = validBets.length;
+        document.getElementById('confirmTotalAmount').textContent = '₹' + totalAmount.toLocaleString();
+        document.getElementById('confirmBetCountText').textContent = validBets.length;
+        document.getElementById('confirmTotalAmountText').textContent = '₹' + totalAmount.toLocaleString();
+
+        // Show modal
+        document.getElementById('bulkBetConfirmModal').classList.remove('hidden');
+        document.getElementById('bulkBetConfirmModal').classList.add('flex');
+    });
+
+    // Cancel Confirmation
+    document.getElementById('cancelBulkConfirmBtn').addEventListener('click', function() {
+        document.getElementById('bulkBetConfirmModal').classList.add('hidden');
+        document.getElementById('bulkBetConfirmModal').classList.remove('flex');
+    });
+
+    // Final Confirm and Place Bets
+    document.getElementById('finalConfirmBulkBtn').addEventListener('click', async function() {
+        // Close modal
+        document.getElementById('bulkBetConfirmModal').classList.add('hidden');
+        document.getElementById('bulkBetConfirmModal').classList.remove('flex');
+
+        const validBets = parsedBulkBets.filter(bet => bet.isValid);
+
+        if (validBets.length === 0) {
+            showToast('No Valid Bets', 'No valid bets to place', 'warning');
+            return;
+        }
+
+        // Show loader
+        showLoader(`Placing ${validBets.length} bets...`);
+
+        let successCount = 0;
+        let failCount = 0;
+        const failedBets = [];
+
+        try {
+            for (const bet of validBets) {
+                try {
+                    const response = await fetch(API.PLACE_BET, {
+                        method: 'POST',
+                        headers: {
+                            'Content-Type': 'application/json',
+                            'X-CSRFToken': getCSRFToken()
+                        },
+                        body: JSON.stringify({
+                            number: bet.number,
+                            amount: bet.amount,
+                            bazar: currentBazar,
+                            date: currentDate
+                        })
+                    });
+
+                    const result = await response.json();
+                    if (result.success) {
+                        successCount++;
+                        const num = bet.number;
+                        if (!bets[num]) bets[num] = { total: 0, history: [] };
+                        bets[num].total += parseFloat(bet.amount);
+                        bets[num].history.push({
+                            id: result.bet_id,
+                            amount: parseFloat(bet.amount),
+                            created_at: new Date().toISOString(),
+                            bet_type: 'SINGLE'
+                        });
+                        updateBetTotal(num);
+                    } else {
+                        failCount++;
+                        failedBets.push(`${bet.number}`);
+                    }
+                } catch (error) {
+                    failCount++;
+                    failedBets.push(`${bet.number}`);
+                    console.error('Bulk bet error:', error);
+                }
+            }
+        } finally {
+            hideLoader();
+        }
+
+        // Show results
+        if (successCount > 0 && failCount === 0) {
+            showToast('All Bets Placed!', `Successfully placed ${successCount} bet(s)`, 'success');
+            // Clear and reset
+            document.getElementById('bulkPasteTextarea').value = '';
+            parsedBulkBets = [];
+            document.getElementById('bulkPasteInput').classList.remove('hidden');
+            document.getElementById('bulkPastePreview').classList.add('hidden');
+            // Reload data
+            await loadBets();
+            await updateTotalAmount();
+            await refreshAllBetTotals();
+            renderPage(1);
+        } else if (successCount > 0 && failCount > 0) {
+            showToast('Partial Success', `${successCount} placed, ${failCount} failed: ${failedBets.slice(0, 5).join(', ')}${failedBets.length > 5 ? '...' : ''}`, 'warning');
+            await loadBets();
+            await updateTotalAmount();
+            await refreshAllBetTotals();
+            renderPage(1);
+        } else {
+            showToast('All Failed', `Failed to place ${failCount} bet(s)`, 'error');
+        }
+    });
+
+    // Close modal on overlay click
+    document.getElementById('bulkBetConfirmModal').addEventListener('click', function(e) {
+        if (e.target === this) {
+            this.classList.add('hidden');
+            this.classList.remove('flex');
+        }
+    });
+
+    // ========== END BULK PASTE FUNCTIONALITY ==========
+
+    // Shared page API handed to the lazily loaded panels
+    const panelApp = {
+        API,
+        bazarNames,
+        showToast,
+        showLoader,
+        hideLoader,
+        getCSRFToken,
+        TIMES_VERSION,
+        setServerTimeZone,
+        formatBetTime,
+        loadBets,
+        updateTotalAmount,
+        refreshAllBetTotals,
+        getLastBulkAction,
+        renderPage,
+        get currentBazar() { return currentBazar; },
+        get currentDate() { return currentDate; },
+    };
+    async function withPanel(name, callback) {
+        try {
+            callback(await loadPanel(name, panelApp));
+        } catch (err) {
+            console.error(`Error loading ${name} panel:`, err);
+            showToast('Error', 'Failed to load panel. Please try again.', 'error');
+        }
+    }
+
+    // History Modal (lazy bundle: panels/history.js)
+    document.getElementById('toggleHistoryBtn').addEventListener('click', function () {
+        withPanel('history', history => history.open());
+    });
+    // Sidebar functions
+    const sidebar = document.getElementById('sidebar');
+    const sidebarOverlay = document.getElementById('sidebarOverlay');
+    const openSidebarBtn = document.getElementById('openSidebar');
+    const closeSidebarBtn = document.getElementById('closeSidebar');
+    const bazarSelectorSidebar = document.getElementById('bazarSelectorSidebar');
+    const dateSelectorSidebar = document.getElementById('dateSelectorSidebar');
+    function openSidebar() {
+        sidebar.classList.add('active');
+        sidebarOverlay.classList.add('active');
+        openSidebarBtn.classList.add('active');
+        document.body.style.overflow = 'hidden';
+        // Database storage meter (lazy bundle: panels/storage.js)
+        withPanel('storage', storage => storage.refresh());
+        loadBazarOverview();
+    }
+    function closeSidebar() {
+        sidebar.classList.remove('active');
+        sidebarOverlay.classList.remove('active');
+        openSidebarBtn.classList.remove('active');
+        document.body.style.overflow = '';
+    }
+    openSidebarBtn.addEventListener('click', openSidebar);
+    closeSidebarBtn.addEventListener('click', closeSidebar);
+    sidebarOverlay.addEventListener('click', closeSidebar);
+    // Toggle button for showing all bet types
+    const showAllBetTypesToggle = document.getElementById('showAllBetTypesToggle');
+    const betButtonsContainer = document.getElementById('betButtonsContainer');
+    // Function to update button visibility based on toggle state
+    function updateBetButtonsVisibility() {
+        if (showAllBetTypesToggle && betButtonsContainer) {
+            if (showAllBetTypesToggle.checked) {
+                // Toggle ON - Show buttons
+                betButtonsContainer.classList.remove('hidden');
+            } else {
+                // Toggle OFF - Hide buttons
+                betButtonsContainer.classList.add('hidden');
+            }
+        }
+    }
+    // Initial visibility check on page load
+    updateBetButtonsVisibility();
+    if (showAllBetTypesToggle) {
+        showAllBetTypesToggle.addEventListener('change', function () {
+            updateBetButtonsVisibility();
+            showToast('Button Visibility', showAllBetTypesToggle.checked ? 'All bet type buttons visible' : 'Bet type buttons hidden', 'info');
+        });
+    }
+    // Date population is now handled by Django template (see date_options in views.py)
+    // No need for JavaScript date generation
+    function updateBazarDateDisplay() {
+        const bazarDisplay = document.getElementById('currentBazarDisplay');
+        const dateDisplay = document.getElementById('currentDateDisplay');
+        const bazarDisplaySidebar = document.getElementById('currentBazarDisplaySidebar');
+        const dateDisplaySidebar = document.getElementById('currentDateDisplaySidebar');
+        const displayText = bazarNames[currentBazar];
+        const dateText = dateSelectorSidebar.options[dateSelectorSidebar.selectedIndex].text;
+        bazarDisplay.textContent = displayText;
+        dateDisplay.textContent = dateText;
+        bazarDisplaySidebar.textContent = displayText;
+        dateDisplaySidebar.textContent = dateText;
+        // Sync selectors
+        bazarSelectorSidebar.value = currentBazar;
+        dateSelectorSidebar.value = currentDate;
+    }
+    bazarSelectorSidebar.addEventListener('change', async function (e) {
+        const newBazar = e.target.value;
+        // Prevent duplicate execution
+        if (newBazar === currentBazar) {
+            return;
+        }
+        try {
+            showLoader('Switching bazar...');
+            console.log('Switching from', currentBazar, 'to', newBazar);
+            currentBazar = newBazar;
+            // Save to localStorage to persist across page refreshes
+            localStorage.setItem('selectedBazar', newBazar);
+            updateBazarDateDisplay();
+            // Close sidebar
+            closeSidebar();
+            bets = {};
+            // Clear element cache on bazar change
+            betTotalElementCache.clear();
+            tbody.innerHTML = '<tr><td colspan="10" class="text-center py-8 text-gray-500">Loading...</td></tr>';
+            currentPage = 1;
+            // Reload all data for new bazar in one request
+            updateLoader('Loading bets...');
+            await loadBookSnapshot();
+            updateLoader('Complete!');
+            hideLoader();
+            showToast('Bazar Changed', `Switched to ${bazarNames[currentBazar]}`, 'success');
+            console.log('Bazar switch complete');
+        } catch (error) {
+            console.error('Error switching bazar:', error);
+            hideLoader();
+            showToast('Error', 'Failed to switch bazar. Please try again.', 'error');
+            // Revert to previous bazar on error
+            e.target.value = currentBazar;
+            updateBazarDateDisplay();
+        }
+    });
+    // Date change handler (sidebar)
+    dateSelectorSidebar.addEventListener('change', async function (e) {
+        const newDate = e.target.value;
+        // Prevent duplicate execution
+        if (newDate === currentDate) {
+            return;
+        }
+        try {
+            showLoader('Loading data...');
+            console.log('Changing from', currentDate, 'to', newDate);
+            currentDate = newDate;
+            updateBazarDateDisplay();
+            // Close sidebar
+            closeSidebar();
+            bets = {};
+            // Clear element cache on date change
+            betTotalElementCache.clear();
+            tbody.innerHTML = '<tr><td colspan="10" class="text-center py-8 text-gray-500">Loading...</td></tr>';
+            currentPage = 1;
+            // Reload all data for new date in one request
+            updateLoader('Loading bets...');
+            await loadBookSnapshot();
+            updateLoader('Complete!');
+            hideLoader();
+            const selectedText = e.target.options[e.target.selectedIndex].text;
+            showToast('Date Changed', `Showing data for ${selectedText}`, 'success');
+            console.log('Date change complete');
+        } catch (error) {
+            console.error('Error changing date:', error);
+            hideLoader();
+            showToast('Error', 'Failed to load data. Please try again.', 'error');
+            // Revert to previous date on error
+            e.target.value = currentDate;
+            updateBazarDateDisplay();
+        }
+    });
+    // Initialize dates
+    // Initial setup - dates are pre-populated by Django
+    updateBazarDateDisplay();
+    // Restore bazar selector to saved value
+    if (bazarSelectorSidebar) bazarSelectorSidebar.value = currentBazar;
+    const refreshBalanceBtn = document.getElementById('refreshBalanceBtn');
+    const refreshBalanceBtnMobile = document.getElementById('refreshBalanceBtnMobile');
+    if (refreshBalanceBtn) {
+        refreshBalanceBtn.addEventListener('click', async () => {
+            refreshBalanceBtn.classList.add('animate-spin');
+            await updateTotalAmount();
+            setTimeout(() => refreshBalanceBtn.classList.remove('animate-spin'), 500);
+            showToast('Balance Updated', 'Total balance has been refreshed', 'success');
+        });
+    }
+    if (refreshBalanceBtnMobile) {
+        refreshBalanceBtnMobile.addEventListener('click', async () => {
+            refreshBalanceBtnMobile.classList.add('animate-spin');
+            await updateTotalAmount();
+            setTimeout(() => refreshBalanceBtnMobile.classList.remove('animate-spin'), 500);
+            showToast('Balance Updated', 'Total balance has been refreshed', 'success');
+        });
+    }
+    renderPage(1);
+
+    // Set up periodic polling for multi-device synchronization
+    // Use longer interval and throttle to reduce server load
+    let syncInterval = null;
+    let isPageVisible = true;
+
+    // Only sync when page is visible
+    document.addEventListener('visibilitychange', () => {
+        isPageVisible = !document.hidden;
+        if (isPageVisible && !syncInterval) {
+            startSync();
+        } else if (!isPageVisible && syncInterval) {
+            clearInterval(syncInterval);
+            syncInterval = null;
+        }
+    });
+
+    function startSync() {
+        syncInterval = setInterval(async () => {
+            if (isPageVisible) {
+                try {
+                    await refreshAllBetTotals({ poll: true });
+                } catch (err) {
+                    console.error('Sync error:', err);
+                }
+            }
+        }, 15000); // 15 seconds (increased from 10)
+    }
+
+    startSync();
+
+    window.addEventListener('beforeunload', () => {
+        if (syncInterval) clearInterval(syncInterval);
+    });
+
+    // Initialize - the whole book in one request
+    showLoader('Initializing...');
+    try {
+        updateLoader('Loading bets...');
+        await loadBookSnapshot();
+        updateLoader('Ready!');
+    } catch (err) {
+        console.error('Initialization error:', err);
+    } finally {
+        setTimeout(() => hideLoader(), 300);
+    }
+
+    // Master Delete / Delete Bazar dialogs (lazy bundle: panels/danger-zone.js)
+    window.showMasterDeleteConfirmation = function () {
+        withPanel('dangerZone', dangerZone => dangerZone.showMasterDeleteConfirmation());
+    };
+    window.showDeleteBazarConfirmation = function () {
+        withPanel('dangerZone', dangerZone => dangerZone.showDeleteBazarConfirmation());
+    };
+}); // End of DOMContentLoaded
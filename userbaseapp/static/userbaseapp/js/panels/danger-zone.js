@@ -0,0 +1,252 @@
+// Master Delete and Delete Bazar confirmation dialogs - loaded on first use by home.js
+window.BettingPanels = window.BettingPanels || {};
+window.BettingPanels.dangerZone = function (app) {
+    const { API, bazarNames, showToast, showLoader, hideLoader, getCSRFToken, updateTotalAmount, refreshAllBetTotals, renderPage } = app;
+
+    async function showMasterDeleteConfirmation() {
+        const modal = document.getElementById('masterDeleteModal');
+        const checkbox = document.getElementById('confirmDeleteCheckbox');
+        const passwordInput = document.getElementById('deletePassword');
+        const confirmBtn = document.getElementById('confirmMasterDeleteBtn');
+        const totalBetsCount = document.getElementById('totalBetsCount');
+
+        if (!modal || !checkbox || !passwordInput || !confirmBtn || !totalBetsCount) {
+            showToast('Error', 'Modal elements not found. Please refresh the page.', 'error');
+            return;
+        }
+
+        // Show loading in count while fetching
+        totalBetsCount.textContent = '...';
+
+        // Fetch actual count from database
+        try {
+            const response = await fetch(API.GET_TOTAL_BET_COUNT, {
+                method: 'GET',
+                headers: {
+                    'X-CSRFToken': getCSRFToken()
+                }
+            });
+
+            if (response.ok) {
+                const data = await response.json();
+                if (data.success) {
+                    totalBetsCount.textContent = data.total_count;
+                } else {
+                    totalBetsCount.textContent = '0';
+                    showToast('Error', 'Failed to fetch bet count', 'error');
+                }
+            } else {
+                totalBetsCount.textContent = '0';
+                showToast('Error', 'Failed to fetch bet count', 'error');
+            }
+        } catch (error) {
+            console.error('Error fetching bet count:', error);
+            totalBetsCount.textContent = '0';
+            showToast('Error', 'Failed to fetch bet count', 'error');
+        }
+
+        // Reset form
+        checkbox.checked = false;
+        passwordInput.value = '';
+        passwordInput.disabled = true;
+        confirmBtn.disabled = true;
+
+        // Show modal
+        modal.classList.remove('hidden');
+        modal.classList.add('flex');
+
+        // Setup checkbox listener
+        checkbox.onchange = function () {
+            passwordInput.disabled = !this.checked;
+            if (this.checked) {
+                passwordInput.focus();
+            } else {
+                passwordInput.value = '';
+            }
+            updateDeleteButtonState();
+        };
+
+        // Setup password input listener
+        passwordInput.oninput = updateDeleteButtonState;
+    }
+
+    window.updateDeleteButtonState = function () {
+        const checkbox = document.getElementById('confirmDeleteCheckbox');
+        const passwordInput = document.getElementById('deletePassword');
+        const confirmBtn = document.getElementById('confirmMasterDeleteBtn');
+
+        confirmBtn.disabled = !(checkbox.checked && passwordInput.value.length > 0);
+    }
+
+    window.cancelMasterDelete = function () {
+        const modal = document.getElementById('masterDeleteModal');
+        modal.classList.add('hidden');
+        modal.classList.remove('flex');
+    }
+
+    // Delete Bazar Database Functions
+    async function showDeleteBazarConfirmation() {
+        const modal = document.getElementById('deleteBazarModal');
+        const checkbox = document.getElementById('confirmBazarDeleteCheckbox');
+        const confirmBtn = document.getElementById('confirmBazarDeleteBtn');
+
+        // Reset modal state
+        checkbox.checked = false;
+        confirmBtn.disabled = true;
+
+        // Update bazar name and date display
+        document.getElementById('deleteBazarName').textContent = bazarNames[app.currentBazar] || app.currentBazar;
+        document.getElementById('deleteBazarDate').textContent = app.currentDate;
+
+        // Fetch bet count for current bazar and date
+        try {
+            const response = await fetch(`${API.LOAD_BETS}?bazar=${app.currentBazar}&date=${app.currentDate}`, { cache: 'no-cache' });
+            const data = await response.json();
+            if (data.success) {
+                let totalBets = 0;
+                for (const [number, betData] of Object.entries(data.bets)) {
+                    if (betData.history && Array.isArray(betData.history)) {
+                        totalBets += betData.history.length;
+                    }
+                }
+                document.getElementById('bazarBetsCount').textContent = totalBets;
+            }
+        } catch (err) {
+            console.error('Error fetching bet count:', err);
+            document.getElementById('bazarBetsCount').textContent = '?';
+        }
+
+        // Setup checkbox listener
+        checkbox.onchange = function () {
+            confirmBtn.disabled = !this.checked;
+        };
+
+        // Show modal
+        modal.classList.remove('hidden');
+        modal.classList.add('flex');
+    }
+
+    window.cancelBazarDelete = function () {
+        const modal = document.getElementById('deleteBazarModal');
+        modal.classList.add('hidden');
+        modal.classList.remove('flex');
+    }
+
+    window.executeBazarDelete = async function () {
+        const confirmBtn = document.getElementById('confirmBazarDeleteBtn');
+
+        // Disable button and show loading
+        confirmBtn.disabled = true;
+        confirmBtn.textContent = 'Deleting...';
+        showLoader(`Deleting bets for ${bazarNames[app.currentBazar]}...`);
+
+        try {
+            const response = await fetch(API.DELETE_BAZAR_BETS, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': getCSRFToken()
+                },
+                body: JSON.stringify({
+                    bazar: app.currentBazar,
+                    date: app.currentDate
+                })
+            });
+
+            const data = await response.json();
+
+            if (data.success) {
+                // Reset UI
+                renderPage(1);
+                await updateTotalAmount();
+                await refreshAllBetTotals();
+
+                // Close modal
+                cancelBazarDelete();
+
+                // Show success message
+                showToast('Success', `Deleted ${data.deleted_count} bets for ${bazarNames[app.currentBazar]}`, 'success');
+            } else {
+                showToast('Error', data.error || 'Failed to delete bazar bets', 'error');
+            }
+        } catch (err) {
+            console.error('Error deleting bazar bets:', err);
+            showToast('Error', 'Failed to delete bazar bets. Please try again.', 'error');
+        } finally {
+            hideLoader();
+            confirmBtn.textContent = 'Delete Bazar Data';
+            confirmBtn.disabled = false;
+        }
+    }
+
+    window.executeMasterDelete = async function () {
+        console.log('Execute master delete called');
+        const passwordInput = document.getElementById('deletePassword');
+        const password = passwordInput.value;
+        const confirmBtn = document.getElementById('confirmMasterDeleteBtn');
+
+        console.log('Password length:', password.length);
+
+        if (!password) {
+            showToast('Error', 'Please enter your password', 'error');
+            return;
+        }
+
+        // Disable button and show loading
+        confirmBtn.disabled = true;
+        confirmBtn.textContent = 'Deleting...';
+        showLoader('Deleting all bets...');
+
+        console.log('Sending delete request...');
+
+        try {
+            const response = await fetch(API.MASTER_DELETE, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': getCSRFToken()
+                },
+                body: JSON.stringify({
+                    password: password
+                })
+            });
+
+            console.log('Response status:', response.status);
+            const data = await response.json();
+            console.log('Response data:', data);
+
+            if (data.success) {
+                // Clear local bets object
+                if (typeof window.bets !== 'undefined') {
+                    for (const bazar in window.bets) {
+                        delete window.bets[bazar];
+                    }
+                }
+
+                // Reset UI
+                renderPage(1);
+                await updateTotalAmount();
+                await refreshAllBetTotals();
+
+                // Close modal
+                cancelMasterDelete();
+
+                // Show success message
+                showToast('Success', `${data.deleted_count} bets deleted successfully`, 'success');
+            } else {
+                showToast('Error', data.error || 'Failed to delete bets', 'error');
+                confirmBtn.disabled = false;
+                confirmBtn.textContent = 'Delete All Bets';
+            }
+        } catch (error) {
+            console.error('Master delete error:', error);
+            showToast('Error', 'Network error. Please try again.', 'error');
+            confirmBtn.disabled = false;
+            confirmBtn.textContent = 'Delete All Bets';
+        } finally {
+            hideLoader();
+        }
+    }
+
+    return { showMasterDeleteConfirmation, showDeleteBazarConfirmation };
+};
@@ -0,0 +1,339 @@
+// Bet history modal (bulk actions and individual bets) - loaded on first open by home.js
+window.BettingPanels = window.BettingPanels || {};
+window.BettingPanels.history = function (app) {
+    const { API, bazarNames, showToast, getCSRFToken, loadBets, updateTotalAmount, renderPage, getLastBulkAction } = app;
+    const { TIMES_VERSION, setServerTimeZone, formatBetTime } = app;
+
+    const historyModal = document.getElementById('historyModal');
+    const historyTableBody = document.getElementById('historyTableBody');
+    async function loadBulkActionHistory() {
+        try {
+            // Build URL with bazar and date filters
+            let url = `${API.GET_BULK_HISTORY}?bazar=${app.currentBazar}&date=${app.currentDate}&v=${TIMES_VERSION}`;
+            const res = await fetch(url);
+            const data = await res.json();
+            if (data.success) {
+                setServerTimeZone(data);
+                renderHistoryTable(data.history);
+                updateHistoryStats(data.history);
+            } else {
+                showToast('Error', 'Failed to load history', 'error');
+            }
+        } catch (err) {
+            console.error('Error loading history:', err);
+            showToast('Error', 'Failed to load history', 'error');
+        }
+    }
+    function renderHistoryTable(history) {
+        historyTableBody.innerHTML = '';
+        if (history.length === 0) {
+            historyTableBody.innerHTML = `
+                    <tr>
+                        <td colspan="11" class="border border-gray-300 px-4 py-8 text-center text-gray-500">
+                            No history records found
+                        </td>
+                    </tr>
+                `;
+            return;
+        }
+        history.forEach((record, index) => {
+            const row = document.createElement('tr');
+            row.className = index % 2 === 0 ? 'bg-white hover:bg-purple-50' : 'bg-gray-50 hover:bg-purple-50';
+            // Action type with color coding
+            let actionTypeClass = 'bg-gray-100 text-gray-800';
+            if (record.action_type === 'SP') actionTypeClass = 'bg-lime-100 text-lime-800';
+            else if (record.action_type === 'DP') actionTypeClass = 'bg-blue-100 text-blue-800';
+            else if (record.action_type === 'JODI') actionTypeClass = 'bg-purple-100 text-purple-800';
+            else if (record.action_type === 'EKI') actionTypeClass = 'bg-cyan-100 text-cyan-800';
+            else if (record.action_type === 'BEKI') actionTypeClass = 'bg-cyan-100 text-cyan-800';
+            else if (record.action_type === 'DADAR') actionTypeClass = 'bg-yellow-100 text-yellow-800';
+            else if (record.action_type === 'ABR_CUT') actionTypeClass = 'bg-pink-100 text-pink-800';
+            else if (record.action_type === 'JODI_PANEL') actionTypeClass = 'bg-teal-100 text-teal-800';
+            else if (record.action_type === 'MOTAR') actionTypeClass = 'bg-orange-100 text-orange-800';
+            else if (record.action_type === 'COMMAN_PANA_36') actionTypeClass = 'bg-blue-100 text-blue-800';
+            else if (record.action_type === 'COMMAN_PANA_56') actionTypeClass = 'bg-indigo-100 text-indigo-800';
+            else if (record.action_type === 'SET_PANA') actionTypeClass = 'bg-violet-100 text-violet-800';
+            else if (record.action_type === 'GROUP') actionTypeClass = 'bg-fuchsia-100 text-fuchsia-800';
+            // Status badge
+            const statusBadge = record.is_undone
+                ? '<span class="px-2 py-1 bg-red-100 text-red-800 text-xs font-semibold rounded">Undone</span>'
+                : '<span class="px-2 py-1 bg-green-100 text-green-800 text-xs font-semibold rounded">Active</span>';
+            // Delete button - only show if not already undone
+            const deleteButton = record.is_undone
+                ? '<span class="text-gray-400 text-sm">-</span>'
+                : `<button onclick="deleteBulkAction(${record.id})" class="text-red-600 hover:text-red-800 hover:bg-red-50 p-2 rounded transition-colors" title="Delete bulk action">
+                        <svg xmlns="http://www.w3.org/2000/svg" class="h-5 w-5" viewBox="0 0 20 20" fill="currentColor">
+                            <path fill-rule="evenodd" d="M9 2a1 1 0 00-.894.553L7.382 4H4a1 1 0 000 2v10a2 2 0 002 2h8a2 2 0 002-2V6a1 1 0 100-2h-3.382l-.724-1.447A1 1 0 0011 2H9zM7 8a1 1 0 012 0v6a1 1 0 11-2 0V8zm5-1a1 1 0 00-1 1v6a1 1 0 102 0V8a1 1 0 00-1-1z" clip-rule="evenodd" />
+                        </svg>
+                    </button>`;
+            // Format bazar name
+            const bazarName = record.bazar ? bazarNames[record.bazar] || record.bazar : '-';
+            row.innerHTML = `
+                    <td class="border border-gray-300 px-4 py-2 text-sm font-mono">${record.id}</td>
+                    <td class="border border-gray-300 px-4 py-2">
+                        <span class="px-2 py-1 ${actionTypeClass} text-xs font-semibold rounded">${record.action_type}</span>
+                    </td>
+                    <td class="border border-gray-300 px-4 py-2 text-sm text-gray-700">${bazarName}</td>
+                    <td class="border border-gray-300 px-4 py-2 text-sm font-mono">${record.action_date || '-'}</td>
+                    <td class="border border-gray-300 px-4 py-2 text-sm font-semibold text-green-700">${parseFloat(record.amount).toLocaleString('en-IN')}</td>
+                    <td class="border border-gray-300 px-4 py-2 text-sm text-center font-semibold">${record.total_bets}</td>
+                    <td class="border border-gray-300 px-4 py-2 text-sm text-center">${record.jodi_column || '-'}</td>
+                    <td class="border border-gray-300 px-4 py-2 text-sm text-center">${record.jodi_type || '-'}</td>
+                    <td class="border border-gray-300 px-4 py-2 text-sm font-mono">${formatBetTime(record.created_at)}</td>
+                    <td class="border border-gray-300 px-4 py-2 text-center">${statusBadge}</td>
+                    <td class="border border-gray-300 px-4 py-2 text-center">${deleteButton}</td>
+                `;
+            historyTableBody.appendChild(row);
+        });
+    }
+    function updateHistoryStats(history) {
+        const totalRecords = history.length;
+        const totalAmount = history.reduce((sum, record) => sum + parseFloat(record.amount) * record.total_bets, 0);
+        const totalBets = history.reduce((sum, record) => sum + record.total_bets, 0);
+        document.getElementById('totalRecords').textContent = totalRecords;
+        document.getElementById('totalHistoryAmount').textContent = `${totalAmount.toLocaleString('en-IN')}`;
+        document.getElementById('totalHistoryBets').textContent = totalBets;
+    }
+
+    // Individual Bet History Functions
+    const individualBetsTableBody = document.getElementById('individualBetsTableBody');
+
+    async function loadIndividualBetHistory() {
+        try {
+            // Load all bets for the current bazar and date (including bulk bets)
+            let url = `${API.LOAD_BETS}?bazar=${app.currentBazar}&date=${app.currentDate}&v=${TIMES_VERSION}`;
+            const res = await fetch(url);
+            const data = await res.json();
+
+            if (data.success) {
+                // Include ALL bets (both individual and bulk) so users can delete any bet
+                const individualBets = [];
+                for (const [number, betData] of Object.entries(data.bets)) {
+                    if (betData.history && Array.isArray(betData.history)) {
+                        betData.history.forEach(bet => {
+                            // Include all bets - both individual and bulk
+                            individualBets.push({
+                                ...bet,
+                                number: number
+                            });
+                        });
+                    }
+                }
+
+                // Sort by created_at descending (newest first)
+                individualBets.sort((a, b) => b.created_at - a.created_at);
+
+                renderIndividualBetsTable(individualBets);
+                updateIndividualBetsStats(individualBets);
+            } else {
+                showToast('Error', 'Failed to load individual bets', 'error');
+            }
+        } catch (err) {
+            console.error('Error loading individual bets:', err);
+            showToast('Error', 'Failed to load individual bets', 'error');
+        }
+    }
+
+    function renderIndividualBetsTable(bets) {
+        individualBetsTableBody.innerHTML = '';
+
+        if (bets.length === 0) {
+            individualBetsTableBody.innerHTML = `
+                <tr>
+                    <td colspan="8" class="border border-gray-300 px-4 py-8 text-center text-gray-500">
+                        No individual bets found
+                    </td>
+                </tr>
+            `;
+            return;
+        }
+
+        bets.forEach((bet, index) => {
+            const row = document.createElement('tr');
+            row.className = index % 2 === 0 ? 'bg-white hover:bg-blue-50' : 'bg-gray-50 hover:bg-blue-50';
+
+            // Bet type with color coding
+            let betTypeClass = 'bg-gray-100 text-gray-800';
+            if (bet.bet_type === 'SINGLE') betTypeClass = 'bg-green-100 text-green-800';
+            else if (bet.bet_type === 'SP') betTypeClass = 'bg-lime-100 text-lime-800';
+            else if (bet.bet_type === 'DP') betTypeClass = 'bg-blue-100 text-blue-800';
+            else if (bet.bet_type === 'JODI') betTypeClass = 'bg-purple-100 text-purple-800';
+            else if (bet.bet_type === 'GROUP') betTypeClass = 'bg-fuchsia-100 text-fuchsia-800';
+
+            // Format bazar name
+            const bazarName = bet.bazar ? bazarNames[bet.bazar] || bet.bazar : app.currentBazar;
+            const displayBazarName = bazarNames[bazarName] || bazarName;
+
+            // Format date
+            const betDate = bet.bet_date || app.currentDate;
+
+            // Format timestamp
+            const timestamp = new Date(bet.created_at).toLocaleString('en-IN', {
+                year: 'numeric',
+                month: '2-digit',
+                day: '2-digit',
+                hour: '2-digit',
+                minute: '2-digit',
+                second: '2-digit',
+                hour12: false
+            });
+
+            // Delete button
+            const deleteButton = `<button onclick="deleteIndividualBet(${bet.id}, '${bet.number}')" 
+                class="text-red-600 hover:text-red-800 hover:bg-red-50 p-2 rounded transition-colors" title="Delete bet">
+                <svg xmlns="http://www.w3.org/2000/svg" class="h-5 w-5" viewBox="0 0 20 20" fill="currentColor">
+                    <path fill-rule="evenodd" d="M9 2a1 1 0 00-.894.553L7.382 4H4a1 1 0 000 2v10a2 2 0 002 2h8a2 2 0 002-2V6a1 1 0 100-2h-3.382l-.724-1.447A1 1 0 0011 2H9zM7 8a1 1 0 012 0v6a1 1 0 11-2 0V8zm5-1a1 1 0 00-1 1v6a1 1 0 102 0V8a1 1 0 00-1-1z" clip-rule="evenodd" />
+                </svg>
+            </button>`;
+
+            row.innerHTML = `
+                <td class="border border-gray-300 px-4 py-2 text-sm font-mono">${bet.id}</td>
+                <td class="border border-gray-300 px-4 py-2 text-sm font-mono font-bold">${bet.number}</td>
+                <td class="border border-gray-300 px-4 py-2 text-sm font-semibold text-green-700">${parseFloat(bet.amount).toLocaleString('en-IN')}</td>
+                <td class="border border-gray-300 px-4 py-2">
+                    <span class="px-2 py-1 ${betTypeClass} text-xs font-semibold rounded">${bet.bet_type}</span>
+                </td>
+                <td class="border border-gray-300 px-4 py-2 text-sm text-gray-700">${displayBazarName}</td>
+                <td class="border border-gray-300 px-4 py-2 text-sm font-mono">${betDate}</td>
+                <td class="border border-gray-300 px-4 py-2 text-sm font-mono">${timestamp}</td>
+                <td class="border border-gray-300 px-4 py-2 text-center">${deleteButton}</td>
+            `;
+
+            individualBetsTableBody.appendChild(row);
+        });
+    }
+
+    function updateIndividualBetsStats(bets) {
+        const totalRecords = bets.length;
+        const totalAmount = bets.reduce((sum, bet) => sum + parseFloat(bet.amount), 0);
+        const totalBets = bets.length;
+
+        document.getElementById('totalRecords').textContent = totalRecords;
+        document.getElementById('totalHistoryAmount').textContent = `${totalAmount.toLocaleString('en-IN')}`;
+        document.getElementById('totalHistoryBets').textContent = totalBets;
+    }
+
+    // Delete individual bet function
+    window.deleteIndividualBet = async function (betId, number) {
+        if (!confirm('Are you sure you want to delete this bet?')) {
+            return;
+        }
+
+        try {
+            const response = await fetch(API.DELETE_BET, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': getCSRFToken()
+                },
+                body: JSON.stringify({ bet_id: betId })
+            });
+
+            const data = await response.json();
+
+            if (data.success) {
+                showToast('Deleted!', 'Bet deleted successfully', 'success');
+
+                // Reload individual bets table
+                await loadIndividualBetHistory();
+
+                // Reload main bets and update totals
+                await loadBets();
+                await updateTotalAmount();
+                renderPage(1);
+            } else {
+                showToast('Error', data.message || 'Failed to delete bet', 'error');
+            }
+        } catch (error) {
+            console.error('Error deleting bet:', error);
+            showToast('Error', 'Failed to delete bet', 'error');
+        }
+    };
+
+    // Tab Switching Functions
+    const bulkActionsTab = document.getElementById('bulkActionsTab');
+    const individualBetsTab = document.getElementById('individualBetsTab');
+    const bulkActionsContent = document.getElementById('bulkActionsContent');
+    const individualBetsContent = document.getElementById('individualBetsContent');
+
+    function switchToBulkActionsTab() {
+        bulkActionsContent.classList.remove('hidden');
+        individualBetsContent.classList.add('hidden');
+        bulkActionsTab.classList.add('border-indigo-600', 'text-indigo-600');
+        bulkActionsTab.classList.remove('border-transparent', 'text-gray-500');
+        individualBetsTab.classList.remove('border-indigo-600', 'text-indigo-600');
+        individualBetsTab.classList.add('border-transparent', 'text-gray-500');
+        loadBulkActionHistory();
+    }
+
+    function switchToIndividualBetsTab() {
+        bulkActionsContent.classList.add('hidden');
+        individualBetsContent.classList.remove('hidden');
+        individualBetsTab.classList.add('border-indigo-600', 'text-indigo-600');
+        individualBetsTab.classList.remove('border-transparent', 'text-gray-500');
+        bulkActionsTab.classList.remove('border-indigo-600', 'text-indigo-600');
+        bulkActionsTab.classList.add('border-transparent', 'text-gray-500');
+        loadIndividualBetHistory();
+    }
+
+    bulkActionsTab.addEventListener('click', switchToBulkActionsTab);
+    individualBetsTab.addEventListener('click', switchToIndividualBetsTab);
+
+    // Delete bulk action function
+    window.deleteBulkAction = async function (bulkActionId) {
+        if (!confirm('Are you sure you want to delete this bulk action? All associated bets will be permanently deleted.')) {
+            return;
+        }
+        try {
+            const response = await fetch(API.UNDO_BULK, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': getCSRFToken()
+                },
+                body: JSON.stringify({ bulk_action_id: bulkActionId })
+            });
+            // Check if response is ok
+            if (!response.ok) {
+                const errorData = await response.json();
+                throw new Error(errorData.message || `HTTP error! status: ${response.status}`);
+            }
+            const data = await response.json();
+            if (data.success) {
+                showToast('Deleted!', data.message, 'success');
+                // Reload history table
+                await loadBulkActionHistory();
+                // Reload bets and update totals
+                await loadBets();
+                await updateTotalAmount();
+                renderPage(1);
+                await getLastBulkAction();
+            } else {
+                showToast('Error', data.message || 'Failed to delete bulk action', 'error');
+            }
+        } catch (error) {
+            console.error('Error deleting bulk action:', error);
+            showToast('Error', error.message || 'Failed to delete bulk action', 'error');
+        }
+    };
+    document.getElementById('closeHistoryModal').addEventListener('click', function () {
+        historyModal.classList.add('hidden');
+    });
+    document.getElementById('refreshHistoryBtn').addEventListener('click', function () {
+        loadBulkActionHistory();
+        showToast('Refreshed', 'History data updated', 'success');
+    });
+    // Close modal on outside click
+    historyModal.addEventListener('click', function (e) {
+        if (e.target === historyModal) {
+            historyModal.classList.add('hidden');
+        }
+    });
+
+    function open() {
+        historyModal.classList.remove('hidden');
+        loadBulkActionHistory();
+    }
+
+    return { open };
+};
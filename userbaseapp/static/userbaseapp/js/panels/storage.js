@@ -0,0 +1,38 @@
+// Sidebar database storage meter - loaded when the sidebar is first opened by home.js
+window.BettingPanels = window.BettingPanels || {};
+window.BettingPanels.storage = function (app) {
+    const { API } = app;
+
+    async function loadDatabaseStorage() {
+        try {
+            const res = await fetch(API.GET_DATABASE_STORAGE);
+            const data = await res.json();
+            if (data.success) {
+                const storageUsed = document.getElementById('storageUsed');
+                const storagePercentage = document.getElementById('storagePercentage');
+                const storageProgressBar = document.getElementById('storageProgressBar');
+                const databaseType = document.getElementById('databaseType');
+                storageUsed.textContent = `${data.storage_used_mb} MB / ${data.storage_total_mb} MB`;
+                storagePercentage.textContent = `${data.percentage}%`;
+                storageProgressBar.style.width = `${Math.min(data.percentage, 100)}%`;
+                databaseType.textContent = data.database_type;
+                // Change color based on usage
+                if (data.percentage >= 90) {
+                    storageProgressBar.style.background = 'linear-gradient(to right, #ef4444, #dc2626)'; // Red
+                } else if (data.percentage >= 70) {
+                    storageProgressBar.style.background = 'linear-gradient(to right, #f59e0b, #d97706)'; // Orange
+                } else {
+                    storageProgressBar.style.background = 'linear-gradient(to right, #3b82f6, #06b6d4)'; // Blue
+                }
+            } else {
+                console.error('Failed to load storage info:', data.error);
+                document.getElementById('storageUsed').textContent = 'Error loading';
+            }
+        } catch (err) {
+            console.error('Error loading database storage:', err);
+            document.getElementById('storageUsed').textContent = 'N/A';
+        }
+    }
+
+    return { refresh: loadDatabaseStorage };
+};
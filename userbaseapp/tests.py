@@ -1,3 +1,1194 @@
-from django.test import TestCase
+import asyncio
+import importlib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from urllib.parse import urlencode
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import connection, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from . import dense_totals
+from .admin import ColumnNumberFilter, EstimatedCountPaginator
+from .book_cache import asingle_flight, coalesced_book_read, single_flight
+from .closing import close_book
+from .db_router import PIN_COOKIE, replica_reads
+from .fields import (
+    NUMBER_SET_BYTES, discard_from_number_set, number_set_contains, number_set_size, pack_number_set,
+    unpack_number_set,
+)
+from .events import rebuild_projections
+from .models import (
+    Bet, BookColumnTotal, BookExposure, BookNumberTotal, BookSnapshot, BookSummary, BulkBetAction, ClosedBook,
+)
+from .transactions import read_snapshot
+from .views import CATALOG_MAX_AGE, catalog_version
+
+# Pages render without the manifest collectstatic writes
+UNHASHED_STATIC = {
+    **settings.STORAGES,
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+
+class BookTestCase(TestCase):
+    """A logged-in user and helpers to write to and read their book through the views"""
+    bazar = 'KALYAN_OPEN'
+
+    def setUp(self):
+        cache.clear()
+        self.date = timezone.localdate().isoformat()
+        self.user = get_user_model().objects.create_user('alice', password='secret')
+        self.client.force_login(self.user)
+
+    def post(self, url, payload, client=None):
+        # Run the on_commit hooks (book invalidation) as a real commit would
+        with self.captureOnCommitCallbacks(execute=True):
+            response = (client or self.client).post(url, json.dumps(payload), content_type='application/json')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def place_bet(self, number, amount, **payload):
+        return self.post('/place-bet/', {'number': number, 'amount': amount, 'bazar': self.bazar, 'date': self.date, **payload})
+
+    def book_url(self, path, **params):
+        query = '&'.join(f'{key}={value}' for key, value in {'bazar': self.bazar, 'date': self.date, **params}.items())
+        return f'{path}?{query}'
+
+
+@override_settings(SHARED_CACHE=True)
+class ConditionalBookReadTests(BookTestCase):
+
+    def test_unchanged_book_is_not_modified(self):
+        self.place_bet('128', 10)
+        url = self.book_url('/get-bet-total/')
+        first = self.client.get(url)
+        self.assertEqual(first.json()['total_amount'], 10)
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        self.place_bet('129', 5)
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json()['total_amount'], 15)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+
+    @override_settings(SHARED_CACHE=False)
+    def test_reads_stay_live_without_a_shared_cache(self):
+        url = self.book_url('/get-bet-total/')
+        self.place_bet('128', 10)
+        self.client.get(url)
+
+        # As if the next write was handled by another worker: this one's
+        # versions are not bumped
+        with mock.patch('userbaseapp.book_cache._bump'):
+            self.place_bet('129', 5)
+        self.assertEqual(self.client.get(url).json()['total_amount'], 15)
+
+
+@override_settings(SHARED_CACHE=True)
+class PastBookCachingTests(BookTestCase):
+    """Past books are cached long; every correction must still retire them"""
+
+    def setUp(self):
+        super().setUp()
+        self.date = (timezone.localdate() - timedelta(days=3)).isoformat()
+        self.staff = get_user_model().objects.create_user('staff', password='secret', is_staff=True)
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+
+    def etag(self, path='/load-bets/'):
+        response = self.client.get(self.book_url(path))
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def test_browsers_revalidate_by_default(self):
+        response = self.client.get(self.book_url('/get-bet-total/'))
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertNotIn('max-age', response['Cache-Control'])
+
+    @override_settings(PAST_BOOK_MAX_AGE=60)
+    def test_max_age_is_opt_in(self):
+        response = self.client.get(self.book_url('/get-bet-total/'))
+        self.assertIn('max-age=60', response['Cache-Control'])
+
+    def test_admin_edit_is_visible(self):
+        self.place_bet('128', 10)
+        url = self.book_url('/get-bet-total/')
+        before = self.client.get(url)
+        self.assertEqual(before.json()['total_amount'], 10)
+
+        bet = Bet.objects.get()
+        bet.amount = Decimal('25')
+        with self.captureOnCommitCallbacks(execute=True):
+            admin.site._registry[Bet].save_model(None, bet, None, True)
+
+        after = self.client.get(url, HTTP_IF_NONE_MATCH=before['ETag'])
+        self.assertEqual(after.status_code, 200)
+        self.assertEqual(after.json()['total_amount'], 25)
+
+    @override_settings(COMPACT_BULK_BETS=True)
+    def test_settlement_retires_the_book(self):
+        self.place_bet('128', 10)
+        # A compact bulk action: the book has virtual bets too
+        self.post('/place-bulk-bet/', {'type': 'SP', 'amount': 7, 'bazar': self.bazar, 'date': self.date})
+        self.assertTrue(BulkBetAction.objects.get().is_compact)
+        before = self.etag()
+
+        self.post('/declare-result/', {'bazar': self.bazar, 'date': self.date, 'pana': '128'}, client=self.staff_client)
+        self.assertNotEqual(self.etag(), before)
+
+    def test_undo_and_bazar_delete_retire_the_book(self):
+        self.post('/place-bulk-bet/', {'type': 'SP', 'amount': 7, 'bazar': self.bazar, 'date': self.date, 'columns': [1]})
+        self.place_bet('128', 10)
+        before = self.etag()
+
+        action = BulkBetAction.objects.get()
+        self.post('/undo-bulk-action/', {'bulk_action_id': action.id})
+        after_undo = self.etag()
+        self.assertNotEqual(after_undo, before)
+
+        self.post('/delete-bazar-bets/', {'bazar': self.bazar, 'date': self.date})
+        self.assertNotEqual(self.etag(), after_undo)
+        self.assertEqual(self.client.get(self.book_url('/get-bet-total/')).json()['total_amount'], 0)
+
+
+@replica_reads
+def read_alias(request, book=None):
+    """Database a replica-eligible view reads from (or a coalesced read of `book`, if given)"""
+    if book is None:
+        return Bet.objects.all().db
+    return coalesced_book_read('read_alias', *book, lambda: Bet.objects.all().db, params=time.time_ns())
+
+
+class ReplicaRoutingTests(BookTestCase):
+    """Routing with a replica configured; only which database a read uses is checked"""
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch('userbaseapp.db_router.replica_available', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def alias(self, cookies=None, book=None):
+        request = RequestFactory().get('/')
+        request.user = self.user
+        request.COOKIES.update(cookies or {})
+        return read_alias(request, book)
+
+    def test_reads_use_the_replica(self):
+        self.assertEqual(self.alias(), 'replica')
+
+    def test_writer_is_pinned_on_every_worker(self):
+        self.place_bet('128', 10)
+        self.assertIn(PIN_COOKIE, self.client.cookies)
+        # The pin doesn't depend on this worker's cache
+        cache.clear()
+        self.assertEqual(self.alias(cookies={PIN_COOKIE: '1'}), 'default')
+        self.assertEqual(self.alias(), 'replica')
+
+    def test_owner_is_pinned_after_a_staff_write(self):
+        self.place_bet('128', 10)
+        cache.clear()
+        self.assertEqual(self.alias(), 'replica')
+
+        bet = Bet.objects.get()
+        bet.amount = Decimal('25')
+        with self.captureOnCommitCallbacks(execute=True):
+            admin.site._registry[Bet].save_model(None, bet, None, True)
+        self.assertEqual(self.alias(), 'default')
+
+    @override_settings(SHARED_CACHE=True)
+    def test_just_written_book_is_cached_from_the_primary(self):
+        book = (self.user.id, self.bazar, self.date)
+        self.place_bet('128', 10)
+        cache.delete(f'db-primary-pin:{self.user.id}')
+        self.assertEqual(self.alias(book=book), 'default')
+
+        later = time.time_ns() + (settings.REPLICA_STICKY_SECONDS + 1) * 1_000_000_000
+        with mock.patch('userbaseapp.book_cache.time.time_ns', return_value=later):
+            self.assertEqual(self.alias(book=book), 'replica')
+
+
+@override_settings(SHARED_CACHE=True)
+class ClosedBookTests(BookTestCase):
+    """Closed books are read from snapshots, which every write keeps current"""
+
+    def setUp(self):
+        super().setUp()
+        self.staff = get_user_model().objects.create_user('staff', password='secret', is_staff=True)
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+
+    def set_closed(self, closed, **payload):
+        url = '/close-bazar-book/' if closed else '/reopen-bazar-book/'
+        self.post(url, {'bazar': self.bazar, 'date': self.date, **payload}, client=self.staff_client)
+
+    def total(self):
+        return self.client.get(self.book_url('/get-bet-total/')).json()['total_amount']
+
+    def test_writes_refresh_the_snapshot(self):
+        self.place_bet('128', 10)
+        self.set_closed(True, block_placements=False)
+        self.assertEqual(self.total(), 10)
+
+        self.place_bet('129', 5)
+        self.assertEqual(BookSnapshot.objects.get().data['total'], 1500)
+        self.assertEqual(self.total(), 15)
+
+    def test_reopen_is_seen_at_once(self):
+        self.place_bet('128', 10)
+        self.set_closed(True)
+        self.assertEqual(self.total(), 10)
+        response = self.client.post(
+            '/place-bet/', json.dumps({'number': '129', 'amount': 5, 'bazar': self.bazar, 'date': self.date}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+        self.set_closed(False)
+        self.place_bet('129', 5)
+        self.assertFalse(BookSnapshot.objects.exists())
+        self.assertEqual(self.total(), 15)
+
+    def test_open_book_write_checks_closing_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.place_bet('128', 10)
+        closed_queries = [query for query in queries if ClosedBook._meta.db_table in query['sql']]
+        self.assertEqual(len(closed_queries), 1)
+
+
+class SimulateOutcomesTests(BookTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.staff = get_user_model().objects.create_user('staff', password='secret', is_staff=True)
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+
+    def test_bare_numbers_count_as_stake_only(self):
+        self.place_bet('128', 10)
+        # A bare number stored above the three-digit range, which no pana matches
+        self.place_bet('7', 5)
+        response = self.staff_client.get(self.book_url('/simulate-outcomes/', top=1))
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()
+        self.assertEqual(data['total_stake'], 15)
+        self.assertEqual(data['worst'][0]['pana'], '128')
+        self.assertEqual(data['worst'][0]['payout'], 1400)
+
+
+class SettlementTests(BookTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.staff = get_user_model().objects.create_user('staff', password='secret', is_staff=True)
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+
+    def declare(self, pana):
+        payload = {'bazar': self.bazar, 'date': self.date, 'pana': pana}
+        return self.post('/declare-result/', payload, client=self.staff_client)['result']
+
+    def column_bet(self, column, amount):
+        self.post('/place-column-bet/', {'column': column, 'amount': amount, 'bazar': self.bazar, 'date': self.date})
+
+    def statuses(self):
+        return dict(Bet.objects.values_list('number', 'status'))
+
+    def test_won_and_lost_bets_are_split(self):
+        self.place_bet('128', 10)
+        self.place_bet('129', 5)
+        # 128's ank is 1
+        self.column_bet(1, 2)
+        self.column_bet(2, 3)
+
+        result = self.declare('128')
+        self.assertEqual(self.statuses(), {'128': 'WON', '129': 'LOST', '1': 'WON', '2': 'LOST'})
+        self.assertEqual((result['total_bets'], result['winning_bets']), (4, 2))
+        self.assertEqual(Decimal(result['total_stake']), Decimal('20'))
+        self.assertEqual(Decimal(result['total_payout']), Decimal('1418'))
+
+    @override_settings(SETTLEMENT_PAYOUT_RATES={'SINGLE': '100', 'COLUMN': '9.5'})
+    def test_payout_rates_can_be_overridden(self):
+        self.place_bet('128', 10)
+        # 5 paise at 9.5 is 47.5 paise, rounded half up
+        self.column_bet(1, '0.05')
+
+        result = self.declare('128')
+        self.assertEqual(Decimal(result['total_payout']), Decimal('1000.48'))
+
+    def test_declaring_again_resettles(self):
+        self.place_bet('128', 10)
+        self.place_bet('129', 5)
+        self.declare('128')
+
+        result = self.declare('129')
+        self.assertEqual(self.statuses(), {'128': 'LOST', '129': 'WON'})
+        self.assertEqual((result['total_bets'], result['winning_bets']), (2, 1))
+        self.assertEqual(Decimal(result['total_payout']), Decimal('700'))
+
+    @override_settings(COMPACT_BULK_BETS=True)
+    def test_compact_actions_settle_without_bet_rows(self):
+        self.place_bet('128', 10)
+        # Without columns, All SP is stored as one compact action
+        self.post('/place-bulk-bet/', {'type': 'SP', 'amount': 7, 'bazar': self.bazar, 'date': self.date})
+        action = BulkBetAction.objects.get()
+        self.assertIn('128', action.numbers)
+
+        result = self.declare('128')
+        self.assertEqual(Bet.objects.count(), 1)
+        action.refresh_from_db()
+        self.assertTrue(action.is_compact)
+        self.assertEqual(result['total_bets'], 1 + action.total_bets)
+        self.assertEqual(result['winning_bets'], 2)
+        self.assertEqual(Decimal(result['total_stake']), 10 + 7 * action.total_bets)
+        self.assertEqual(Decimal(result['total_payout']), Decimal(1400 + 980))
+
+        # A discarded virtual bet no longer wins
+        self.post('/delete-bet/', {'bet_id': action.virtual_bet_id('128')})
+        result = self.declare('128')
+        self.assertEqual(result['winning_bets'], 1)
+        self.assertEqual(Decimal(result['total_payout']), Decimal('1400'))
+
+
+class AmountTests(BookTestCase):
+
+    def test_largest_amount_round_trips(self):
+        self.place_bet('128', '99999999.99')
+        self.assertEqual(Bet.objects.get().amount, Decimal('99999999.99'))
+        self.assertEqual(self.client.get(self.book_url('/get-bet-total/')).json()['total_amount'], 99999999.99)
+
+    def test_amount_keeps_the_decimal_range(self):
+        field = Bet._meta.get_field('amount')
+        field.clean(Decimal('99999999.99'), None)
+        with self.assertRaises(ValidationError):
+            field.clean(Decimal('100000000'), None)
+
+
+class DenseTotalsTests(BookTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.place_bet('128', '10.50')
+        # Two of the largest bets: beyond 32 bits of paise
+        self.place_bet('129', '99999999.99')
+        self.place_bet('129', '99999999.99')
+        self.place_bet('7', 5)
+        self.expected = {'128': 1050, '129': 19999999998, '7': 500}
+
+    def test_array_format(self):
+        data = self.client.get(self.book_url('/get-all-bet-totals/', format='array')).json()
+        self.assertEqual(len(data['totals']), dense_totals.DENSE_SLOTS)
+        self.assertEqual(data['totals'][128], 1050)
+        self.assertEqual(data['totals'][129], 19999999998)
+        self.assertEqual(sum(data['totals']), 1050 + 19999999998)
+        self.assertEqual(data['extra'], {'7': 500})
+
+    def test_binary_format(self):
+        response = self.client.get(self.book_url('/get-all-bet-totals/', format='binary'))
+        self.assertEqual(response['Content-Type'], dense_totals.BINARY_CONTENT_TYPE)
+        self.assertEqual(dense_totals.decode_binary(response.content), self.expected)
+
+    def test_binary_round_trip(self):
+        self.assertEqual(dense_totals.decode_binary(dense_totals.encode_binary({})), {})
+        totals = {'000': 1, '999': -5, '10': 2 ** 40, **self.expected}
+        self.assertEqual(dense_totals.decode_binary(dense_totals.encode_binary(totals)), totals)
+
+
+class CompactEncodingMigrationTests(TransactionTestCase):
+    """0017 turns Bet's number, bazar and bet_type into codes and back"""
+    before = [('userbaseapp', '0016_add_cm1_to_cm8_bazars')]
+    after = [('userbaseapp', '0017_compact_bet_encoding')]
+    numbers = ['000', '007', '128', '999', '0', '1', '7', '10']
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def create_bets(self, numbers):
+        apps = self.migrate(self.before)
+        user = apps.get_model('userbaseapp', 'CustomUser').objects.create(username='alice')
+        Bet = apps.get_model('userbaseapp', 'Bet')
+        for number in numbers:
+            bet_type = 'SINGLE' if len(number) == 3 else 'COLUMN'
+            Bet.objects.create(
+                user=user, number=number, amount=Decimal('1.25'), bazar='CM_12', bet_type=bet_type,
+                bet_date=timezone.localdate(),
+            )
+
+    def test_forward_and_backward(self):
+        self.create_bets(self.numbers)
+
+        apps = self.migrate(self.after)
+        Bet = apps.get_model('userbaseapp', 'Bet')
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT number, bazar, bet_type FROM {Bet._meta.db_table} ORDER BY id')
+            codes = cursor.fetchall()
+        self.assertEqual([number for number, bazar, bet_type in codes], [0, 7, 128, 999, 1000, 1001, 1007, 1010])
+        self.assertEqual({bazar for number, bazar, bet_type in codes}, {24})
+        self.assertEqual([bet_type for number, bazar, bet_type in codes], [1] * 4 + [14] * 4)
+        self.assertEqual(list(Bet.objects.order_by('id').values_list('number', flat=True)), self.numbers)
+
+        apps = self.migrate(self.before)
+        Bet = apps.get_model('userbaseapp', 'Bet')
+        self.assertEqual(
+            list(Bet.objects.order_by('id').values_list('number', 'bazar', 'bet_type')),
+            [(number, 'CM_12', 'SINGLE' if len(number) == 3 else 'COLUMN') for number in self.numbers]
+        )
+
+    def test_unencodable_numbers_stop_the_migration(self):
+        self.create_bets(['128', '0012', '07', 'abc'])
+        with self.assertRaisesMessage(ValueError, "2: '0012', 3: '07', 4: 'abc'"):
+            self.migrate(self.after)
+        # Nothing was converted; once corrected the bets migrate
+        Bet = self.migrate(self.before).get_model('userbaseapp', 'Bet')
+        self.assertEqual(list(Bet.objects.order_by('id').values_list('number', flat=True)), ['128', '0012', '07', 'abc'])
+        Bet.objects.exclude(number='128').delete()
+        Bet = self.migrate(self.after).get_model('userbaseapp', 'Bet')
+        self.assertEqual(list(Bet.objects.values_list('number', flat=True)), ['128'])
+
+
+class SingleFlightTests(BookTestCase):
+    """Concurrent identical reads share one computation"""
+
+    def test_concurrent_reads_compute_once(self):
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'totals'
+
+        results = []
+        readers = [threading.Thread(target=lambda: results.append(single_flight('sf-test', compute, 60)))]
+        readers[0].start()
+        started.wait(5)
+        readers += [threading.Thread(target=lambda: results.append(single_flight('sf-test', compute, 60))) for _ in range(4)]
+        for reader in readers[1:]:
+            reader.start()
+        release.set()
+        for reader in readers:
+            reader.join(5)
+
+        self.assertEqual(results, ['totals'] * 5)
+        self.assertEqual(len(calls), 1)
+
+    def test_errors_are_not_cached(self):
+        def fail():
+            raise RuntimeError('database unavailable')
+
+        with self.assertRaises(RuntimeError):
+            single_flight('sf-error', fail, 60)
+        self.assertEqual(single_flight('sf-error', lambda: 'totals', 60), 'totals')
+
+    def test_async_reads_compute_once(self):
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 'totals'
+
+        async def read_all():
+            return await asyncio.gather(*(asingle_flight('asf-test', compute, 60) for _ in range(5)))
+
+        self.assertEqual(asyncio.run(read_all()), ['totals'] * 5)
+        self.assertEqual(len(calls), 1)
+
+    @override_settings(SHARED_CACHE=True)
+    def test_book_reads_are_reused_until_a_write(self):
+        calls = []
+
+        def read():
+            calls.append(1)
+            return Bet.objects.count()
+
+        book = (self.user.id, self.bazar, self.date)
+        self.assertEqual(coalesced_book_read('count', *book, read), 0)
+        self.assertEqual(coalesced_book_read('count', *book, read), 0)
+        self.assertEqual(len(calls), 1)
+
+        self.place_bet('128', 10)
+        self.assertEqual(coalesced_book_read('count', *book, read), 1)
+        self.assertEqual(len(calls), 2)
+
+
+@override_settings(COMPACT_BULK_BETS=True)
+class UndoManyTests(BookTestCase):
+
+    def bulk_bet(self, **payload):
+        data = self.post('/place-bulk-bet/', {'type': 'SP', 'amount': 7, 'bazar': self.bazar, 'date': self.date, **payload})
+        return BulkBetAction.objects.get(pk=data['bulk_action_id'])
+
+    def test_undoes_row_and_compact_actions(self):
+        rows = self.bulk_bet(columns=[1])
+        compact = self.bulk_bet()
+        self.assertFalse(rows.is_compact)
+        self.assertTrue(compact.is_compact)
+        undone = self.bulk_bet(columns=[2])
+        undone.undo()
+        self.place_bet('128', 10)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bet_counts = BulkBetAction.undo_many(BulkBetAction.objects.all(), undone_by_user=self.user)
+
+        self.assertEqual(bet_counts, {rows.id: 12, compact.id: compact.total_bets})
+        self.assertEqual(list(Bet.objects.values_list('number', flat=True)), ['128'])
+        self.assertEqual(
+            set(BulkBetAction.objects.values_list('status', 'is_undone', 'undone_by')),
+            {('UNDONE', True, self.user.id), ('UNDONE', True, None)}
+        )
+        self.assertEqual(self.client.get(self.book_url('/get-bet-total/')).json()['total_amount'], 10)
+        # Nothing left to undo
+        self.assertEqual(BulkBetAction.undo_many(BulkBetAction.objects.all()), {})
+
+
+class NumberSetTests(SimpleTestCase):
+
+    def test_pack_and_unpack(self):
+        numbers = ['000', '128', '500', '999']
+        data = pack_number_set(numbers)
+        self.assertEqual(len(data), NUMBER_SET_BYTES)
+        self.assertEqual(unpack_number_set(data), numbers)
+        self.assertEqual(number_set_size(data), 4)
+        self.assertTrue(number_set_contains(data, '128'))
+        self.assertFalse(number_set_contains(data, '129'))
+        self.assertEqual(unpack_number_set(discard_from_number_set(data, '128')), ['000', '500', '999'])
+
+    def test_unrepresentable_numbers_are_not_packed(self):
+        self.assertIsNone(pack_number_set(['128', '128']))
+        self.assertIsNone(pack_number_set(['128', '7']))
+        self.assertIsNone(pack_number_set(['1000']))
+
+
+@override_settings(COMPACT_BULK_BETS=True)
+class VirtualBetTests(BookTestCase):
+
+    def setUp(self):
+        super().setUp()
+        data = self.post('/place-bulk-bet/', {'type': 'SP', 'amount': 7, 'bazar': self.bazar, 'date': self.date})
+        self.action = BulkBetAction.objects.get(pk=data['bulk_action_id'])
+        self.size = self.action.total_bets
+
+    def test_virtual_bet_ids(self):
+        bet_id = self.action.virtual_bet_id('128')
+        self.assertLess(bet_id, 0)
+        self.assertEqual(BulkBetAction.split_virtual_bet_id(bet_id), (self.action.id, '128'))
+        self.assertEqual([bet.number for bet in self.action.virtual_bets()], self.action.numbers)
+
+    def test_deleting_a_virtual_bet(self):
+        self.post('/delete-bet/', {'bet_id': self.action.virtual_bet_id('128')})
+
+        self.action.refresh_from_db()
+        self.assertNotIn('128', self.action.numbers)
+        self.assertEqual(self.action.total_bets, self.size - 1)
+        self.assertFalse(Bet.objects.exists())
+        totals = self.client.get(self.book_url('/get-all-bet-totals/')).json()['bet_totals']
+        self.assertNotIn('128', totals)
+        self.assertEqual(len(totals), self.size - 1)
+
+        # Deleting it again finds nothing
+        response = self.client.post(
+            '/delete-bet/', json.dumps({'bet_id': self.action.virtual_bet_id('128')}), content_type='application/json'
+        )
+        self.assertNotEqual(response.status_code, 200)
+
+
+@override_settings(COMPACT_BULK_BETS=True)
+class EventReplayTests(BookTestCase):
+    """Replaying the event log rebuilds the projections the writes maintained"""
+
+    def projections(self):
+        return {
+            'number_totals': set(BookNumberTotal.objects.values_list('user_id', 'bazar', 'bet_date', 'number', 'stake', 'bets')),
+            'column_totals': set(BookColumnTotal.objects.values_list('user_id', 'bazar', 'bet_date', 'column', 'stake', 'bets')),
+            'summary': set(BookSummary.objects.values_list('user_id', 'bazar', 'bet_date', 'last_seq', 'stake', 'bets')),
+        }
+
+    def test_rebuild_matches_the_live_projections(self):
+        staff = get_user_model().objects.create_user('staff', password='secret', is_staff=True)
+        staff_client = Client()
+        staff_client.force_login(staff)
+
+        self.place_bet('128', 10)
+        self.place_bet('129', 5)
+        self.post('/place-column-bet/', {'column': 1, 'amount': 3, 'bazar': self.bazar, 'date': self.date})
+        rows = self.post('/place-bulk-bet/', {'type': 'SP', 'amount': 2, 'bazar': self.bazar, 'date': self.date, 'columns': [2]})
+        compact = self.post('/place-bulk-bet/', {'type': 'DP', 'amount': 4, 'bazar': self.bazar, 'date': self.date})
+        self.post('/place-bulk-bet/', {'type': 'SP', 'amount': 1, 'bazar': self.bazar, 'date': self.date})
+        # Another bazar, then wiped
+        self.place_bet('128', 8, bazar='KALYAN_CLOSED')
+        self.place_bet('130', 6, bazar='KALYAN_CLOSED')
+
+        self.post('/undo-bulk-action/', {'bulk_action_id': rows['bulk_action_id']})
+        self.post('/delete-bet/', {'bet_id': Bet.objects.get(number='129').id})
+        action = BulkBetAction.objects.get(pk=compact['bulk_action_id'])
+        self.post('/delete-bet/', {'bet_id': action.virtual_bet_id(action.numbers[0])})
+        self.post('/delete-bazar-bets/', {'bazar': 'KALYAN_CLOSED', 'date': self.date})
+        self.post('/declare-result/', {'bazar': self.bazar, 'date': self.date, 'pana': '128'}, client=staff_client)
+
+        live = self.projections()
+        self.assertTrue(live['number_totals'] and live['column_totals'])
+        totals = self.client.get(self.book_url('/get-all-bet-totals/')).json()['bet_totals']
+        self.assertEqual(
+            {number: stake / 100 for user_id, bazar, bet_date, number, stake, bets in live['number_totals'] if bazar == self.bazar},
+            totals
+        )
+
+        self.assertEqual(rebuild_projections(), 2)
+        self.assertEqual(self.projections(), live)
+
+
+@override_settings(SHARED_CACHE=True)
+class ColumnTotalsTests(BookTestCase):
+    bazar = 'SRIDEVI_OPEN'
+
+    def setUp(self):
+        super().setUp()
+        # The date book reads default to
+        self.date = timezone.now().date().isoformat()
+
+    def test_book_defaults_to_today(self):
+        self.post('/place-column-bet/', {'column': 3, 'amount': 4, 'bazar': self.bazar, 'date': self.date})
+        for path in ('/get-column-totals/', '/async/get-column-totals/'):
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertEqual(response.json()['column_totals']['3'], 4)
+
+    def test_invalid_date(self):
+        for path in ('/get-column-totals/', '/async/get-column-totals/'):
+            self.assertEqual(self.client.get(f'{path}?bazar=KALYAN_OPEN&date=tomorrow').status_code, 400)
+
+    def test_etag_and_body_are_of_the_same_book(self):
+        for path in ('/get-column-totals/', '/async/get-column-totals/'):
+            first = self.client.get(path)
+            self.post('/place-column-bet/', {'column': 3, 'amount': 4, 'bazar': self.bazar, 'date': self.date})
+            second = self.client.get(path, HTTP_IF_NONE_MATCH=first['ETag'])
+            self.assertEqual(second.status_code, 200)
+            self.assertEqual(second.json()['column_totals']['3'], first.json()['column_totals']['3'] + 4)
+            self.assertEqual(self.client.get(path, HTTP_IF_NONE_MATCH=second['ETag']).status_code, 304)
+
+
+@override_settings(STORAGES=UNHASHED_STATIC)
+class BetAdminSearchTests(BookTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.admin_user = get_user_model().objects.create_superuser('root', password='secret')
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin_user)
+        for number in ('007', '7', '128'):
+            self.place_bet(number, 1)
+
+    def search(self, term):
+        response = self.admin_client.get('/admin/userbaseapp/bet/', {'q': term})
+        self.assertEqual(response.status_code, 200)
+        return sorted(bet.number for bet in response.context['cl'].result_list)
+
+    def test_numbers_match_exactly(self):
+        self.assertEqual(self.search('007'), ['007'])
+        self.assertEqual(self.search('7'), ['7'])
+        self.assertEqual(self.search('0007'), [])
+        self.assertEqual(self.search('alice'), ['007', '128', '7'])
+
+
+class BetNumberValidationTests(BookTestCase):
+
+    def test_invalid_numbers_are_rejected(self):
+        for number in ('0012', '07', '12a'):
+            response = self.client.post(
+                '/place-bet/', json.dumps({'number': number, 'amount': 5, 'bazar': self.bazar, 'date': self.date}),
+                content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 400, number)
+
+        data = self.post('/place-quick-bets/', {
+            'bazar': self.bazar, 'date': self.date, 'bets': [{'number': '1234', 'amount': 5}, {'number': '7', 'amount': 5}],
+        })
+        self.assertEqual([bet['number'] for bet in data['created_bets']], ['007'])
+        self.assertEqual(data['errors'][0]['number'], '1234')
+        self.assertEqual(Bet.objects.count(), 1)
+
+
+@override_settings(STORAGES=UNHASHED_STATIC)
+class StaticBundleTests(BookTestCase):
+
+    def test_home_loads_the_bundles(self):
+        response = self.client.get('/home/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f'{settings.STATIC_URL}userbaseapp/js/home.js')
+        self.assertContains(response, f'{settings.STATIC_URL}userbaseapp/css/home.css')
+        # Rarely used panels are only linked from the page config
+        self.assertNotContains(response, '<script src="/static/userbaseapp/js/panels/')
+        self.assertEqual(
+            response.context['home_config']['panels']['history'],
+            f'{settings.STATIC_URL}userbaseapp/js/panels/history.js'
+        )
+
+    def test_bundle_budget(self):
+        call_command('check_bundle_budget', stdout=StringIO())
+        with override_settings(STATIC_BUNDLE_BUDGETS={'userbaseapp/js/home.js': 1024}):
+            with self.assertRaisesMessage(CommandError, 'userbaseapp/js/home.js'):
+                call_command('check_bundle_budget', stdout=StringIO())
+        with override_settings(STATIC_BUNDLE_BUDGETS={'userbaseapp/js/missing.js': 1024}):
+            with self.assertRaisesMessage(CommandError, 'not found'):
+                call_command('check_bundle_budget', stdout=StringIO())
+
+
+@override_settings(COMPACT_BULK_BETS=True)
+class AsyncViewTests(BookTestCase):
+    """The async variants return exactly what their sync counterparts do"""
+    paths = [
+        '/load-bets/', '/get-last-bulk-action/', '/get-bet-total/', '/get-all-bet-totals/',
+        '/get-bulk-action-history/', '/get-column-totals/',
+    ]
+
+    def setUp(self):
+        super().setUp()
+        self.place_bet('128', '10.50')
+        self.place_bet('7', 5)
+        self.post('/place-column-bet/', {'column': 4, 'amount': 3, 'bazar': self.bazar, 'date': self.date})
+        self.post('/place-bulk-bet/', {'type': 'SP', 'amount': 2, 'bazar': self.bazar, 'date': self.date, 'columns': [2]})
+        self.post('/place-bulk-bet/', {'type': 'DP', 'amount': 4, 'bazar': self.bazar, 'date': self.date})
+
+    def assert_same_payloads(self, **params):
+        for path in self.paths:
+            sync = self.client.get(self.book_url(path, **params))
+            asynchronous = self.client.get(self.book_url(f'/async{path}', **params))
+            self.assertEqual(sync.status_code, 200, path)
+            self.assertEqual(asynchronous.json(), sync.json(), path)
+
+    def test_same_payloads(self):
+        self.assert_same_payloads()
+        self.assert_same_payloads(v=2)
+        self.assert_same_payloads(format='array')
+
+    def test_same_payloads_of_a_closed_book(self):
+        staff = get_user_model().objects.create_user('staff', password='secret', is_staff=True)
+        staff_client = Client()
+        staff_client.force_login(staff)
+        self.post('/close-bazar-book/', {'bazar': self.bazar, 'date': self.date}, client=staff_client)
+        self.assertTrue(BookSnapshot.objects.exists())
+        self.assert_same_payloads()
+
+
+class GunicornConfTests(SimpleTestCase):
+
+    def load(self, cpus=2, **environ):
+        environ = {'GUNICORN_WORKERS': '', **environ}
+        with mock.patch.dict(os.environ, environ), \
+                mock.patch('os.sched_getaffinity', return_value=set(range(cpus)), create=True):
+            from mymainserver import gunicorn_conf
+            return importlib.reload(gunicorn_conf)
+
+    def test_gthread_by_default(self):
+        conf = self.load(cpus=2)
+        self.assertEqual((conf.worker_class, conf.workers, conf.threads), ('gthread', 3, 4))
+        self.assertEqual(conf.wsgi_app, 'mymainserver.wsgi:application')
+        self.assertTrue(conf.preload_app)
+
+    def test_worker_sizing(self):
+        self.assertEqual(self.load(cpus=8, GUNICORN_WORKER_CLASS='sync').workers, 4)
+        self.assertEqual(self.load(cpus=8, GUNICORN_WORKER_CLASS='sync', GUNICORN_MAX_WORKERS='32').workers, 17)
+        self.assertEqual(self.load(cpus=8, GUNICORN_WORKERS='7').workers, 7)
+        self.assertEqual(self.load(cpus=1, GUNICORN_WORKER_CLASS='sync').threads, 1)
+
+    def test_uvicorn_serves_asgi(self):
+        conf = self.load(GUNICORN_WORKER_CLASS='uvicorn')
+        self.assertEqual(conf.worker_class, 'uvicorn.workers.UvicornWorker')
+        self.assertEqual(conf.wsgi_app, 'mymainserver.asgi:application')
+
+    def test_unknown_worker_class(self):
+        with self.assertRaisesMessage(ValueError, 'GUNICORN_WORKER_CLASS'):
+            self.load(GUNICORN_WORKER_CLASS='eventlet')
+
+
+class BootstrapTests(TestCase):
+
+    def setUp(self):
+        static_root = tempfile.TemporaryDirectory()
+        self.addCleanup(static_root.cleanup)
+        settings_override = override_settings(STATIC_ROOT=static_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # collectstatic itself is not under test
+        patcher = mock.patch('userbaseapp.management.commands.bootstrap.call_command')
+        self.call_command = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def bootstrap(self, *args):
+        stdout = StringIO()
+        call_command('bootstrap', *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_static_files_are_collected_once(self):
+        self.assertIn('Static files collected', self.bootstrap('--skip-db'))
+        self.assertIn('skipping collectstatic', self.bootstrap('--skip-db'))
+        self.assertEqual(self.call_command.call_count, 1)
+
+        with mock.patch(
+            'userbaseapp.management.commands.bootstrap.Command.static_fingerprint', return_value='changed'
+        ):
+            self.assertIn('Static files collected', self.bootstrap('--skip-db'))
+        self.assertEqual(self.call_command.call_count, 2)
+
+    def test_database_steps_skip_done_work(self):
+        output = self.bootstrap('--skip-static')
+        self.assertIn('No pending migrations', output)
+        self.assertIn('created successfully', output)
+        self.assertTrue(get_user_model().objects.filter(username='admin', is_superuser=True).exists())
+        self.assertIn('already exists', self.bootstrap('--skip-static'))
+        self.call_command.assert_not_called()
+
+
+@override_settings(STORAGES=UNHASHED_STATIC)
+class AdminChangelistTests(BookTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.admin_user = get_user_model().objects.create_superuser('root', password='secret')
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin_user)
+
+    def changelist(self, model, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.admin_client.get(f'/admin/userbaseapp/{model}/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.context['cl'], [query['sql'] for query in queries]
+
+    def test_bet_changelist(self):
+        self.post('/place-column-bet/', {'column': 4, 'amount': 3, 'bazar': self.bazar, 'date': self.date})
+        self.place_bet('128', 10)
+
+        cl, queries = self.changelist('bet', column_number=4)
+        self.assertIsInstance(cl.paginator, EstimatedCountPaginator)
+        self.assertFalse(cl.show_full_result_count)
+        self.assertEqual([bet.number for bet in cl.result_list], ['4'])
+        # Filter choices are fixed, not a DISTINCT scan of the table
+        column_filter = next(spec for spec in cl.filter_specs if isinstance(spec, ColumnNumberFilter))
+        self.assertEqual([value for value, label in column_filter.lookup_choices], [str(column) for column in range(1, 11)])
+        self.assertFalse([sql for sql in queries if 'DISTINCT' in sql.upper()])
+
+    def test_bulk_action_changelist_queries_do_not_grow(self):
+        def place_actions(count):
+            for _ in range(count):
+                self.post('/place-bulk-bet/', {'type': 'SP', 'amount': 2, 'bazar': self.bazar, 'date': self.date, 'columns': [2]})
+
+        place_actions(2)
+        cl, few = self.changelist('bulkbetaction')
+        self.assertIsInstance(cl.paginator, EstimatedCountPaginator)
+        self.assertEqual({action.live_bet_count for action in cl.result_list}, {12})
+        place_actions(4)
+        cl, many = self.changelist('bulkbetaction')
+        self.assertEqual(len(cl.result_list), 6)
+        self.assertEqual(len(many), len(few))
+
+
+class ReadSnapshotTests(BookTestCase):
+    """Reads of several queries that must agree run in one snapshot; requests are not atomic"""
+
+    def setUp(self):
+        super().setUp()
+        self.place_bet('128', 10)
+        self.post('/place-bulk-bet/', {'type': 'SP', 'amount': 2, 'bazar': self.bazar, 'date': self.date, 'columns': [2]})
+
+    def test_requests_are_not_atomic(self):
+        for alias in settings.DATABASES:
+            self.assertFalse(connections[alias].settings_dict['ATOMIC_REQUESTS'])
+
+    def test_multi_query_reads_use_a_snapshot(self):
+        with mock.patch('userbaseapp.views.read_snapshot', wraps=read_snapshot) as snapshot:
+            response = self.client.get(self.book_url('/book-snapshot/', sections='bets,totals,total'))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(snapshot.call_count, 1)
+
+            response = self.client.get('/get-bet-summary/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(snapshot.call_count, 2)
+
+    def test_closing_snapshot_is_computed_in_a_snapshot(self):
+        staff = get_user_model().objects.create_user('staff', password='secret', is_staff=True)
+        staff_client = Client()
+        staff_client.force_login(staff)
+        with mock.patch('userbaseapp.closing.read_snapshot', wraps=read_snapshot) as snapshot:
+            self.post('/close-bazar-book/', {'bazar': self.bazar, 'date': self.date}, client=staff_client)
+        snapshot.assert_called_once_with(using='default')
+        self.assertEqual(BookSnapshot.objects.get().data['total'], 1000 + 12 * 200)
+
+
+class PoolStatsTests(BookTestCase):
+
+    def test_staff_only(self):
+        response = self.client.get('/get-db-pool-stats/')
+        self.assertEqual(response.status_code, 403)
+        self.client.logout()
+        self.assertEqual(self.client.get('/get-db-pool-stats/').status_code, 302)
+
+    def test_pool_metrics(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual(self.client.get('/get-db-pool-stats/').json()['pooled'], False)
+
+        pool = mock.Mock()
+        pool.get_stats.return_value = {
+            'pool_min': 2, 'pool_max': 10, 'pool_size': 6, 'pool_available': 1,
+            'requests_queued': 4, 'requests_wait_ms': 30,
+        }
+        with mock.patch.dict(connection.settings_dict['OPTIONS'], {'pool': True}), \
+                mock.patch.object(connection, 'pool', pool, create=True):
+            stats = self.client.get('/get-db-pool-stats/').json()
+        self.assertEqual(stats['in_use'], 5)
+        self.assertEqual(stats['saturation'], 0.5)
+        self.assertEqual(stats['wait_ms_avg'], 7.5)
+        self.assertEqual(stats['pid'], os.getpid())
+
+
+class CompactTimesTests(BookTestCase):
+    """?v=2 payloads carry epoch-millisecond timestamps and the zone to show them in"""
+    epoch = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+    def setUp(self):
+        super().setUp()
+        self.place_bet('128', 10)
+        self.action = self.post(
+            '/place-bulk-bet/?v=2', {'type': 'SP', 'amount': 2, 'bazar': self.bazar, 'date': self.date, 'columns': [2]}
+        )
+
+    def assertEpochMs(self, value, dt):
+        self.assertIsInstance(value, int)
+        self.assertEqual(value, (dt - self.epoch) // timedelta(milliseconds=1))
+
+    def test_placement_response(self):
+        self.assertEqual(self.action['tz'], settings.TIME_ZONE)
+        for bet in self.action['bets']:
+            self.assertEpochMs(bet['created_at'], Bet.objects.get(pk=bet['id']).created_at)
+
+    def test_reads(self):
+        bet = Bet.objects.get(number='128')
+        action = BulkBetAction.objects.get()
+
+        payload = self.client.get(self.book_url('/load-bets/', v=2)).json()
+        self.assertEqual(payload['tz'], settings.TIME_ZONE)
+        self.assertEpochMs(payload['bets']['128']['history'][0]['created_at'], bet.created_at)
+
+        payload = self.client.get(self.book_url('/get-last-bulk-action/', v=2)).json()
+        self.assertEpochMs(payload['action']['created_at'], action.created_at)
+
+        payload = self.client.get(self.book_url('/get-bulk-action-history/', v=2)).json()
+        self.assertEpochMs(payload['history'][0]['created_at'], action.created_at)
+
+    def test_legacy_strings_by_default(self):
+        bet = Bet.objects.get(number='128')
+        payload = self.client.get(self.book_url('/load-bets/')).json()
+        self.assertNotIn('tz', payload)
+        self.assertEqual(
+            payload['bets']['128']['history'][0]['created_at'],
+            timezone.localtime(bet.created_at).strftime('%Y-%m-%d %I:%M:%S %p IST')
+        )
+
+
+@override_settings(COMPACT_BULK_BETS=True, STORAGES=UNHASHED_STATIC)
+class HouseExposureTests(BookTestCase):
+    """Every write path keeps the BookExposure totals of the book current"""
+
+    def setUp(self):
+        super().setUp()
+        self.staff = get_user_model().objects.create_user('staff', password='secret', is_staff=True)
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+
+    def exposure(self, **params):
+        response = self.staff_client.get(self.book_url('/get-house-exposure/', **params))
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def stake(self, number):
+        return sum(BookExposure.objects.filter(number=number).values_list('stake', flat=True))
+
+    def test_placing_and_undoing(self):
+        bet_id = self.place_bet('128', 10)['bet_id']
+        self.post('/place-bet/', {'number': '128', 'amount': 5, 'bazar': self.bazar, 'date': self.date}, client=self.staff_client)
+        rows = self.post('/place-bulk-bet/', {'type': 'SP', 'amount': 2, 'bazar': self.bazar, 'date': self.date, 'columns': [2]})
+        compact = self.post('/place-bulk-bet/', {'type': 'SP', 'amount': 1, 'bazar': self.bazar, 'date': self.date})
+        self.post('/place-column-bet/', {'column': 4, 'amount': 3, 'bazar': self.bazar, 'date': self.date})
+        self.assertTrue(BulkBetAction.objects.get(pk=compact['bulk_action_id']).is_compact)
+
+        # 128 is an SP pana of column 1, so the compact action covers it too
+        self.assertEqual(self.stake('128'), 1600)
+        exposure = self.exposure()
+        self.assertEqual(exposure['total_bets'], 3 + rows['total_bets'] + compact['total_bets'])
+        self.assertEqual(exposure['total_stake'], 18 + 2 * rows['total_bets'] + compact['total_bets'])
+        self.assertEqual(exposure['top_numbers'][0], {'number': '128', 'stake': 16, 'bets': 3})
+        self.assertEqual(exposure['by_column'][3]['column_stake'], 3)
+
+        self.post('/delete-bet/', {'bet_id': bet_id})
+        self.post('/undo-bulk-action/', {'bulk_action_id': rows['bulk_action_id']})
+        self.post('/undo-bulk-action/', {'bulk_action_id': compact['bulk_action_id']})
+        self.assertEqual(self.stake('128'), 500)
+        exposure = self.exposure()
+        self.assertEqual((exposure['total_stake'], exposure['total_bets']), (8, 2))
+
+    def test_staff_only(self):
+        self.assertEqual(self.client.get(self.book_url('/get-house-exposure/')).status_code, 403)
+        self.assertRedirects(self.client.get('/exposure/'), '/home/', fetch_redirect_response=False)
+        response = self.staff_client.get('/exposure/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['exposure_config']['urls']['houseExposure'], '/get-house-exposure/')
+
+
+@override_settings(COMPACT_BULK_BETS=True)
+class BazarOverviewTests(BookTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.yesterday = (timezone.localdate() - timedelta(days=1)).isoformat()
+        self.place_bet('128', 10)
+        self.compact = self.post('/place-bulk-bet/', {'type': 'SP', 'amount': 1, 'bazar': self.bazar, 'date': self.date})
+        self.post('/place-bet/', {'number': '5', 'amount': 4, 'bazar': 'MAIN_BAZAR', 'date': self.yesterday})
+
+    def overview(self, **params):
+        response = self.client.get('/get-bazar-overview/', params)
+        self.assertEqual(response.status_code, 200)
+        return {item['bazar']: item for item in response.json()['bazars']}
+
+    def test_one_date(self):
+        bazars = self.overview(date=self.date)
+        self.assertEqual(set(bazars), {bazar for bazar, label in Bet.BAZAR_CHOICES})
+        kalyan = bazars[self.bazar]
+        self.assertEqual(kalyan['bet_count'], 1 + self.compact['total_bets'])
+        self.assertEqual(kalyan['total_amount'], 10 + self.compact['total_bets'])
+        self.assertEqual(kalyan['last_action']['id'], self.compact['bulk_action_id'])
+        self.assertEqual(bazars['MAIN_BAZAR'], {
+            'bazar': 'MAIN_BAZAR', 'label': dict(Bet.BAZAR_CHOICES)['MAIN_BAZAR'],
+            'bet_count': 0, 'last_action': None, 'total_amount': 0,
+        })
+
+    def test_date_range(self):
+        bazars = self.overview(date_from=self.yesterday, date_to=self.date)
+        self.assertEqual(bazars['MAIN_BAZAR']['bet_count'], 1)
+        self.assertEqual(bazars['MAIN_BAZAR']['total_amount'], 4)
+        self.assertEqual(bazars[self.bazar]['bet_count'], 1 + self.compact['total_bets'])
+
+    def test_invalid_ranges(self):
+        for params in (
+            {'date': 'yesterday'},
+            {'date_from': self.date, 'date_to': self.yesterday},
+            {'date_from': '2024-01-01', 'date_to': '2025-01-01'},
+        ):
+            self.assertEqual(self.client.get('/get-bazar-overview/', params).status_code, 400, params)
+
+
+@override_settings(COMPACT_BULK_BETS=True)
+class BookSnapshotTests(BookTestCase):
+    """book-snapshot returns what the per-section reads do, in one request"""
+
+    def setUp(self):
+        super().setUp()
+        self.place_bet('128', 10)
+        self.post('/place-column-bet/', {'column': 4, 'amount': 3, 'bazar': self.bazar, 'date': self.date})
+        self.post('/place-bulk-bet/', {'type': 'SP', 'amount': 2, 'bazar': self.bazar, 'date': self.date, 'columns': [2]})
+        self.compact = self.post('/place-bulk-bet/', {'type': 'DP', 'amount': 1, 'bazar': self.bazar, 'date': self.date})
+
+    def snapshot(self, **params):
+        response = self.client.get(self.book_url('/book-snapshot/', **params))
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def read(self, path, key):
+        return self.client.get(self.book_url(path)).json()[key]
+
+    def test_sections_match_the_reads(self):
+        snapshot = self.snapshot()
+        self.assertEqual(snapshot['bets'], self.read('/load-bets/', 'bets'))
+        self.assertEqual(snapshot['bet_totals'], self.read('/get-all-bet-totals/', 'bet_totals'))
+        self.assertEqual(snapshot['total_amount'], self.read('/get-bet-total/', 'total_amount'))
+        self.assertEqual(snapshot['last_action'], self.read('/get-last-bulk-action/', 'action'))
+        self.assertEqual(snapshot['column_totals'], self.read('/get-column-totals/', 'column_totals'))
+        self.assertIn('storage', snapshot)
+
+        bulk_actions = {row['action_type']: row for row in snapshot['breakdown']['bulk_actions']}
+        self.assertEqual(bulk_actions['DP']['bets'], self.compact['total_bets'])
+        self.assertEqual(
+            sum(row['stake'] for row in snapshot['breakdown']['by_bet_type']), snapshot['total_amount']
+        )
+
+    def test_closed_book(self):
+        sections = 'totals,total,last_action,column_totals,breakdown'
+        live = self.snapshot(sections=sections)
+        with self.captureOnCommitCallbacks(execute=True):
+            close_book(self.bazar, self.date)
+        self.assertTrue(BookSnapshot.objects.exists())
+        self.assertEqual(self.snapshot(sections=sections), live)
+
+    def test_section_selection(self):
+        snapshot = self.snapshot(sections='total,last_action')
+        self.assertEqual(set(snapshot), {'success', 'bazar', 'date', 'total_amount', 'last_action'})
+
+        response = self.client.get(self.book_url('/book-snapshot/', sections='total,everything'))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'Unknown sections: everything')
+
+
+class CatalogTests(BookTestCase):
+    """Catalog GETs are the POST previews as immutable, canonically addressed responses"""
+
+    def canonical(self, path, **params):
+        return f'{path}?{urlencode({**params, "v": catalog_version()})}'
+
+    def test_same_numbers_as_the_posts(self):
+        response = self.client.get(self.canonical('/catalog/motar-numbers/', digits='1234'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), self.post('/generate-motar-numbers/', {'digits': '1234'}))
+
+        for bet_type in ('36', '56'):
+            response = self.client.get(self.canonical('/catalog/comman-pana-numbers/', digit='7', type=bet_type))
+            self.assertEqual(response.json(), self.post('/find-comman-pana-numbers/', {'digit': '7', 'type': bet_type}))
+
+    def test_requests_are_redirected_to_the_canonical_url(self):
+        for url, canonical in (
+            ('/catalog/motar-numbers/?digits=4321', self.canonical('/catalog/motar-numbers/', digits='1234')),
+            ('/catalog/motar-numbers/?digits=1234', self.canonical('/catalog/motar-numbers/', digits='1234')),
+            ('/catalog/comman-pana-numbers/?type=56&digit=7',
+             self.canonical('/catalog/comman-pana-numbers/', digit='7', type='56')),
+            ('/catalog/comman-pana-numbers/?digit=7&type=x',
+             self.canonical('/catalog/comman-pana-numbers/', digit='7', type='36')),
+        ):
+            self.assertRedirects(self.client.get(url), canonical, status_code=302, fetch_redirect_response=False)
+        self.assertEqual(self.client.get('/catalog/motar-numbers/?digits=12').status_code, 400)
+
+    def test_cache_headers(self):
+        url = self.canonical('/catalog/motar-numbers/', digits='1234')
+        response = self.client.get(url)
+        self.assertTrue(response.headers['ETag'])
+        self.assertEqual(
+            set(response.headers['Cache-Control'].split(', ')),
+            {'public', 'immutable', f'max-age={CATALOG_MAX_AGE}'}
+        )
+
+        revalidated = self.client.get(url, HTTP_IF_NONE_MATCH=response.headers['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.headers['ETag'], response.headers['ETag'])
+        self.assertIn('immutable', revalidated.headers['Cache-Control'])
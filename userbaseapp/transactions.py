@@ -0,0 +1,31 @@
+# userbaseapp/transactions.py
+"""
+Transaction policy for views.
+
+Requests are not wrapped in a transaction (ATOMIC_REQUESTS is off), so the
+high-frequency polling reads run in autocommit without BEGIN/COMMIT round
+trips. Instead:
+
+- Write views wrap just their writes in a short `transaction.atomic()` block.
+- Reads that issue several queries which must agree with each other use
+  `read_snapshot()`, a read-only repeatable-read transaction on PostgreSQL.
+- Single-query reads need nothing: one statement is always consistent.
+"""
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+@contextmanager
+def read_snapshot(using=DEFAULT_DB_ALIAS):
+    """Run the enclosed queries against one consistent, read-only snapshot"""
+    connection = connections[using]
+    # SET TRANSACTION must be the first statement of a transaction, so it can
+    # only be issued when this block opens it (not inside an outer atomic)
+    outermost = not connection.in_atomic_block
+
+    with transaction.atomic(using=using):
+        if outermost and connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY')
+        yield
@@ -16,7 +16,7 @@ Including another URLconf
 """
 # userbaseapp/urls.py
 from django.urls import path
-from . import views
+from . import views, async_views
 
 app_name = 'userbaseapp'
 
@@ -32,6 +32,7 @@ urlpatterns = [
     path('place-bulk-bet/', views.place_bulk_bet, name='place_bulk_bet'),
     path('place-quick-bets/', views.place_quick_bets, name='place_quick_bets'),
     path('load-bets/', views.load_bets, name='load_bets'),
+    path('book-snapshot/', views.get_book_snapshot, name='get_book_snapshot'),
     path('delete-bet/', views.delete_bet, name='delete_bet'),
     
     # Bulk action operations
@@ -41,6 +42,8 @@ urlpatterns = [
     # Motar and Comman Pana operations
     path('generate-motar-numbers/', views.generate_motar_numbers, name='generate_motar_numbers'),
     path('find-comman-pana-numbers/', views.find_comman_pana_numbers, name='find_comman_pana_numbers'),
+    path('catalog/motar-numbers/', views.get_motar_numbers, name='get_motar_numbers'),
+    path('catalog/comman-pana-numbers/', views.get_comman_pana_numbers, name='get_comman_pana_numbers'),
     path('place-motar-bet/', views.place_motar_bet, name='place_motar_bet'),
     path('place-comman-pana-bet/', views.place_comman_pana_bet, name='place_comman_pana_bet'),
     path('place-set-pana-bet/', views.place_set_pana_bet, name='place_set_pana_bet'),
@@ -51,11 +54,31 @@ urlpatterns = [
     path('get-bet-total/', views.get_bet_total, name='get_bet_total'),
     path('get-all-bet-totals/', views.get_all_bet_totals, name='get_all_bet_totals'),
     path('get-bulk-action-history/', views.get_bulk_action_history, name='get_bulk_action_history'),
+    path('get-bazar-overview/', views.get_bazar_overview, name='get_bazar_overview'),
     
     # Database storage info
     path('get-database-storage/', views.get_database_storage, name='get_database_storage'),
+    path('get-db-pool-stats/', views.get_db_pool_stats, name='get_db_pool_stats'),
     
     # Column betting
     path('place-column-bet/', views.place_column_bet, name='place_column_bet'),
     path('get-column-totals/', views.get_column_totals, name='get_column_totals'),
+    
+    # Results and settlement
+    path('declare-result/', views.declare_result, name='declare_result'),
+    path('close-bazar-book/', views.close_bazar_book, name='close_bazar_book'),
+    path('reopen-bazar-book/', views.reopen_bazar_book, name='reopen_bazar_book'),
+    path('simulate-outcomes/', views.simulate_outcomes, name='simulate_outcomes'),
+    
+    # House exposure across all users
+    path('exposure/', views.exposure_dashboard, name='exposure_dashboard'),
+    path('get-house-exposure/', views.get_house_exposure, name='get_house_exposure'),
+    
+    # Async (ASGI) variants of the read-heavy polling endpoints
+    path('async/load-bets/', async_views.load_bets, name='async_load_bets'),
+    path('async/get-last-bulk-action/', async_views.get_last_bulk_action, name='async_get_last_bulk_action'),
+    path('async/get-bet-total/', async_views.get_bet_total, name='async_get_bet_total'),
+    path('async/get-all-bet-totals/', async_views.get_all_bet_totals, name='async_get_all_bet_totals'),
+    path('async/get-bulk-action-history/', async_views.get_bulk_action_history, name='async_get_bulk_action_history'),
+    path('async/get-column-totals/', async_views.get_column_totals, name='async_get_column_totals'),
 ]
\ No newline at end of file
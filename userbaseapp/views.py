@@ -3,13 +3,41 @@ from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login as auth_login, logout as auth_logout
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from .models import CustomUser, Bet, BulkBetAction
-from django.http import JsonResponse
+from .models import CustomUser, Bet, BookSnapshot, BulkBetAction
+from .fields import (
+    PaiseSum, RawPaise, is_valid_bet_number, number_set_size, pack_number_set, paise_to_decimal,
+    paise_to_rupees, rupees_to_paise,
+)
+from .transactions import read_snapshot
+from .settlement import settle_bazar
+from .exposure import add_bets, add_bulk_action, book_exposure, remove_bets, remove_compact_actions
+from .events import log_placed_bets, log_placed_bulk_action, log_removed_bets, log_wiped_books
+from .closing import (
+    book_breakdown_paise, close_book, closed_book_snapshot, format_breakdown, placement_state,
+    reopen_book, snapshot_column_totals, snapshot_last_action,
+)
+from . import dense_totals
+from .db_router import replica_reads
+from .book_cache import (
+    coalesced_book_read, coalesced_user_read, conditional_book_read, invalidate_book,
+    invalidate_user_books, request_book,
+)
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.cache import cache_page, cache_control
 from django.db import transaction, connection
-from django.db.models import Sum
+from django.db.models import Count, Max
 from decimal import Decimal
+from functools import lru_cache
+from operator import attrgetter
+from urllib.parse import urlencode
+import calendar
+import hashlib
+import heapq
 import json
 import os
 
@@ -129,6 +157,15 @@ ALL_COLUMN_DATA = [
 ]
 
 
+# Rarely used home page panels, split out of the critical home.js bundle and
+# fetched on first open (see loadPanel in home.js)
+HOME_PANEL_BUNDLES = {
+    'history': 'userbaseapp/js/panels/history.js',
+    'storage': 'userbaseapp/js/panels/storage.js',
+    'dangerZone': 'userbaseapp/js/panels/danger-zone.js',
+}
+
+
 def get_sp_numbers():
     """Get all SP numbers (first 12 rows, 120 numbers)"""
     sp_numbers = []
@@ -279,13 +316,31 @@ def home(request):
         'CM_12': 'CM-12'
     }
     
+    # Page configuration consumed by static/userbaseapp/js/home.js (rendered via json_script)
+    home_config = {
+        'allColumnData': ALL_COLUMN_DATA,
+        'rowLabels': row_labels,
+        'bazarNames': bazar_names,
+        'defaultBazar': bazar_choices[0]['value'],
+        'currentDate': today.strftime('%Y-%m-%d'),
+        'urls': {
+            'placeQuickBets': reverse('userbaseapp:place_quick_bets'),
+            'getTotalBetCount': reverse('userbaseapp:get_total_bet_count'),
+            'masterDelete': reverse('userbaseapp:master_delete_all_bets'),
+            'bazarOverview': reverse('userbaseapp:get_bazar_overview'),
+            'bookSnapshot': reverse('userbaseapp:get_book_snapshot'),
+            'motarNumbers': reverse('userbaseapp:get_motar_numbers'),
+            'commanPanaNumbers': reverse('userbaseapp:get_comman_pana_numbers'),
+        },
+        'catalogVersion': catalog_version(),
+        # Lazily loaded panel bundles (hashed URLs in production)
+        'panels': {name: static(path) for name, path in HOME_PANEL_BUNDLES.items()},
+    }
+    
     return render(request, 'userbaseapp/home.html', {
-        'ALL_COLUMN_DATA': json.dumps(ALL_COLUMN_DATA),
         'bazar_choices': bazar_choices,
         'date_options': date_options,
-        'row_labels': row_labels,
-        'bazar_names_json': json.dumps(bazar_names),
-        'current_date': today.strftime('%Y-%m-%d')
+        'home_config': home_config,
     })
 
 
@@ -319,10 +374,19 @@ def master_delete_all_bets(request):
         # Delete all bets for this user
         with transaction.atomic():
             deleted_count = Bet.objects.filter(user=user).count()
+            deleted_count += BulkBetAction.compact_bet_count(BulkBetAction.objects.filter(user=user))
+            log_wiped_books(user.id)
+            remove_bets(Bet.objects.filter(user=user))
+            remove_compact_actions(BulkBetAction.objects.filter(user=user))
             Bet.objects.filter(user=user).delete()
             
             # Also delete bulk action history for this user
             BulkBetAction.objects.filter(user=user).delete()
+            
+            # Closed books of the user are empty now; read them live
+            BookSnapshot.objects.filter(user=user).delete()
+            
+            invalidate_user_books(user.id)
         
         return JsonResponse({
             'success': True,
@@ -370,7 +434,23 @@ def delete_bazar_bets(request):
                 bazar=bazar,
                 bet_date=bet_date
             ).count()
+            deleted_count += BulkBetAction.compact_bet_count(BulkBetAction.objects.filter(
+                user=user,
+                bazar=bazar,
+                action_date=bet_date
+            ))
             
+            log_wiped_books(user.id, bazar, bet_date)
+            remove_bets(Bet.objects.filter(
+                user=user,
+                bazar=bazar,
+                bet_date=bet_date
+            ))
+            remove_compact_actions(BulkBetAction.objects.filter(
+                user=user,
+                bazar=bazar,
+                action_date=bet_date
+            ))
             Bet.objects.filter(
                 user=user,
                 bazar=bazar,
@@ -383,6 +463,8 @@ def delete_bazar_bets(request):
                 bazar=bazar,
                 action_date=bet_date
             ).delete()
+            
+            invalidate_book(user.id, bazar, bet_date)
         
         return JsonResponse({
             'success': True,
@@ -408,6 +490,7 @@ def get_total_bet_count(request):
     """Get total count of all bets for the current user"""
     try:
         total_count = Bet.objects.filter(user=request.user).count()
+        total_count += BulkBetAction.compact_bet_count(BulkBetAction.objects.filter(user=request.user))
         return JsonResponse({
             'success': True,
             'total_count': total_count
@@ -433,6 +516,9 @@ def place_bet(request):
         if not number or not amount:
             return JsonResponse({'error': 'Missing number or amount'}, status=400)
 
+        if not is_valid_bet_number(number):
+            return JsonResponse({'error': 'Number must be 3 digits or a column number (0-99)'}, status=400)
+
         amount = Decimal(str(amount))
         if amount <= 0:
             return JsonResponse({'error': 'Amount must be greater than 0'}, status=400)
@@ -444,14 +530,22 @@ def place_bet(request):
             from datetime import datetime
             bet_date = datetime.fromisoformat(date_str).date()
 
-        bet = Bet.objects.create(
-            user=request.user,
-            number=str(number),
-            amount=amount,
-            bet_type='SINGLE',
-            bazar=bazar,
-            bet_date=bet_date
-        )
+        closed, blocked = placement_state(bazar, bet_date)
+        if blocked:
+            return JsonResponse({'success': False, 'error': 'This bazar is closed for the date'}, status=400)
+
+        with transaction.atomic():
+            bet = Bet.objects.create(
+                user=request.user,
+                number=str(number),
+                amount=amount,
+                bet_type='SINGLE',
+                bazar=bazar,
+                bet_date=bet_date
+            )
+            add_bets([bet])
+            log_placed_bets([bet])
+            invalidate_book(request.user.id, bazar, bet_date, closed=closed)
 
         return JsonResponse({
             'success': True,
@@ -467,9 +561,18 @@ def place_bet(request):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+def compact_number_set(action_type, numbers):
+    """
+    Number-set bitmap for a new bulk action whose bets should be stored
+    compactly (settings.COMPACT_BULK_BETS), or None to create Bet rows
+    """
+    if not settings.COMPACT_BULK_BETS or action_type not in BulkBetAction.COMPACT_ACTION_TYPES:
+        return None
+    return pack_number_set(numbers)
+
+
 @login_required
 @require_http_methods(["POST"])
-@transaction.atomic
 def place_bulk_bet(request):
     """Place bulk bets (SP, DP, Jodi Vagar, Dadar, Eki, Beki, or ABR Cut)"""
     try:
@@ -493,6 +596,10 @@ def place_bulk_bet(request):
             from datetime import datetime
             bet_date = datetime.fromisoformat(date_str).date()
 
+        closed, blocked = placement_state(bazar, bet_date)
+        if blocked:
+            return JsonResponse({'success': False, 'error': 'This bazar is closed for the date'}, status=400)
+
         # Determine which numbers to bet on
         if bet_type == 'SP':
             columns = data.get('columns')  # Support multiple columns
@@ -625,103 +732,122 @@ def place_bulk_bet(request):
             if columns and isinstance(columns, list) and len(columns) > 0:
                 jodi_column = columns[0]
         
-        bulk_action = BulkBetAction.objects.create(
-            user=request.user,
-            action_type=bet_type,
-            amount=amount,
-            total_bets=len(numbers),
-            jodi_column=jodi_column,
-            jodi_type=data.get('jodi_type') if bet_type == 'JODI' else (data.get('panel_type') if bet_type == 'JODI_PANEL' else None),
-            bazar=bazar,
-            action_date=bet_date
-        )
+        # Bets with a column need rows; plain SP/DP sets can be stored compactly
+        number_set = None if data.get('columns') else compact_number_set(bet_type, numbers)
 
-        # Create all bets
-        bets_created = []
-        
-        # Determine sub_type for tracking
-        sub_type = None
-        if bet_type == 'JODI':
-            sub_type = str(data.get('jodi_type'))  # '5', '7', or '12'
-        elif bet_type == 'JODI_PANEL':
-            sub_type = str(data.get('panel_type'))  # '6' or '7'
-        elif bet_type in ['EKI', 'BEKI', 'DADAR']:
-            sub_type = bet_type  # Store EKI, BEKI, or DADAR as sub_type
-        
-        # Get all columns for multi-column bets
-        all_columns = data.get('columns', [])
-        if not isinstance(all_columns, list):
-            all_columns = [all_columns] if all_columns else []
-        
-        for number in numbers:
-            # Determine which column this number belongs to (for column-based bet types)
-            column_num = None
-            
-            # For SP and DP, detect column from ALL_COLUMN_DATA if columns were selected
-            if bet_type in ['SP', 'DP'] and all_columns:
-                for col in all_columns:
-                    col_int = int(col)
-                    if 1 <= col_int <= 10:
-                        column_data = ALL_COLUMN_DATA[col_int - 1]
-                        if bet_type == 'SP':
-                            # Check if number is in first 12 positions (SP numbers)
-                            if number in [str(n) for n in column_data[0:12]]:
-                                column_num = col_int
-                                break
-                        elif bet_type == 'DP':
-                            # Check if number is in positions 12-21 (DP numbers)
-                            if number in [str(n) for n in column_data[12:22]]:
-                                column_num = col_int
-                                break
-            
-            # For other column-based bet types (only if columns were provided)
-            elif bet_type in ['JODI', 'ABR_CUT', 'JODI_PANEL'] and all_columns:
-                # Find which column contains this number
-                for col in all_columns:
-                    col_int = int(col)
-                    if bet_type == 'JODI' and col_int in JODI_VAGAR_NUMBERS:
-                        if int(number) in JODI_VAGAR_NUMBERS[col_int]:
-                            column_num = col_int
-                            break
-                    elif bet_type == 'ABR_CUT' and col_int in ABR_CUT_NUMBERS:
-                        if int(number) in ABR_CUT_NUMBERS[col_int]:
-                            column_num = col_int
-                            break
-                    elif bet_type == 'JODI_PANEL' and col_int in JODI_PANEL_NUMBERS:
-                        if int(number) in JODI_PANEL_NUMBERS[col_int]:
-                            column_num = col_int
-                            break
-            
-            bet = Bet.objects.create(
+        with transaction.atomic():
+            bulk_action = BulkBetAction.objects.create(
                 user=request.user,
-                number=str(number),
+                action_type=bet_type,
                 amount=amount,
-                bulk_action=bulk_action,
-                bet_type=bet_type,
-                column_number=column_num,
-                sub_type=sub_type,
+                total_bets=len(numbers),
+                jodi_column=jodi_column,
+                jodi_type=data.get('jodi_type') if bet_type == 'JODI' else (data.get('panel_type') if bet_type == 'JODI_PANEL' else None),
                 bazar=bazar,
-                bet_date=bet_date
+                action_date=bet_date,
+                number_set=number_set
             )
-            # Convert to IST for display
-            from django.utils import timezone as tz
-            local_time = tz.localtime(bet.created_at)
-            bets_created.append({
-                'id': bet.id,
-                'number': bet.number,
-                'amount': str(bet.amount),
-                'bet_type': bet.bet_type,
-                'column': column_num,
-                'created_at': local_time.strftime('%Y-%m-%d %I:%M:%S %p IST')
-            })
 
-        return JsonResponse({
+            # Create all bets
+            bets_created = []
+        
+            # Determine sub_type for tracking
+            sub_type = None
+            if bet_type == 'JODI':
+                sub_type = str(data.get('jodi_type'))  # '5', '7', or '12'
+            elif bet_type == 'JODI_PANEL':
+                sub_type = str(data.get('panel_type'))  # '6' or '7'
+            elif bet_type in ['EKI', 'BEKI', 'DADAR']:
+                sub_type = bet_type  # Store EKI, BEKI, or DADAR as sub_type
+        
+            # Get all columns for multi-column bets
+            all_columns = data.get('columns', [])
+            if not isinstance(all_columns, list):
+                all_columns = [all_columns] if all_columns else []
+        
+            compact_times = wants_compact_times(request)
+            if bulk_action.is_compact:
+                created_at = format_created_at(bulk_action.created_at, compact_times)
+                for bet in bulk_action.virtual_bets():
+                    bets_created.append({
+                        'id': bet.id,
+                        'number': bet.number,
+                        'amount': str(amount),
+                        'bet_type': bet.bet_type,
+                        'column': None,
+                        'created_at': created_at
+                    })
+            else:
+                for number in numbers:
+                    # Determine which column this number belongs to (for column-based bet types)
+                    column_num = None
+            
+                    # For SP and DP, detect column from ALL_COLUMN_DATA if columns were selected
+                    if bet_type in ['SP', 'DP'] and all_columns:
+                        for col in all_columns:
+                            col_int = int(col)
+                            if 1 <= col_int <= 10:
+                                column_data = ALL_COLUMN_DATA[col_int - 1]
+                                if bet_type == 'SP':
+                                    # Check if number is in first 12 positions (SP numbers)
+                                    if number in [str(n) for n in column_data[0:12]]:
+                                        column_num = col_int
+                                        break
+                                elif bet_type == 'DP':
+                                    # Check if number is in positions 12-21 (DP numbers)
+                                    if number in [str(n) for n in column_data[12:22]]:
+                                        column_num = col_int
+                                        break
+            
+                    # For other column-based bet types (only if columns were provided)
+                    elif bet_type in ['JODI', 'ABR_CUT', 'JODI_PANEL'] and all_columns:
+                        # Find which column contains this number
+                        for col in all_columns:
+                            col_int = int(col)
+                            if bet_type == 'JODI' and col_int in JODI_VAGAR_NUMBERS:
+                                if int(number) in JODI_VAGAR_NUMBERS[col_int]:
+                                    column_num = col_int
+                                    break
+                            elif bet_type == 'ABR_CUT' and col_int in ABR_CUT_NUMBERS:
+                                if int(number) in ABR_CUT_NUMBERS[col_int]:
+                                    column_num = col_int
+                                    break
+                            elif bet_type == 'JODI_PANEL' and col_int in JODI_PANEL_NUMBERS:
+                                if int(number) in JODI_PANEL_NUMBERS[col_int]:
+                                    column_num = col_int
+                                    break
+            
+                    bet = Bet.objects.create(
+                        user=request.user,
+                        number=str(number),
+                        amount=amount,
+                        bulk_action=bulk_action,
+                        bet_type=bet_type,
+                        column_number=column_num,
+                        sub_type=sub_type,
+                        bazar=bazar,
+                        bet_date=bet_date
+                    )
+                    bets_created.append({
+                        'id': bet.id,
+                        'number': bet.number,
+                        'amount': str(bet.amount),
+                        'bet_type': bet.bet_type,
+                        'column': column_num,
+                        'created_at': format_created_at(bet.created_at, compact_times)
+                    })
+        
+            add_bulk_action(bulk_action)
+            log_placed_bulk_action(bulk_action)
+            invalidate_book(request.user.id, bazar, bet_date, closed=closed)
+
+        return JsonResponse(versioned_payload({
             'success': True,
             'message': f'{len(numbers)} bets placed successfully',
             'bulk_action_id': bulk_action.id,
             'total_bets': len(numbers),
             'bets': bets_created
-        })
+        }, compact_times))
 
     except json.JSONDecodeError:
         return JsonResponse({'error': 'Invalid JSON'}, status=400)
@@ -729,8 +855,357 @@ def place_bulk_bet(request):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+# ========== BOOK READ HELPERS ==========
+# Querysets and payload builders shared by the sync read views below and
+# their async variants in async_views.py
+
+# Payload timestamps. By default created_at is an IST display string; with
+# ?v=2 it is integer epoch milliseconds, the response carries the server
+# time zone once in 'tz', and the client formats it.
+COMPACT_TIMES_VERSION = '2'
+
+
+def wants_compact_times(request):
+    return request.GET.get('v') == COMPACT_TIMES_VERSION
+
+
+def epoch_ms(dt):
+    return calendar.timegm(dt.utctimetuple()) * 1000 + dt.microsecond // 1000
+
+
+def format_created_at(dt, compact_times=False):
+    """Epoch milliseconds (v=2) or the legacy 'YYYY-MM-DD hh:mm:ss AM IST' string"""
+    if compact_times:
+        return epoch_ms(dt)
+    from django.utils import timezone as tz
+    return tz.localtime(dt).strftime('%Y-%m-%d %I:%M:%S %p IST')
+
+
+def versioned_payload(payload, compact_times):
+    """Add the time zone compact timestamps are to be shown in"""
+    if compact_times:
+        payload['tz'] = settings.TIME_ZONE
+    return payload
+
+
+def book_read_name(name, compact_times):
+    """Cache name of a book read whose payload depends on the time format"""
+    return f'{name}_v{COMPACT_TIMES_VERSION}' if compact_times else name
+
+
+def book_bets_queryset(user, bazar, bet_date):
+    """Bets of one book with only the fields load_bets needs, newest first"""
+    # Optimized query - only fetch needed fields and use index
+    return Bet.objects.filter(
+        user=user,
+        bazar=bazar,
+        bet_date=bet_date
+    ).only(
+        'id', 'number', 'created_at', 
+        'bet_type', 'column_number', 'sub_type'
+    ).annotate(
+        amount_paise=RawPaise('amount')
+    ).order_by('-created_at')
+
+
+def compact_actions_queryset(user, bazar, bet_date):
+    """Active compact bulk actions of one book (their bets are not rows), newest first"""
+    return BulkBetAction.objects.filter(
+        user=user,
+        bazar=bazar,
+        action_date=bet_date,
+        is_undone=False,
+        number_set__isnull=False
+    ).only(
+        'id', 'action_type', 'amount', 'number_set', 'created_at'
+    ).order_by('-created_at')
+
+
+def expand_compact_actions(actions):
+    """Virtual bets of compact actions, newest action first"""
+    return [bet for action in actions for bet in action.virtual_bets()]
+
+
+def compact_actions_total_paise(actions):
+    return sum(rupees_to_paise(action.amount) * number_set_size(action.number_set) for action in actions)
+
+
+def group_bets_by_number(bets, virtual_bets=(), compact_times=False):
+    """Build the load_bets payload {number: {'total': ..., 'history': [...]}}"""
+    bets_dict = {}
+    total_paise = {}
+    # Both are newest first; merge so each number's history stays in that order
+    for bet in heapq.merge(bets, virtual_bets, key=attrgetter('created_at'), reverse=True):
+        if bet.number not in bets_dict:
+            bets_dict[bet.number] = {
+                'total': 0,
+                'history': []
+            }
+            total_paise[bet.number] = 0
+        total_paise[bet.number] += bet.amount_paise
+        bets_dict[bet.number]['history'].append({
+            'id': bet.id,
+            'amount': paise_to_rupees(bet.amount_paise),
+            'created_at': format_created_at(bet.created_at, compact_times),
+            'bet_type': bet.bet_type,
+            'column': bet.column_number,
+            'sub_type': bet.sub_type
+        })
+    # Sum in integer paise, convert once per number
+    for number, paise in total_paise.items():
+        bets_dict[number]['total'] = paise_to_rupees(paise)
+    return bets_dict
+
+
+def book_total_queryset(user, bazar, bet_date):
+    """Bets of one book, for a database-level SUM"""
+    return Bet.objects.filter(
+        user=user,
+        bazar=bazar,
+        bet_date=bet_date
+    )
+
+
+def book_totals_queryset(user, bazar, bet_date):
+    """Per-number totals of one book, grouped and summed at database level"""
+    return Bet.objects.filter(
+        user=user,
+        bazar=bazar,
+        bet_date=bet_date
+    ).values('number').annotate(
+        total=PaiseSum('amount')
+    ).order_by('number')
+
+
+def paise_totals_by_number(rows, virtual_bets=()):
+    """Convert grouped total rows (plus any virtual bets) to {number: paise} for easy lookup"""
+    total_paise = {item['number']: item['total'] for item in rows}
+    for bet in virtual_bets:
+        total_paise[bet.number] = total_paise.get(bet.number, 0) + bet.amount_paise
+    return {number: total_paise[number] for number in sorted(total_paise)}
+
+
+def bet_totals_response(paise_totals, totals_format=None):
+    """get_all_bet_totals response: {number: rupees} JSON, or a dense format (see dense_totals)"""
+    if totals_format == 'binary':
+        return HttpResponse(
+            dense_totals.encode_binary(paise_totals),
+            content_type=dense_totals.BINARY_CONTENT_TYPE
+        )
+    if totals_format == 'array':
+        dense, extra = dense_totals.split_totals(paise_totals)
+        return JsonResponse({
+            'success': True,
+            'unit': 'paise',
+            'totals': dense,
+            'extra': extra
+        })
+    return JsonResponse({
+        'success': True,
+        'bet_totals': {number: paise_to_rupees(paise) for number, paise in paise_totals.items()}
+    })
+
+
+def last_bulk_action_queryset(user, bazar, action_date):
+    """Active bulk actions of one book, newest first (Meta ordering)"""
+    # Optimized query - only fetch needed fields
+    return BulkBetAction.objects.filter(
+        user=user,
+        is_undone=False,
+        bazar=bazar,
+        action_date=action_date
+    ).only(
+        'id', 'action_type', 'amount', 'total_bets',
+        'jodi_column', 'jodi_type', 'created_at'
+    )
+
+
+def serialize_last_bulk_action(last_action, compact_times=False):
+    """Payload for get_last_bulk_action, or None when there is no action"""
+    if not last_action:
+        return None
+    
+    return {
+        'id': last_action.id,
+        'type': last_action.action_type,
+        'amount': str(last_action.amount),
+        'total_bets': last_action.total_bets,
+        'jodi_column': last_action.jodi_column,
+        'jodi_type': last_action.jodi_type,
+        'created_at': format_created_at(last_action.created_at, compact_times)
+    }
+
+
+# Longest date range the bazar overview accepts
+MAX_OVERVIEW_DAYS = 366
+
+
+def bazar_overview(user, date_from, date_to, compact_times=False):
+    """
+    Total amount, bet count and last bulk action of every bazar of a user
+    for a date range: one grouped query over the bets, plus one each for
+    compact bulk actions and the last actions.
+    """
+    overview = {
+        bazar: {'bazar': bazar, 'label': label, 'total_paise': 0, 'bet_count': 0, 'last_action': None}
+        for bazar, label in Bet.BAZAR_CHOICES
+    }
+
+    rows = Bet.objects.filter(
+        user=user,
+        bet_date__range=(date_from, date_to)
+    ).order_by().values('bazar').annotate(
+        total=PaiseSum('amount'),
+        count=Count('id')
+    )
+    for row in rows:
+        overview[row['bazar']]['total_paise'] += row['total']
+        overview[row['bazar']]['bet_count'] += row['count']
+
+    actions = BulkBetAction.objects.filter(
+        user=user,
+        is_undone=False,
+        action_date__range=(date_from, date_to)
+    )
+    compact_actions = actions.filter(number_set__isnull=False).only('bazar', 'amount', 'number_set')
+    for action in compact_actions:
+        size = number_set_size(action.number_set)
+        overview[action.bazar]['total_paise'] += rupees_to_paise(action.amount) * size
+        overview[action.bazar]['bet_count'] += size
+
+    # Newest active action per bazar (ids grow with creation time)
+    last_ids = actions.order_by().values('bazar').annotate(last_id=Max('id')).values('last_id')
+    last_actions = BulkBetAction.objects.filter(id__in=last_ids).only(
+        'id', 'bazar', 'action_type', 'amount', 'total_bets',
+        'jodi_column', 'jodi_type', 'created_at'
+    )
+    for action in last_actions:
+        overview[action.bazar]['last_action'] = serialize_last_bulk_action(action, compact_times)
+
+    bazars = list(overview.values())
+    for item in bazars:
+        item['total_amount'] = paise_to_rupees(item.pop('total_paise'))
+    return bazars
+
+
+# Sections of book-snapshot; `storage` is the database size, not part of the book
+BOOK_SNAPSHOT_SECTIONS = ('bets', 'totals', 'total', 'last_action', 'column_totals', 'breakdown', 'storage')
+
+
+def book_snapshot(user, bazar, bet_date, sections, compact_times=False):
+    """
+    The book sections of book-snapshot (everything but storage), read from
+    one consistent snapshot so they all describe the same set of bets. A
+    closed book's sections come from its BookSnapshot row, except the bets.
+    """
+    snapshot = {}
+    closed = closed_book_snapshot(user.id, bazar, bet_date)
+    if closed is not None:
+        if 'totals' in sections:
+            snapshot['bet_totals'] = {number: paise_to_rupees(paise) for number, paise in closed['totals'].items()}
+        if 'total' in sections:
+            snapshot['total_amount'] = paise_to_rupees(closed['total'])
+        if 'last_action' in sections:
+            snapshot['last_action'] = snapshot_last_action(closed, compact_times)
+        if 'column_totals' in sections:
+            snapshot['column_totals'] = snapshot_column_totals(closed)
+        if 'breakdown' in sections:
+            snapshot['breakdown'] = format_breakdown(closed['by_bet_type'], closed['bulk_actions'])
+        sections = sections & {'bets'}
+    
+    bets = book_bets_queryset(user, bazar, bet_date)
+    with read_snapshot(using=bets.db):
+        # Compact actions are shared by the bets, totals, total and breakdown sections
+        compact_actions = []
+        if sections & {'bets', 'totals', 'total', 'breakdown'}:
+            compact_actions = list(compact_actions_queryset(user, bazar, bet_date))
+        virtual_bets = expand_compact_actions(compact_actions)
+
+        if 'bets' in sections:
+            snapshot['bets'] = group_bets_by_number(bets, virtual_bets, compact_times)
+        if 'totals' in sections:
+            paise_totals = paise_totals_by_number(book_totals_queryset(user, bazar, bet_date), virtual_bets)
+            snapshot['bet_totals'] = {number: paise_to_rupees(paise) for number, paise in paise_totals.items()}
+        if 'total' in sections:
+            total = book_total_queryset(user, bazar, bet_date).aggregate(total=PaiseSum('amount'))['total']
+            snapshot['total_amount'] = paise_to_rupees(total + compact_actions_total_paise(compact_actions))
+        if 'last_action' in sections:
+            snapshot['last_action'] = serialize_last_bulk_action(
+                last_bulk_action_queryset(user, bazar, bet_date).first(),
+                compact_times
+            )
+        if 'column_totals' in sections:
+            snapshot['column_totals'] = column_totals_from_rows(column_totals_queryset(user, bazar, bet_date))
+        if 'breakdown' in sections:
+            snapshot['breakdown'] = format_breakdown(
+                *book_breakdown_paise(user.id, bazar, bet_date, compact_actions)
+            )
+    return snapshot
+
+
+def bulk_action_history_queryset(user, bazar=None, date_str=None):
+    """Bulk actions of a user, optionally filtered by bazar and date, newest first"""
+    # Start with base query
+    bulk_actions = BulkBetAction.objects.filter(user=user)
+    
+    # Apply bazar filter if provided
+    if bazar:
+        bulk_actions = bulk_actions.filter(bazar=bazar)
+    
+    # Apply date filter if provided
+    if date_str:
+        from datetime import datetime
+        try:
+            filter_date = datetime.fromisoformat(date_str).date()
+            bulk_actions = bulk_actions.filter(action_date=filter_date)
+        except ValueError:
+            pass  # Invalid date format, skip filtering
+    
+    # Order by newest first
+    return bulk_actions.order_by('-created_at')
+
+
+def serialize_bulk_action_history(action, compact_times=False):
+    """One row of the get_bulk_action_history payload"""
+    return {
+        'id': action.id,
+        'action_type': action.action_type,
+        'amount': str(action.amount),
+        'total_bets': action.total_bets,
+        'jodi_column': action.jodi_column,
+        'jodi_type': action.jodi_type,
+        'created_at': format_created_at(action.created_at, compact_times),
+        'is_undone': action.is_undone,
+        'bazar': action.bazar,
+        'action_date': action.action_date.strftime('%Y-%m-%d') if action.action_date else None
+    }
+
+
+def column_totals_queryset(user, bazar, bet_date):
+    """Column bet totals of one book, grouped by column in a single query"""
+    return Bet.objects.filter(
+        user=user,
+        bet_type='COLUMN',
+        bazar=bazar,
+        bet_date=bet_date,
+        is_deleted=False
+    ).values('column_number').annotate(
+        total=PaiseSum('amount')
+    ).order_by()
+
+
+def column_totals_from_rows(rows):
+    """Convert grouped column rows to {column: total} for columns 1-10"""
+    column_totals = {col: 0.0 for col in range(1, 11)}
+    for row in rows:
+        if row['column_number'] in column_totals:
+            column_totals[row['column_number']] = paise_to_rupees(row['total'])
+    return column_totals
+
+
 @login_required
 @require_http_methods(["GET"])
+@conditional_book_read
 def load_bets(request):
     """Load all bets for the current user organized by number"""
     try:
@@ -744,43 +1219,79 @@ def load_bets(request):
             from datetime import datetime
             bet_date = datetime.fromisoformat(date_str).date()
         
-        # Optimized query - only fetch needed fields and use index
-        user_bets = Bet.objects.filter(
-            user=request.user,
-            bazar=bazar,
-            bet_date=bet_date
-        ).only(
-            'id', 'number', 'amount', 'created_at', 
-            'bet_type', 'column_number', 'sub_type'
-        ).order_by('-created_at')
-        
-        bets_dict = {}
-        for bet in user_bets:
-            if bet.number not in bets_dict:
-                bets_dict[bet.number] = {
-                    'total': 0,
-                    'history': []
-                }
-            bets_dict[bet.number]['total'] += float(bet.amount)
-            # Convert to IST for display
-            local_time = timezone.localtime(bet.created_at)
-            bets_dict[bet.number]['history'].append({
-                'id': bet.id,
-                'amount': float(bet.amount),
-                'created_at': local_time.strftime('%Y-%m-%d %I:%M:%S %p IST'),
-                'bet_type': bet.bet_type,
-                'column': bet.column_number,
-                'sub_type': bet.sub_type
-            })
+        compact_times = wants_compact_times(request)
+        bets_dict = coalesced_book_read(
+            book_read_name('load_bets', compact_times), request.user.id, bazar, bet_date,
+            lambda: group_bets_by_number(
+                book_bets_queryset(request.user, bazar, bet_date),
+                expand_compact_actions(compact_actions_queryset(request.user, bazar, bet_date)),
+                compact_times
+            )
+        )
         
-        return JsonResponse({
+        return JsonResponse(versioned_payload({
             'success': True,
             'bets': bets_dict
-        })
+        }, compact_times))
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
 
+@login_required
+@require_http_methods(["GET"])
+@replica_reads
+def get_book_snapshot(request):
+    """
+    Everything the page loads for a book in one request: bets, per-number
+    totals, total amount, last bulk action, column totals, a breakdown by bet
+    type and bulk action, and database storage. ?sections= (comma-separated)
+    selects a subset.
+    """
+    try:
+        bazar = request.GET.get('bazar', 'SRIDEVI_OPEN')
+        date_str = request.GET.get('date')
+        
+        # Parse date if provided
+        from django.utils import timezone
+        bet_date = timezone.now().date()
+        if date_str:
+            from datetime import datetime
+            bet_date = datetime.fromisoformat(date_str).date()
+        
+        sections = set(BOOK_SNAPSHOT_SECTIONS)
+        if request.GET.get('sections'):
+            sections = set(request.GET['sections'].split(','))
+            unknown = sections - set(BOOK_SNAPSHOT_SECTIONS)
+            if unknown:
+                return JsonResponse({
+                    'success': False,
+                    'error': f'Unknown sections: {", ".join(sorted(unknown))}'
+                }, status=400)
+        
+        compact_times = wants_compact_times(request)
+        book_sections = sections - {'storage'}
+        snapshot = {}
+        if book_sections:
+            snapshot = coalesced_book_read(
+                book_read_name('book_snapshot', compact_times), request.user.id, bazar, bet_date,
+                lambda: book_snapshot(request.user, bazar, bet_date, book_sections, compact_times),
+                params=','.join(sorted(book_sections))
+            )
+        if 'storage' in sections:
+            snapshot = {**snapshot, 'storage': database_storage()}
+        
+        return JsonResponse(versioned_payload({
+            'success': True,
+            'bazar': bazar,
+            'date': bet_date.strftime('%Y-%m-%d'),
+            **snapshot
+        }, compact_times))
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid date'}, status=400)
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
 @login_required
 @require_http_methods(["POST"])
 def delete_bet(request):
@@ -792,12 +1303,29 @@ def delete_bet(request):
         if not bet_id:
             return JsonResponse({'error': 'Missing bet_id'}, status=400)
 
+        # Negative ids are virtual bets of a compact bulk action
+        if int(bet_id) < 0:
+            action_id, number = BulkBetAction.split_virtual_bet_id(bet_id)
+            bulk_action = BulkBetAction.objects.filter(
+                id=action_id, user=request.user, is_undone=False
+            ).first()
+            if not bulk_action or not bulk_action.discard_number(number):
+                return JsonResponse({'error': 'Bet not found or unauthorized'}, status=404)
+            return JsonResponse({
+                'success': True,
+                'message': 'Bet deleted successfully'
+            })
+
         bet = Bet.objects.filter(id=bet_id, user=request.user).first()
         
         if not bet:
             return JsonResponse({'error': 'Bet not found or unauthorized'}, status=404)
         
-        bet.delete()
+        with transaction.atomic():
+            remove_bets(Bet.objects.filter(pk=bet.pk))
+            log_removed_bets(Bet.objects.filter(pk=bet.pk))
+            invalidate_book(bet.user_id, bet.bazar, bet.bet_date)
+            bet.delete()
 
         return JsonResponse({
             'success': True,
@@ -812,7 +1340,6 @@ def delete_bet(request):
 
 @login_required
 @require_http_methods(["POST"])
-@transaction.atomic
 def undo_bulk_action(request):
     """Undo/Delete a bulk betting action"""
     try:
@@ -836,7 +1363,7 @@ def undo_bulk_action(request):
             return JsonResponse({'success': False, 'message': 'This bulk action has already been deleted'}, status=400)
         
         # Get count before deletion for message
-        bet_count = bulk_action.bets.count()
+        bet_count = bulk_action.bet_count()
         
         # Delete all associated bets and mark as undone
         success, message = bulk_action.undo()
@@ -862,6 +1389,7 @@ def undo_bulk_action(request):
 
 @login_required
 @require_http_methods(["GET"])
+@conditional_book_read
 def get_last_bulk_action(request):
     """Get the last bulk action for undo button visibility"""
     try:
@@ -875,53 +1403,63 @@ def get_last_bulk_action(request):
             from datetime import datetime
             action_date = datetime.fromisoformat(date_str).date()
         
-        # Optimized query - only fetch needed fields
-        last_action = BulkBetAction.objects.filter(
-            user=request.user,
-            is_undone=False,
-            bazar=bazar,
-            action_date=action_date
-        ).only(
-            'id', 'action_type', 'amount', 'total_bets',
-            'jodi_column', 'jodi_type', 'created_at'
-        ).first()
+        compact_times = wants_compact_times(request)
+        
+        def build_last_action():
+            snapshot = closed_book_snapshot(request.user.id, bazar, action_date)
+            if snapshot is not None:
+                return snapshot_last_action(snapshot, compact_times)
+            return serialize_last_bulk_action(
+                last_bulk_action_queryset(request.user, bazar, action_date).first(),
+                compact_times
+            )
+        
+        action = coalesced_book_read(
+            book_read_name('last_bulk_action', compact_times), request.user.id, bazar, action_date,
+            build_last_action
+        )
         
-        if not last_action:
+        if not action:
             return JsonResponse({
                 'success': True,
                 'has_action': False
             })
         
-        # Convert to IST for display
-        from django.utils import timezone as tz
-        local_time = tz.localtime(last_action.created_at)
-        return JsonResponse({
+        return JsonResponse(versioned_payload({
             'success': True,
             'has_action': True,
-            'action': {
-                'id': last_action.id,
-                'type': last_action.action_type,
-                'amount': str(last_action.amount),
-                'total_bets': last_action.total_bets,
-                'jodi_column': last_action.jodi_column,
-                'jodi_type': last_action.jodi_type,
-                'created_at': local_time.strftime('%Y-%m-%d %I:%M:%S %p IST')
-            }
-        })
+            'action': action
+        }, compact_times))
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
 
 @login_required
 @require_http_methods(["GET"])
+@replica_reads
 def get_bet_summary(request):
     """Get summary statistics for user's bets"""
     try:
         user_bets = Bet.objects.filter(user=request.user)
         
-        total_amount = sum(bet.amount for bet in user_bets)
-        total_bets = user_bets.count()
-        unique_numbers = user_bets.values('number').distinct().count()
+        # Several queries that must describe the same set of bets
+        compact_actions = BulkBetAction.objects.filter(
+            user=request.user, is_undone=False, number_set__isnull=False
+        ).only('amount', 'number_set')
+        with read_snapshot(using=user_bets.db):
+            total_paise = user_bets.aggregate(total=PaiseSum('amount'))['total']
+            total_bets = user_bets.count()
+            compact_actions = list(compact_actions)
+            if compact_actions:
+                total_paise += compact_actions_total_paise(compact_actions)
+                total_bets += sum(number_set_size(action.number_set) for action in compact_actions)
+                numbers = set(user_bets.values_list('number', flat=True).distinct())
+                for action in compact_actions:
+                    numbers.update(action.numbers)
+                unique_numbers = len(numbers)
+            else:
+                unique_numbers = user_bets.values('number').distinct().count()
+        total_amount = paise_to_decimal(total_paise)
         
         return JsonResponse({
             'success': True,
@@ -936,6 +1474,8 @@ def get_bet_summary(request):
 
 
 @login_required
+@conditional_book_read
+@replica_reads
 def get_bet_total(request):
     try:
         bazar = request.GET.get('bazar', 'SRIDEVI_OPEN')
@@ -949,15 +1489,18 @@ def get_bet_total(request):
             bet_date = datetime.fromisoformat(date_str).date()
         
         # Optimized aggregation - uses database-level SUM for better performance
-        total_amount = Bet.objects.filter(
-            user=request.user,
-            bazar=bazar,
-            bet_date=bet_date
-        ).aggregate(total=Sum('amount'))['total'] or 0
+        def build_total():
+            snapshot = closed_book_snapshot(request.user.id, bazar, bet_date)
+            if snapshot is not None:
+                return snapshot['total']
+            total = book_total_queryset(request.user, bazar, bet_date).aggregate(total=PaiseSum('amount'))['total']
+            return total + compact_actions_total_paise(compact_actions_queryset(request.user, bazar, bet_date))
+
+        total_paise = coalesced_book_read('bet_total_paise', request.user.id, bazar, bet_date, build_total)
         
         return JsonResponse({
             'success': True,
-            'total_amount': float(total_amount)
+            'total_amount': paise_to_rupees(total_paise)
         })
     except Exception as e:
         return JsonResponse({
@@ -968,6 +1511,8 @@ def get_bet_total(request):
 
 @login_required
 @require_http_methods(["GET"])
+@conditional_book_read
+@replica_reads
 def get_all_bet_totals(request):
     """Get bet totals for all numbers grouped by number - for real-time sync across devices"""
     try:
@@ -982,24 +1527,19 @@ def get_all_bet_totals(request):
             bet_date = datetime.fromisoformat(date_str).date()
         
         # Optimized query - group by number and sum amounts at database level
-        from django.db.models import Sum
-        bet_totals = Bet.objects.filter(
-            user=request.user,
-            bazar=bazar,
-            bet_date=bet_date
-        ).values('number').annotate(
-            total=Sum('amount')
-        ).order_by('number')
-        
-        # Convert to dictionary for easy lookup: {number: total}
-        totals_dict = {}
-        for item in bet_totals:
-            totals_dict[item['number']] = float(item['total'])
+        def build_paise_totals():
+            snapshot = closed_book_snapshot(request.user.id, bazar, bet_date)
+            if snapshot is not None:
+                return snapshot['totals']
+            return paise_totals_by_number(
+                book_totals_queryset(request.user, bazar, bet_date),
+                expand_compact_actions(compact_actions_queryset(request.user, bazar, bet_date))
+            )
         
-        return JsonResponse({
-            'success': True,
-            'bet_totals': totals_dict
-        })
+        paise_totals = coalesced_book_read('bet_totals_paise', request.user.id, bazar, bet_date, build_paise_totals)
+        
+        # ?format=array or ?format=binary for the dense formats
+        return bet_totals_response(paise_totals, request.GET.get('format'))
     except Exception as e:
         return JsonResponse({
             'success': False,
@@ -1009,6 +1549,7 @@ def get_all_bet_totals(request):
 
 @login_required
 @require_http_methods(["GET"])
+@replica_reads
 def get_bulk_action_history(request):
     """Get all bulk action history for the current user with optional bazar and date filtering"""
     try:
@@ -1016,54 +1557,63 @@ def get_bulk_action_history(request):
         bazar = request.GET.get('bazar', None)
         date_str = request.GET.get('date', None)
         
-        # Start with base query
-        bulk_actions = BulkBetAction.objects.filter(user=request.user).select_related('user')
+        compact_times = wants_compact_times(request)
+        bulk_actions = bulk_action_history_queryset(request.user, bazar, date_str)
+        history_data = [serialize_bulk_action_history(action, compact_times) for action in bulk_actions]
         
-        # Apply bazar filter if provided
-        if bazar:
-            bulk_actions = bulk_actions.filter(bazar=bazar)
-        
-        # Apply date filter if provided
-        if date_str:
-            from datetime import datetime
-            try:
-                filter_date = datetime.fromisoformat(date_str).date()
-                bulk_actions = bulk_actions.filter(action_date=filter_date)
-            except ValueError:
-                pass  # Invalid date format, skip filtering
-        
-        # Order by newest first
-        bulk_actions = bulk_actions.order_by('-created_at')
-        
-        history_data = []
-        for action in bulk_actions:
-            # Convert to IST for display
-            from django.utils import timezone as tz
-            local_time = tz.localtime(action.created_at)
-            history_data.append({
-                'id': action.id,
-                'action_type': action.action_type,
-                'amount': str(action.amount),
-                'total_bets': action.total_bets,
-                'jodi_column': action.jodi_column,
-                'jodi_type': action.jodi_type,
-                'created_at': local_time.strftime('%Y-%m-%d %I:%M:%S %p IST'),
-                'is_undone': action.is_undone,
-                'bazar': action.bazar,
-                'action_date': action.action_date.strftime('%Y-%m-%d') if action.action_date else None
-            })
-        
-        return JsonResponse({
+        return JsonResponse(versioned_payload({
             'success': True,
             'history': history_data,
             'count': len(history_data)
-        })
+        }, compact_times))
     except Exception as e:
         return JsonResponse({
             'success': False,
             'error': str(e)
         })
-    
+
+
+@login_required
+@require_http_methods(["GET"])
+@replica_reads
+def get_bazar_overview(request):
+    """Total amount, bet count and last action of every bazar for a date or date range"""
+    try:
+        from datetime import datetime
+        from django.utils import timezone
+        date_str = request.GET.get('date')
+        date_from = date_to = timezone.now().date()
+        if date_str:
+            date_from = date_to = datetime.fromisoformat(date_str).date()
+        if request.GET.get('date_from'):
+            date_from = datetime.fromisoformat(request.GET['date_from']).date()
+        if request.GET.get('date_to'):
+            date_to = datetime.fromisoformat(request.GET['date_to']).date()
+
+        if date_from > date_to:
+            return JsonResponse({'success': False, 'error': 'date_from must not be after date_to'}, status=400)
+        if (date_to - date_from).days >= MAX_OVERVIEW_DAYS:
+            return JsonResponse({'success': False, 'error': f'Date range is limited to {MAX_OVERVIEW_DAYS} days'}, status=400)
+
+        compact_times = wants_compact_times(request)
+        bazars = coalesced_user_read(
+            book_read_name('bazar_overview', compact_times), request.user.id,
+            lambda: bazar_overview(request.user, date_from, date_to, compact_times),
+            params=f'{date_from}:{date_to}'
+        )
+
+        return JsonResponse(versioned_payload({
+            'success': True,
+            'date_from': date_from.strftime('%Y-%m-%d'),
+            'date_to': date_to.strftime('%Y-%m-%d'),
+            'bazars': bazars
+        }, compact_times))
+
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid date'}, status=400)
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
 
 def generate_three_digit_numbers(digits_string):
     """
@@ -1258,9 +1808,93 @@ def find_comman_pana_numbers(request):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+# Catalog previews are pure functions of their parameters over the static
+# number catalog, so the GET variants are public and cached as immutable:
+# their canonical URL carries the catalog version, which changes whenever
+# the catalog data does
+CATALOG_MAX_AGE = 365 * 24 * 60 * 60
+
+
+@lru_cache(maxsize=None)
+def catalog_version():
+    """Short hash of the number catalog the previews are computed from"""
+    catalog = json.dumps([ALL_COLUMN_DATA, generate_three_digit_numbers('1234567890')])
+    return hashlib.md5(catalog.encode()).hexdigest()[:12]
+
+
+def catalog_response(request, canonical_params, compute):
+    """
+    Immutable response for a catalog GET. Requests that are not in canonical
+    form (parameter order, digit order, catalog version) are redirected to
+    it, so browsers and proxies keep one cache entry per distinct preview.
+    """
+    query = urlencode({**canonical_params, 'v': catalog_version()})
+    if request.META.get('QUERY_STRING') != query:
+        # Not permanent: the version in the target changes with the catalog
+        return redirect(f'{request.path}?{query}')
+
+    etag = f'"{hashlib.md5(query.encode()).hexdigest()}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = JsonResponse(compute())
+    response.headers['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=CATALOG_MAX_AGE, immutable=True)
+    return response
+
+
+@require_http_methods(["GET"])
+def get_motar_numbers(request):
+    """Cacheable GET variant of generate_motar_numbers (?digits=)"""
+    digits = request.GET.get('digits', '')
+    if not digits or not digits.isdigit():
+        return JsonResponse({'error': 'Invalid digits input'}, status=400)
+    if len(digits) < 4 or len(digits) > 10:
+        return JsonResponse({'error': 'Digits must be 4-10 characters long'}, status=400)
+    
+    def compute():
+        numbers = generate_three_digit_numbers(digits)
+        return {
+            'success': True,
+            'numbers': numbers,
+            'count': len(numbers)
+        }
+    
+    # The numbers only depend on which digits are given, not their order
+    return catalog_response(request, {'digits': ''.join(sorted(digits))}, compute)
+
+
+@require_http_methods(["GET"])
+def get_comman_pana_numbers(request):
+    """Cacheable GET variant of find_comman_pana_numbers (?digit=&type=)"""
+    digit_str = request.GET.get('digit', '')
+    if not digit_str:
+        return JsonResponse({'error': 'Missing digit parameter'}, status=400)
+    if not digit_str.isdigit() or len(digit_str) != 1:
+        return JsonResponse({'error': 'Digit must be a single digit (0-9)'}, status=400)
+    # Anything but 56 is Common Pana 36, as in the POST variant
+    bet_type = '56' if request.GET.get('type') == '56' else '36'
+    
+    def compute():
+        if bet_type == '56':
+            numbers = find_sp_dp_numbers_with_digit(digit_str)
+            bet_name = 'Common Pana 56'
+        else:
+            numbers = find_sp_numbers_with_digit(digit_str)
+            bet_name = 'Common Pana 36'
+        return {
+            'success': True,
+            'numbers': numbers,
+            'count': len(numbers),
+            'digit': digit_str,
+            'type': bet_type,
+            'bet_name': bet_name
+        }
+    
+    return catalog_response(request, {'digit': digit_str, 'type': bet_type}, compute)
+
+
 @login_required
 @require_http_methods(["POST"])
-@transaction.atomic
 def place_motar_bet(request):
     """Place bulk Motar bet - generate numbers and place all bets in one transaction"""
     try:
@@ -1290,6 +1924,10 @@ def place_motar_bet(request):
         if date_str:
             from datetime import datetime
             bet_date = datetime.fromisoformat(date_str).date()
+
+        closed, blocked = placement_state(bazar, bet_date)
+        if blocked:
+            return JsonResponse({'success': False, 'error': 'This bazar is closed for the date'}, status=400)
         
         # Generate numbers server-side
         numbers = generate_three_digit_numbers(digits)
@@ -1298,35 +1936,50 @@ def place_motar_bet(request):
             return JsonResponse({'error': 'No valid numbers generated'}, status=400)
         
         # Create bulk action record for Motar
-        bulk_action = BulkBetAction.objects.create(
-            user=request.user,
-            action_type='MOTAR',
-            amount=amount,
-            total_bets=len(numbers),
-            bazar=bazar,
-            action_date=bet_date
-        )
-        
-        # Create bets and track IDs for undo functionality
-        bet_ids = []
-        bets_created = []
-        
-        for number in numbers:
-            bet = Bet.objects.create(
+        with transaction.atomic():
+            bulk_action = BulkBetAction.objects.create(
                 user=request.user,
-                number=str(number),
+                action_type='MOTAR',
                 amount=amount,
-                bet_type='MOTAR',
-                bulk_action=bulk_action,
+                total_bets=len(numbers),
                 bazar=bazar,
-                bet_date=bet_date
+                action_date=bet_date,
+                number_set=compact_number_set('MOTAR', numbers)
             )
-            bet_ids.append(bet.id)
-            bets_created.append({
-                'bet_id': bet.id,
-                'number': bet.number,
-                'amount': str(bet.amount)
-            })
+        
+            # Create bets and track IDs for undo functionality
+            bet_ids = []
+            bets_created = []
+        
+            if bulk_action.is_compact:
+                for bet in bulk_action.virtual_bets():
+                    bet_ids.append(bet.id)
+                    bets_created.append({
+                        'bet_id': bet.id,
+                        'number': bet.number,
+                        'amount': str(amount)
+                    })
+            else:
+                for number in numbers:
+                    bet = Bet.objects.create(
+                        user=request.user,
+                        number=str(number),
+                        amount=amount,
+                        bet_type='MOTAR',
+                        bulk_action=bulk_action,
+                        bazar=bazar,
+                        bet_date=bet_date
+                    )
+                    bet_ids.append(bet.id)
+                    bets_created.append({
+                        'bet_id': bet.id,
+                        'number': bet.number,
+                        'amount': str(bet.amount)
+                    })
+        
+            add_bulk_action(bulk_action)
+            log_placed_bulk_action(bulk_action)
+            invalidate_book(request.user.id, bazar, bet_date, closed=closed)
         
         return JsonResponse({
             'success': True,
@@ -1346,7 +1999,6 @@ def place_motar_bet(request):
 
 @login_required
 @require_http_methods(["POST"])
-@transaction.atomic
 def place_comman_pana_bet(request):
     """Place bulk Common Pana bet - supports both 36 (SP only) and 56 (SP + DP)"""
     try:
@@ -1378,6 +2030,10 @@ def place_comman_pana_bet(request):
         if date_str:
             from datetime import datetime
             bet_date = datetime.fromisoformat(date_str).date()
+
+        closed, blocked = placement_state(bazar, bet_date)
+        if blocked:
+            return JsonResponse({'success': False, 'error': 'This bazar is closed for the date'}, status=400)
         
         # Find numbers based on type
         if bet_type == '56':
@@ -1395,36 +2051,51 @@ def place_comman_pana_bet(request):
             return JsonResponse({'error': f'No numbers contain digit {digit}'}, status=400)
         
         # Create bulk action record
-        bulk_action = BulkBetAction.objects.create(
-            user=request.user,
-            action_type=action_type,
-            amount=amount,
-            total_bets=len(numbers),
-            jodi_type=int(digit),  # Store the digit in jodi_type field for reference
-            bazar=bazar,
-            action_date=bet_date
-        )
-        
-        # Create bets and track IDs for undo functionality
-        bet_ids = []
-        bets_created = []
-        
-        for number in numbers:
-            bet = Bet.objects.create(
+        with transaction.atomic():
+            bulk_action = BulkBetAction.objects.create(
                 user=request.user,
-                number=str(number),
+                action_type=action_type,
                 amount=amount,
-                bet_type=bet_type_name,
-                bulk_action=bulk_action,
+                total_bets=len(numbers),
+                jodi_type=int(digit),  # Store the digit in jodi_type field for reference
                 bazar=bazar,
-                bet_date=bet_date
+                action_date=bet_date,
+                number_set=compact_number_set(action_type, numbers)
             )
-            bet_ids.append(bet.id)
-            bets_created.append({
-                'bet_id': bet.id,
-                'number': bet.number,
-                'amount': str(bet.amount)
-            })
+        
+            # Create bets and track IDs for undo functionality
+            bet_ids = []
+            bets_created = []
+        
+            if bulk_action.is_compact:
+                for bet in bulk_action.virtual_bets():
+                    bet_ids.append(bet.id)
+                    bets_created.append({
+                        'bet_id': bet.id,
+                        'number': bet.number,
+                        'amount': str(amount)
+                    })
+            else:
+                for number in numbers:
+                    bet = Bet.objects.create(
+                        user=request.user,
+                        number=str(number),
+                        amount=amount,
+                        bet_type=bet_type_name,
+                        bulk_action=bulk_action,
+                        bazar=bazar,
+                        bet_date=bet_date
+                    )
+                    bet_ids.append(bet.id)
+                    bets_created.append({
+                        'bet_id': bet.id,
+                        'number': bet.number,
+                        'amount': str(bet.amount)
+                    })
+        
+            add_bulk_action(bulk_action)
+            log_placed_bulk_action(bulk_action)
+            invalidate_book(request.user.id, bazar, bet_date, closed=closed)
         
         return JsonResponse({
             'success': True,
@@ -1445,7 +2116,6 @@ def place_comman_pana_bet(request):
 
 @login_required
 @require_http_methods(["POST"])
-@transaction.atomic
 def place_set_pana_bet(request):
     """Place Set Pana bet - bets on all numbers in a family group"""
     try:
@@ -1477,6 +2147,10 @@ def place_set_pana_bet(request):
         if date_str:
             from datetime import datetime
             bet_date = datetime.fromisoformat(date_str).date()
+
+        closed, blocked = placement_state(bazar, bet_date)
+        if blocked:
+            return JsonResponse({'success': False, 'error': 'This bazar is closed for the date'}, status=400)
         
         # Find the family group
         family_name, family_numbers = find_family_group_by_number(number)
@@ -1487,35 +2161,50 @@ def place_set_pana_bet(request):
             }, status=400)
         
         # Create bulk action record
-        bulk_action = BulkBetAction.objects.create(
-            user=request.user,
-            action_type='SET_PANA',
-            amount=amount,
-            total_bets=len(family_numbers),
-            bazar=bazar,
-            action_date=bet_date
-        )
-        
-        # Create bets for all numbers in the family
-        bet_ids = []
-        bets_created = []
-        
-        for num in family_numbers:
-            bet = Bet.objects.create(
+        with transaction.atomic():
+            bulk_action = BulkBetAction.objects.create(
                 user=request.user,
-                number=str(num),
+                action_type='SET_PANA',
                 amount=amount,
-                bet_type='SET_PANA',
-                bulk_action=bulk_action,
+                total_bets=len(family_numbers),
                 bazar=bazar,
-                bet_date=bet_date
+                action_date=bet_date,
+                number_set=compact_number_set('SET_PANA', family_numbers)
             )
-            bet_ids.append(bet.id)
-            bets_created.append({
-                'bet_id': bet.id,
-                'number': bet.number,
-                'amount': str(bet.amount)
-            })
+        
+            # Create bets for all numbers in the family
+            bet_ids = []
+            bets_created = []
+        
+            if bulk_action.is_compact:
+                for bet in bulk_action.virtual_bets():
+                    bet_ids.append(bet.id)
+                    bets_created.append({
+                        'bet_id': bet.id,
+                        'number': bet.number,
+                        'amount': str(amount)
+                    })
+            else:
+                for num in family_numbers:
+                    bet = Bet.objects.create(
+                        user=request.user,
+                        number=str(num),
+                        amount=amount,
+                        bet_type='SET_PANA',
+                        bulk_action=bulk_action,
+                        bazar=bazar,
+                        bet_date=bet_date
+                    )
+                    bet_ids.append(bet.id)
+                    bets_created.append({
+                        'bet_id': bet.id,
+                        'number': bet.number,
+                        'amount': str(bet.amount)
+                    })
+        
+            add_bulk_action(bulk_action)
+            log_placed_bulk_action(bulk_action)
+            invalidate_book(request.user.id, bazar, bet_date, closed=closed)
         
         return JsonResponse({
             'success': True,
@@ -1569,6 +2258,10 @@ def place_group_bet(request):
         if date_str:
             from datetime import datetime
             bet_date = datetime.fromisoformat(date_str).date()
+
+        closed, blocked = placement_state(bazar, bet_date)
+        if blocked:
+            return JsonResponse({'success': False, 'error': 'This bazar is closed for the date'}, status=400)
         
         # Generate all valid 3-digit numbers containing both digits
         d1_str = str(digit1)
@@ -1596,35 +2289,50 @@ def place_group_bet(request):
         matching_numbers.sort()
         
         # Create bulk action record
-        bulk_action = BulkBetAction.objects.create(
-            user=request.user,
-            action_type='GROUP',
-            amount=amount,
-            total_bets=len(matching_numbers),
-            bazar=bazar,
-            action_date=bet_date
-        )
-        
-        # Create bets for all matching numbers
-        bet_ids = []
-        bets_created = []
-        
-        for num in matching_numbers:
-            bet = Bet.objects.create(
+        with transaction.atomic():
+            bulk_action = BulkBetAction.objects.create(
                 user=request.user,
-                number=num,
+                action_type='GROUP',
                 amount=amount,
-                bet_type='GROUP',
-                bulk_action=bulk_action,
+                total_bets=len(matching_numbers),
                 bazar=bazar,
-                bet_date=bet_date
+                action_date=bet_date,
+                number_set=compact_number_set('GROUP', matching_numbers)
             )
-            bet_ids.append(bet.id)
-            bets_created.append({
-                'bet_id': bet.id,
-                'number': bet.number,
-                'amount': str(bet.amount)
-            })
+        
+            # Create bets for all matching numbers
+            bet_ids = []
+            bets_created = []
+        
+            if bulk_action.is_compact:
+                for bet in bulk_action.virtual_bets():
+                    bet_ids.append(bet.id)
+                    bets_created.append({
+                        'bet_id': bet.id,
+                        'number': bet.number,
+                        'amount': str(amount)
+                    })
+            else:
+                for num in matching_numbers:
+                    bet = Bet.objects.create(
+                        user=request.user,
+                        number=num,
+                        amount=amount,
+                        bet_type='GROUP',
+                        bulk_action=bulk_action,
+                        bazar=bazar,
+                        bet_date=bet_date
+                    )
+                    bet_ids.append(bet.id)
+                    bets_created.append({
+                        'bet_id': bet.id,
+                        'number': bet.number,
+                        'amount': str(bet.amount)
+                    })
+        
+            add_bulk_action(bulk_action)
+            log_placed_bulk_action(bulk_action)
+            invalidate_book(request.user.id, bazar, bet_date, closed=closed)
         
         return JsonResponse({
             'success': True,
@@ -1642,57 +2350,107 @@ def place_group_bet(request):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+def database_storage():
+    """Database size payload for the storage meter, or None when the SQLite file is missing"""
+    # Check if using PostgreSQL (production/Aiven) or SQLite (development)
+    db_engine = connection.settings_dict['ENGINE']
+    
+    if 'postgresql' in db_engine:
+        # For PostgreSQL (Aiven)
+        with connection.cursor() as cursor:
+            # Get database size in bytes
+            cursor.execute("SELECT pg_database_size(current_database());")
+            size_bytes = cursor.fetchone()[0]
+        database_type = 'PostgreSQL (Aiven)'
+    else:
+        # For SQLite (development)
+        db_path = connection.settings_dict['NAME']
+        if not os.path.exists(db_path):
+            return None
+        size_bytes = os.path.getsize(db_path)
+        database_type = 'SQLite (Development)'
+    
+    # Convert to MB
+    size_mb = size_bytes / (1024 * 1024)
+    # Aiven free tier limit: 1 GB = 1024 MB (same limit for SQLite, for consistency)
+    max_storage_mb = 1024
+    percentage = (size_mb / max_storage_mb) * 100
+    
+    return {
+        'storage_used_mb': round(size_mb, 2),
+        'storage_total_mb': max_storage_mb,
+        'percentage': round(percentage, 2),
+        'database_type': database_type
+    }
+
+
 @login_required
 @require_http_methods(["GET"])
 def get_database_storage(request):
     """Get database storage usage information"""
     try:
-        # Check if using PostgreSQL (production/Aiven) or SQLite (development)
-        db_engine = connection.settings_dict['ENGINE']
-        
-        if 'postgresql' in db_engine:
-            # For PostgreSQL (Aiven)
-            with connection.cursor() as cursor:
-                # Get database size in bytes
-                cursor.execute("SELECT pg_database_size(current_database());")
-                size_bytes = cursor.fetchone()[0]
+        storage = database_storage()
+        if storage is None:
+            return JsonResponse({
+                'success': False,
+                'error': 'Database file not found'
+            }, status=404)
+        
+        return JsonResponse({
+            'success': True,
+            **storage
+        })
                 
-            # Convert to MB
-            size_mb = size_bytes / (1024 * 1024)
-            # Aiven free tier limit: 1 GB = 1024 MB
-            max_storage_mb = 1024
-            percentage = (size_mb / max_storage_mb) * 100
-            
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+@login_required
+@require_http_methods(["GET"])
+def get_db_pool_stats(request):
+    """Get connection pool metrics for this worker process (staff only)"""
+    if not request.user.is_staff:
+        return JsonResponse({'success': False, 'error': 'Staff access required'}, status=403)
+
+    try:
+        if not connection.settings_dict['OPTIONS'].get('pool'):
             return JsonResponse({
                 'success': True,
-                'storage_used_mb': round(size_mb, 2),
-                'storage_total_mb': max_storage_mb,
-                'percentage': round(percentage, 2),
-                'database_type': 'PostgreSQL (Aiven)'
+                'pooled': False,
+                'database_type': connection.vendor
             })
-        else:
-            # For SQLite (development)
-            db_path = connection.settings_dict['NAME']
-            if os.path.exists(db_path):
-                size_bytes = os.path.getsize(db_path)
-                size_mb = size_bytes / (1024 * 1024)
-                # Use same 1GB limit for consistency
-                max_storage_mb = 1024
-                percentage = (size_mb / max_storage_mb) * 100
-                
-                return JsonResponse({
-                    'success': True,
-                    'storage_used_mb': round(size_mb, 2),
-                    'storage_total_mb': max_storage_mb,
-                    'percentage': round(percentage, 2),
-                    'database_type': 'SQLite (Development)'
-                })
-            else:
-                return JsonResponse({
-                    'success': False,
-                    'error': 'Database file not found'
-                }, status=404)
-                
+
+        # Pools are per process, so these numbers cover this worker only.
+        # get_stats() returns gauges plus counters accumulated since start.
+        stats = connection.pool.get_stats()
+        pool_max = stats.get('pool_max', 0)
+        in_use = stats.get('pool_size', 0) - stats.get('pool_available', 0)
+        queued = stats.get('requests_queued', 0)
+
+        return JsonResponse({
+            'success': True,
+            'pooled': True,
+            'database_type': connection.vendor,
+            'pid': os.getpid(),
+            'pool_min': stats.get('pool_min', 0),
+            'pool_max': pool_max,
+            'pool_size': stats.get('pool_size', 0),
+            'in_use': in_use,
+            'available': stats.get('pool_available', 0),
+            'waiting': stats.get('requests_waiting', 0),
+            'saturation': round(in_use / pool_max, 3) if pool_max else 0,
+            'checkouts': stats.get('requests_num', 0),
+            'checkouts_queued': queued,
+            'checkout_errors': stats.get('requests_errors', 0),
+            'wait_ms_total': stats.get('requests_wait_ms', 0),
+            'wait_ms_avg': round(stats.get('requests_wait_ms', 0) / queued, 2) if queued else 0,
+            'connections_opened': stats.get('connections_num', 0),
+            'connection_errors': stats.get('connections_errors', 0),
+            'connections_lost': stats.get('connections_lost', 0)
+        })
     except Exception as e:
         return JsonResponse({
             'success': False,
@@ -1723,6 +2481,10 @@ def place_column_bet(request):
                 'error': 'Amount must be greater than 0'
             }, status=400)
         
+        closed, blocked = placement_state(bazar, bet_date)
+        if blocked:
+            return JsonResponse({'success': False, 'error': 'This bazar is closed for the date'}, status=400)
+        
         # Create the bet with column number as the "number" field
         with transaction.atomic():
             bet = Bet.objects.create(
@@ -1734,6 +2496,9 @@ def place_column_bet(request):
                 bazar=bazar,
                 bet_date=bet_date
             )
+            add_bets([bet])
+            log_placed_bets([bet])
+            invalidate_book(request.user.id, bazar, bet_date, closed=closed)
         
         return JsonResponse({
             'success': True,
@@ -1752,25 +2517,25 @@ def place_column_bet(request):
 
 @login_required
 @require_http_methods(["GET"])
+@conditional_book_read
+@replica_reads
 def get_column_totals(request):
     """Get total bet amounts for each column (1-10)"""
     try:
-        bazar = request.GET.get('bazar')
-        bet_date = request.GET.get('date')
+        # The same book conditional_book_read derived the ETag from
+        book = request_book(request)
+        if book is None:
+            return JsonResponse({'success': False, 'error': 'Invalid date'}, status=400)
+        bazar, bet_date = book
         
-        # Get totals for each column
-        column_totals = {}
-        for col in range(1, 11):
-            total = Bet.objects.filter(
-                user=request.user,
-                bet_type='COLUMN',
-                column_number=col,
-                bazar=bazar,
-                bet_date=bet_date,
-                is_deleted=False
-            ).aggregate(total=Sum('amount'))['total'] or 0
-            
-            column_totals[col] = float(total)
+        # Get totals for each column in one grouped query
+        def build_column_totals():
+            snapshot = closed_book_snapshot(request.user.id, bazar, bet_date)
+            if snapshot is not None:
+                return snapshot_column_totals(snapshot)
+            return column_totals_from_rows(column_totals_queryset(request.user, bazar, bet_date))
+        
+        column_totals = coalesced_book_read('column_totals', request.user.id, bazar, bet_date, build_column_totals)
         
         return JsonResponse({
             'success': True,
@@ -1786,7 +2551,6 @@ def get_column_totals(request):
 
 @login_required
 @require_http_methods(["POST"])
-@transaction.atomic
 def place_quick_bets(request):
     """Place multiple quick bets at once (used for voice input and manual quick entry)"""
     try:
@@ -1805,41 +2569,59 @@ def place_quick_bets(request):
             from datetime import datetime
             bet_date = datetime.fromisoformat(date_str).date()
 
+        closed, blocked = placement_state(bazar, bet_date)
+        if blocked:
+            return JsonResponse({'success': False, 'error': 'This bazar is closed for the date'}, status=400)
+
         created_bets = []
+        new_bets = []
         errors = []
 
-        for bet_item in bets:
-            number = bet_item.get('number')
-            amount = bet_item.get('amount')
-
-            if not number or not amount:
-                errors.append({'number': number, 'error': 'Missing number or amount'})
-                continue
+        # One commit for the whole batch
+        with transaction.atomic():
+            for bet_item in bets:
+                number = bet_item.get('number')
+                amount = bet_item.get('amount')
 
-            try:
-                amount = Decimal(str(amount))
-                if amount <= 0:
-                    errors.append({'number': number, 'error': 'Amount must be greater than 0'})
+                if not number or not amount:
+                    errors.append({'number': number, 'error': 'Missing number or amount'})
                     continue
 
-                # Pad number to 3 digits
-                number_str = str(number).zfill(3)
-
-                bet = Bet.objects.create(
-                    user=request.user,
-                    number=number_str,
-                    amount=amount,
-                    bet_type='SINGLE',
-                    bazar=bazar,
-                    bet_date=bet_date
-                )
-                created_bets.append({
-                    'id': bet.id,
-                    'number': bet.number,
-                    'amount': str(bet.amount)
-                })
-            except Exception as e:
-                errors.append({'number': number, 'error': str(e)})
+                try:
+                    amount = Decimal(str(amount))
+                    if amount <= 0:
+                        errors.append({'number': number, 'error': 'Amount must be greater than 0'})
+                        continue
+
+                    # Pad number to 3 digits
+                    number_str = str(number).zfill(3)
+                    if not is_valid_bet_number(number_str):
+                        errors.append({'number': number, 'error': 'Number must be 3 digits'})
+                        continue
+
+                    # Savepoint, so one failed insert doesn't abort the whole batch
+                    with transaction.atomic():
+                        bet = Bet.objects.create(
+                            user=request.user,
+                            number=number_str,
+                            amount=amount,
+                            bet_type='SINGLE',
+                            bazar=bazar,
+                            bet_date=bet_date
+                        )
+                    new_bets.append(bet)
+                    created_bets.append({
+                        'id': bet.id,
+                        'number': bet.number,
+                        'amount': str(bet.amount)
+                    })
+                except Exception as e:
+                    errors.append({'number': number, 'error': str(e)})
+
+            if created_bets:
+                add_bets(new_bets)
+                log_placed_bets(new_bets)
+                invalidate_book(request.user.id, bazar, bet_date, closed=closed)
 
         return JsonResponse({
             'success': len(created_bets) > 0,
@@ -1852,4 +2634,227 @@ def place_quick_bets(request):
     except json.JSONDecodeError:
         return JsonResponse({'error': 'Invalid JSON'}, status=400)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
\ No newline at end of file
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required
+@require_http_methods(["POST"])
+def declare_result(request):
+    """Declare the pana of a bazar and settle all of its bets (staff only)"""
+    if not request.user.is_staff:
+        return JsonResponse({'success': False, 'error': 'Staff access required'}, status=403)
+
+    try:
+        data = json.loads(request.body.decode('utf-8'))
+        bazar = data.get('bazar')
+        date_str = data.get('date')
+        pana = data.get('pana')
+
+        if not bazar or not date_str or pana is None:
+            return JsonResponse({'success': False, 'error': 'Bazar, date and pana are required'}, status=400)
+
+        if bazar not in Bet.BAZAR_CODES:
+            return JsonResponse({'success': False, 'error': f'Unknown bazar {bazar}'}, status=400)
+
+        from datetime import datetime
+        result_date = datetime.fromisoformat(date_str).date()
+
+        try:
+            result, summaries = settle_bazar(bazar, result_date, pana, declared_by=request.user)
+        except ValueError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+        return JsonResponse({
+            'success': True,
+            'result': {
+                'bazar': result.bazar,
+                'date': result.result_date.strftime('%Y-%m-%d'),
+                'pana': result.pana,
+                'total_bets': result.total_bets,
+                'winning_bets': result.winning_bets,
+                'total_stake': str(result.total_stake),
+                'total_payout': str(result.total_payout)
+            },
+            'users': summaries
+        })
+
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'error': 'Invalid JSON'}, status=400)
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+@login_required
+@require_http_methods(["POST"])
+def close_bazar_book(request):
+    """Close a bazar for a date: serve its books from snapshots, optionally blocking placements (staff only)"""
+    if not request.user.is_staff:
+        return JsonResponse({'success': False, 'error': 'Staff access required'}, status=403)
+
+    try:
+        data = json.loads(request.body.decode('utf-8'))
+        bazar = data.get('bazar')
+        date_str = data.get('date')
+
+        if not bazar or not date_str:
+            return JsonResponse({'success': False, 'error': 'Bazar and date are required'}, status=400)
+
+        if bazar not in Bet.BAZAR_CODES:
+            return JsonResponse({'success': False, 'error': f'Unknown bazar {bazar}'}, status=400)
+
+        from datetime import datetime
+        bet_date = datetime.fromisoformat(date_str).date()
+
+        closed, books = close_book(
+            bazar, bet_date,
+            blocks_placements=bool(data.get('block_placements', True)),
+            closed_by=request.user
+        )
+        
+        return JsonResponse({
+            'success': True,
+            'bazar': closed.bazar,
+            'date': closed.bet_date.strftime('%Y-%m-%d'),
+            'blocks_placements': closed.blocks_placements,
+            'books': books
+        })
+    
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'error': 'Invalid JSON'}, status=400)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid date'}, status=400)
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+@login_required
+@require_http_methods(["POST"])
+def reopen_bazar_book(request):
+    """Return a closed bazar to live reads and placements (staff only)"""
+    if not request.user.is_staff:
+        return JsonResponse({'success': False, 'error': 'Staff access required'}, status=403)
+
+    try:
+        data = json.loads(request.body.decode('utf-8'))
+        bazar = data.get('bazar')
+        date_str = data.get('date')
+
+        if not bazar or not date_str:
+            return JsonResponse({'success': False, 'error': 'Bazar and date are required'}, status=400)
+
+        if bazar not in Bet.BAZAR_CODES:
+            return JsonResponse({'success': False, 'error': f'Unknown bazar {bazar}'}, status=400)
+
+        from datetime import datetime
+        bet_date = datetime.fromisoformat(date_str).date()
+
+        if not reopen_book(bazar, bet_date):
+            return JsonResponse({'success': False, 'error': 'This bazar is not closed for the date'}, status=400)
+        
+        return JsonResponse({
+            'success': True,
+            'bazar': bazar,
+            'date': bet_date.strftime('%Y-%m-%d')
+        })
+    
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'error': 'Invalid JSON'}, status=400)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid date'}, status=400)
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+@login_required
+@require_http_methods(["GET"])
+@replica_reads
+def simulate_outcomes(request):
+    """Payout of a bazar's whole book for every possible pana (staff only)"""
+    if not request.user.is_staff:
+        return JsonResponse({'success': False, 'error': 'Staff access required'}, status=403)
+
+    try:
+        bazar = request.GET.get('bazar')
+        date_str = request.GET.get('date')
+
+        if not bazar or not date_str:
+            return JsonResponse({'success': False, 'error': 'Bazar and date are required'}, status=400)
+
+        if bazar not in Bet.BAZAR_CODES:
+            return JsonResponse({'success': False, 'error': f'Unknown bazar {bazar}'}, status=400)
+
+        from datetime import datetime
+        bet_date = datetime.fromisoformat(date_str).date()
+        top = max(1, min(int(request.GET.get('top', 10)), 220))
+
+        # Imported here so NumPy is only needed by this report
+        from .liability import simulate_outcomes as simulate
+
+        return JsonResponse({
+            'success': True,
+            'bazar': bazar,
+            'date': bet_date.strftime('%Y-%m-%d'),
+            **simulate(bazar, bet_date, top=top)
+        })
+
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid date or top'}, status=400)
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+# Seconds between refreshes of the house exposure dashboard
+EXPOSURE_REFRESH_SECONDS = 3
+
+
+@login_required
+def exposure_dashboard(request):
+    """House exposure dashboard across all users (staff only)"""
+    if not request.user.is_staff:
+        return redirect('userbaseapp:home')
+
+    from django.utils import timezone
+    exposure_config = {
+        'bazars': [{'value': value, 'label': label} for value, label in Bet.BAZAR_CHOICES],
+        'currentDate': timezone.now().date().strftime('%Y-%m-%d'),
+        'refreshSeconds': EXPOSURE_REFRESH_SECONDS,
+        'urls': {
+            'houseExposure': reverse('userbaseapp:get_house_exposure'),
+        },
+    }
+    return render(request, 'userbaseapp/exposure.html', {'exposure_config': exposure_config})
+
+
+@login_required
+@require_http_methods(["GET"])
+@replica_reads
+def get_house_exposure(request):
+    """Stake per number across all users of a bazar and date, from the exposure table (staff only)"""
+    if not request.user.is_staff:
+        return JsonResponse({'success': False, 'error': 'Staff access required'}, status=403)
+
+    try:
+        bazar = request.GET.get('bazar')
+        date_str = request.GET.get('date')
+
+        if not bazar or not date_str:
+            return JsonResponse({'success': False, 'error': 'Bazar and date are required'}, status=400)
+
+        if bazar not in Bet.BAZAR_CODES:
+            return JsonResponse({'success': False, 'error': f'Unknown bazar {bazar}'}, status=400)
+
+        from datetime import datetime
+        bet_date = datetime.fromisoformat(date_str).date()
+        top = max(1, min(int(request.GET.get('top', 20)), 1000))
+
+        return JsonResponse({
+            'success': True,
+            'bazar': bazar,
+            'date': bet_date.strftime('%Y-%m-%d'),
+            **book_exposure(bazar, bet_date, top=top)
+        })
+
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid date or top'}, status=400)
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)